@@ -0,0 +1,87 @@
+"""
+Async Database
+AsyncSession layer for high-traffic read endpoints, which then wait on the
+database without holding one of the threadpool's threads. It connects to
+DATABASE_URL through the async driver for the backend (aiosqlite for
+SQLite, asyncpg for Postgres) with the pool settings and SQLite pragmas of
+database.py.
+
+The engine is created on first use, so worker roles that never serve these
+endpoints do not load the async drivers.
+"""
+import threading
+from typing import AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+import database
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+_lock = threading.Lock()
+_engine = None
+_session_factory = None
+
+
+def async_url(url: str) -> URL:
+    """The same database URL with the backend's async driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == "postgresql" and "sslmode" in parsed.query:
+        # asyncpg takes ssl= instead of libpq's sslmode=
+        parsed = parsed.update_query_dict(
+            {"ssl": parsed.query["sslmode"]}
+        ).difference_update_query(["sslmode"])
+    return parsed
+
+
+def get_async_engine():
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                url = async_url(database.DATABASE_URL)
+                is_sqlite = url.get_backend_name() == "sqlite"
+                options = {}
+                if not (is_sqlite and url.database in (None, "", ":memory:")):
+                    options.update(
+                        poolclass=AsyncAdaptedQueuePool,
+                        pool_size=database.POOL_SIZE,
+                        max_overflow=database.MAX_OVERFLOW,
+                        pool_timeout=database.POOL_TIMEOUT,
+                        pool_recycle=database.POOL_RECYCLE,
+                        pool_pre_ping=not is_sqlite,
+                    )
+                engine = create_async_engine(url, **options)
+                pragmas = database.SQLITE_PROFILES.get(database.SQLITE_PRAGMA_PROFILE) if is_sqlite else None
+                if pragmas:
+                    event.listen(engine.sync_engine, "connect", database._sqlite_pragmas(pragmas))
+                _session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+                _engine = engine
+    return _engine
+
+
+def async_session() -> AsyncSession:
+    """New AsyncSession; use as `async with async_session() as db:`"""
+    get_async_engine()
+    return _session_factory()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with async_session() as db:
+        yield db
+
+
+async def dispose():
+    """Close pooled connections (application shutdown)"""
+    if _engine is not None:
+        await _engine.dispose()
@@ -0,0 +1,247 @@
+"""
+Audit Archive
+Keeps audit_logs to a bounded window. Whole calendar months older than the
+kept window are exported to gzip-compressed JSON-lines files and removed
+from the live table in one transaction; every file is recorded in
+audit_archives (month, row count, first/last timestamp) so searches only open
+the files whose month overlaps the requested range.
+
+Archiving is off unless an admin turns it on: run POST /audit-logs/archive,
+or set AUDIT_ARCHIVE_AFTER_MONTHS for a background job after audit flushes.
+AUDIT_ARCHIVE_DIR must be persistent storage; on hosts with an ephemeral
+disk (Render and similar) archived months are lost with the instance.
+
+Configuration (environment variables):
+    AUDIT_ARCHIVE_DIR             Archive directory (default: "audit_archive" next to the database)
+    AUDIT_ARCHIVE_AFTER_MONTHS    Months kept live by the automatic job; 0 disables it (default: 0)
+    AUDIT_ARCHIVE_INTERVAL_HOURS  Minimum time between automatic runs (default: 24)
+"""
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+import models
+from database import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", os.path.join(BASE_DIR, "audit_archive"))
+ARCHIVE_AFTER_MONTHS = int(os.getenv("AUDIT_ARCHIVE_AFTER_MONTHS", "0"))
+ARCHIVE_INTERVAL = timedelta(hours=int(os.getenv("AUDIT_ARCHIVE_INTERVAL_HOURS", "24")))
+
+# Rows fetched per round trip while exporting a month
+EXPORT_BATCH_SIZE = 1000
+
+COLUMNS = [column.name for column in models.AuditLog.__table__.columns]
+
+# Replaced by idx_audit_record_history, which has it as a prefix
+LEGACY_INDEXES = ["idx_audit_table_record"]
+
+
+def ensure_indexes(engine):
+    """Create the audit_logs indexes on databases created before they existed"""
+    for index in models.AuditLog.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        for name in LEGACY_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    # Audit timestamps are UTC; compare them without tzinfo
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def archive_before(db: Session, cutoff: datetime, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Archive every whole month that ends on or before cutoff
+    
+    Returns:
+        One {month, path, rows} item per file written
+    """
+    table = models.AuditLog.__table__
+    cutoff = _month_start(_utc_naive(cutoff))
+    oldest = db.query(func.min(table.c.timestamp)).filter(table.c.timestamp < cutoff).scalar()
+    if oldest is None:
+        return []
+    if isinstance(oldest, str):
+        oldest = datetime.fromisoformat(oldest)
+        
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    archived = []
+    month = _month_start(_utc_naive(oldest))
+    while month < cutoff:
+        result = _archive_month(db, month, _next_month(month), user_id)
+        if result:
+            archived.append(result)
+        month = _next_month(month)
+    return archived
+
+
+def archive_old_months(db: Session, keep_months: int, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Archive the months before the last keep_months (the current month counts as one)"""
+    if keep_months < 1:
+        raise ValueError("keep_months must be at least 1")
+    cutoff = _month_start(datetime.now(timezone.utc).replace(tzinfo=None))
+    for _ in range(max(keep_months - 1, 0)):
+        cutoff = _month_start(cutoff - timedelta(days=1))
+    return archive_before(db, cutoff, user_id)
+
+
+def _archive_month(db: Session, start: datetime, end: datetime, user_id: Optional[int]) -> Optional[Dict[str, Any]]:
+    table = models.AuditLog.__table__
+    in_month = (table.c.timestamp >= start, table.c.timestamp < end)
+    label = start.strftime("%Y-%m")
+    
+    existing = db.query(models.AuditArchive).filter(models.AuditArchive.month == label).count()
+    name = f"audit_{start:%Y_%m}.jsonl.gz" if not existing else f"audit_{start:%Y_%m}_{existing + 1}.jsonl.gz"
+    path = os.path.join(ARCHIVE_DIR, name)
+    
+    rows = 0
+    min_id = max_id = first = last = None
+    query = select(table).where(*in_month).order_by(table.c.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    with gzip.open(path + ".tmp", "wt", encoding="utf-8") as archive:
+        for row in db.execute(query):
+            entry = dict(row._mapping)
+            archive.write(json.dumps(entry, default=str) + "\n")
+            rows += 1
+            min_id = entry["id"] if min_id is None else min(min_id, entry["id"])
+            max_id = entry["id"] if max_id is None else max(max_id, entry["id"])
+            first = entry["timestamp"] if first is None else min(first, entry["timestamp"])
+            last = entry["timestamp"] if last is None else max(last, entry["timestamp"])
+    if not rows:
+        os.remove(path + ".tmp")
+        return None
+    os.replace(path + ".tmp", path)
+    
+    deleted = db.query(models.AuditLog).filter(
+        *in_month, models.AuditLog.id.between(min_id, max_id)
+    ).delete(synchronize_session=False)
+    if deleted != rows:
+        # Rows for this month arrived during the export; leave it for the next run
+        db.rollback()
+        os.remove(path)
+        logger.warning("Audit month %s changed while archiving (%s exported, %s matched); skipped", label, rows, deleted)
+        return None
+        
+    db.add(models.AuditArchive(
+        month=label,
+        path=name,
+        row_count=rows,
+        first_timestamp=first,
+        last_timestamp=last,
+        archived_by=user_id
+    ))
+    db.commit()
+    logger.info("Archived %s audit entries for %s to %s", rows, label, path)
+    return {"month": label, "path": name, "rows": rows}
+
+
+def _matches(entry: Dict[str, Any], filters: Dict[str, Any], start_date, end_date) -> bool:
+    for key, value in filters.items():
+        if value is not None and entry.get(key) != value:
+            return False
+    if start_date is not None and entry["timestamp"] < start_date:
+        return False
+    if end_date is not None and entry["timestamp"] > end_date:
+        return False
+    return True
+
+
+def _read_archive(path: str):
+    with gzip.open(os.path.join(ARCHIVE_DIR, path), "rt", encoding="utf-8") as archive:
+        for line in archive:
+            entry = json.loads(line)
+            entry["timestamp"] = _utc_naive(datetime.fromisoformat(entry["timestamp"])) if entry["timestamp"] else None
+            yield entry
+
+
+def search_archives(
+    db: Session,
+    table_name: Optional[str] = None,
+    record_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """Archived entries matching the filters, newest first, reading only overlapping months"""
+    start_date, end_date = _utc_naive(start_date), _utc_naive(end_date)
+    query = db.query(models.AuditArchive)
+    if start_date:
+        query = query.filter(models.AuditArchive.last_timestamp >= start_date)
+    if end_date:
+        query = query.filter(models.AuditArchive.first_timestamp <= end_date)
+        
+    months: Dict[str, List[str]] = {}
+    for archive in query.order_by(models.AuditArchive.month.desc(), models.AuditArchive.id):
+        months.setdefault(archive.month, []).append(archive.path)
+        
+    filters = {"table_name": table_name, "record_id": record_id, "user_id": user_id, "action": action}
+    results = []
+    for paths in months.values():
+        if len(results) >= limit:
+            break
+        matched = []
+        for path in paths:
+            try:
+                matched.extend(
+                    entry for entry in _read_archive(path)
+                    if _matches(entry, filters, start_date, end_date)
+                )
+            except FileNotFoundError:
+                logger.error("Audit archive %s is missing from %s", path, ARCHIVE_DIR)
+        matched.sort(key=lambda entry: (entry["timestamp"], entry["id"]), reverse=True)
+        results.extend(matched[:limit - len(results)])
+    return results
+
+
+_archival_lock = threading.Lock()
+_last_archival_run: Optional[datetime] = None
+
+
+def schedule_archival() -> bool:
+    """Archive old months on a background thread, at most once per ARCHIVE_INTERVAL (when enabled)"""
+    global _last_archival_run
+    if ARCHIVE_AFTER_MONTHS <= 0:
+        return False
+    now = datetime.now()
+    if _last_archival_run and now - _last_archival_run < ARCHIVE_INTERVAL:
+        return False
+    if not _archival_lock.acquire(blocking=False):
+        return False
+    _last_archival_run = now
+    threading.Thread(target=_archival_worker, name="audit-archival", daemon=True).start()
+    return True
+
+
+def _archival_worker():
+    from database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        archive_old_months(db, ARCHIVE_AFTER_MONTHS)
+    except Exception:
+        db.rollback()
+        logger.exception("Audit archival failed; it runs again after the next interval")
+    finally:
+        db.close()
+        _archival_lock.release()
@@ -4,10 +4,11 @@ Tracks all user actions and data changes for compliance and security
 """
 
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import models
+import audit_writer
 
 class AuditService:
     """Service for logging user actions and data changes"""
@@ -25,7 +26,8 @@ class AuditService:
         new_values: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        commit: bool = True
     ) -> models.AuditLog:
         """
         Log an audit trail entry
@@ -40,25 +42,37 @@ class AuditService:
             ip_address: User's IP address
             user_agent: User's browser/client info
             description: Human-readable description
+            commit: Write regardless of the caller's transaction. Pass False
+                to tie the entry to the caller's transaction: it is written only
+                once the caller commits, and dropped on rollback
         
         Returns:
-            Created AuditLog entry
+            The AuditLog entry. Unless AUDIT_SYNC is set it is not yet in the
+            database; the audit writer inserts it in the background
         """
-        audit_log = models.AuditLog(
-            user_id=user_id,
-            action=action,
-            table_name=table_name,
-            record_id=record_id,
-            old_values=json.dumps(old_values) if old_values else None,
-            new_values=json.dumps(new_values) if new_values else None,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            description=description
-        )
+        entry = {
+            "user_id": user_id,
+            "action": action,
+            "table_name": table_name,
+            "record_id": record_id,
+            "old_values": json.dumps(old_values, default=str) if old_values else None,
+            "new_values": json.dumps(new_values, default=str) if new_values else None,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "timestamp": datetime.now(timezone.utc),
+            "description": description
+        }
+        audit_log = models.AuditLog(**entry)
         
-        self.db.add(audit_log)
-        self.db.commit()
-        self.db.refresh(audit_log)
+        if audit_writer.SYNC:
+            self.db.add(audit_log)
+            if commit:
+                self.db.commit()
+                self.db.refresh(audit_log)
+        elif commit:
+            audit_writer.writer.enqueue(entry)
+        else:
+            audit_writer.enqueue_on_commit(self.db, entry)
         
         return audit_log
     
@@ -69,7 +83,8 @@ class AuditService:
         record_id: int,
         new_values: Dict[str, Any],
         ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None
+        user_agent: Optional[str] = None,
+        commit: bool = True
     ) -> models.AuditLog:
         """Log a record creation"""
         return self.log_action(
@@ -80,7 +95,8 @@ class AuditService:
             new_values=new_values,
             ip_address=ip_address,
             user_agent=user_agent,
-            description=f"Created {table_name} record #{record_id}"
+            description=f"Created {table_name} record #{record_id}",
+            commit=commit
         )
     
     def log_update(
@@ -168,6 +184,12 @@ class AuditService:
             description="User logged out"
         )
     
+    def _query(self, rows: bool):
+        # Column tuples skip building AuditLog objects for list responses
+        if rows:
+            return self.db.query(*models.AuditLog.__table__.columns)
+        return self.db.query(models.AuditLog)
+    
     def get_audit_trail(
         self,
         table_name: Optional[str] = None,
@@ -177,14 +199,16 @@ class AuditService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        rows: bool = False
     ):
         """
         Query audit trail with filters
         
-        Returns list of audit log entries matching criteria
+        Returns list of audit log entries matching criteria (column tuples
+        instead of AuditLog objects with rows=True)
         """
-        query = self.db.query(models.AuditLog)
+        query = self._query(rows)
         
         if table_name:
             query = query.filter(models.AuditLog.table_name == table_name)
@@ -207,23 +231,31 @@ class AuditService:
     def get_record_history(
         self,
         table_name: str,
-        record_id: int
+        record_id: int,
+        limit: Optional[int] = None,
+        rows: bool = False
     ):
         """Get complete history of changes for a specific record"""
-        return self.db.query(models.AuditLog).filter(
+        query = self._query(rows).filter(
             models.AuditLog.table_name == table_name,
             models.AuditLog.record_id == record_id
-        ).order_by(models.AuditLog.timestamp.asc()).all()
+        ).order_by(models.AuditLog.timestamp.asc())
+        
+        if limit:
+            query = query.limit(limit)
+        
+        return query.all()
     
     def get_user_activity(
         self,
         user_id: int,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        rows: bool = False
     ):
         """Get all activity for a specific user"""
-        query = self.db.query(models.AuditLog).filter(
+        query = self._query(rows).filter(
             models.AuditLog.user_id == user_id
         )
         
@@ -233,6 +265,55 @@ class AuditService:
             query = query.filter(models.AuditLog.timestamp <= end_date)
         
         return query.order_by(models.AuditLog.timestamp.desc()).limit(limit).all()
+    
+    def search(
+        self,
+        table_name: Optional[str] = None,
+        record_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        include_archived: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Query live and archived audit entries, newest first
+        
+        Archived months are older than every live entry, so the archive files
+        are only opened when the live table cannot fill the limit.
+        """
+        import audit_archive
+        
+        logs = self.get_audit_trail(
+            table_name=table_name,
+            record_id=record_id,
+            user_id=user_id,
+            action=action,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+        results = [
+            dict({column: getattr(log, column) for column in audit_archive.COLUMNS}, archived=False)
+            for log in logs
+        ]
+        
+        if include_archived and len(results) < limit:
+            for entry in audit_archive.search_archives(
+                self.db,
+                table_name=table_name,
+                record_id=record_id,
+                user_id=user_id,
+                action=action,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit - len(results)
+            ):
+                entry["archived"] = True
+                results.append(entry)
+        
+        return results
 
 def get_client_ip(request) -> Optional[str]:
     """Extract client IP address from request"""
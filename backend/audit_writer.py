@@ -0,0 +1,329 @@
+"""
+Audit Writer
+Takes audit log inserts off the request path. AuditService.log_action hands
+each entry to the writer, and a background flusher bulk-inserts the queue in
+its own session every FLUSH_INTERVAL or as soon as BATCH_SIZE entries wait.
+
+Every queued entry is first appended to a write-ahead spill file, which is
+rewritten once its entries are committed. Entries a crash leaves in the file
+are queued again on the next start, so a crash between the insert and the
+rewrite can repeat an entry but never loses one.
+
+Each process spills to its own file (the pid is added to AUDIT_SPILL_PATH),
+so worker processes never truncate each other's entries. On start a process
+also takes over the files of processes that are no longer running, claiming
+each one with a rename so only one live process replays it.
+
+A batch the database rejects is retried entry by entry; entries it still
+refuses (a constraint or data error) go to a dead-letter file instead of
+blocking the queue. Any other failure (the database is unreachable) keeps the
+batch queued and spilled, and flushes back off for RETRY_DELAY; until the
+database is back the queue keeps growing, in memory and in the spill file.
+
+Set AUDIT_SYNC=true (tests, one-off scripts) to write each entry in the
+caller's session as before.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+import audit_archive
+import models
+from database import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+SYNC = os.getenv("AUDIT_SYNC", "false").lower() == "true"
+
+# Longest an entry waits in memory before it is inserted
+FLUSH_INTERVAL = int(os.getenv("AUDIT_FLUSH_MS", "500")) / 1000
+
+# Entries per INSERT, and the queue length that triggers an early flush
+BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+
+# Queue length at which the caller that fills it flushes inline (backpressure)
+BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+
+# Pause after a failed flush before the flusher or a caller tries again
+RETRY_DELAY = int(os.getenv("AUDIT_RETRY_MS", "5000")) / 1000
+
+SPILL_PATH = os.getenv("AUDIT_SPILL_PATH", os.path.join(BASE_DIR, "audit_spill.jsonl"))
+
+# Entries the database refused, with the error, for an operator to fix and re-import
+DEAD_LETTER_PATH = os.getenv("AUDIT_DEAD_LETTER_PATH", os.path.join(BASE_DIR, "audit_dead_letter.jsonl"))
+
+# Errors that condemn the entry rather than the connection
+REJECTED_ERRORS = (IntegrityError, DataError, ValueError)
+
+# fsync every spill write; survives power loss as well as process crashes
+SPILL_FSYNC = os.getenv("AUDIT_SPILL_FSYNC", "false").lower() == "true"
+
+
+class AuditWriter:
+    """In-memory queue of audit entries backed by an append-only spill file"""
+    
+    def __init__(
+        self,
+        spill_path: str = SPILL_PATH,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        buffer_size: int = BUFFER_SIZE,
+        dead_letter_path: str = DEAD_LETTER_PATH,
+        retry_delay: float = RETRY_DELAY
+    ):
+        self.spill_base = spill_path
+        self.spill_path: Optional[str] = None
+        self.dead_letter_path = dead_letter_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.retry_delay = retry_delay
+        self._retry_at = 0.0
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._spill = None
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        
+    def enqueue(self, entry: Dict[str, Any]):
+        """Queue one audit_logs row (column name -> value)"""
+        with self._wake:
+            self._start()
+            self._write_spill([entry])
+            self._buffer.append(entry)
+            queued = len(self._buffer)
+            if queued == 1 or queued >= self.batch_size:
+                self._wake.notify()
+        if queued >= self.buffer_size and time.monotonic() >= self._retry_at:
+            self.flush()
+            
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+            
+    def flush(self) -> int:
+        """
+        Insert everything queued so far; returns the number of entries written.
+        Entries the database refuses are moved to the dead-letter file.
+        """
+        from database import SessionLocal
+        
+        with self._flush_lock:
+            with self._lock:
+                self._start()
+                batch = list(self._buffer)
+            if not batch:
+                return 0
+                
+            db = SessionLocal()
+            try:
+                rejected = self._insert(db, batch)
+            except Exception:
+                db.rollback()
+                self._retry_at = time.monotonic() + self.retry_delay
+                logger.exception("Writing %s audit entries failed; they stay queued and spilled", len(batch))
+                return 0
+            finally:
+                db.close()
+            self._retry_at = 0.0
+            if rejected:
+                self._dead_letter(rejected)
+                
+            with self._lock:
+                # Only flush() removes entries, so the batch is still the head of the queue
+                for _ in range(len(batch)):
+                    self._buffer.popleft()
+                self._spill.seek(0)
+                self._spill.truncate()
+                self._write_spill(self._buffer)
+            audit_archive.schedule_archival()
+            return len(batch) - len(rejected)
+            
+    def _insert(self, db: Session, batch: List[Dict[str, Any]]) -> List[tuple]:
+        """Commit the batch; (entry, error) of each entry the database refused"""
+        try:
+            for start in range(0, len(batch), self.batch_size):
+                rows = [_row(entry) for entry in batch[start:start + self.batch_size]]
+                db.execute(insert(models.AuditLog), rows)
+            db.commit()
+            return []
+        except REJECTED_ERRORS:
+            db.rollback()
+            
+        # One bad entry fails its whole INSERT; find it with a savepoint per entry
+        logger.warning("An audit batch of %s entries was rejected; retrying them one by one", len(batch))
+        rejected = []
+        for entry in batch:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(models.AuditLog), [_row(entry)])
+            except REJECTED_ERRORS as e:
+                rejected.append((entry, e))
+        db.commit()
+        return rejected
+        
+    def _dead_letter(self, rejected: List[tuple]):
+        logger.error("%s audit entries were refused by the database; moved to %s", len(rejected), self.dead_letter_path)
+        with open(self.dead_letter_path, "a", encoding="utf-8") as dead_letter:
+            for entry, error in rejected:
+                record = {"entry": entry, "error": str(error).splitlines()[0], "rejected_at": datetime.now().isoformat()}
+                dead_letter.write(json.dumps(record, default=str) + "\n")
+            dead_letter.flush()
+            if SPILL_FSYNC:
+                os.fsync(dead_letter.fileno())
+            
+    def _start(self):
+        # Called with _lock held
+        if self._spill is not None and self._pid != os.getpid():
+            # A forked worker: the queue and the spill file belong to the parent
+            self._spill = None
+            self._buffer.clear()
+            self._thread = None
+        if self._spill is None:
+            self._pid = os.getpid()
+            self.spill_path = _spill_file(self.spill_base, self._pid)
+            # Our own file is left over from an earlier process that had this pid
+            for entry in _read_spill(self.spill_path):
+                self._buffer.append(entry)
+            self._spill = open(self.spill_path, "a", encoding="utf-8")
+            self._adopt_orphans()
+            if self._buffer:
+                logger.warning("Re-queued %s audit entries from earlier processes", len(self._buffer))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            
+    def _adopt_orphans(self):
+        # Called with _lock held, after our own spill file is open
+        for path in _orphaned_spills(self.spill_base, self.spill_path):
+            claimed = f"{self.spill_path}.{os.path.basename(path)}.claimed"
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue  # Another process claimed it first
+            entries = _read_spill(claimed)
+            # Into our own file before the claim goes, so a crash here repeats entries rather than losing them
+            self._write_spill(entries)
+            self._buffer.extend(entries)
+            os.remove(claimed)
+            
+    def _write_spill(self, entries):
+        # Called with _lock held
+        for entry in entries:
+            self._spill.write(json.dumps(entry, default=str) + "\n")
+        self._spill.flush()
+        if SPILL_FSYNC:
+            os.fsync(self._spill.fileno())
+            
+    def _run(self):
+        while True:
+            with self._wake:
+                while not self._buffer:
+                    self._wake.wait()
+                if len(self._buffer) < self.batch_size:
+                    self._wake.wait(self.flush_interval)
+                while time.monotonic() < self._retry_at:
+                    self._wake.wait(self._retry_at - time.monotonic())
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed")
+                
+    def close(self):
+        """Flush and release the spill file (process exit)"""
+        if self._spill is None:
+            return
+        self.flush()
+        with self._lock:
+            self._spill.close()
+            self._spill = None
+
+
+def _spill_file(base: str, pid: int) -> str:
+    stem, ext = os.path.splitext(base)
+    return f"{stem}.{pid}{ext}"
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; leave other pids' files alone
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _orphaned_spills(base: str, own_path: str) -> List[str]:
+    """
+    Spill files no running process owns: the shared pre-pid file, files of
+    exited pids, and claims an earlier process with our pid left unfinished
+    """
+    stem, ext = os.path.splitext(base)
+    orphans = [base] if os.path.exists(base) else []
+    for path in glob.glob(glob.escape(stem) + ".*"):
+        owner = path[len(stem) + 1:].split(".", 1)[0]
+        if path == own_path or not owner.isdigit():
+            continue
+        if int(owner) == os.getpid() or not _pid_alive(int(owner)):
+            orphans.append(path)
+    return orphans
+
+
+def _read_spill(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as spill:
+        for line in spill:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A line torn by the crash itself; it was never acknowledged
+                logger.warning("Skipping unreadable audit spill line: %r", line[:200])
+    return entries
+
+
+def _row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    row = dict(entry)
+    if isinstance(row.get("timestamp"), str):
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+    return row
+
+
+writer = AuditWriter()
+atexit.register(writer.close)
+
+
+def enqueue_on_commit(session: Session, entry: Dict[str, Any]):
+    """Queue an entry once the session's transaction commits; dropped on rollback or close"""
+    session.info.setdefault('audit_pending', []).append(entry)
+
+
+@event.listens_for(Session, 'after_commit')
+def _enqueue_committed(session):
+    for entry in session.info.pop('audit_pending', ()):
+        writer.enqueue(entry)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_uncommitted(session, transaction):
+    # Runs after after_commit, so anything still pending was never committed
+    if transaction.parent is None:
+        session.info.pop('audit_pending', None)
@@ -1,59 +1,126 @@
 """
 Database Backup Service
 Automated backup and restore functionality for PGT TMS
+
+SQLite databases are copied online with the sqlite3 backup API (a
+consistent snapshot that does not block writers for the whole copy), then
+split into fixed-size chunks stored once by content hash and compressed with
+zstd (zlib if `zstandard` is not installed). Each backup is a small JSON
+manifest listing its chunks, so nightly backups only store changed chunks.
+Postgres databases are dumped with pg_dump.
+
+Every backup is recorded in `catalog.json` (metadata plus file checksum) at
+creation time, so listing backups never opens the archives.
+
+Configuration (environment variables):
+    BACKUP_DIR            Backup directory (default: "backups")
+    BACKUP_CHUNK_SIZE     Chunk size in bytes (default: 1 MiB)
+    BACKUP_STEP_PAGES     Pages copied per sqlite3 backup step (default: 1024)
+    BACKUP_KEEP_LAST      Always keep the N most recent backups (default: 10)
+    BACKUP_KEEP_DAILY     Keep newest backup of each of the last N days (default: 7)
+    BACKUP_KEEP_WEEKLY    Keep newest backup of each of the last N weeks (default: 4)
+    BACKUP_KEEP_MONTHLY   Keep newest backup of each of the last N months (default: 12)
 """
 import os
 import shutil
 import sqlite3
+import hashlib
+import subprocess
+import tempfile
+import zlib
 from datetime import datetime
 from pathlib import Path
 import zipfile
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from urllib.parse import urlparse
+
+from database import DATABASE_URL, DB_PATH
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency - fall back to zlib
+    zstandard = None
+
+# Serializes read-modify-write of the catalog file within this process
+_catalog_lock = threading.Lock()
+
+
+def _compress(data: bytes) -> tuple:
+    """Compress a chunk, returning (codec, payload)"""
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise Exception("Backup uses zstd compression but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return zlib.decompress(payload)
+
 
 class BackupService:
-    def __init__(self, db_path: str = "pgt_tms.db", backup_dir: str = "backups"):
-        self.db_path = db_path
-        self.backup_dir = Path(backup_dir)
+    def __init__(self, db_path: Optional[str] = None, backup_dir: Optional[str] = None, database_url: Optional[str] = None):
+        self.database_url = database_url or DATABASE_URL
+        self.is_sqlite = self.database_url.startswith("sqlite")
+        self.db_path = db_path or (self._sqlite_path(self.database_url) if self.is_sqlite else DB_PATH)
+        self.backup_dir = Path(backup_dir or os.getenv("BACKUP_DIR", "backups"))
         self.backup_dir.mkdir(exist_ok=True)
+        self.chunk_dir = self.backup_dir / "chunks"
+        self.catalog_path = self.backup_dir / "catalog.json"
+        self.chunk_size = int(os.getenv("BACKUP_CHUNK_SIZE", 1024 * 1024))
+        self.step_pages = int(os.getenv("BACKUP_STEP_PAGES", 1024))
+        self.retention = {
+            "keep_last": int(os.getenv("BACKUP_KEEP_LAST", 10)),
+            "keep_daily": int(os.getenv("BACKUP_KEEP_DAILY", 7)),
+            "keep_weekly": int(os.getenv("BACKUP_KEEP_WEEKLY", 4)),
+            "keep_monthly": int(os.getenv("BACKUP_KEEP_MONTHLY", 12)),
+        }
         
+    @staticmethod
+    def _sqlite_path(url: str) -> str:
+        path = url.split(":///", 1)[1] if ":///" in url else "pgt_tms.db"
+        return path or "pgt_tms.db"
+        
+    # ============================================
+    # CREATE
+    # ============================================
+    
     def create_backup(self, description: str = "") -> dict:
-        """Create a full database backup"""
+        """Create a database backup (chunked SQLite snapshot or pg_dump)"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"backup_{timestamp}"
-            backup_path = self.backup_dir / backup_name
-            backup_path.mkdir(exist_ok=True)
-            
-            # Copy database file
-            db_backup = backup_path / "pgt_tms.db"
-            shutil.copy2(self.db_path, db_backup)
-            
-            # Create metadata
+            suffix = 1
+            while self.find_backup(backup_name) is not None:
+                suffix += 1
+                backup_name = f"backup_{timestamp}_{suffix}"
+                
             metadata = {
                 "timestamp": timestamp,
                 "datetime": datetime.now().isoformat(),
                 "description": description,
-                "db_size": os.path.getsize(self.db_path),
                 "backup_name": backup_name
             }
             
-            with open(backup_path / "metadata.json", "w") as f:
+            if self.is_sqlite:
+                metadata.update(self._backup_sqlite())
+            else:
+                metadata.update(self._backup_postgres(backup_name))
+                
+            manifest_path = self.backup_dir / f"{backup_name}.json"
+            with open(manifest_path, "w") as f:
                 json.dump(metadata, f, indent=2)
-            
-            # Create zip archive
-            zip_path = self.backup_dir / f"{backup_name}.zip"
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                zipf.write(db_backup, "pgt_tms.db")
-                zipf.write(backup_path / "metadata.json", "metadata.json")
-            
-            # Clean up temporary files
-            shutil.rmtree(backup_path)
+            self._update_catalog(add=self._catalog_entry(manifest_path))
             
             return {
                 "success": True,
-                "backup_file": str(zip_path),
-                "metadata": metadata
+                "backup_file": str(manifest_path),
+                "metadata": {k: v for k, v in metadata.items() if k != "chunks"}
             }
             
         except Exception as e:
@@ -61,36 +128,147 @@ class BackupService:
                 "success": False,
                 "error": str(e)
             }
+            
+    def _snapshot_sqlite(self, target: str):
+        """Consistent online copy of the live database via the sqlite3 backup API"""
+        source = sqlite3.connect(self.db_path)
+        dest = sqlite3.connect(target)
+        try:
+            # Copy in steps so writers can interleave between steps
+            source.backup(dest, pages=self.step_pages, sleep=0.005)
+        finally:
+            dest.close()
+            source.close()
+            
+    def _backup_sqlite(self) -> dict:
+        """Snapshot the database and store only chunks not already in the chunk store"""
+        self.chunk_dir.mkdir(exist_ok=True)
+        fd, snapshot = tempfile.mkstemp(suffix=".db", dir=self.backup_dir)
+        os.close(fd)
+        try:
+            self._snapshot_sqlite(snapshot)
+            
+            chunks = []
+            new_chunks = 0
+            stored_bytes = 0
+            file_hash = hashlib.sha256()
+            with open(snapshot, "rb") as f:
+                while True:
+                    data = f.read(self.chunk_size)
+                    if not data:
+                        break
+                    file_hash.update(data)
+                    digest = hashlib.sha256(data).hexdigest()
+                    chunks.append(digest)
+                    if self._chunk_path(digest) is None:
+                        stored_bytes += self._write_chunk(digest, data)
+                        new_chunks += 1
+                        
+            return {
+                "engine": "sqlite",
+                "format": "chunked",
+                "db_size": os.path.getsize(snapshot),
+                "sha256": file_hash.hexdigest(),
+                "chunk_size": self.chunk_size,
+                "chunk_count": len(chunks),
+                "new_chunks": new_chunks,
+                "stored_bytes": stored_bytes,
+                "chunks": chunks
+            }
+        finally:
+            os.remove(snapshot)
+            
+    def _chunk_path(self, digest: str) -> Optional[Path]:
+        """Path of a stored chunk (any codec), or None if not stored yet"""
+        for suffix in (".zst", ".zz"):
+            path = self.chunk_dir / digest[:2] / f"{digest}{suffix}"
+            if path.exists():
+                return path
+        return None
+        
+    def _write_chunk(self, digest: str, data: bytes) -> int:
+        codec, payload = _compress(data)
+        path = self.chunk_dir / digest[:2] / f"{digest}{'.zst' if codec == 'zstd' else '.zz'}"
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)  # Atomic - a crash never leaves a partial chunk
+        return len(payload)
+        
+    def _read_chunk(self, digest: str) -> bytes:
+        path = self._chunk_path(digest)
+        if path is None:
+            raise Exception(f"Backup chunk {digest} is missing")
+        with open(path, "rb") as f:
+            data = _decompress("zstd" if path.suffix == ".zst" else "zlib", f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise Exception(f"Backup chunk {digest} is corrupted")
+        return data
+        
+    def _pg_env(self) -> tuple:
+        """Connection args for pg_dump/pg_restore (password passed via env, not argv)"""
+        url = urlparse(self.database_url.replace("postgres://", "postgresql://", 1))
+        env = dict(os.environ)
+        if url.password:
+            env["PGPASSWORD"] = url.password
+        args = ["--host", url.hostname or "localhost", "--port", str(url.port or 5432),
+                "--username", url.username or "", "--dbname", url.path.lstrip("/")]
+        return args, env
+        
+    def _backup_postgres(self, backup_name: str) -> dict:
+        """pg_dump in custom (compressed) format"""
+        dump_path = self.backup_dir / f"{backup_name}.dump"
+        args, env = self._pg_env()
+        subprocess.run(
+            ["pg_dump", "--format=custom", "--compress=6", "--file", str(dump_path)] + args,
+            env=env, check=True, capture_output=True
+        )
+        with open(dump_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return {
+            "engine": "postgres",
+            "format": "pg_dump",
+            "dump_file": dump_path.name,
+            "db_size": os.path.getsize(dump_path),
+            "stored_bytes": os.path.getsize(dump_path),
+            "sha256": digest
+        }
+        
+    # ============================================
+    # RESTORE
+    # ============================================
     
+    def find_backup(self, backup_name: str) -> Optional[Path]:
+        """Locate a backup by name (chunked manifest or legacy zip)"""
+        if "/" in backup_name or "\\" in backup_name:
+            return None
+        for candidate in (self.backup_dir / f"{backup_name}.json", self.backup_dir / f"{backup_name}.zip"):
+            if candidate.exists():
+                return candidate
+        return None
+        
     def restore_backup(self, backup_file: str) -> dict:
         """Restore database from backup"""
         try:
             # Create safety backup before restore
             safety_backup = self.create_backup("Pre-restore safety backup")
             
-            # Extract backup
-            temp_dir = self.backup_dir / "temp_restore"
-            temp_dir.mkdir(exist_ok=True)
-            
-            with zipfile.ZipFile(backup_file, 'r') as zipf:
-                zipf.extractall(temp_dir)
-            
-            # Verify backup integrity
-            restored_db = temp_dir / "pgt_tms.db"
-            if not restored_db.exists():
-                raise Exception("Backup file is corrupted")
-            
-            # Test database connection
-            conn = sqlite3.connect(str(restored_db))
-            conn.execute("SELECT 1")
-            conn.close()
-            
-            # Replace current database
-            shutil.copy2(restored_db, self.db_path)
-            
-            # Clean up
-            shutil.rmtree(temp_dir)
-            
+            if backup_file.endswith(".json"):
+                with open(backup_file) as f:
+                    manifest = json.load(f)
+                if manifest.get("engine") == "postgres":
+                    args, env = self._pg_env()
+                    subprocess.run(
+                        ["pg_restore", "--clean", "--if-exists", "--no-owner",
+                         str(self.backup_dir / manifest["dump_file"])] + args,
+                        env=env, check=True, capture_output=True
+                    )
+                else:
+                    self._restore_sqlite_manifest(manifest)
+            else:
+                self._restore_legacy_zip(backup_file)
+                
             return {
                 "success": True,
                 "message": "Database restored successfully",
@@ -102,37 +280,245 @@ class BackupService:
                 "success": False,
                 "error": str(e)
             }
+            
+    def _restore_sqlite_manifest(self, manifest: dict):
+        fd, restored_db = tempfile.mkstemp(suffix=".db", dir=self.backup_dir)
+        try:
+            file_hash = hashlib.sha256()
+            with os.fdopen(fd, "wb") as f:
+                for digest in manifest["chunks"]:
+                    data = self._read_chunk(digest)
+                    file_hash.update(data)
+                    f.write(data)
+            if file_hash.hexdigest() != manifest["sha256"]:
+                raise Exception("Backup file is corrupted")
+            self._load_sqlite_file(restored_db)
+        finally:
+            os.remove(restored_db)
+            
+    def _restore_legacy_zip(self, backup_file: str):
+        temp_dir = Path(tempfile.mkdtemp(dir=self.backup_dir))
+        try:
+            with zipfile.ZipFile(backup_file, 'r') as zipf:
+                zipf.extractall(temp_dir)
+            restored_db = temp_dir / "pgt_tms.db"
+            if not restored_db.exists():
+                raise Exception("Backup file is corrupted")
+            self._load_sqlite_file(str(restored_db))
+        finally:
+            shutil.rmtree(temp_dir)
+            
+    def _load_sqlite_file(self, restored_db: str):
+        """Copy a restored file into the live database through the backup API"""
+        source = sqlite3.connect(restored_db)
+        try:
+            if source.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+                raise Exception("Backup database failed integrity check")
+            dest = sqlite3.connect(self.db_path)
+            try:
+                source.backup(dest)
+            finally:
+                dest.close()
+        finally:
+            source.close()
+            
+    # ============================================
+    # CATALOG
+    # ============================================
     
-    def list_backups(self) -> list:
-        """List all available backups"""
-        backups = []
-        for backup_file in self.backup_dir.glob("backup_*.zip"):
+    def _file_sha256(self, path) -> str:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+            
+    def _catalog_entry(self, backup_file: Path) -> dict:
+        """Build the catalog record for one backup (reads the manifest/archive once)"""
+        if backup_file.suffix == ".json":
+            with open(backup_file) as f:
+                metadata = json.load(f)
+            metadata.pop("chunks", None)
+            metadata["file_size"] = metadata.get("stored_bytes", os.path.getsize(backup_file))
+        else:
+            with zipfile.ZipFile(backup_file, 'r') as zipf:
+                with zipf.open("metadata.json") as f:
+                    metadata = json.load(f)
+            metadata["format"] = "zip"
+            metadata["file_size"] = os.path.getsize(backup_file)
+        metadata["backup_name"] = backup_file.stem
+        metadata["file_path"] = str(backup_file)
+        metadata["file_sha256"] = self._file_sha256(backup_file)
+        return metadata
+        
+    def _load_catalog(self) -> dict:
+        """Catalog of backups keyed by name; rebuilt from disk if missing or unreadable"""
+        try:
+            with open(self.catalog_path) as f:
+                return json.load(f)["backups"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return self.rebuild_catalog()
+            
+    def _save_catalog(self, catalog: dict):
+        tmp = self.catalog_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "backups": catalog}, f, indent=2)
+        os.replace(tmp, self.catalog_path)
+        
+    def _update_catalog(self, add: dict = None, remove: str = None):
+        with _catalog_lock:
+            catalog = self._load_catalog()
+            if add:
+                catalog[add["backup_name"]] = add
+            if remove:
+                catalog.pop(remove, None)
+            self._save_catalog(catalog)
+            
+    def rebuild_catalog(self) -> dict:
+        """Scan every manifest/archive once and rewrite the catalog"""
+        catalog = {}
+        for backup_file in list(self.backup_dir.glob("backup_*.json")) + list(self.backup_dir.glob("backup_*.zip")):
             try:
-                with zipfile.ZipFile(backup_file, 'r') as zipf:
-                    with zipf.open("metadata.json") as f:
-                        metadata = json.load(f)
-                        metadata["file_path"] = str(backup_file)
-                        metadata["file_size"] = os.path.getsize(backup_file)
-                        backups.append(metadata)
-            except:
+                catalog[backup_file.stem] = self._catalog_entry(backup_file)
+            except Exception:
                 continue
+        self._save_catalog(catalog)
+        return catalog
         
-        return sorted(backups, key=lambda x: x["timestamp"], reverse=True)
+    # ============================================
+    # LIST / DELETE / RETENTION
+    # ============================================
     
-    def delete_backup(self, backup_file: str) -> dict:
-        """Delete a backup file"""
+    def list_backups(self, limit: Optional[int] = None, offset: int = 0) -> list:
+        """List available backups from the catalog (newest first)"""
+        backups = sorted(
+            self._load_catalog().values(),
+            key=lambda x: (x["timestamp"], x.get("datetime", "")),
+            reverse=True
+        )
+        if limit is not None:
+            return backups[offset:offset + limit]
+        return backups[offset:]
+        
+    def count_backups(self) -> int:
+        return len(self._load_catalog())
+        
+    def verify_backups(self, backup_names: Optional[list] = None, workers: int = 4) -> list:
+        """
+        Verify backup integrity in parallel.
+        
+        Checks the manifest/archive checksum recorded in the catalog, then every
+        chunk (decompressed and re-hashed), the pg_dump file, or the zip CRCs.
+        Chunks shared by several backups are only verified once.
+        """
+        catalog = self._load_catalog()
+        names = backup_names or list(catalog.keys())
+        chunk_status = {}
+        
+        def check_chunk(digest):
+            if digest not in chunk_status:
+                try:
+                    self._read_chunk(digest)
+                    chunk_status[digest] = None
+                except Exception as e:
+                    chunk_status[digest] = str(e)
+            return chunk_status[digest]
+            
+        def verify(name):
+            errors = []
+            entry = catalog.get(name)
+            backup_file = self.find_backup(name)
+            if entry is None or backup_file is None:
+                return {"backup_name": name, "ok": False, "errors": ["Backup not found"]}
+            if self._file_sha256(backup_file) != entry.get("file_sha256"):
+                errors.append("Checksum mismatch with catalog")
+            elif backup_file.suffix == ".zip":
+                with zipfile.ZipFile(backup_file, 'r') as zipf:
+                    bad = zipf.testzip()
+                    if bad:
+                        errors.append(f"Corrupted archive member: {bad}")
+            else:
+                with open(backup_file) as f:
+                    manifest = json.load(f)
+                if manifest.get("dump_file"):
+                    dump = self.backup_dir / manifest["dump_file"]
+                    if not dump.exists() or self._file_sha256(dump) != manifest.get("sha256"):
+                        errors.append("pg_dump file missing or corrupted")
+                for digest in manifest.get("chunks", []):
+                    error = check_chunk(digest)
+                    if error:
+                        errors.append(error)
+            return {"backup_name": name, "ok": not errors, "errors": errors}
+            
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return list(pool.map(verify, names))
+            
+    def delete_backup(self, backup_file: str, collect_garbage: bool = True) -> dict:
+        """Delete a backup and any chunks no other backup references"""
         try:
+            if backup_file.endswith(".json"):
+                with open(backup_file) as f:
+                    manifest = json.load(f)
+                if manifest.get("dump_file"):
+                    dump = self.backup_dir / manifest["dump_file"]
+                    if dump.exists():
+                        os.remove(dump)
             os.remove(backup_file)
+            self._update_catalog(remove=Path(backup_file).stem)
+            if collect_garbage:
+                self.collect_garbage()
             return {"success": True, "message": "Backup deleted"}
         except Exception as e:
             return {"success": False, "error": str(e)}
-    
+            
+    def collect_garbage(self) -> int:
+        """Remove chunks that are no longer referenced by any manifest"""
+        if not self.chunk_dir.exists():
+            return 0
+        referenced = set()
+        for manifest_file in self.backup_dir.glob("backup_*.json"):
+            with open(manifest_file) as f:
+                referenced.update(json.load(f).get("chunks", []))
+        removed = 0
+        for chunk in self.chunk_dir.glob("*/*"):
+            if chunk.name.split(".")[0] not in referenced:
+                chunk.unlink()
+                removed += 1
+        return removed
+        
+    def apply_retention(self, keep_last: int = None, keep_daily: int = None,
+                        keep_weekly: int = None, keep_monthly: int = None) -> dict:
+        """
+        Grandfather-father-son retention: keep the newest `keep_last` backups
+        plus the newest backup of each of the last N days/weeks/months.
+        """
+        policy = dict(self.retention)
+        for key, value in (("keep_last", keep_last), ("keep_daily", keep_daily),
+                           ("keep_weekly", keep_weekly), ("keep_monthly", keep_monthly)):
+            if value is not None:
+                policy[key] = value
+                
+        backups = self.list_backups()  # Newest first
+        keep = {b["file_path"] for b in backups[:policy["keep_last"]]}
+        for period, fmt in (("keep_daily", "%Y-%m-%d"), ("keep_weekly", "%G-W%V"), ("keep_monthly", "%Y-%m")):
+            seen = []
+            for backup in backups:
+                bucket = datetime.strptime(backup["timestamp"], "%Y%m%d_%H%M%S").strftime(fmt)
+                if bucket not in seen:
+                    if len(seen) >= policy[period]:
+                        break
+                    seen.append(bucket)
+                    keep.add(backup["file_path"])
+                    
+        deleted = []
+        for backup in backups:
+            if backup["file_path"] not in keep:
+                self.delete_backup(backup["file_path"], collect_garbage=False)
+                deleted.append(backup["backup_name"])
+        removed_chunks = self.collect_garbage()
+        
+        return {"kept": len(keep), "deleted": deleted, "removed_chunks": removed_chunks, "policy": policy}
+        
     def cleanup_old_backups(self, keep_count: int = 10):
         """Keep only the most recent N backups"""
-        backups = self.list_backups()
-        if len(backups) > keep_count:
-            for backup in backups[keep_count:]:
-                self.delete_backup(backup["file_path"])
+        return self.apply_retention(keep_last=keep_count, keep_daily=0, keep_weekly=0, keep_monthly=0)
 
 # Scheduled backup function
 def scheduled_backup():
@@ -141,12 +527,12 @@ def scheduled_backup():
     result = service.create_backup("Automated daily backup")
     
     if result["success"]:
-        # Keep only last 30 backups
-        service.cleanup_old_backups(keep_count=30)
+        # Apply the configured retention policy
+        service.apply_retention()
         print(f"✅ Backup created: {result['backup_file']}")
     else:
         print(f"❌ Backup failed: {result['error']}")
-    
+        
     return result
 
 if __name__ == "__main__":
@@ -0,0 +1,343 @@
+"""
+Balance Head Service
+Keeps the current totals and running balance of CEO capital, office expenses
+and each staff member's advances in one small row per account (balance_heads).
+
+Every posting locks the account's head row, takes the previous balance from it
+and updates it in the same transaction as the detail row, so concurrent
+postings queue on the lock instead of both reading the same "last balance".
+Balance reads are a single-row lookup; verify() rebuilds the heads from the
+detail tables and reports (or repairs) any drift.
+"""
+import logging
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import models
+
+logger = logging.getLogger(__name__)
+
+CEO_CAPITAL = 'ceo_capital'
+OFFICE_EXPENSE = 'office_expense'
+STAFF_ADVANCE = 'staff_advance'
+
+ACCOUNT_TYPES = (CEO_CAPITAL, OFFICE_EXPENSE, STAFF_ADVANCE)
+
+# Float sums over many rows drift slightly; differences below this are not reported
+BALANCE_TOLERANCE = 0.005
+
+
+class DetailTotals(NamedTuple):
+    total_in: float = 0.0
+    total_out: float = 0.0
+    entry_count: int = 0
+    last_entry_date: Optional[date] = None
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).date()
+    return value
+
+
+class BalanceHeadService:
+    """
+    Balance heads for one database session. Use one instance per transaction:
+    heads locked through it stay locked until the caller commits or rolls back.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self._locked: Dict[Tuple[str, int], models.BalanceHead] = {}
+        
+    # ============================================
+    # POSTING
+    # ============================================
+    
+    def lock(self, account_type: str, account_id: int = 0) -> models.BalanceHead:
+        """
+        Lock the account's head row for the rest of the transaction and return it,
+        creating it from the detail rows on first use. Call this before adding the
+        new detail row to the session.
+        """
+        key = (account_type, account_id)
+        head = self._locked.get(key)
+        if head is not None:
+            return head
+            
+        while head is None:
+            # A write to the row takes the row lock on PostgreSQL and the database
+            # write lock on SQLite, which has no SELECT ... FOR UPDATE.
+            touched = self._head_query(account_type, account_id).update(
+                {models.BalanceHead.updated_at: func.now()},
+                synchronize_session=False
+            )
+            if touched:
+                head = self._head_query(account_type, account_id).with_for_update().populate_existing().one()
+            else:
+                head = self._create(account_type, account_id)
+                
+        self._locked[key] = head
+        return head
+        
+    def post(
+        self,
+        account_type: str,
+        amount_in: float = 0.0,
+        amount_out: float = 0.0,
+        entry_date=None,
+        account_id: int = 0
+    ) -> Tuple[float, float]:
+        """
+        Apply one posting to the account's head and return (previous_balance, new_balance).
+        The caller stores new_balance on the detail row it adds in the same transaction.
+        """
+        head = self.lock(account_type, account_id)
+        amount_in = float(amount_in or 0)
+        amount_out = float(amount_out or 0)
+        
+        previous_balance = head.balance
+        head.total_in += amount_in
+        head.total_out += amount_out
+        head.balance = previous_balance + amount_in - amount_out
+        head.entry_count += 1
+        
+        entry_date = _as_date(entry_date) or date.today()
+        if head.last_entry_date is None or entry_date > head.last_entry_date:
+            head.last_entry_date = entry_date
+            
+        return previous_balance, head.balance
+        
+    # ============================================
+    # READS
+    # ============================================
+    
+    def get(self, account_type: str, account_id: int = 0) -> models.BalanceHead:
+        """
+        Current head without locking. An account that has not been posted to since
+        heads were introduced is computed from the detail rows and not stored.
+        """
+        head = self._head_query(account_type, account_id).first()
+        if head is None:
+            head = self._build(account_type, account_id)
+        return head
+        
+    # ============================================
+    # VERIFICATION
+    # ============================================
+    
+    def verify(self, account_type: Optional[str] = None, repair: bool = False) -> Dict:
+        """
+        Rebuild totals from the detail rows and compare them with the stored heads.
+        With repair=True the heads are locked first, mismatches are overwritten with
+        the rebuilt values and missing heads are created; the caller commits.
+        """
+        account_types = [account_type] if account_type else list(ACCOUNT_TYPES)
+        for name in account_types:
+            if name not in ACCOUNT_TYPES:
+                raise ValueError(f"Unknown account type '{name}'; use one of {', '.join(ACCOUNT_TYPES)}")
+                
+        report = {'checked': 0, 'mismatches': [], 'created': 0, 'repaired': 0}
+        for name in account_types:
+            if repair:
+                # Lock every head of this type before reading the details, so
+                # postings in flight finish first and none start until we commit
+                self.db.query(models.BalanceHead).filter(
+                    models.BalanceHead.account_type == name
+                ).update({models.BalanceHead.updated_at: func.now()}, synchronize_session=False)
+                
+            heads_query = self.db.query(models.BalanceHead).filter(models.BalanceHead.account_type == name)
+            if repair:
+                heads_query = heads_query.with_for_update().populate_existing()
+            heads = {head.account_id: head for head in heads_query.all()}
+            details = self._detail_totals(name)
+            mirrors = self._staff_balances() if name == STAFF_ADVANCE else {}
+            
+            for account_id in sorted(set(heads) | set(details)):
+                head = heads.get(account_id)
+                if head is None:
+                    if repair:
+                        self._locked[(name, account_id)] = self._create(name, account_id)
+                        report['created'] += 1
+                    continue
+                    
+                report['checked'] += 1
+                problems = self._compare(head, details.get(account_id, DetailTotals()), mirrors.get(account_id))
+                if not problems:
+                    continue
+                    
+                report['mismatches'].append({
+                    'account_type': name,
+                    'account_id': account_id,
+                    'differences': problems
+                })
+                if repair:
+                    self._apply(head, details.get(account_id, DetailTotals()))
+                    self._locked[(name, account_id)] = head
+                    report['repaired'] += 1
+                    
+        if report['mismatches']:
+            logger.warning("Balance head verification found %s mismatched account(s)", len(report['mismatches']))
+        return report
+        
+    def _compare(self, head: models.BalanceHead, totals: DetailTotals, mirror: Optional[float]) -> List[Dict]:
+        expected = {
+            'total_in': totals.total_in,
+            'total_out': totals.total_out,
+            'balance': head.opening_balance + totals.total_in - totals.total_out,
+            'entry_count': totals.entry_count
+        }
+        if mirror is not None:
+            expected['staff_advance_balance'] = expected['balance']
+            
+        stored = {
+            'total_in': head.total_in,
+            'total_out': head.total_out,
+            'balance': head.balance,
+            'entry_count': head.entry_count,
+            'staff_advance_balance': mirror
+        }
+        problems = []
+        for field, value in expected.items():
+            if abs((stored[field] or 0) - value) > BALANCE_TOLERANCE:
+                problems.append({'field': field, 'stored': stored[field], 'expected': value})
+        if totals.entry_count and head.last_entry_date != totals.last_entry_date:
+            problems.append({'field': 'last_entry_date', 'stored': head.last_entry_date, 'expected': totals.last_entry_date})
+        return problems
+        
+    def _apply(self, head: models.BalanceHead, totals: DetailTotals):
+        head.total_in = totals.total_in
+        head.total_out = totals.total_out
+        head.entry_count = totals.entry_count
+        head.last_entry_date = totals.last_entry_date
+        head.balance = head.opening_balance + totals.total_in - totals.total_out
+        if head.account_type == STAFF_ADVANCE:
+            self.db.query(models.Staff).filter(models.Staff.id == head.account_id).update(
+                {models.Staff.advance_balance: head.balance},
+                synchronize_session=False
+            )
+            
+    # ============================================
+    # DETAIL ROWS
+    # ============================================
+    
+    def _head_query(self, account_type: str, account_id: int):
+        return self.db.query(models.BalanceHead).filter(
+            models.BalanceHead.account_type == account_type,
+            models.BalanceHead.account_id == account_id
+        )
+        
+    def _build(self, account_type: str, account_id: int) -> models.BalanceHead:
+        """Unsaved head rebuilt from the detail rows"""
+        totals = self._detail_totals(account_type, account_id).get(account_id, DetailTotals())
+        net = totals.total_in - totals.total_out
+        
+        # Carry over what the application showed before heads existed, so
+        # introducing them never changes a displayed balance
+        anchor = self._anchor_balance(account_type, account_id)
+        opening_balance = anchor - net if anchor is not None else 0.0
+        if abs(opening_balance) <= BALANCE_TOLERANCE:
+            opening_balance = 0.0
+            
+        return models.BalanceHead(
+            account_type=account_type,
+            account_id=account_id,
+            opening_balance=opening_balance,
+            total_in=totals.total_in,
+            total_out=totals.total_out,
+            balance=opening_balance + net,
+            entry_count=totals.entry_count,
+            last_entry_date=totals.last_entry_date
+        )
+        
+    def _create(self, account_type: str, account_id: int) -> Optional[models.BalanceHead]:
+        """
+        Insert a new head; None when a concurrent transaction created it first.
+        
+        The race only exists on PostgreSQL, where the other transaction's
+        INSERT commits between our UPDATE finding no row and our INSERT; the
+        savepoint lets lock() retry on the committed row. On SQLite the UPDATE
+        in lock() has already taken the database write lock, even when it
+        matched no row, so a concurrent creator waits on busy_timeout (or fails
+        with "database is locked") instead of racing us, and the savepoint
+        only rolls back an IntegrityError from our own session.
+        """
+        if account_type not in ACCOUNT_TYPES:
+            raise ValueError(f"Unknown account type '{account_type}'")
+            
+        head = self._build(account_type, account_id)
+        if head.opening_balance:
+            logger.info(
+                "Balance head %s/%s starts with %.2f not covered by detail rows",
+                account_type, account_id, head.opening_balance
+            )
+        try:
+            with self.db.begin_nested():
+                self.db.add(head)
+        except IntegrityError:
+            return None
+        return head
+        
+    def _detail_totals(self, account_type: str, account_id: Optional[int] = None) -> Dict[int, DetailTotals]:
+        """Aggregate the detail table with one query, keyed by account id"""
+        if account_type == CEO_CAPITAL:
+            rows = self.db.query(
+                func.sum(models.CEOCapital.amount_in),
+                func.sum(models.CEOCapital.amount_out),
+                func.count(models.CEOCapital.id),
+                func.max(models.CEOCapital.date)
+            ).all()
+            rows = [(0,) + tuple(row) for row in rows]
+        elif account_type == OFFICE_EXPENSE:
+            rows = self.db.query(
+                func.sum(models.OfficeExpense.amount_received),
+                func.sum(models.OfficeExpense.amount_paid),
+                func.count(models.OfficeExpense.id),
+                func.max(models.OfficeExpense.date)
+            ).all()
+            rows = [(0,) + tuple(row) for row in rows]
+        elif account_type == STAFF_ADVANCE:
+            ledger = models.StaffAdvanceLedger
+            query = self.db.query(
+                ledger.staff_id,
+                func.sum(case((ledger.amount > 0, ledger.amount), else_=0.0)),
+                func.sum(case((ledger.amount < 0, -ledger.amount), else_=0.0)),
+                func.count(ledger.id),
+                func.max(ledger.transaction_date)
+            )
+            if account_id is not None:
+                query = query.filter(ledger.staff_id == account_id)
+            rows = query.group_by(ledger.staff_id).all()
+        else:
+            raise ValueError(f"Unknown account type '{account_type}'")
+            
+        return {
+            row_id: DetailTotals(float(total_in or 0), float(total_out or 0), int(count or 0), _as_date(last_date))
+            for row_id, total_in, total_out, count, last_date in rows
+            if count
+        }
+        
+    def _anchor_balance(self, account_type: str, account_id: int) -> Optional[float]:
+        """Balance the pre-head code read: latest CEO capital row, or the staff record"""
+        if account_type == CEO_CAPITAL:
+            latest = self.db.query(models.CEOCapital.balance).order_by(
+                models.CEOCapital.date.desc(),
+                models.CEOCapital.id.desc()
+            ).first()
+            return float(latest[0] or 0) if latest else None
+        if account_type == STAFF_ADVANCE:
+            staff = self.db.query(models.Staff.advance_balance).filter(models.Staff.id == account_id).first()
+            return float(staff[0] or 0) if staff else None
+        return None
+        
+    def _staff_balances(self) -> Dict[int, float]:
+        return {
+            staff_id: float(balance or 0)
+            for staff_id, balance in self.db.query(models.Staff.id, models.Staff.advance_balance).all()
+        }
@@ -4,12 +4,19 @@ CSV/Excel import and export for all entities
 """
 import csv
 import io
-from typing import List, Dict, Optional
+import logging
+from typing import List, Dict, Optional, Callable
 from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 import models
+import search_index
+from balance_heads import BalanceHeadService
+from period_close import invalidate_from
+
+logger = logging.getLogger(__name__)
 
 class BulkImportExportService:
     def __init__(self, db: Session):
@@ -19,83 +26,277 @@ class BulkImportExportService:
     # IMPORT FUNCTIONS
     # ============================================
     
-    def import_clients_csv(self, csv_file) -> Dict:
-        """Import clients from CSV"""
+    def stream_import(
+        self,
+        upload_file,
+        filename: str,
+        model,
+        natural_key: str,
+        build_row: Callable[[Dict], Dict],
+        chunk_size: int = 500,
+        upsert: bool = True,
+        code_prefix: Optional[str] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Shared streaming importer for master data
+        
+        Rows are parsed incrementally from the upload and written in chunks of
+        `chunk_size`, each chunk in its own transaction. Rows are matched on
+        `natural_key`: existing records are updated when `upsert` is True and
+        skipped otherwise; duplicates inside a chunk collapse to the last row.
+        Rows without a natural key get a generated `code_prefix`-NNNN code
+        (if a prefix is given). `progress` is called with the running results
+        after every committed chunk.
+        """
         results = {
             'total': 0,
             'success': 0,
+            'inserted': 0,
+            'updated': 0,
+            'skipped': 0,
             'failed': 0,
+            'chunks': 0,
             'errors': []
         }
         
+        chunk = []
         try:
-            csv_content = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(io.StringIO(csv_content))
-            
-            for row in results['total'], row_data in enumerate(csv_reader, 1):
+            for row_number, row_data in enumerate(self._read_rows(upload_file, filename), 2):  # Row 1 is the header
                 results['total'] += 1
                 try:
-                    client = models.Client(
-                        name=row_data['name'],
-                        contact_person=row_data.get('contact_person'),
-                        phone=row_data.get('phone'),
-                        email=row_data.get('email'),
-                        address=row_data.get('address'),
-                        credit_limit=float(row_data.get('credit_limit', 0)),
-                        payment_terms=int(row_data.get('payment_terms', 30))
-                    )
-                    self.db.add(client)
-                    results['success'] += 1
+                    chunk.append((row_number, build_row(row_data)))
                 except Exception as e:
                     results['failed'] += 1
-                    results['errors'].append(f"Row {results['total']}: {str(e)}")
-            
-            self.db.commit()
+                    results['errors'].append(f"Row {row_number}: {str(e)}")
+                    continue
+                
+                if len(chunk) >= chunk_size:
+                    self._write_import_chunk(model, natural_key, chunk, upsert, code_prefix, results, progress)
+                    chunk = []
             
+            if chunk:
+                self._write_import_chunk(model, natural_key, chunk, upsert, code_prefix, results, progress)
+        
         except Exception as e:
             results['errors'].append(f"File error: {str(e)}")
         
         return results
     
-    def import_vendors_csv(self, csv_file) -> Dict:
-        """Import vendors from CSV"""
-        results = {
-            'total': 0,
-            'success': 0,
-            'failed': 0,
-            'errors': []
-        }
+    def _write_import_chunk(self, model, natural_key, chunk, upsert, code_prefix, results, progress):
+        """Insert/update one chunk of mapped rows and commit it"""
+        key_column = getattr(model, natural_key)
+        
+        # Dedupe within the chunk on the natural key (last row wins)
+        keyed = {}
+        unkeyed = []
+        for row_number, mapping in chunk:
+            key = mapping.get(natural_key)
+            if key:
+                if key in keyed:
+                    results['skipped'] += 1
+                keyed[key] = (row_number, mapping)
+            else:
+                unkeyed.append((row_number, mapping))
         
         try:
-            csv_content = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(io.StringIO(csv_content))
+            existing = dict(self.db.query(key_column, model.id).filter(key_column.in_(keyed.keys()))) if keyed else {}
             
-            for row_data in csv_reader:
-                results['total'] += 1
-                try:
-                    vendor = models.Vendor(
-                        name=row_data['name'],
-                        contact_person=row_data.get('contact_person'),
-                        phone=row_data.get('phone'),
-                        email=row_data.get('email'),
-                        address=row_data.get('address'),
-                        payment_terms=int(row_data.get('payment_terms', 30))
-                    )
-                    self.db.add(vendor)
-                    results['success'] += 1
-                except Exception as e:
-                    results['failed'] += 1
-                    results['errors'].append(f"Row {results['total']}: {str(e)}")
+            inserts = [m for key, (_, m) in keyed.items() if key not in existing]
+            updates = []
+            for key, (row_number, mapping) in keyed.items():
+                if key not in existing:
+                    continue
+                if upsert:
+                    updates.append({**mapping, 'id': existing[key]})
+                else:
+                    results['skipped'] += 1
+                    results['errors'].append(f"Row {row_number}: {natural_key} '{key}' already exists")
             
-            self.db.commit()
+            if unkeyed and code_prefix:
+                codes = self._next_codes(model, key_column, code_prefix, len(unkeyed))
+                for (_, mapping), code in zip(unkeyed, codes):
+                    mapping[natural_key] = code
+            inserts.extend(m for _, m in unkeyed)
             
+            renamed = search_index.renamed_ids(self.db, model, updates)
+            if inserts:
+                self.db.bulk_insert_mappings(model, inserts)
+            if updates:
+                self.db.bulk_update_mappings(model, updates)
+            # Bulk writes skip the search index flush hook
+            inserted_ids = [id_ for (id_,) in self.db.query(model.id).filter(
+                key_column.in_([m[natural_key] for m in inserts])
+            )] if inserts else []
+            search_index.index_rows(self.db, model, inserted_ids + [m['id'] for m in updates], renamed)
+            self.db.commit()
         except Exception as e:
-            results['errors'].append(f"File error: {str(e)}")
-        
-        return results
+            self.db.rollback()
+            failed_rows = len(keyed) + len(unkeyed)
+            results['failed'] += failed_rows
+            results['errors'].append(
+                f"Rows {chunk[0][0]}-{chunk[-1][0]}: chunk rolled back ({failed_rows} rows): {str(e)}"
+            )
+            return
+        
+        results['inserted'] += len(inserts)
+        results['updated'] += len(updates)
+        results['success'] += len(inserts) + len(updates)
+        results['chunks'] += 1
+        logger.info(
+            f"Import {model.__tablename__}: chunk {results['chunks']} committed "
+            f"({results['success']}/{results['total']} rows so far)"
+        )
+        if progress:
+            progress(dict(results))
+    
+    def _next_codes(self, model, key_column, prefix: str, count: int) -> List[str]:
+        """Generate `count` unused PREFIX-NNNN codes (same scheme as crud.create_client)"""
+        codes = []
+        next_number = self.db.query(model).count() + 1
+        while len(codes) < count:
+            candidates = [f"{prefix}-{n:04d}" for n in range(next_number, next_number + count - len(codes))]
+            next_number += len(candidates)
+            taken = {c for (c,) in self.db.query(key_column).filter(key_column.in_(candidates))}
+            codes.extend(c for c in candidates if c not in taken)
+        return codes
+    
+    @staticmethod
+    def _text(row_data: Dict, field: str, required: bool = False) -> Optional[str]:
+        value = row_data.get(field)
+        value = str(value).strip() if value is not None else ''
+        if required and not value:
+            raise ValueError(f"'{field}' is required")
+        return value or None
+    
+    @staticmethod
+    def _picked(row_data: Dict, mapping: Dict) -> Dict:
+        """Keep only columns present in the upload so upserts don't blank out other fields"""
+        return {k: v for k, v in mapping.items() if k in row_data and v is not None}
+    
+    def _client_row(self, row_data: Dict) -> Dict:
+        mapping = {
+            'client_code': self._text(row_data, 'client_code'),
+            'name': self._text(row_data, 'name', required=True),
+            'contact_person': self._text(row_data, 'contact_person'),
+            'phone': self._text(row_data, 'phone'),
+            'email': self._text(row_data, 'email'),
+            'address': self._text(row_data, 'address'),
+            'credit_limit': float(row_data['credit_limit']) if self._text(row_data, 'credit_limit') else None,
+            'payment_terms': int(float(row_data['payment_terms'])) if self._text(row_data, 'payment_terms') else None
+        }
+        return self._picked(row_data, mapping)
+    
+    def _vendor_row(self, row_data: Dict) -> Dict:
+        mapping = {
+            'vendor_code': self._text(row_data, 'vendor_code'),
+            'name': self._text(row_data, 'name', required=True),
+            'contact_person': self._text(row_data, 'contact_person'),
+            'phone': self._text(row_data, 'phone'),
+            'email': self._text(row_data, 'email'),
+            'address': self._text(row_data, 'address'),
+            'payment_terms': int(float(row_data['payment_terms'])) if self._text(row_data, 'payment_terms') else None
+        }
+        return self._picked(row_data, mapping)
+    
+    def _staff_row(self, row_data: Dict) -> Dict:
+        mapping = {
+            'employee_id': self._text(row_data, 'employee_id', required=True),
+            'name': self._text(row_data, 'name', required=True),
+            'position': self._text(row_data, 'position', required=True),
+            'gross_salary': float(self._text(row_data, 'gross_salary', required=True)),
+            'monthly_deduction': float(row_data['monthly_deduction']) if self._text(row_data, 'monthly_deduction') else None
+        }
+        return self._picked(row_data, mapping)
+    
+    def _vehicle_row(self, row_data: Dict) -> Dict:
+        mapping = {
+            'vehicle_no': self._text(row_data, 'vehicle_no', required=True),
+            'vehicle_type': self._text(row_data, 'vehicle_type', required=True),
+            'capacity_tons': float(self._text(row_data, 'capacity_tons', required=True))
+        }
+        return self._picked(row_data, mapping)
+    
+    def import_clients_csv(self, csv_file, filename: str = "clients.csv", chunk_size: int = 500,
+                           upsert: bool = True, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Import clients from CSV/Excel (upsert on client_code)"""
+        return self.stream_import(csv_file, filename, models.Client, 'client_code', self._client_row,
+                                  chunk_size=chunk_size, upsert=upsert, code_prefix='CLI', progress=progress)
+    
+    def import_vendors_csv(self, csv_file, filename: str = "vendors.csv", chunk_size: int = 500,
+                           upsert: bool = True, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Import vendors from CSV/Excel (upsert on vendor_code)"""
+        return self.stream_import(csv_file, filename, models.Vendor, 'vendor_code', self._vendor_row,
+                                  chunk_size=chunk_size, upsert=upsert, progress=progress)
     
-    def import_staff_csv(self, csv_file) -> Dict:
-        """Import staff from CSV"""
+    def import_staff_csv(self, csv_file, filename: str = "staff.csv", chunk_size: int = 500,
+                         upsert: bool = True, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Import staff from CSV/Excel (upsert on employee_id)"""
+        return self.stream_import(csv_file, filename, models.Staff, 'employee_id', self._staff_row,
+                                  chunk_size=chunk_size, upsert=upsert, progress=progress)
+    
+    def import_vehicles_csv(self, csv_file, filename: str = "vehicles.csv", chunk_size: int = 500,
+                            upsert: bool = True, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Import vehicles from CSV/Excel (upsert on vehicle_no)"""
+        return self.stream_import(csv_file, filename, models.Vehicle, 'vehicle_no', self._vehicle_row,
+                                  chunk_size=chunk_size, upsert=upsert, progress=progress)
+    
+    # ============================================
+    # TRIP IMPORT (bulk, validated)
+    # ============================================
+    
+    TRIP_IMPORT_COLUMNS = [
+        'date', 'reference_no', 'vehicle_no', 'client_name', 'vendor_name',
+        'category_product', 'source_location', 'destination_location', 'driver_operator',
+        'freight_mode', 'total_tonnage', 'tonnage', 'rate_per_ton',
+        'vendor_freight', 'client_freight', 'local_shifting_charges',
+        'advance_paid', 'fuel_cost', 'munshiyana_bank_charges', 'other_expenses', 'notes'
+    ]
+    
+    def _read_rows(self, upload_file, filename: str):
+        """Yield row dicts from a CSV or XLSX upload"""
+        if filename.lower().endswith(('.xlsx', '.xlsm')):
+            wb = openpyxl.load_workbook(upload_file, read_only=True, data_only=True)
+            rows = wb.active.iter_rows(values_only=True)
+            headers = [str(h).strip() if h is not None else '' for h in next(rows, [])]
+            for values in rows:
+                if values and any(v not in (None, '') for v in values):
+                    yield dict(zip(headers, values))
+            wb.close()
+        else:
+            text = io.TextIOWrapper(upload_file, encoding='utf-8-sig', newline='')
+            try:
+                for row_data in csv.DictReader(text):
+                    yield {(k or '').strip(): v for k, v in row_data.items()}
+            finally:
+                text.detach()
+    
+    def import_trips(
+        self,
+        upload_file,
+        filename: str,
+        current_user_id: int,
+        chunk_size: int = 500,
+        dry_run: bool = False
+    ) -> Dict:
+        """
+        Import trips from CSV/XLSX with the same side effects as trip entry
+        (receivable, payable, client balance, CEO Capital profit allocation).
+        
+        Client/vendor/vehicle names are resolved with one query per table,
+        every row is checked against BusinessValidator.validate_trip_data and
+        valid rows are written with bulk_insert_mappings in chunks. Invalid
+        rows are skipped and reported; nothing is written when dry_run=True.
+        
+        Validation is per row, not vectorized over columns: the rules live in
+        schemas.TripCreate and BusinessValidator, and checking rows through
+        them keeps imported trips to exactly the rules of trip entry. The
+        lookups and writes around them are the batched part.
+        """
+        import schemas
+        from crud import _trip_documents, _trip_profit_allocation, _trip_values
+        from validators import BusinessValidator
+        
         results = {
             'total': 0,
             'success': 0,
@@ -103,64 +304,180 @@ class BulkImportExportService:
             'errors': []
         }
         
+        def fail(row_number, reference_no, field, message):
+            results['errors'].append({
+                'row': row_number,
+                'reference_no': reference_no,
+                'errors': [{'field': field, 'message': message}]
+            })
+        
         try:
-            csv_content = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(io.StringIO(csv_content))
+            rows = list(self._read_rows(upload_file, filename))
+        except Exception as e:
+            results['errors'].append({'row': None, 'errors': [{'field': 'file', 'message': str(e)}]})
+            return results
+        results['total'] = len(rows)
+        
+        def column(name):
+            return {str(r.get(name) or '').strip().lower() for r in rows} - {''}
+        
+        # One lookup per table for name -> id resolution
+        client_ids = {name.lower(): id_ for id_, name in self.db.query(models.Client.id, models.Client.name).filter(
+            func.lower(models.Client.name).in_(column('client_name'))
+        )}
+        vendor_ids = {name.lower(): id_ for id_, name in self.db.query(models.Vendor.id, models.Vendor.name).filter(
+            func.lower(models.Vendor.name).in_(column('vendor_name'))
+        )}
+        vehicle_ids = {no.lower(): id_ for id_, no in self.db.query(models.Vehicle.id, models.Vehicle.vehicle_no).filter(
+            func.lower(models.Vehicle.vehicle_no).in_(column('vehicle_no'))
+        )}
+        existing_refs = {ref for (ref,) in self.db.query(models.Trip.reference_no).filter(
+            models.Trip.reference_no.in_({str(r.get('reference_no') or '').strip() for r in rows})
+        )}
+        
+        valid = []
+        seen_refs = set()
+        for row_number, row in enumerate(rows, 2):  # Row 1 is the header
+            reference_no = str(row.get('reference_no') or '').strip()
+            if reference_no in existing_refs:
+                fail(row_number, reference_no, 'reference_no', 'Trip reference already exists')
+                continue
+            if reference_no in seen_refs:
+                fail(row_number, reference_no, 'reference_no', 'Duplicate reference in file')
+                continue
             
-            for row_data in csv_reader:
-                results['total'] += 1
+            missing = [
+                (field, value) for field, value, lookup in (
+                    ('client_name', row.get('client_name'), client_ids),
+                    ('vendor_name', row.get('vendor_name'), vendor_ids),
+                    ('vehicle_no', row.get('vehicle_no'), vehicle_ids),
+                ) if str(value or '').strip().lower() not in lookup
+            ]
+            if missing:
+                results['errors'].append({
+                    'row': row_number,
+                    'reference_no': reference_no,
+                    'errors': [{'field': f, 'message': f"Unknown value '{v or ''}'"} for f, v in missing]
+                })
+                continue
+            
+            data = {k: (None if v == '' else v) for k, v in row.items() if k in self.TRIP_IMPORT_COLUMNS}
+            data.pop('client_name', None)
+            data.pop('vendor_name', None)
+            data.pop('vehicle_no', None)
+            data.update(
+                reference_no=reference_no,
+                client_id=client_ids[str(row['client_name']).strip().lower()],
+                vendor_id=vendor_ids[str(row['vendor_name']).strip().lower()],
+                vehicle_id=vehicle_ids[str(row['vehicle_no']).strip().lower()],
+                freight_mode=data.get('freight_mode') or 'total'
+            )
+            if isinstance(data.get('date'), str):
                 try:
-                    staff = models.Staff(
-                        employee_id=row_data['employee_id'],
-                        name=row_data['name'],
-                        position=row_data['position'],
-                        gross_salary=float(row_data['gross_salary']),
-                        monthly_deduction=float(row_data.get('monthly_deduction', 0))
-                    )
-                    self.db.add(staff)
-                    results['success'] += 1
-                except Exception as e:
-                    results['failed'] += 1
-                    results['errors'].append(f"Row {results['total']}: {str(e)}")
+                    data['date'] = datetime.fromisoformat(data['date'].strip())
+                except ValueError:
+                    pass  # Reported by schema validation below
+            for optional in ('local_shifting_charges', 'advance_paid', 'fuel_cost',
+                             'munshiyana_bank_charges', 'other_expenses'):
+                data[optional] = data.get(optional) or 0.0
             
-            self.db.commit()
+            try:
+                trip = schemas.TripCreate(**data)
+                BusinessValidator.validate_trip_data(trip.model_dump())
+            except ValueError as e:
+                detail = e.args[0] if e.args else str(e)
+                if isinstance(detail, dict) and 'validation_errors' in detail:
+                    row_errors = detail['validation_errors']
+                elif hasattr(e, 'errors'):  # pydantic ValidationError
+                    row_errors = [{'field': '.'.join(str(p) for p in err['loc']), 'message': err['msg']} for err in e.errors()]
+                else:
+                    row_errors = [{'field': None, 'message': str(detail)}]
+                results['errors'].append({'row': row_number, 'reference_no': reference_no, 'errors': row_errors})
+                continue
             
-        except Exception as e:
-            results['errors'].append(f"File error: {str(e)}")
+            seen_refs.add(reference_no)
+            valid.append(trip)
         
-        return results
-    
-    def import_vehicles_csv(self, csv_file) -> Dict:
-        """Import vehicles from CSV"""
-        results = {
-            'total': 0,
-            'success': 0,
-            'failed': 0,
-            'errors': []
-        }
+        results['failed'] = len(results['errors'])
+        results['valid'] = len(valid)
+        if dry_run or not valid:
+            return results
         
         try:
-            csv_content = csv_file.read().decode('utf-8')
-            csv_reader = csv.DictReader(io.StringIO(csv_content))
+            balances = BalanceHeadService(self.db)
+            client_totals = {}
+            # Same invoice numbering and dates as trip entry (crud._stage_trips)
+            issued = datetime.now()
             
-            for row_data in csv_reader:
-                results['total'] += 1
-                try:
-                    vehicle = models.Vehicle(
-                        vehicle_no=row_data['vehicle_no'],
-                        vehicle_type=row_data['vehicle_type'],
-                        capacity_tons=float(row_data['capacity_tons'])
+            for start in range(0, len(valid), chunk_size):
+                chunk = valid[start:start + chunk_size]
+                
+                trip_rows = [_trip_values(trip) for trip in chunk]
+                self.db.bulk_insert_mappings(models.Trip, trip_rows)
+                trip_ids = dict(self.db.query(models.Trip.reference_no, models.Trip.id).filter(
+                    models.Trip.reference_no.in_([t['reference_no'] for t in trip_rows])
+                ))
+                for trip_row in trip_rows:
+                    trip_row['id'] = trip_ids[trip_row['reference_no']]
+                
+                receivable_rows = []
+                payable_rows = []
+                for trip, trip_row in zip(chunk, trip_rows):
+                    receivable_row, payable_row = _trip_documents(
+                        trip, trip_row['id'], trip_row['reference_no'], current_user_id, issued
                     )
-                    self.db.add(vehicle)
-                    results['success'] += 1
-                except Exception as e:
-                    results['failed'] += 1
-                    results['errors'].append(f"Row {results['total']}: {str(e)}")
+                    receivable_rows.append(receivable_row)
+                    payable_rows.append(payable_row)
+                    client_totals[trip.client_id] = client_totals.get(trip.client_id, 0.0) + trip.client_freight
+                self.db.bulk_insert_mappings(models.Receivable, receivable_rows)
+                self.db.bulk_insert_mappings(models.Payable, payable_rows)
+                receivable_ids = dict(self.db.query(models.Receivable.invoice_number, models.Receivable.id).filter(
+                    models.Receivable.invoice_number.in_([r['invoice_number'] for r in receivable_rows])
+                ))
+                payable_ids = dict(self.db.query(models.Payable.invoice_number, models.Payable.id).filter(
+                    models.Payable.invoice_number.in_([p['invoice_number'] for p in payable_rows])
+                ))
+                
+                # Link receivable/payable back to each trip
+                self.db.bulk_update_mappings(models.Trip, [
+                    {
+                        'id': t['id'],
+                        'receivable_id': receivable_ids[r['invoice_number']],
+                        'receivable_created': True,
+                        'payable_id': payable_ids[p['invoice_number']],
+                        'payable_created': True
+                    }
+                    for t, r, p in zip(trip_rows, receivable_rows, payable_rows)
+                ])
+                
+                ceo_rows = []
+                for trip, trip_row in zip(chunk, trip_rows):
+                    allocation = _trip_profit_allocation(
+                        balances, trip, trip_row['id'], trip_row['reference_no'], trip_row['date'],
+                        trip_row['net_profit'], current_user_id
+                    )
+                    if allocation:
+                        ceo_rows.append(allocation)
+                if ceo_rows:
+                    self.db.bulk_insert_mappings(models.CEOCapital, ceo_rows)
+                
+                search_index.index_rows(self.db, models.Trip, trip_ids.values())
+                search_index.index_rows(self.db, models.Receivable, receivable_ids.values())
+                search_index.index_rows(self.db, models.Payable, payable_ids.values())
+                
+                results['success'] += len(chunk)
             
-            self.db.commit()
+            for client in self.db.query(models.Client).filter(models.Client.id.in_(client_totals.keys())):
+                client.current_balance = (client.current_balance or 0.0) + client_totals[client.id]
+            
+            # Bulk inserts skip the ORM flush hooks, so re-open closed months here
+            invalidate_from(self.db, min(trip.date for trip in valid))
             
+            self.db.commit()
         except Exception as e:
-            results['errors'].append(f"File error: {str(e)}")
+            self.db.rollback()
+            results['success'] = 0
+            results['errors'].append({'row': None, 'errors': [{'field': 'database', 'message': str(e)}]})
         
         return results
     
@@ -404,10 +721,11 @@ class BulkImportExportService:
     def generate_import_template(self, entity_type: str) -> io.BytesIO:
         """Generate CSV template for import"""
         templates = {
-            'clients': ['name', 'contact_person', 'phone', 'email', 'address', 'credit_limit', 'payment_terms'],
-            'vendors': ['name', 'contact_person', 'phone', 'email', 'address', 'payment_terms'],
+            'clients': ['client_code', 'name', 'contact_person', 'phone', 'email', 'address', 'credit_limit', 'payment_terms'],
+            'vendors': ['vendor_code', 'name', 'contact_person', 'phone', 'email', 'address', 'payment_terms'],
             'staff': ['employee_id', 'name', 'position', 'gross_salary', 'monthly_deduction'],
-            'vehicles': ['vehicle_no', 'vehicle_type', 'capacity_tons']
+            'vehicles': ['vehicle_no', 'vehicle_type', 'capacity_tons'],
+            'trips': self.TRIP_IMPORT_COLUMNS
         }
         
         if entity_type not in templates:
@@ -419,13 +737,17 @@ class BulkImportExportService:
         
         # Add sample row
         if entity_type == 'clients':
-            writer.writerow(['ABC Company', 'John Doe', '+92-XXX-XXXXXXX', 'client@example.com', 'Address', '100000', '30'])
+            writer.writerow(['', 'ABC Company', 'John Doe', '+92-XXX-XXXXXXX', 'client@example.com', 'Address', '100000', '30'])
         elif entity_type == 'vendors':
-            writer.writerow(['XYZ Vendor', 'Jane Smith', '+92-XXX-XXXXXXX', 'vendor@example.com', 'Address', '30'])
+            writer.writerow(['', 'XYZ Vendor', 'Jane Smith', '+92-XXX-XXXXXXX', 'vendor@example.com', 'Address', '30'])
         elif entity_type == 'staff':
             writer.writerow(['EMP001', 'John Doe', 'Driver', '50000', '5000'])
         elif entity_type == 'vehicles':
             writer.writerow(['ABC-123', 'Truck', '10'])
+        elif entity_type == 'trips':
+            writer.writerow(['2024-01-15', 'TRP-0001', 'ABC-123', 'ABC Company', 'XYZ Vendor',
+                             'Cement', 'Karachi', 'Lahore', 'Driver Name', 'total', '25', '', '',
+                             '30000', '40000', '0', '0', '0', '0', '0', ''])
         
         buffer.seek(0)
         return io.BytesIO(buffer.getvalue().encode('utf-8'))
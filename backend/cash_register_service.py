@@ -12,12 +12,44 @@ MANDATORY RULES:
 - Every payment event MUST insert a record here
 - Vendor payments are NOT expenses (cost already captured at trip creation)
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy import func, and_, extract, case, delete, event, insert, select, text
 from datetime import datetime, date
-from typing import Optional
+from itertools import chain
+from typing import Iterable, NamedTuple, Optional
+import os
 import models
 
+# Keep the per-day rollup (cash_daily_rollups) in step with the register; reads
+# use it once it has been built with CashRegisterService.rebuild_daily_rollup()
+DAILY_ROLLUP = os.getenv("CASH_DAILY_ROLLUP", "true").lower() in ("1", "true", "yes")
+ROLLUP_READY_KEY = "cash_daily_rollup_ready"
+
+class _AggregateColumns(NamedTuple):
+    name: str
+    date: object
+    source_module: object
+    payment_mode: object
+    cash_in: object
+    cash_out: object
+    transaction_count: object
+    criteria: tuple
+
+# Namespace of the per-day advisory locks taken while a day's rollup is recomputed (PostgreSQL)
+ROLLUP_LOCK_CLASS = 0x43524452
+
+def _rollup_ready(db: Session) -> bool:
+    # Looked up once per session, not per process: a restored or reset
+    # database carries its own flag
+    if not DAILY_ROLLUP:
+        return False
+    if ROLLUP_READY_KEY not in db.info:
+        value = db.query(models.SystemSetting.setting_value).filter(
+            models.SystemSetting.setting_key == ROLLUP_READY_KEY
+        ).scalar()
+        db.info[ROLLUP_READY_KEY] = value == "true"
+    return db.info[ROLLUP_READY_KEY]
+
 class CashRegisterService:
     """Central Cash Register - Single Source of Truth"""
     
@@ -240,45 +272,72 @@ class CashRegisterService:
     # TASK 5: DASHBOARD BACKEND CALCULATIONS
     # ============================================
     
+    def get_cash_position(self, as_of: Optional[date] = None) -> dict:
+        """
+        Cash balance, the day's IN/OUT and totals per source module and payment
+        mode from one conditional-aggregate query, read from the daily rollup
+        once it has been built.
+        With as_of, only transactions up to that date count and "today" is as_of.
+        """
+        today = as_of or date.today()
+        columns = self._aggregate_columns()
+        
+        query = self.db.query(
+            columns.source_module,
+            columns.payment_mode,
+            func.sum(columns.cash_in),
+            func.sum(columns.cash_out),
+            func.sum(case((columns.date == today, columns.cash_in), else_=0.0)),
+            func.sum(case((columns.date == today, columns.cash_out), else_=0.0)),
+            columns.transaction_count
+        ).filter(*columns.criteria)
+        if as_of:
+            query = query.filter(columns.date <= as_of)
+        rows = query.group_by(columns.source_module, columns.payment_mode).all()
+        
+        position = {
+            "balance": 0.0,
+            "cash_in": 0.0,
+            "cash_out": 0.0,
+            "transaction_count": 0,
+            "today": {"date": today.isoformat(), "cash_in": 0.0, "cash_out": 0.0, "net": 0.0},
+            "by_source_module": {},
+            "by_payment_mode": {},
+            "source": columns.name
+        }
+        for source_module, payment_mode, cash_in, cash_out, today_in, today_out, count in rows:
+            cash_in, cash_out = float(cash_in or 0), float(cash_out or 0)
+            position["cash_in"] += cash_in
+            position["cash_out"] += cash_out
+            position["transaction_count"] += int(count or 0)
+            position["today"]["cash_in"] += float(today_in or 0)
+            position["today"]["cash_out"] += float(today_out or 0)
+            for breakdown, key in (("by_source_module", source_module), ("by_payment_mode", payment_mode)):
+                totals = position[breakdown].setdefault(key.value, {"cash_in": 0.0, "cash_out": 0.0, "net": 0.0})
+                totals["cash_in"] += cash_in
+                totals["cash_out"] += cash_out
+                totals["net"] += cash_in - cash_out
+        
+        position["balance"] = position["cash_in"] - position["cash_out"]
+        position["today"]["net"] = position["today"]["cash_in"] - position["today"]["cash_out"]
+        return position
+    
     def get_cash_balance(self) -> float:
         """
         Calculate current cash balance
         Cash Balance = SUM(IN) - SUM(OUT)
         """
-        cash_in = self.db.query(func.sum(models.CashTransaction.amount)).filter(
-            models.CashTransaction.direction == models.CashDirection.IN,
-            models.CashTransaction.is_deleted == False
-        ).scalar() or 0.0
-        
-        cash_out = self.db.query(func.sum(models.CashTransaction.amount)).filter(
-            models.CashTransaction.direction == models.CashDirection.OUT,
-            models.CashTransaction.is_deleted == False
-        ).scalar() or 0.0
-        
-        return cash_in - cash_out
+        return self.get_cash_position()["balance"]
     
     def get_today_cash_flow(self) -> dict:
         """
         Get today's cash IN and OUT
         """
-        today = date.today()
-        
-        cash_in = self.db.query(func.sum(models.CashTransaction.amount)).filter(
-            models.CashTransaction.date == today,
-            models.CashTransaction.direction == models.CashDirection.IN,
-            models.CashTransaction.is_deleted == False
-        ).scalar() or 0.0
-        
-        cash_out = self.db.query(func.sum(models.CashTransaction.amount)).filter(
-            models.CashTransaction.date == today,
-            models.CashTransaction.direction == models.CashDirection.OUT,
-            models.CashTransaction.is_deleted == False
-        ).scalar() or 0.0
-        
+        today = self.get_cash_position()["today"]
         return {
-            "cash_in": cash_in,
-            "cash_out": cash_out,
-            "net": cash_in - cash_out
+            "cash_in": today["cash_in"],
+            "cash_out": today["cash_out"],
+            "net": today["net"]
         }
     
     # ============================================
@@ -294,39 +353,32 @@ class CashRegisterService:
         Get daily cash flow for date range
         Returns: opening balance, cash IN, cash OUT, closing balance per day
         """
-        # Get opening balance (all transactions before start_date)
-        opening_in = self.db.query(func.sum(models.CashTransaction.amount)).filter(
-            models.CashTransaction.date < start_date,
-            models.CashTransaction.direction == models.CashDirection.IN,
-            models.CashTransaction.is_deleted == False
-        ).scalar() or 0.0
+        columns = self._aggregate_columns()
         
-        opening_out = self.db.query(func.sum(models.CashTransaction.amount)).filter(
-            models.CashTransaction.date < start_date,
-            models.CashTransaction.direction == models.CashDirection.OUT,
-            models.CashTransaction.is_deleted == False
+        # Opening balance (all transactions before start_date); a prefix sum over the rollup
+        opening_balance = self.db.query(
+            func.sum(columns.cash_in - columns.cash_out)
+        ).filter(
+            columns.date < start_date,
+            *columns.criteria
         ).scalar() or 0.0
         
-        opening_balance = opening_in - opening_out
-        
         # Get transactions for date range grouped by date
-        from sqlalchemy import case
-        
         daily_data = self.db.query(
-            models.CashTransaction.date,
-            func.sum(case((models.CashTransaction.direction == models.CashDirection.IN, models.CashTransaction.amount), else_=0)).label('cash_in'),
-            func.sum(case((models.CashTransaction.direction == models.CashDirection.OUT, models.CashTransaction.amount), else_=0)).label('cash_out')
+            columns.date.label('date'),
+            func.sum(columns.cash_in).label('cash_in'),
+            func.sum(columns.cash_out).label('cash_out')
         ).filter(
             and_(
-                models.CashTransaction.date >= start_date,
-                models.CashTransaction.date <= end_date,
-                models.CashTransaction.is_deleted == False
+                columns.date >= start_date,
+                columns.date <= end_date,
+                *columns.criteria
             )
-        ).group_by(models.CashTransaction.date).order_by(models.CashTransaction.date).all()
+        ).group_by(columns.date).order_by(columns.date).all()
         
         # Build daily flow with running balance
         result = []
-        running_balance = opening_balance
+        running_balance = float(opening_balance)
         
         for row in daily_data:
             cash_in = float(row.cash_in)
@@ -345,6 +397,50 @@ class CashRegisterService:
         
         return result
     
+    # ============================================
+    # DAILY ROLLUP
+    # ============================================
+    
+    def rebuild_daily_rollup(self) -> int:
+        """
+        Rebuild every day of the rollup from the register and mark it ready,
+        so reads switch to it. The caller commits. Returns the rows written.
+        """
+        connection = self.db.connection()
+        connection.execute(delete(models.CashDailyRollup.__table__))
+        written = refresh_days(connection, None)
+        
+        setting = self.db.query(models.SystemSetting).filter(
+            models.SystemSetting.setting_key == ROLLUP_READY_KEY
+        ).first()
+        if setting is None:
+            setting = models.SystemSetting(
+                setting_key=ROLLUP_READY_KEY,
+                setting_type="boolean",
+                description="Cash register reads use the per-day rollup"
+            )
+            self.db.add(setting)
+        setting.setting_value = "true"
+        self.db.info.pop(ROLLUP_READY_KEY, None)
+        return written
+    
+    def _aggregate_columns(self) -> "_AggregateColumns":
+        """Row-level IN/OUT expressions over the rollup when it is ready, else over the register"""
+        if _rollup_ready(self.db):
+            rollup = models.CashDailyRollup
+            return _AggregateColumns(
+                "rollup", rollup.date, rollup.source_module, rollup.payment_mode,
+                rollup.cash_in, rollup.cash_out, func.sum(rollup.transaction_count), ()
+            )
+        cash = models.CashTransaction
+        return _AggregateColumns(
+            "register", cash.date, cash.source_module, cash.payment_mode,
+            case((cash.direction == models.CashDirection.IN, cash.amount), else_=0.0),
+            case((cash.direction == models.CashDirection.OUT, cash.amount), else_=0.0),
+            func.count(cash.id),
+            (cash.is_deleted == False,)
+        )
+    
     # ============================================
     # SOFT DELETE (TASK 8)
     # ============================================
@@ -370,3 +466,98 @@ class CashRegisterService:
         
         self.db.commit()
         return True
+
+
+# ============================================
+# DAILY ROLLUP MAINTENANCE
+# ============================================
+
+def refresh_days(connection, days: Optional[Iterable[date]]) -> int:
+    """
+    Recompute the rollup rows of the given days (every day when None) from the
+    register, on the caller's connection and transaction. Returns rows written.
+    
+    On PostgreSQL each day is first locked with a transaction-scoped advisory
+    lock, so concurrent postings on one day recompute it one after the other:
+    the second waits for the first to commit and then, under READ COMMITTED,
+    deletes and re-aggregates rows that include it instead of inserting a
+    duplicate (date, source_module, payment_mode) row. SQLite already
+    serializes writers on the database lock.
+    """
+    rollup = models.CashDailyRollup.__table__
+    cash = models.CashTransaction.__table__
+    
+    totals = select(
+        cash.c.date,
+        cash.c.source_module,
+        cash.c.payment_mode,
+        func.sum(case((cash.c.direction == models.CashDirection.IN, cash.c.amount), else_=0.0)),
+        func.sum(case((cash.c.direction == models.CashDirection.OUT, cash.c.amount), else_=0.0)),
+        func.count(cash.c.id)
+    ).where(
+        cash.c.is_deleted == False
+    ).group_by(cash.c.date, cash.c.source_module, cash.c.payment_mode)
+    
+    if days is not None:
+        days = sorted(set(days))
+        if not days:
+            return 0
+        if connection.dialect.name == "postgresql":
+            # Sorted, so two transactions locking overlapping days cannot deadlock
+            for day in days:
+                connection.execute(
+                    text("SELECT pg_advisory_xact_lock(CAST(:namespace AS INTEGER), CAST(:day AS INTEGER))"),
+                    {"namespace": ROLLUP_LOCK_CLASS, "day": day.toordinal()}
+                )
+        connection.execute(delete(rollup).where(rollup.c.date.in_(days)))
+        totals = totals.where(cash.c.date.in_(days))
+    
+    result = connection.execute(insert(rollup).from_select(
+        ['date', 'source_module', 'payment_mode', 'cash_in', 'cash_out', 'transaction_count'],
+        totals
+    ))
+    return result.rowcount
+
+def refresh_transaction_days(db: Session, transaction_ids: Iterable[int]) -> int:
+    """Refresh the days of transactions changed by bulk updates, which skip the flush hooks"""
+    if not DAILY_ROLLUP:
+        return 0
+    ids = list(transaction_ids)
+    days = set()
+    for start in range(0, len(ids), 900):
+        days.update(
+            day for (day,) in db.query(models.CashTransaction.date).filter(
+                models.CashTransaction.id.in_(ids[start:start + 900])
+            ).distinct()
+        )
+    return refresh_days(db.connection(), days)
+
+@event.listens_for(Session, 'before_flush')
+def _collect_cash_days(session, flush_context, instances):
+    if not DAILY_ROLLUP:
+        return
+    days = session.info.setdefault('cash_rollup_days', set())
+    for obj in chain(session.new, session.deleted, session.dirty):
+        if not isinstance(obj, models.CashTransaction):
+            continue
+        if obj.date is not None:
+            days.add(obj.date)
+        # A moved transaction also changes the day it left
+        history = attributes.get_history(obj, 'date')
+        days.update(day for day in history.deleted if day is not None)
+        state = attributes.instance_state(obj)
+        if history.added and not history.deleted and state.has_identity:
+            # Set after the instance expired (e.g. on commit): the old day was never loaded
+            stored = session.execute(
+                select(models.CashTransaction.date).where(models.CashTransaction.id == state.identity[0])
+            ).scalar()
+            if stored is not None:
+                days.add(stored)
+    if not days:
+        session.info.pop('cash_rollup_days', None)
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_cash_days(session, flush_context):
+    days = session.info.pop('cash_rollup_days', None)
+    if days:
+        refresh_days(session.connection(), days)
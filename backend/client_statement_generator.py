@@ -0,0 +1,324 @@
+"""
+Client Ledger Statement Generator - Bank Statement Style
+Invoices and collections with running balance for a client over a period
+"""
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from datetime import datetime
+from io import BytesIO
+from typing import Optional, Dict, List
+from staff_ledger_generator import StaffLedgerGenerator
+
+class ClientStatementGenerator(StaffLedgerGenerator):
+    """Same header, palette and table language as the staff recovery statement"""
+    
+    def __init__(self):
+        super().__init__()
+        self.company_info = dict(self.company_info, tagline="Client Account Statement")
+        
+    def generate_client_statement(
+        self,
+        client_data: Dict,
+        entries: List[Dict],
+        output_path: Optional[str] = None
+    ) -> BytesIO:
+        """
+        Generate bank statement style client ledger statement
+        
+        client_data: {
+            'name': 'Fauji Foods Limited',
+            'client_code': 'CLI-0001',
+            'contact_person': 'Mr. Ahmed Khan',
+            'phone': '+92-21-34567890',
+            'period': '01-Jan-2026 to 31-Jan-2026',
+            'opening_balance': 100000
+        }
+        
+        entries: [
+            {
+                'date': datetime(2026, 1, 5),
+                'reference': 'TRP-2026-001',
+                'description': 'Invoice: INV-2026-001',
+                'debit': 412000,
+                'credit': 0,
+                'balance': 512000
+            }
+        ]
+        """
+        buffer = BytesIO()
+        
+        doc = SimpleDocTemplate(
+            buffer if not output_path else output_path,
+            pagesize=letter,
+            rightMargin=0.5*inch,
+            leftMargin=0.5*inch,
+            topMargin=0.4*inch,
+            bottomMargin=0.4*inch
+        )
+        
+        # Build PDF
+        doc.build(self.build_client_statement_story(client_data, entries))
+        
+        if not output_path:
+            buffer.seek(0)
+            return buffer
+        return None
+        
+    def build_client_statement_story(self, client_data: Dict, entries: List[Dict]) -> List:
+        """Statement flowables; used for single PDFs and for multi-document bundles"""
+        elements = self.build_statement_header()
+        styles = self.assets.styles
+        
+        opening_balance = client_data.get('opening_balance', 0)
+        total_invoiced = sum(e.get('debit', 0) for e in entries)
+        total_received = sum(e.get('credit', 0) for e in entries)
+        closing_balance = opening_balance + total_invoiced - total_received
+        
+        # ============================================
+        # STATEMENT TITLE
+        # ============================================
+        
+        title = f'<font size=18 color="{self.colors.hex["primary"]}"><b>CLIENT ACCOUNT STATEMENT</b></font>'
+        elements.append(Paragraph(title, styles['AlignCenter']))
+        if client_data.get('period'):
+            elements.append(Paragraph(f'<font size=9>Period: {client_data["period"]}</font>', styles['AlignCenter']))
+        elements.append(Spacer(1, 0.15*inch))
+        
+        # ============================================
+        # CLIENT INFORMATION BOX
+        # ============================================
+        
+        client_info_data = [
+            [
+                Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>CLIENT DETAILS</b></font>', styles['Normal']),
+                Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>ACCOUNT SUMMARY</b></font>', styles['Normal'])
+            ],
+            [
+                Paragraph(f"""
+                <font size=9>
+                <b>Name:</b> {client_data['name']}<br/>
+                <b>Client Code:</b> {client_data.get('client_code') or '-'}<br/>
+                <b>Contact:</b> {client_data.get('contact_person') or '-'}<br/>
+                <b>Phone:</b> {client_data.get('phone') or '-'}
+                </font>
+                """, styles['Normal']),
+                
+                Paragraph(f"""
+                <font size=9>
+                <b>Opening Balance:</b> PKR {opening_balance:,.2f}<br/>
+                <b>Total Invoiced:</b> PKR {total_invoiced:,.2f}<br/>
+                <b>Total Received:</b> PKR {total_received:,.2f}<br/>
+                <b>Closing Balance:</b> <font color="{self.colors.hex['negative']}"><b>PKR {closing_balance:,.2f}</b></font>
+                </font>
+                """, styles['Normal'])
+            ]
+        ]
+        
+        client_info_table = Table(client_info_data, colWidths=[3.5*inch, 3.5*inch])
+        client_info_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), self.colors['background']),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('BOX', (0, 0), (-1, -1), 1, self.colors['text']),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, self.colors['text']),
+        ]))
+        elements.append(client_info_table)
+        elements.append(Spacer(1, 0.25*inch))
+        
+        # ============================================
+        # TRANSACTION HISTORY (BANK STATEMENT STYLE)
+        # ============================================
+        
+        elements.append(Paragraph(f'<font size=11 color="{self.colors.hex["primary"]}"><b>▓ TRANSACTION HISTORY</b></font>', styles['Normal']))
+        elements.append(Spacer(1, 0.1*inch))
+        
+        trans_data = [
+            [
+                Paragraph('<font size=9 color="white"><b>Date</b></font>', styles['Normal']),
+                Paragraph('<font size=9 color="white"><b>Reference</b></font>', styles['Normal']),
+                Paragraph('<font size=9 color="white"><b>Description</b></font>', styles['Normal']),
+                Paragraph('<font size=9 color="white"><b>Invoiced</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>Received</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>Balance</b></font>', styles['AlignRight'])
+            ],
+            [
+                '',
+                '',
+                Paragraph('<font size=8><b>Balance brought forward</b></font>', styles['Normal']),
+                '',
+                '',
+                Paragraph(f'<font size=8><b>{opening_balance:,.2f}</b></font>', styles['AlignRight'])
+            ]
+        ]
+        
+        for entry in entries:
+            date_str = entry.get('date', '')
+            if isinstance(date_str, datetime):
+                date_str = date_str.strftime('%d-%b-%Y')
+                
+            debit = entry.get('debit', 0)
+            credit = entry.get('credit', 0)
+            balance = entry.get('balance', 0)
+            balance_color = self.colors.hex['negative'] if balance > 0 else self.colors.hex['positive']
+            
+            trans_data.append([
+                Paragraph(f'<font size=8>{date_str}</font>', styles['Normal']),
+                Paragraph(f'<font size=8>{entry.get("reference") or ""}</font>', styles['Normal']),
+                Paragraph(f'<font size=8>{entry.get("description", "")}</font>', styles['Normal']),
+                Paragraph(f'<font size=8>{debit:,.2f}</font>' if debit > 0 else '<font size=8>-</font>', styles['AlignRight']),
+                Paragraph(f'<font size=8>{credit:,.2f}</font>' if credit > 0 else '<font size=8>-</font>', styles['AlignRight']),
+                Paragraph(f'<font size=8 color="{balance_color}"><b>{balance:,.2f}</b></font>', styles['AlignRight'])
+            ])
+            
+        trans_table = Table(
+            trans_data,
+            colWidths=[0.9*inch, 1.1*inch, 2*inch, 1*inch, 1*inch, 1*inch],
+            repeatRows=1
+        )
+        trans_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), self.colors['primary']),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 5),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+            ('GRID', (0, 0), (-1, -1), 0.5, self.colors['text']),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.colors['background']]),
+        ]))
+        elements.append(trans_table)
+        elements.append(Spacer(1, 0.25*inch))
+        
+        # ============================================
+        # FOOTER
+        # ============================================
+        
+        footer_line = Table([['']], colWidths=[7*inch])
+        footer_line.setStyle(TableStyle([
+            ('LINEABOVE', (0, 0), (-1, 0), 2, self.colors['primary']),
+        ]))
+        elements.append(footer_line)
+        elements.append(Spacer(1, 0.08*inch))
+        
+        footer_text = f"""
+        <font size=8 color="{self.colors.hex['text']}">
+        <b>PGT International (Private) Limited</b><br/>
+        Please report any discrepancy within 7 days of the statement date.<br/>
+        For queries: {self.company_info['phone']} | {self.company_info['email']}<br/>
+        Generated: {datetime.now().strftime('%d-%b-%Y %I:%M %p')}
+        </font>
+        """
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
+        
+        return elements
+        
+    def generate_from_client_id(
+        self,
+        db,
+        client_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> BytesIO:
+        """Generate statement from client ID for an optional period"""
+        import models
+        from period_close import PeriodCloseService, CLIENT
+        
+        client = db.query(models.Client).filter(models.Client.id == client_id).first()
+        if not client:
+            raise ValueError(f"Client {client_id} not found")
+            
+        receivables = db.query(models.Receivable).filter(models.Receivable.client_id == client_id)
+        collections = db.query(models.Collection).filter(models.Collection.client_id == client_id)
+        opening_balance = 0.0
+        
+        if start_date:
+            opening_balance = PeriodCloseService(db).opening_balance(CLIENT, start_date, client_id)
+            receivables = receivables.filter(models.Receivable.invoice_date >= start_date)
+            collections = collections.filter(models.Collection.collection_date >= start_date)
+        if end_date:
+            receivables = receivables.filter(models.Receivable.invoice_date <= end_date)
+            collections = collections.filter(models.Collection.collection_date <= end_date)
+            
+        trip_refs = dict(
+            db.query(models.Trip.id, models.Trip.reference_no)
+            .join(models.Receivable, models.Receivable.trip_id == models.Trip.id)
+            .filter(models.Receivable.client_id == client_id)
+            .all()
+        )
+        
+        client_data, entries = self.statement_data(
+            client,
+            receivables.all(),
+            collections.all(),
+            trip_refs=trip_refs,
+            opening_balance=opening_balance,
+            period=self.format_period(start_date, end_date)
+        )
+        return self.generate_client_statement(client_data, entries)
+        
+    @staticmethod
+    def format_period(start_date: Optional[datetime], end_date: Optional[datetime]) -> Optional[str]:
+        if not start_date and not end_date:
+            return None
+        start = start_date.strftime('%d-%b-%Y') if start_date else 'Inception'
+        end = end_date.strftime('%d-%b-%Y') if end_date else 'Today'
+        return f"{start} to {end}"
+        
+    @staticmethod
+    def statement_data(
+        client,
+        receivables,
+        collections,
+        trip_refs: Optional[Dict[int, str]] = None,
+        opening_balance: float = 0.0,
+        period: Optional[str] = None
+    ) -> tuple:
+        """Shape a client row with its receivables and collections into (client_data, entries)"""
+        trip_refs = trip_refs or {}
+        client_data = {
+            'name': client.name,
+            'client_code': client.client_code,
+            'contact_person': client.contact_person,
+            'phone': client.phone,
+            'period': period,
+            'opening_balance': opening_balance
+        }
+        
+        entries = []
+        for receivable in receivables:
+            entries.append({
+                'date': receivable.invoice_date,
+                'reference': trip_refs.get(receivable.trip_id) or receivable.invoice_number,
+                'description': receivable.description or f"Invoice: {receivable.invoice_number}",
+                'debit': float(receivable.total_amount or 0),
+                'credit': 0
+            })
+        for collection in collections:
+            channel = collection.collection_channel.value.replace('_', ' ').title() if collection.collection_channel else 'N/A'
+            entries.append({
+                'date': collection.collection_date,
+                'reference': collection.reference_number or '',
+                'description': f"Payment Received: {channel}",
+                'debit': 0,
+                'credit': float(collection.collection_amount or 0)
+            })
+            
+        # Invoices before payments on the same day, then running balance from the opening balance
+        entries.sort(key=lambda e: (e['date'].replace(tzinfo=None) if e['date'] else datetime.min, e['credit'] > 0))
+        running_balance = opening_balance
+        for entry in entries:
+            running_balance += entry['debit'] - entry['credit']
+            entry['balance'] = running_balance
+            
+        return client_data, entries
+
+
+# Create singleton instance
+client_statement_generator = ClientStatementGenerator()
@@ -0,0 +1,94 @@
+"""
+Response Compression
+Compresses JSON and text responses above a size threshold with brotli when
+the client accepts it and the `brotli` package is installed, gzip otherwise.
+
+Only complete bodies are compressed: streamed responses (event streams,
+exports) and already-compressed downloads (Excel, PDF, ZIP) pass through.
+
+Configuration (environment variables):
+    RESPONSE_COMPRESSION           Enable the middleware (default: true)
+    RESPONSE_COMPRESSION_MIN_SIZE  Smallest body compressed, in bytes (default: 1024)
+    RESPONSE_GZIP_LEVEL            gzip level 1-9 (default: 6)
+    RESPONSE_BROTLI_QUALITY        brotli quality 0-11 (default: 4)
+"""
+import gzip
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+ENABLED = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"
+MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/csv")
+
+
+def _accepted(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(coding.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = MIN_SIZE,
+                 gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        
+    def _encoding(self, scope: Scope):
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+        
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+        
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+            
+        held_start = None
+        
+        async def send_compressed(message: Message) -> None:
+            nonlocal held_start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0].strip()
+                if "content-encoding" not in headers and media_type in COMPRESSIBLE_TYPES:
+                    # Decided by the first body message
+                    held_start = message
+                    return
+            elif message["type"] == "http.response.body" and held_start is not None:
+                start, held_start = held_start, None
+                body = message.get("body", b"")
+                if not message.get("more_body", False) and len(body) >= self.minimum_size:
+                    body = self._compress(encoding, body)
+                    headers = MutableHeaders(raw=start["headers"])
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    headers.add_vary_header("Accept-Encoding")
+                    message = {**message, "body": body}
+                await send(start)
+            await send(message)
+            
+        await self.app(scope, receive, send_compressed)
@@ -1,15 +1,21 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
+from sqlalchemy import and_, case, func, extract
+import logging
 import models
 import schemas
 from auth import get_password_hash
 from datetime import datetime, date, timedelta
 from audit_service import AuditService
+from balance_heads import BalanceHeadService, CEO_CAPITAL, STAFF_ADVANCE
 from notification_service import NotificationService
+from pagination import fetch_page
+from projections import Projection, entity_columns, schema_columns
 from validators import Validator, BusinessValidator, ValidationError
 from typing import Optional
 from fastapi import Request
 
+logger = logging.getLogger(__name__)
+
 # User CRUD
 def create_user(db: Session, user: schemas.UserCreate):
     hashed_password = get_password_hash(user.password)
@@ -39,10 +45,28 @@ def get_staff(db: Session, staff_id: int):
 def get_all_staff(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Staff).filter(models.Staff.is_active == True).offset(skip).limit(limit).all()
 
-def update_staff_advance(db: Session, staff_id: int, advance_amount: float):
+def update_staff_advance(db: Session, staff_id: int, advance_amount: float, created_by: int = 1):
+    """Adjust a staff advance balance; recorded in the advance ledger like any other posting"""
     staff = get_staff(db, staff_id)
-    if staff:
-        staff.advance_balance += advance_amount
+    if staff and advance_amount:
+        transaction_date = datetime.now()
+        _, new_balance = BalanceHeadService(db).post(
+            STAFF_ADVANCE,
+            amount_in=max(advance_amount, 0.0),
+            amount_out=max(-advance_amount, 0.0),
+            entry_date=transaction_date,
+            account_id=staff_id
+        )
+        db.add(models.StaffAdvanceLedger(
+            staff_id=staff_id,
+            transaction_date=transaction_date,
+            transaction_type='adjustment',
+            amount=advance_amount,
+            balance_after=new_balance,
+            description='Advance balance adjustment',
+            created_by=created_by
+        ))
+        staff.advance_balance = new_balance
         db.commit()
         db.refresh(staff)
     return staff
@@ -62,171 +86,221 @@ def get_active_fleet_count(db: Session):
     return db.query(models.Vehicle).filter(models.Vehicle.is_active == True).count()
 
 # SMART TRIP CRUD - One-Time Entry System
-def create_trip(db: Session, trip: schemas.TripCreate, current_user_id: int = 1, request: Optional[Request] = None):
-    """
-    SMART SYSTEM: One trip entry automatically creates:
-    1. Trip record with automatic profit calculations
-    2. Receivable (Client owes Company)
-    3. Payable (Company owes Vendor)
-    
-    Example: Vendor Freight = 30,000, Client Freight = 40,000, Company Profit = 10,000
-    """
-    
-    # SMART CALCULATIONS
+def _calculate_trip_financials(trip: schemas.TripCreate) -> dict:
+    """SMART CALCULATIONS for a single trip (mutates client_freight in per-ton mode)"""
     # Handle per-ton calculation if freight_mode is "per_ton"
     if trip.freight_mode == "per_ton" and trip.tonnage and trip.rate_per_ton:
         # For per-ton mode: Only auto-calculate CLIENT freight
         # Vendor freight remains manual (lump sum deal)
         trip.client_freight = trip.tonnage * trip.rate_per_ton
-        # vendor_freight is kept as provided by user (lump sum deal)
     
-    # Auto Calculations for SMART SYSTEM
     # Total vendor cost includes vendor_freight + local_shifting_charges
     total_vendor_cost = trip.vendor_freight + (trip.local_shifting_charges or 0)
     gross_profit = trip.client_freight - total_vendor_cost  # Company's gross profit
     net_profit = gross_profit - (trip.advance_paid + trip.fuel_cost + trip.munshiyana_bank_charges + trip.other_expenses)
     profit_margin = (net_profit / trip.client_freight * 100) if trip.client_freight > 0 else 0
     
-    # Create Trip with SMART calculations
-    db_trip = models.Trip(
+    return {
+        "gross_profit": gross_profit,
+        "net_profit": net_profit,
+        "profit_margin": profit_margin
+    }
+
+def _trip_values(trip: schemas.TripCreate) -> dict:
+    """Column values of a new trip, with its SMART calculations"""
+    financials = _calculate_trip_financials(trip)
+    return {
         **trip.model_dump(exclude={'gross_profit', 'net_profit', 'profit_margin'}),
-        gross_profit=gross_profit,
-        net_profit=net_profit,
-        profit_margin=profit_margin,
-        receivable_created=False,  # Will be set to True after creating receivable
-        payable_created=False     # Will be set to True after creating payable
+        **financials,
+        "receivable_created": False,
+        "payable_created": False
+    }
+
+def _trip_documents(trip: schemas.TripCreate, trip_id: int, reference_no: str, current_user_id: int, issued: datetime) -> tuple:
+    """Column values of the receivable (client owes Company) and payable (Company owes vendor) of a new trip"""
+    receivable_data = schemas.ReceivableCreate(
+        client_id=trip.client_id,
+        trip_id=trip_id,
+        invoice_number=f"INV-{reference_no}-{issued.strftime('%Y%m%d')}",
+        description=f"Transportation service - {trip.category_product} from {trip.source_location} to {trip.destination_location}",
+        total_amount=trip.client_freight,  # Amount client owes to company
+        invoice_date=issued,
+        due_date=issued + timedelta(days=30),
+        payment_terms=30
     )
-    db.add(db_trip)
-    db.commit()
-    db.refresh(db_trip)
     
-    # AUDIT LOGGING
-    if request:
-        audit = AuditService(db)
-        from audit_service import get_client_ip, get_user_agent
-        audit.log_create(
-            user_id=current_user_id,
-            table_name="trips",
-            record_id=db_trip.id,
-            new_values={
-                "reference_no": db_trip.reference_no,
-                "client_freight": db_trip.client_freight,
-                "vendor_freight": db_trip.vendor_freight,
-                "gross_profit": gross_profit,
-                "net_profit": net_profit
-            },
-            ip_address=get_client_ip(request) if request else None,
-            user_agent=get_user_agent(request) if request else None
-        )
+    # Total amount to pay vendor includes vendor_freight + local_shifting_charges
+    total_payable_amount = trip.vendor_freight + (trip.local_shifting_charges or 0)
+    payable_data = schemas.PayableCreate(
+        vendor_id=trip.vendor_id,
+        invoice_number=f"PAY-{reference_no}-{issued.strftime('%Y%m%d')}",
+        description=f"Vehicle hire - {trip.category_product} transport service (Freight: PKR {trip.vendor_freight:,.0f} + Local/Shifting: PKR {trip.local_shifting_charges or 0:,.0f})",
+        amount=total_payable_amount,
+        due_date=issued + timedelta(days=15),  # Shorter payment terms for vendors
+        status="pending"
+    )
+    return _receivable_values(receivable_data, current_user_id), _payable_values(payable_data)
+
+def _trip_profit_allocation(
+    balances: BalanceHeadService,
+    trip: schemas.TripCreate,
+    trip_id: int,
+    reference_no: str,
+    trip_date,
+    net_profit: float,
+    current_user_id: int
+) -> Optional[dict]:
+    """Post a trip's profit to the CEO Capital head; column values of its CEOCapital row, or None without profit"""
+    if net_profit <= 0:
+        return None
+    trip_date = trip_date.date() if isinstance(trip_date, datetime) else trip_date
+    _, ceo_balance = balances.post(CEO_CAPITAL, amount_in=net_profit, entry_date=trip_date)
+    return {
+        "date": trip_date,
+        "transaction_type": 'profit_allocation',
+        "description": f"Trip Profit: {reference_no} - {trip.category_product} ({trip.source_location} to {trip.destination_location})",
+        "amount_in": net_profit,
+        "amount_out": 0.0,
+        "balance": ceo_balance,
+        "reference_id": trip_id,
+        "reference_type": 'trip',
+        "created_by": current_user_id
+    }
+
+def _stage_trips(db: Session, trips: list, current_user_id: int, request: Optional[Request] = None) -> list:
+    """
+    Add trips plus their receivables, payables, CEO Capital allocations and
+    audit records to the session WITHOUT committing.
     
-    # SMART SYSTEM: Automatically create RECEIVABLE (Client owes Company)
-    try:
-        # Generate invoice number for receivable
-        invoice_number = f"INV-{db_trip.reference_no}-{datetime.now().strftime('%Y%m%d')}"
-        
-        receivable_data = schemas.ReceivableCreate(
-            client_id=trip.client_id,
-            trip_id=db_trip.id,
-            invoice_number=invoice_number,
-            description=f"Transportation service - {trip.category_product} from {trip.source_location} to {trip.destination_location}",
-            total_amount=trip.client_freight,  # Amount client owes to company
-            invoice_date=datetime.now(),
-            due_date=datetime.now() + timedelta(days=30),
-            payment_terms=30
-        )
-        
-        receivable = create_receivable(db, receivable_data, current_user_id)
-        
-        # Link receivable to trip
+    Rows are flushed per table (trips, then receivables/payables) so SQLAlchemy
+    can batch the INSERTs; the caller owns the single commit/rollback.
+    """
+    now = datetime.now()
+    
+    # 1. Trips with SMART calculations
+    db_trips = [models.Trip(**_trip_values(trip)) for trip in trips]
+    db.add_all(db_trips)
+    db.flush()  # Assign trip IDs
+    
+    # 2. RECEIVABLE (Client owes Company) and PAYABLE (Company owes Vendor)
+    receivables = []
+    payables = []
+    client_totals = {}
+    for db_trip, trip in zip(db_trips, trips):
+        receivable_values, payable_values = _trip_documents(trip, db_trip.id, db_trip.reference_no, current_user_id, now)
+        receivables.append(models.Receivable(**receivable_values))
+        payables.append(models.Payable(**payable_values))
+        client_totals[trip.client_id] = client_totals.get(trip.client_id, 0.0) + trip.client_freight
+    db.add_all(receivables)
+    db.add_all(payables)
+    db.flush()  # Assign receivable/payable IDs
+    
+    # Link receivable/payable to trip
+    for db_trip, receivable, payable in zip(db_trips, receivables, payables):
         db_trip.receivable_id = receivable.id
         db_trip.receivable_created = True
-        
-        print(f"✅ SMART SYSTEM: Created receivable {receivable.id} for PKR {trip.client_freight:,.2f}")
-        
-    except Exception as e:
-        print(f"❌ Warning: Failed to create receivable for trip {db_trip.id}: {e}")
-    
-    # SMART SYSTEM: Automatically create PAYABLE (Company owes Vendor)
-    try:
-        # Generate invoice number for payable
-        payable_invoice = f"PAY-{db_trip.reference_no}-{datetime.now().strftime('%Y%m%d')}"
-        
-        # Total amount to pay vendor includes vendor_freight + local_shifting_charges
-        total_payable_amount = trip.vendor_freight + (trip.local_shifting_charges or 0)
-        
-        payable_data = schemas.PayableCreate(
-            vendor_id=trip.vendor_id,
-            invoice_number=payable_invoice,
-            description=f"Vehicle hire - {trip.category_product} transport service (Freight: PKR {trip.vendor_freight:,.0f} + Local/Shifting: PKR {trip.local_shifting_charges or 0:,.0f})",
-            amount=total_payable_amount,  # Amount company owes to vendor (including local charges)
-            due_date=datetime.now() + timedelta(days=15),  # Shorter payment terms for vendors
-            status="pending"
-        )
-        
-        payable = create_payable(db, payable_data)
-        
-        # Link payable to trip
         db_trip.payable_id = payable.id
         db_trip.payable_created = True
-        
-        print(f"✅ SMART SYSTEM: Created payable {payable.id} for PKR {total_payable_amount:,.2f} (Freight: {trip.vendor_freight:,.0f} + Local/Shifting: {trip.local_shifting_charges or 0:,.0f})")
-        
-    except Exception as e:
-        print(f"❌ Warning: Failed to create payable for trip {db_trip.id}: {e}")
     
-    # SMART SYSTEM: Automatically allocate profit to CEO Capital
-    try:
-        if net_profit > 0:  # Only allocate if there's actual profit
-            # Get current CEO Capital balance
-            last_ceo_transaction = db.query(models.CEOCapital).order_by(
-                models.CEOCapital.date.desc(),
-                models.CEOCapital.id.desc()
-            ).first()
-            
-            current_balance = last_ceo_transaction.balance if last_ceo_transaction else 0.0
-            new_balance = current_balance + net_profit
-            
-            # Create CEO Capital profit allocation transaction
-            ceo_transaction = models.CEOCapital(
-                date=db_trip.trip_date,
-                transaction_type='profit_allocation',
-                description=f"Trip Profit: {db_trip.reference_no} - {trip.category_product} ({trip.source_location} to {trip.destination_location})",
-                amount_in=net_profit,
-                amount_out=0.0,
-                balance=new_balance,
-                reference_id=db_trip.id,
-                reference_type='trip',
-                created_by=current_user_id
+    # Update clients' current balance (one query for all clients in the batch)
+    clients = db.query(models.Client).filter(models.Client.id.in_(client_totals.keys())).all()
+    for client in clients:
+        client.current_balance = (client.current_balance or 0.0) + client_totals[client.id]
+    
+    # 3. Allocate profit to CEO Capital (only trips with actual profit)
+    balances = BalanceHeadService(db)
+    for db_trip, trip in zip(db_trips, trips):
+        allocation = _trip_profit_allocation(
+            balances, trip, db_trip.id, db_trip.reference_no, db_trip.date, db_trip.net_profit, current_user_id
+        )
+        if allocation:
+            db.add(models.CEOCapital(**allocation))
+    
+    # 4. AUDIT LOGGING (staged in the same transaction)
+    if request:
+        from audit_service import get_client_ip, get_user_agent
+        audit = AuditService(db)
+        ip_address = get_client_ip(request)
+        user_agent = get_user_agent(request)
+        for db_trip in db_trips:
+            audit.log_create(
+                user_id=current_user_id,
+                table_name="trips",
+                record_id=db_trip.id,
+                new_values={
+                    "reference_no": db_trip.reference_no,
+                    "client_freight": db_trip.client_freight,
+                    "vendor_freight": db_trip.vendor_freight,
+                    "gross_profit": db_trip.gross_profit,
+                    "net_profit": db_trip.net_profit
+                },
+                ip_address=ip_address,
+                user_agent=user_agent,
+                commit=False
             )
-            db.add(ceo_transaction)
-            db.flush()
-            
-            print(f"✅ SMART SYSTEM: Allocated profit PKR {net_profit:,.2f} to CEO Capital (New Balance: PKR {new_balance:,.2f})")
-        else:
-            print(f"⚠️ SMART SYSTEM: No profit to allocate (Net Profit: PKR {net_profit:,.2f})")
-            
-    except Exception as e:
-        print(f"❌ Warning: Failed to allocate profit to CEO Capital for trip {db_trip.id}: {e}")
     
-    # Final commit with all smart integrations
-    db.commit()
+    db.flush()
+    return db_trips
+
+def create_trip(db: Session, trip: schemas.TripCreate, current_user_id: int = 1, request: Optional[Request] = None):
+    """
+    SMART SYSTEM: One trip entry automatically creates:
+    1. Trip record with automatic profit calculations
+    2. Receivable (Client owes Company)
+    3. Payable (Company owes Vendor)
+    4. CEO Capital profit allocation and audit record
+    
+    Everything is written in ONE transaction: either all records are
+    committed or none are.
+    
+    Example: Vendor Freight = 30,000, Client Freight = 40,000, Company Profit = 10,000
+    """
+    try:
+        db_trip = _stage_trips(db, [trip], current_user_id, request)[0]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     db.refresh(db_trip)
     
     # SMART SYSTEM SUMMARY
     print(f"""
     🚀 SMART TRIP CREATED:
     📋 Trip: {db_trip.reference_no}
-    💰 Client Freight: PKR {trip.client_freight:,.2f}
-    💸 Vendor Freight: PKR {trip.vendor_freight:,.2f}
-    📈 Gross Profit: PKR {gross_profit:,.2f}
-    📊 Net Profit: PKR {net_profit:,.2f}
-    📋 Receivable: {'✅ Created' if db_trip.receivable_created else '❌ Failed'}
-    📋 Payable: {'✅ Created' if db_trip.payable_created else '❌ Failed'}
-    💼 CEO Capital: {'✅ Profit Allocated' if net_profit > 0 else '⚠️ No Profit'}
+    💰 Client Freight: PKR {db_trip.client_freight:,.2f}
+    💸 Vendor Freight: PKR {db_trip.vendor_freight:,.2f}
+    📈 Gross Profit: PKR {db_trip.gross_profit:,.2f}
+    📊 Net Profit: PKR {db_trip.net_profit:,.2f}
+    📋 Receivable: ✅ {db_trip.receivable_id}
+    📋 Payable: ✅ {db_trip.payable_id}
+    💼 CEO Capital: {'✅ Profit Allocated' if db_trip.net_profit > 0 else '⚠️ No Profit'}
     """)
     
     return db_trip
 
+def create_trips_bulk(
+    db: Session,
+    trips: list,
+    current_user_id: int = 1,
+    request: Optional[Request] = None,
+    batch_size: int = 500
+):
+    """
+    Bulk version of create_trip: same SMART side effects for many trips,
+    inserted in batches of `batch_size` and committed once.
+    """
+    db_trips = []
+    try:
+        for start in range(0, len(trips), batch_size):
+            db_trips.extend(_stage_trips(db, trips[start:start + batch_size], current_user_id, request))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    logger.info("Created %s trips with receivables and payables", len(db_trips))
+    return db_trips
+
 # Vehicle Log CRUD with Auto Calculations
 def create_vehicle_log(db: Session, log: schemas.VehicleLogCreate):
     # Auto Calculations
@@ -275,12 +349,28 @@ def create_ledger_entry(db: Session, ledger: schemas.LedgerEntryCreate):
     
     return db_ledger
 
+TRIP_LIST = Projection("TripRow", models.Trip, {
+    **entity_columns(
+        models.Trip,
+        "id", "date", "reference_no", "vehicle_id", "category_product", "source_location",
+        "destination_location", "driver_operator", "client_id", "vendor_id", "vendor_client",
+        "freight_mode", "total_tonnage", "tonnage", "rate_per_ton", "vendor_freight",
+        "client_freight", "local_shifting_charges", "advance_paid", "fuel_cost",
+        "munshiyana_bank_charges", "other_expenses", "gross_profit", "net_profit", "profit_margin",
+        "receivable_created", "payable_created", "receivable_id", "payable_id", "status", "notes",
+        "created_at", "updated_at", "completed_at"
+    ),
+    "client_name": models.Client.name,
+    "vendor_name": models.Vendor.name,
+    "vehicle_number": models.Vehicle.vehicle_no,
+}, joins=[
+    (models.Client, models.Trip.client_id == models.Client.id),
+    (models.Vendor, models.Trip.vendor_id == models.Vendor.id),
+    (models.Vehicle, models.Trip.vehicle_id == models.Vehicle.id),
+])
+
 def get_trips(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Trip).options(
-        joinedload(models.Trip.client),
-        joinedload(models.Trip.vendor),
-        joinedload(models.Trip.vehicle)
-    ).offset(skip).limit(limit).all()
+    return TRIP_LIST.fetch(db, TRIP_LIST.select().offset(skip).limit(limit))
 
 def get_monthly_trips(db: Session, year: int, month: int):
     return db.query(models.Trip).filter(
@@ -331,13 +421,15 @@ def create_payroll_entry(db: Session, payroll: schemas.PayrollEntryCreate):
     
     # Update staff advance balance and create ledger entry
     if advance_deduction > 0 and staff.advance_balance > 0:
-        current_balance = staff.advance_balance
-        new_balance = current_balance - advance_deduction
+        transaction_date = datetime.now()
+        current_balance, new_balance = BalanceHeadService(db).post(
+            STAFF_ADVANCE, amount_out=advance_deduction, entry_date=transaction_date, account_id=staff.id
+        )
         
         # Create ledger entry for recovery
         ledger_entry = models.StaffAdvanceLedger(
             staff_id=staff.id,
-            transaction_date=datetime.now(),
+            transaction_date=transaction_date,
             transaction_type='recovery',
             amount=-advance_deduction,  # Negative for recovery
             balance_after=new_balance,
@@ -451,8 +543,17 @@ def create_expense(db: Session, expense: schemas.ExpenseCreate, current_user_id:
     db.refresh(db_expense)
     return db_expense
 
+EXPENSE_LIST = Projection("ExpenseRow", models.Expense, {
+    **schema_columns(schemas.Expense, models.Expense),
+    "vehicle_no": models.Vehicle.vehicle_no,
+    "vendor_name": models.Vendor.name,
+}, joins=[
+    (models.Vehicle, models.Expense.vehicle_id == models.Vehicle.id),
+    (models.Vendor, models.Expense.vendor_id == models.Vendor.id),
+])
+
 def get_expenses(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Expense).offset(skip).limit(limit).all()
+    return EXPENSE_LIST.fetch(db, EXPENSE_LIST.select().offset(skip).limit(limit))
 
 def get_expense(db: Session, expense_id: int):
     return db.query(models.Expense).filter(models.Expense.id == expense_id).first()
@@ -480,16 +581,20 @@ def get_client(db: Session, client_id: int):
     return db.query(models.Client).filter(models.Client.id == client_id).first()
 
 # Receivable CRUD
-def create_receivable(db: Session, receivable: schemas.ReceivableCreate, current_user_id: int):
-    # Calculate remaining amount (initially equals total amount)
-    remaining_amount = receivable.total_amount
-    
-    db_receivable = models.Receivable(
+def _receivable_values(receivable: schemas.ReceivableCreate, current_user_id: int) -> dict:
+    # Remaining amount initially equals total amount
+    return {
         **receivable.model_dump(),
-        paid_amount=0.0,
-        remaining_amount=remaining_amount,
-        created_by=current_user_id
-    )
+        "paid_amount": 0.0,
+        "remaining_amount": receivable.total_amount,
+        "created_by": current_user_id
+    }
+
+def _new_receivable(receivable: schemas.ReceivableCreate, current_user_id: int) -> models.Receivable:
+    return models.Receivable(**_receivable_values(receivable, current_user_id))
+
+def create_receivable(db: Session, receivable: schemas.ReceivableCreate, current_user_id: int):
+    db_receivable = _new_receivable(receivable, current_user_id)
     db.add(db_receivable)
     db.commit()
     db.refresh(db_receivable)
@@ -502,15 +607,113 @@ def create_receivable(db: Session, receivable: schemas.ReceivableCreate, current
     
     return db_receivable
 
+RECEIVABLE_LIST = Projection("ReceivableRow", models.Receivable, {
+    **schema_columns(schemas.Receivable, models.Receivable),
+    **schema_columns(schemas.Client, models.Client, prefix="client."),
+}, joins=[
+    (models.Client, models.Receivable.client_id == models.Client.id),
+])
+
 def get_receivables(db: Session, skip: int = 0, limit: int = 100, client_id: int = None, status: str = None):
-    query = db.query(models.Receivable).options(
-        joinedload(models.Receivable.client)
+    query = RECEIVABLE_LIST.select()
+    if client_id:
+        query = query.where(models.Receivable.client_id == client_id)
+    if status:
+        query = query.where(models.Receivable.status == status)
+    return RECEIVABLE_LIST.fetch(db, query.order_by(models.Receivable.created_at.desc()).offset(skip).limit(limit))
+
+RECEIVABLE_SORTS = {
+    "due_date": models.Receivable.due_date,
+    "invoice_date": models.Receivable.invoice_date,
+    "total_amount": models.Receivable.total_amount,
+    "remaining_amount": models.Receivable.remaining_amount,
+    # Creation order; created_at is not used as its SQLite server default drops the microseconds Python values keep
+    "id": models.Receivable.id,
+}
+
+def _day_range(column, from_date: Optional[date], to_date: Optional[date]):
+    # Both ends inclusive
+    conditions = []
+    if from_date:
+        conditions.append(column >= datetime.combine(from_date, datetime.min.time()))
+    if to_date:
+        conditions.append(column < datetime.combine(to_date + timedelta(days=1), datetime.min.time()))
+    return conditions
+
+def _receivable_overdue(now: datetime):
+    receivable = models.Receivable
+    return and_(
+        receivable.due_date < now,
+        receivable.remaining_amount > 0,
+        receivable.status.notin_([models.ReceivableStatus.PAID, models.ReceivableStatus.CANCELLED])
     )
+
+def receivable_filters(
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    overdue_only: bool = False,
+    outstanding_only: bool = False,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None
+) -> list:
+    """
+    WHERE conditions for receivable lists and totals
+    
+    status is comma-separated, by value or name ("pending,partially_paid");
+    the amount range applies to total_amount.
+    """
+    receivable = models.Receivable
+    conditions = _day_range(receivable.due_date, due_from, due_to)
     if client_id:
-        query = query.filter(models.Receivable.client_id == client_id)
+        conditions.append(receivable.client_id == client_id)
     if status:
-        query = query.filter(models.Receivable.status == status)
-    return query.order_by(models.Receivable.created_at.desc()).offset(skip).limit(limit).all()
+        statuses = []
+        for value in status.split(","):
+            value = value.strip()
+            member = next((m for m in models.ReceivableStatus if value in (m.value, m.name)), None)
+            if member is None:
+                raise ValueError(f"Unknown receivable status '{value}'")
+            statuses.append(member)
+        conditions.append(receivable.status.in_(statuses))
+    if overdue_only:
+        conditions.append(_receivable_overdue(datetime.now()))
+    if outstanding_only:
+        conditions.append(receivable.remaining_amount > 0)
+    if min_amount is not None:
+        conditions.append(receivable.total_amount >= min_amount)
+    if max_amount is not None:
+        conditions.append(receivable.total_amount <= max_amount)
+    return conditions
+
+def receivables_page(db: Session, conditions: list, sort: str = "due_date", descending: bool = False,
+                     cursor: Optional[str] = None, limit: int = 100):
+    """Keyset page of RECEIVABLE_LIST rows: {"items": [...], "next_cursor": ...}"""
+    if sort not in RECEIVABLE_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(RECEIVABLE_SORTS)}")
+    return fetch_page(
+        db, RECEIVABLE_LIST, RECEIVABLE_LIST.select().where(*conditions),
+        RECEIVABLE_SORTS[sort], models.Receivable.id, descending, cursor, limit
+    )
+
+def receivable_totals(db: Session, conditions: list) -> dict:
+    """Count and amount totals of every receivable matching the conditions, in one query"""
+    receivable = models.Receivable
+    count, total, paid, remaining, overdue = db.query(
+        func.count(receivable.id),
+        func.coalesce(func.sum(receivable.total_amount), 0.0),
+        func.coalesce(func.sum(receivable.paid_amount), 0.0),
+        func.coalesce(func.sum(receivable.remaining_amount), 0.0),
+        func.coalesce(func.sum(case((_receivable_overdue(datetime.now()), receivable.remaining_amount), else_=0.0)), 0.0)
+    ).filter(*conditions).one()
+    return {
+        "count": count,
+        "total_amount": float(total),
+        "paid_amount": float(paid),
+        "remaining_amount": float(remaining),
+        "overdue_amount": float(overdue),
+    }
 
 def get_receivable(db: Session, receivable_id: int):
     return db.query(models.Receivable).options(
@@ -606,20 +809,102 @@ def create_receivable_from_trip(db: Session, trip: models.Trip, current_user_id:
     return receivable
 
 # Payable CRUD
-def create_payable(db: Session, payable: schemas.PayableCreate):
-    db_payable = models.Payable(
+def _payable_values(payable: schemas.PayableCreate) -> dict:
+    return {
         **payable.model_dump(),
-        outstanding_amount=payable.amount  # Initially, outstanding = total amount
-    )
+        "outstanding_amount": payable.amount  # Initially, outstanding = total amount
+    }
+
+def _new_payable(payable: schemas.PayableCreate) -> models.Payable:
+    return models.Payable(**_payable_values(payable))
+
+def create_payable(db: Session, payable: schemas.PayableCreate):
+    db_payable = _new_payable(payable)
     db.add(db_payable)
     db.commit()
     db.refresh(db_payable)
     return db_payable
 
+PAYABLE_LIST = Projection("PayableRow", models.Payable, {
+    **schema_columns(schemas.Payable, models.Payable),
+    **schema_columns(schemas.Vendor, models.Vendor, prefix="vendor."),
+}, joins=[
+    (models.Vendor, models.Payable.vendor_id == models.Vendor.id),
+])
+
 def get_payables(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Payable).options(
-        joinedload(models.Payable.vendor)
-    ).offset(skip).limit(limit).all()
+    return PAYABLE_LIST.fetch(db, PAYABLE_LIST.select().offset(skip).limit(limit))
+
+PAYABLE_SORTS = {
+    "due_date": models.Payable.due_date,
+    "amount": models.Payable.amount,
+    "outstanding_amount": models.Payable.outstanding_amount,
+    "id": models.Payable.id,  # Creation order
+}
+
+# Payables created before outstanding_amount existed owe their full amount
+PAYABLE_OUTSTANDING = func.coalesce(models.Payable.outstanding_amount, models.Payable.amount)
+
+def _payable_overdue(now: datetime):
+    return and_(
+        models.Payable.due_date < now,
+        PAYABLE_OUTSTANDING > 0,
+        models.Payable.status != "paid"
+    )
+
+def payable_filters(
+    vendor_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    overdue_only: bool = False,
+    outstanding_only: bool = False,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None
+) -> list:
+    """WHERE conditions for payable lists and totals; status is comma-separated, the amount range applies to amount"""
+    payable = models.Payable
+    conditions = _day_range(payable.due_date, due_from, due_to)
+    if vendor_id:
+        conditions.append(payable.vendor_id == vendor_id)
+    if status:
+        conditions.append(payable.status.in_([value.strip() for value in status.split(",")]))
+    if overdue_only:
+        conditions.append(_payable_overdue(datetime.now()))
+    if outstanding_only:
+        conditions.append(PAYABLE_OUTSTANDING > 0)
+    if min_amount is not None:
+        conditions.append(payable.amount >= min_amount)
+    if max_amount is not None:
+        conditions.append(payable.amount <= max_amount)
+    return conditions
+
+def payables_page(db: Session, conditions: list, sort: str = "due_date", descending: bool = False,
+                  cursor: Optional[str] = None, limit: int = 100):
+    """Keyset page of PAYABLE_LIST rows: {"items": [...], "next_cursor": ...}"""
+    if sort not in PAYABLE_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(PAYABLE_SORTS)}")
+    return fetch_page(
+        db, PAYABLE_LIST, PAYABLE_LIST.select().where(*conditions),
+        PAYABLE_SORTS[sort], models.Payable.id, descending, cursor, limit
+    )
+
+def payable_totals(db: Session, conditions: list) -> dict:
+    """Count and amount totals of every payable matching the conditions, in one query"""
+    payable = models.Payable
+    count, total, outstanding, overdue = db.query(
+        func.count(payable.id),
+        func.coalesce(func.sum(payable.amount), 0.0),
+        func.coalesce(func.sum(PAYABLE_OUTSTANDING), 0.0),
+        func.coalesce(func.sum(case((_payable_overdue(datetime.now()), PAYABLE_OUTSTANDING), else_=0.0)), 0.0)
+    ).filter(*conditions).one()
+    return {
+        "count": count,
+        "amount": float(total),
+        "outstanding_amount": float(outstanding),
+        "paid_amount": float(total - outstanding),
+        "overdue_amount": float(overdue),
+    }
 
 def get_payable(db: Session, payable_id: int):
     return db.query(models.Payable).options(
@@ -1,25 +1,281 @@
-from sqlalchemy import create_engine
+"""
+Database
+Engine, session factory and the get_db dependency.
+
+create_db_engine() builds every engine in the app (the worker processes of
+the reconciliation service included) so pool settings and SQLite pragmas
+are applied the same way everywhere.
+
+Configuration (environment variables):
+    DB_POOL_SIZE            Connections kept open (default: 5)
+    DB_MAX_OVERFLOW         Extra connections allowed under load (default: 10)
+    DB_POOL_TIMEOUT         Seconds to wait for a free connection (default: 30)
+    DB_POOL_RECYCLE         Reopen connections older than this many seconds (default: 1800)
+    DB_POOL_PRE_PING        Test connections on checkout (default: true, false on SQLite)
+    SQLITE_PRAGMA_PROFILE   wal, safe or none (default: wal); see SQLITE_PROFILES
+    SQLITE_BUSY_TIMEOUT_MS  Wait this long for a locked database before failing (default: 5000)
+    SQLITE_CACHE_SIZE_KB    Page cache per connection (default: 65536)
+    DATABASE_REPLICA_URL    Read replica for reporting reads via get_read_db (default: none)
+    DB_REPLICA_MAX_LAG      Seconds of replication lag tolerated before reads go to the primary (default: 30)
+    DB_REPLICA_CHECK_INTERVAL  Seconds between replica health/lag checks (default: 5)
+"""
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+import logging
 import os
+import threading
+import time
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get the directory where this file is located (backend directory)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "pgt_tms.db")
 
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}")
+REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+SQLITE_PRAGMA_PROFILE = os.getenv("SQLITE_PRAGMA_PROFILE", "wal")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "30"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+
+# Pragmas run on every new SQLite connection. WAL lets readers run alongside
+# the single writer; busy_timeout makes a second writer wait for the lock
+# instead of failing with "database is locked".
+SQLITE_PROFILES = {
+    # Durable across process crashes; a power cut can lose the last commits
+    "wal": [
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        f"busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        "temp_store=MEMORY",
+    ],
+    # WAL with an fsync on every commit
+    "safe": [
+        "journal_mode=WAL",
+        "synchronous=FULL",
+        f"busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"cache_size=-{SQLITE_CACHE_SIZE_KB}",
+    ],
+    # SQLite defaults (rollback journal)
+    "none": [],
+}
+
+
+class PoolMetrics:
+    """Checkout counters of one pool: how often and how long requests waited for a connection"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that times every checkout, including the wait for a free connection"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+def _sqlite_pragmas(pragmas):
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+    return apply
+
 
-# For SQLite, we need to enable foreign keys and use check_same_thread=False
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+def create_db_engine(url: str = DATABASE_URL, **engine_kwargs):
+    """
+    Engine with the configured pool and, for SQLite, the pragma profile.
+    Keyword arguments are passed to create_engine and override the defaults
+    (e.g. poolclass=NullPool for short-lived worker processes).
+    """
+    parsed = make_url(url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and parsed.database in (None, "", ":memory:")
+    
+    options = {}
+    if not in_memory:
+        # In-memory SQLite keeps its single-connection pool
+        options.update(
+            poolclass=MeteredQueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            pool_recycle=POOL_RECYCLE,
+            pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "false" if is_sqlite else "true").lower() == "true",
+        )
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    options.update(engine_kwargs)
+    if options.get("poolclass") not in (None, MeteredQueuePool, QueuePool):
+        for key in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(key, None)
+            
+    new_engine = create_engine(url, **options)
+    
+    if is_sqlite and not in_memory:
+        if SQLITE_PRAGMA_PROFILE not in SQLITE_PROFILES:
+            raise ValueError(f"SQLITE_PRAGMA_PROFILE must be one of: {', '.join(SQLITE_PROFILES)}")
+        pragmas = SQLITE_PROFILES[SQLITE_PRAGMA_PROFILE]
+        if pragmas:
+            event.listen(new_engine, "connect", _sqlite_pragmas(pragmas))
+    return new_engine
+
+
+def pool_metrics(target_engine=None) -> dict:
+    """Current pool occupancy and checkout wait statistics"""
+    pool = (target_engine or engine).pool
+    result = {
+        "pool_class": type(pool).__name__,
+        "status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        result.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, MeteredQueuePool):
+        result.update(pool.metrics.snapshot())
+    return result
+
+
+class ReplicaRouter:
+    """
+    Decides whether reads may use the replica: it must answer and lag the
+    primary by at most max_lag seconds. The verdict is cached for
+    check_interval seconds so requests do not each pay for a lag query.
+    """
+    
+    def __init__(self, replica_engine, max_lag: float = REPLICA_MAX_LAG,
+                 check_interval: float = REPLICA_CHECK_INTERVAL):
+        self.engine = replica_engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._usable = False
+        self._lag: Optional[float] = None
+        self._error: Optional[str] = None
+        
+    def measure_lag(self) -> float:
+        """Seconds the replica is behind the primary"""
+        with self.engine.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                # An idle primary ages the replay timestamp, so a fully replayed replica counts as current
+                return float(connection.execute(text(
+                    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+                    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )).scalar())
+            # Other backends (a local SQLite copy standing in for a replica) report no lag
+            connection.execute(text("SELECT 1"))
+            return 0.0
+            
+    def usable(self) -> bool:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._usable
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return self._usable
+            was_usable = self._usable
+            try:
+                self._lag = self.measure_lag()
+                self._error = None
+                self._usable = self._lag <= self.max_lag
+            except Exception as e:
+                self._lag = None
+                self._error = str(e)
+                self._usable = False
+            self._checked_at = time.monotonic()
+            if was_usable != self._usable:
+                if self._usable:
+                    logger.info("Read replica in use (lag %.1fs)", self._lag)
+                else:
+                    logger.warning("Reads fall back to the primary: %s",
+                                   self._error or f"replica lag {self._lag:.1f}s exceeds {self.max_lag}s")
+            return self._usable
+            
+    def status(self) -> dict:
+        usable = self.usable()
+        return {
+            "usable": usable,
+            "lag_seconds": self._lag,
+            "max_lag_seconds": self.max_lag,
+            "error": self._error,
+        }
+
+
+def _reject_writes(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("Sessions on the read replica cannot write; depend on get_db instead of get_read_db")
+
+
+engine = create_db_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engine = create_db_engine(REPLICA_URL) if REPLICA_URL else None
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+replica_router = ReplicaRouter(replica_engine) if replica_engine else None
+if ReplicaSessionLocal is not None:
+    event.listen(ReplicaSessionLocal, "before_flush", _reject_writes)
+
 Base = declarative_base()
 
 def get_db():
@@ -27,4 +283,15 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """Session for read-only endpoints: the replica when configured and current, else the primary"""
+    if replica_router is not None and replica_router.usable():
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,352 @@
+"""
+Document Bundle Service
+Month-end document packs (payslips, staff recovery statements, client ledger
+statements) as a ZIP of per-document PDFs or as one merged PDF.
+
+A ZIP streams: each document is rendered, written and sent before the next
+one starts. A merged PDF cannot be sent before its last page is laid out (the
+trailer needs every object offset), so it is written to a spooled temporary
+file, which moves to disk past BUNDLE_SPOOL_MAX_MEMORY, and sent from there.
+ReportLab still keeps the compressed pages of the merged document until it
+is saved.
+
+Configuration (environment variables):
+    BUNDLE_SPOOL_MAX_MEMORY  Bytes of merged PDF held in memory before spooling to disk (default: 8388608)
+"""
+import calendar
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+from sqlalchemy.orm import Session
+
+import models
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMATS = ('zip', 'pdf')
+
+BUNDLE_MEDIA_TYPES = {
+    'zip': 'application/zip',
+    'pdf': 'application/pdf'
+}
+
+# Send merged-PDF output to the client in pieces of this size
+STREAM_CHUNK_SIZE = 64 * 1024
+
+SPOOL_MAX_MEMORY = int(os.getenv("BUNDLE_SPOOL_MAX_MEMORY", str(8 * 1024 * 1024)))
+
+
+class BundleDocument(NamedTuple):
+    """One document in a bundle; nothing is rendered until the bundle is streamed"""
+    filename: str
+    build_story: Callable[[], List]
+    render: Callable[[], object]
+
+
+class _StreamSink:
+    """Write-only file object; zipfile writes into it and we drain it between documents"""
+    
+    def __init__(self):
+        self._chunks = []
+        
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+        
+    def flush(self):
+        pass
+        
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _StoryStream(list):
+    """
+    Flowable list for a single merged build that pulls the next document's
+    story only when the previous one has been laid out, so at most one
+    document's flowables are alive at a time
+    """
+    
+    def __init__(self, documents: Iterable[BundleDocument], report: Dict):
+        super().__init__()
+        self._documents = iter(documents)
+        self._report = report
+        self._started = False
+        self._finished = False
+        
+    def __len__(self):
+        while not list.__len__(self) and not self._finished:
+            self._pull()
+        return list.__len__(self)
+        
+    def _pull(self):
+        document = next(self._documents, None)
+        if document is None:
+            self._finished = True
+            if self._report['errors']:
+                self.extend(_error_page(self._report, self._started))
+            return
+        try:
+            story = document.build_story()
+        except Exception as e:
+            _record_failure(self._report, document, e)
+            return
+        if self._started:
+            self.append(PageBreak())
+        self.extend(story)
+        self._started = True
+        self._report['generated'] += 1
+
+
+def _record_failure(report: Dict, document: BundleDocument, error: Exception):
+    logger.warning("Bundle document %s failed: %s", document.filename, error)
+    report['failed'] += 1
+    report['errors'].append({'document': document.filename, 'error': str(error)})
+
+
+def _error_page(report: Dict, started: bool) -> List:
+    from pdf_assets import get_pdf_assets
+    
+    styles = get_pdf_assets().styles
+    elements = [PageBreak()] if started else []
+    elements.append(Paragraph('Documents that could not be generated', styles['SectionHeader']))
+    elements.append(Spacer(1, 0.1*inch))
+    for error in report['errors']:
+        elements.append(Paragraph(f"<b>{error['document']}</b>: {error['error']}", styles['Normal']))
+    return elements
+
+
+def stream_bundle(documents: Iterable[BundleDocument], bundle_format: str = 'zip', title: str = 'Documents') -> Iterator[bytes]:
+    """
+    Render documents one at a time and yield the bundle bytes: a ZIP as each
+    document is done, a merged PDF once the whole file is built. Documents that fail are skipped and listed in the bundle (bundle_errors.json
+    in a ZIP, a final page in a merged PDF) because the response has already started.
+    """
+    if bundle_format == 'zip':
+        return _stream_zip(documents)
+    if bundle_format == 'pdf':
+        return _stream_merged_pdf(documents, title)
+    raise ValueError(f"Unsupported bundle format '{bundle_format}'; use one of {', '.join(BUNDLE_FORMATS)}")
+
+
+def _stream_zip(documents: Iterable[BundleDocument]) -> Iterator[bytes]:
+    report = {'generated': 0, 'failed': 0, 'errors': []}
+    sink = _StreamSink()
+    
+    # Generated PDFs are already deflate-compressed, so store them as-is
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for document in documents:
+            try:
+                pdf_buffer = document.render()
+            except Exception as e:
+                _record_failure(report, document, e)
+                continue
+                
+            archive.writestr(document.filename, pdf_buffer.getvalue())
+            pdf_buffer.close()
+            report['generated'] += 1
+            yield sink.drain()
+            
+        if report['errors']:
+            archive.writestr('bundle_errors.json', json.dumps(report, indent=2))
+            
+    logger.info("ZIP bundle finished: %s generated, %s failed", report['generated'], report['failed'])
+    yield sink.drain()
+
+
+def _stream_merged_pdf(documents: Iterable[BundleDocument], title: str) -> Iterator[bytes]:
+    report = {'generated': 0, 'failed': 0, 'errors': []}
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    
+    doc = SimpleDocTemplate(
+        spool,
+        pagesize=letter,
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.4*inch,
+        bottomMargin=0.4*inch,
+        title=title,
+        pageCompression=1
+    )
+    with spool:
+        # Pages are laid out document by document; the PDF trailer needs every
+        # object offset, so bytes can only be sent once the last page is done.
+        doc.build(_StoryStream(documents, report))
+        
+        logger.info("Merged PDF bundle finished: %s generated, %s failed", report['generated'], report['failed'])
+        spool.seek(0)
+        while True:
+            data = spool.read(STREAM_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+
+
+def bundle_response(documents: List[BundleDocument], bundle_format: str, basename: str) -> StreamingResponse:
+    """Send a list of BundleDocuments as a ZIP or a merged PDF download"""
+    if bundle_format not in BUNDLE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"bundle format must be one of: {', '.join(BUNDLE_FORMATS)}")
+    
+    return StreamingResponse(
+        stream_bundle(documents, bundle_format, title=basename.replace('_', ' ')),
+        media_type=BUNDLE_MEDIA_TYPES[bundle_format],
+        headers={"Content-Disposition": f"attachment; filename={basename}.{bundle_format}"}
+    )
+
+
+def _safe_name(value) -> str:
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(value or 'unknown')).strip('_') or 'unknown'
+
+
+def parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    """Parse a comma-separated id list from a query string"""
+    if not ids:
+        return None
+    try:
+        return [int(part) for part in ids.split(',') if part.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid id list '{ids}'; expected comma-separated integers")
+
+
+class DocumentBundleService:
+    """
+    Collects the data for a bundle up front (a handful of set-based queries) and
+    returns lazily rendered BundleDocuments, so rendering can run while the
+    response streams without holding the database session
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        
+    def payslip_documents(self, month: int, year: int, folder: str = '') -> List[BundleDocument]:
+        from payslip_generator import payslip_generator
+        
+        rows = self.db.query(models.PayrollEntry, models.Staff).join(
+            models.Staff, models.PayrollEntry.staff_id == models.Staff.id
+        ).filter(
+            models.PayrollEntry.month == month,
+            models.PayrollEntry.year == year
+        ).order_by(models.Staff.name).all()
+        
+        documents = []
+        for payroll, staff in rows:
+            staff_data, payroll_data = payslip_generator.payslip_data(staff, payroll)
+            documents.append(BundleDocument(
+                filename=f"{folder}payslip_{_safe_name(staff.employee_id)}_{year}_{month:02d}.pdf",
+                build_story=lambda s=staff_data, p=payroll_data: payslip_generator.build_payslip_story(s, p),
+                render=lambda s=staff_data, p=payroll_data: payslip_generator.generate_payslip_pdf(s, p)
+            ))
+        return documents
+        
+    def staff_statement_documents(self, staff_ids: Optional[List[int]] = None, folder: str = '') -> List[BundleDocument]:
+        from staff_ledger_generator import staff_ledger_generator
+        
+        staff_query = self.db.query(models.Staff).filter(models.Staff.is_active == True)
+        if staff_ids:
+            staff_query = staff_query.filter(models.Staff.id.in_(staff_ids))
+        staff_members = staff_query.order_by(models.Staff.name).all()
+        if not staff_members:
+            return []
+            
+        ledger_by_staff = {staff.id: [] for staff in staff_members}
+        ledger_rows = self.db.query(models.StaffAdvanceLedger).filter(
+            models.StaffAdvanceLedger.staff_id.in_(list(ledger_by_staff))
+        ).order_by(models.StaffAdvanceLedger.transaction_date, models.StaffAdvanceLedger.id).all()
+        for entry in ledger_rows:
+            ledger_by_staff[entry.staff_id].append(entry)
+            
+        documents = []
+        for staff in staff_members:
+            staff_data, transactions = staff_ledger_generator.statement_data(staff, ledger_by_staff[staff.id])
+            documents.append(BundleDocument(
+                filename=f"{folder}staff_statement_{_safe_name(staff.employee_id)}.pdf",
+                build_story=lambda s=staff_data, t=transactions: staff_ledger_generator.build_recovery_statement_story(s, t),
+                render=lambda s=staff_data, t=transactions: staff_ledger_generator.generate_staff_recovery_statement(s, t)
+            ))
+        return documents
+        
+    def client_statement_documents(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        client_ids: Optional[List[int]] = None,
+        folder: str = ''
+    ) -> List[BundleDocument]:
+        from client_statement_generator import client_statement_generator
+        
+        client_query = self.db.query(models.Client).filter(models.Client.is_active == True)
+        if client_ids:
+            client_query = client_query.filter(models.Client.id.in_(client_ids))
+        clients = client_query.order_by(models.Client.name).all()
+        if not clients:
+            return []
+        ids = [client.id for client in clients]
+        
+        receivable_query = self.db.query(models.Receivable).filter(models.Receivable.client_id.in_(ids))
+        collection_query = self.db.query(models.Collection).filter(models.Collection.client_id.in_(ids))
+        opening = {client_id: 0.0 for client_id in ids}
+        
+        if start_date:
+            from period_close import PeriodCloseService, CLIENT
+            
+            opening = PeriodCloseService(self.db).opening_balances(CLIENT, start_date, ids)
+            
+            receivable_query = receivable_query.filter(models.Receivable.invoice_date >= start_date)
+            collection_query = collection_query.filter(models.Collection.collection_date >= start_date)
+        if end_date:
+            receivable_query = receivable_query.filter(models.Receivable.invoice_date <= end_date)
+            collection_query = collection_query.filter(models.Collection.collection_date <= end_date)
+            
+        receivables_by_client = {client_id: [] for client_id in ids}
+        collections_by_client = {client_id: [] for client_id in ids}
+        receivables = receivable_query.all()
+        for receivable in receivables:
+            receivables_by_client[receivable.client_id].append(receivable)
+        for collection in collection_query.all():
+            collections_by_client[collection.client_id].append(collection)
+            
+        trip_ids = {r.trip_id for r in receivables if r.trip_id}
+        trip_refs = dict(
+            self.db.query(models.Trip.id, models.Trip.reference_no).filter(models.Trip.id.in_(trip_ids)).all()
+        ) if trip_ids else {}
+        
+        period = client_statement_generator.format_period(start_date, end_date)
+        documents = []
+        for client in clients:
+            client_data, entries = client_statement_generator.statement_data(
+                client,
+                receivables_by_client[client.id],
+                collections_by_client[client.id],
+                trip_refs=trip_refs,
+                opening_balance=opening[client.id],
+                period=period
+            )
+            documents.append(BundleDocument(
+                filename=f"{folder}client_statement_{_safe_name(client.client_code or client.id)}.pdf",
+                build_story=lambda c=client_data, e=entries: client_statement_generator.build_client_statement_story(c, e),
+                render=lambda c=client_data, e=entries: client_statement_generator.generate_client_statement(c, e)
+            ))
+        return documents
+        
+    def month_end_documents(self, month: int, year: int) -> List[BundleDocument]:
+        """Payslips, staff recovery statements and client statements for one month"""
+        start_date = datetime(year, month, 1)
+        end_date = datetime(year, month, calendar.monthrange(year, month)[1], 23, 59, 59)
+        
+        return (
+            self.payslip_documents(month, year, folder='payslips/')
+            + self.staff_statement_documents(folder='staff_statements/')
+            + self.client_statement_documents(start_date, end_date, folder='client_statements/')
+        )
@@ -3,17 +3,13 @@ Enhanced Invoice Generator Service
 Modern, elegant, professional invoice generation with complete trip details
 """
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT, TA_JUSTIFY
-from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from datetime import datetime
 from io import BytesIO
-from typing import Optional, Dict, List
-import os
-from pathlib import Path
+from typing import Optional, Dict
+from pdf_assets import get_pdf_assets
 
 class EnhancedInvoiceGenerator:
     def __init__(self):
@@ -35,10 +31,8 @@ class EnhancedInvoiceGenerator:
             }
         }
         
-        # Logo path (if exists)
-        self.logo_path = Path("backend/static/logo.png")
-        if not self.logo_path.exists():
-            self.logo_path = None
+        # Styles and logo from the shared registry
+        self.assets = get_pdf_assets()
     
     def generate_detailed_invoice_pdf(
         self,
@@ -63,7 +57,7 @@ class EnhancedInvoiceGenerator:
         )
         
         elements = []
-        styles = getSampleStyleSheet()
+        styles = self.assets.styles
         
         # ============================================
         # MODERN HEADER WITH LOGO
@@ -72,27 +66,23 @@ class EnhancedInvoiceGenerator:
         # Create header table with logo and company info
         header_data = []
         
-        if self.logo_path and self.logo_path.exists():
+        if self.assets.logo:
             # With logo
-            logo = Image(str(self.logo_path), width=1.2*inch, height=1.2*inch)
+            logo = self.assets.logo_image(1.2*inch, 1.2*inch)
             company_info_text = f"""
             <font size=16 color="#1e40af"><b>{self.company_info['name']}</b></font><br/>
             <font size=8 color="#64748b"><i>{self.company_info['tagline']}</i></font>
             """
             header_data = [[logo, Paragraph(company_info_text, styles['Normal'])]]
             header_table = Table(header_data, colWidths=[1.5*inch, 5.5*inch])
-            header_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ]))
+            header_table.setStyle(self.assets.table_style('logo_header'))
         else:
             # Without logo - just company name
             company_header = f"""
             <font size=18 color="#1e40af"><b>{self.company_info['name']}</b></font><br/>
             <font size=9 color="#64748b"><i>{self.company_info['tagline']}</i></font>
             """
-            header_table = Paragraph(company_header, ParagraphStyle('CompanyHeader', alignment=TA_CENTER))
+            header_table = Paragraph(company_header, styles['AlignCenter'])
         
         elements.append(header_table)
         elements.append(Spacer(1, 0.1*inch))
@@ -124,11 +114,11 @@ class EnhancedInvoiceGenerator:
         invoice_header_data = [
             [
                 Paragraph('<font size=16 color="#1e40af"><b>TRANSPORTATION INVOICE</b></font>', 
-                         ParagraphStyle('InvTitle', alignment=TA_LEFT)),
+                         styles['AlignLeft']),
                 Paragraph(f'<font size=10 color="#1e40af"><b>Invoice #: {invoice_data["invoice_number"]}</b></font><br/>'
                          f'<font size=8 color="#64748b">Date: {invoice_data["invoice_date"]}<br/>'
                          f'Due: {invoice_data["due_date"]}</font>', 
-                         ParagraphStyle('InvInfo', alignment=TA_RIGHT))
+                         styles['AlignRight'])
             ]
         ]
         
@@ -193,9 +183,9 @@ class EnhancedInvoiceGenerator:
         charges_data = [
             [
                 Paragraph('<font size=9 color="white"><b>DESCRIPTION</b></font>', styles['Normal']),
-                Paragraph('<font size=9 color="white"><b>QTY</b></font>', ParagraphStyle('Center', alignment=TA_CENTER)),
-                Paragraph('<font size=9 color="white"><b>RATE</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph('<font size=9 color="white"><b>AMOUNT</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                Paragraph('<font size=9 color="white"><b>QTY</b></font>', styles['AlignCenter']),
+                Paragraph('<font size=9 color="white"><b>RATE</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>AMOUNT</b></font>', styles['AlignRight'])
             ]
         ]
         
@@ -215,9 +205,9 @@ class EnhancedInvoiceGenerator:
         
         charges_data.append([
             Paragraph(f'<font size=8>{service_desc}</font>', styles['Normal']),
-            Paragraph(f'<font size=8>{qty_text}</font>', ParagraphStyle('Center', alignment=TA_CENTER)),
-            Paragraph(f'<font size=8>{rate_text}</font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-            Paragraph(f'<font size=8><b>PKR {amount:,.2f}</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+            Paragraph(f'<font size=8>{qty_text}</font>', styles['AlignCenter']),
+            Paragraph(f'<font size=8>{rate_text}</font>', styles['AlignRight']),
+            Paragraph(f'<font size=8><b>PKR {amount:,.2f}</b></font>', styles['AlignRight'])
         ])
         
         charges_table = Table(charges_data, colWidths=[3.8*inch, 1*inch, 1.2*inch, 1.2*inch])
@@ -250,26 +240,26 @@ class EnhancedInvoiceGenerator:
         total_amount = subtotal + tax_amount - discount_amount
         
         totals_data = [
-            ['', '', Paragraph('<font size=9><b>Subtotal:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)), 
-             Paragraph(f'<font size=9>PKR {subtotal:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))],
+            ['', '', Paragraph('<font size=9><b>Subtotal:</b></font>', styles['AlignRight']), 
+             Paragraph(f'<font size=9>PKR {subtotal:,.2f}</font>', styles['AlignRight'])],
         ]
         
         if tax_amount > 0:
             totals_data.append([
-                '', '', Paragraph('<font size=9><b>Tax:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph(f'<font size=9>PKR {tax_amount:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                '', '', Paragraph('<font size=9><b>Tax:</b></font>', styles['AlignRight']),
+                Paragraph(f'<font size=9>PKR {tax_amount:,.2f}</font>', styles['AlignRight'])
             ])
         
         if discount_amount > 0:
             totals_data.append([
-                '', '', Paragraph('<font size=9><b>Discount:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph(f'<font size=9>- PKR {discount_amount:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                '', '', Paragraph('<font size=9><b>Discount:</b></font>', styles['AlignRight']),
+                Paragraph(f'<font size=9>- PKR {discount_amount:,.2f}</font>', styles['AlignRight'])
             ])
         
         totals_data.append([
             '', '', 
-            Paragraph('<font size=11 color="#1e40af"><b>TOTAL AMOUNT:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-            Paragraph(f'<font size=11 color="#1e40af"><b>PKR {total_amount:,.2f}</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+            Paragraph('<font size=11 color="#1e40af"><b>TOTAL AMOUNT:</b></font>', styles['AlignRight']),
+            Paragraph(f'<font size=11 color="#1e40af"><b>PKR {total_amount:,.2f}</b></font>', styles['AlignRight'])
         ])
         
         totals_table = Table(totals_data, colWidths=[3.8*inch, 1*inch, 1.2*inch, 1.2*inch])
@@ -355,7 +345,7 @@ class EnhancedInvoiceGenerator:
         Generated: {datetime.now().strftime('%d-%b-%Y %I:%M %p')}
         </font>
         """
-        elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
         
         # Build PDF
         doc.build(elements)
@@ -412,28 +402,11 @@ class EnhancedInvoiceGenerator:
         
         # Container for elements
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=26,
-            textColor=colors.HexColor('#dc2626'),
-            spaceAfter=4,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
+        styles = self.assets.styles
         
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#6b7280'),
-            spaceAfter=8,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Oblique'
-        )
+        # Shared document styles
+        title_style = styles['ClassicInvoiceCompanyTitle']
+        subtitle_style = styles['ClassicInvoiceCompanySubtitle']
         
         # ============================================
         # COMPANY HEADER
@@ -454,9 +427,7 @@ class EnhancedInvoiceGenerator:
         
         # Horizontal line
         line_table = Table([['']], colWidths=[7*inch])
-        line_table.setStyle(TableStyle([
-            ('LINEABOVE', (0, 0), (-1, 0), 2, colors.HexColor('#dc2626')),
-        ]))
+        line_table.setStyle(self.assets.table_style('brand_rule'))
         elements.append(line_table)
         elements.append(Spacer(1, 0.15*inch))
         
@@ -464,7 +435,7 @@ class EnhancedInvoiceGenerator:
         # INVOICE TITLE
         # ============================================
         invoice_title = '<font size=20 color="#dc2626"><b>TRANSPORTATION INVOICE</b></font>'
-        elements.append(Paragraph(invoice_title, ParagraphStyle('InvoiceTitle', alignment=TA_CENTER)))
+        elements.append(Paragraph(invoice_title, styles['AlignCenter']))
         elements.append(Spacer(1, 0.2*inch))
         
         # ============================================
@@ -705,7 +676,7 @@ class EnhancedInvoiceGenerator:
         Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
         </font>
         """
-        elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
         
         # Build PDF
         doc.build(elements)
@@ -721,7 +692,6 @@ class EnhancedInvoiceGenerator:
         Fetches all required data from database
         """
         import models
-        from datetime import timedelta
         
         # Get trip
         trip = db.query(models.Trip).filter(models.Trip.id == trip_id).first()
@@ -225,63 +225,24 @@ class FinancialCalculator:
         Returns:
             Monthly financial summary
         """
-        from models import TripStatus
+        from period_close import PeriodCloseService, TRIPS, EXPENSES
         if not target_month:
             target_month = date.today().replace(day=1)
         
-        # Current month calculations
-        current_month_start = target_month
-        current_month_end = (current_month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
         # Previous month for comparison
-        prev_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-        prev_month_end = current_month_start - timedelta(days=1)
-        
-        # SMART SYSTEM: Current month metrics, exclude CANCELLED trips
-        current_revenue = self.db.query(func.sum(Trip.client_freight)).filter(
-            and_(
-                func.date(Trip.date) >= current_month_start,
-                func.date(Trip.date) <= current_month_end,
-                Trip.status != TripStatus.CANCELLED
-            )
-        ).scalar() or 0.0
+        prev_month_start = (target_month - timedelta(days=1)).replace(day=1)
         
-        current_vendor_costs = self.db.query(func.sum(Trip.vendor_freight)).filter(
-            and_(
-                func.date(Trip.date) >= current_month_start,
-                func.date(Trip.date) <= current_month_end,
-                Trip.status != TripStatus.CANCELLED
-            )
-        ).scalar() or 0.0
+        # SMART SYSTEM: trip revenue/costs exclude CANCELLED trips; closed months
+        # are read from their month-end snapshot instead of re-aggregating trips
+        periods = PeriodCloseService(self.db)
+        current_revenue, current_trip_costs = periods.period_totals(TRIPS, target_month.year, target_month.month)
+        _, current_office_expenses = periods.period_totals(EXPENSES, target_month.year, target_month.month)
         
-        current_operational_costs = self.db.query(
-            func.sum(Trip.fuel_cost + Trip.advance_paid + Trip.munshiyana_bank_charges + Trip.other_expenses)
-        ).filter(
-            and_(
-                func.date(Trip.date) >= current_month_start,
-                func.date(Trip.date) <= current_month_end,
-                Trip.status != TripStatus.CANCELLED
-            )
-        ).scalar() or 0.0
-        
-        current_office_expenses = self.db.query(func.sum(Expense.amount)).filter(
-            and_(
-                func.date(Expense.date) >= current_month_start,
-                func.date(Expense.date) <= current_month_end
-            )
-        ).scalar() or 0.0
-        
-        current_expenses = current_vendor_costs + current_operational_costs + current_office_expenses
+        current_expenses = current_trip_costs + current_office_expenses
         current_profit = current_revenue - current_expenses
         
-        # SMART SYSTEM: Previous month metrics for growth calculation, exclude CANCELLED trips
-        prev_revenue = self.db.query(func.sum(Trip.client_freight)).filter(
-            and_(
-                func.date(Trip.date) >= prev_month_start,
-                func.date(Trip.date) <= prev_month_end,
-                Trip.status != TripStatus.CANCELLED
-            )
-        ).scalar() or 0.0
+        # Previous month revenue for growth calculation
+        prev_revenue, _ = periods.period_totals(TRIPS, prev_month_start.year, prev_month_start.month)
         
         # Growth calculation
         growth_percentage = 0.0
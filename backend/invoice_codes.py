@@ -0,0 +1,124 @@
+"""
+Invoice Verification Codes
+Vector QR codes for invoices drawn as ReportLab shapes (no PNG round-trip),
+cached per invoice number and amount, with an optional signed verification token
+"""
+import base64
+import hashlib
+import hmac
+import os
+from functools import lru_cache
+from typing import Optional
+
+import qrcode
+from reportlab.graphics.shapes import Drawing, Group, Rect
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+VERIFY_URL = os.getenv("INVOICE_VERIFY_URL", "pgtinternational.com/verify")
+
+# Label the fallback invoice key is derived under, so it never equals the JWT key
+SIGNING_KEY_LABEL = b"pgt-tms/invoice-verification/v1"
+
+
+def _signing_key() -> Optional[bytes]:
+    """
+    INVOICE_SIGNING_KEY, else a key derived from SECRET_KEY with HMAC under a
+    fixed label: tokens printed on invoices never expose material that signs
+    access tokens. None (unsigned QR codes) when neither is set.
+    """
+    key = os.getenv("INVOICE_SIGNING_KEY")
+    if key:
+        return key.encode()
+    secret = os.getenv("SECRET_KEY")
+    if secret:
+        return hmac.new(secret.encode(), SIGNING_KEY_LABEL, hashlib.sha256).digest()
+    return None
+
+
+# Key for verification tokens; without one, QR codes carry no signature
+SIGNING_KEY = _signing_key()
+
+# Bounded so regenerating old invoices cannot grow memory without limit
+QR_CACHE_SIZE = int(os.getenv("INVOICE_QR_CACHE_SIZE", "512"))
+
+QR_BORDER_MODULES = 2
+
+
+def _normalize_amount(amount) -> str:
+    return f"{float(amount or 0):.2f}"
+
+
+def verification_token(invoice_number: str, amount) -> Optional[str]:
+    """Short HMAC-SHA256 token over invoice number and amount; None when no signing key is configured"""
+    if not SIGNING_KEY:
+        return None
+    message = f"{invoice_number}|{_normalize_amount(amount)}".encode()
+    digest = hmac.new(SIGNING_KEY, message, hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+def verify_token(invoice_number: str, amount, token: str) -> bool:
+    """Check a token printed on an invoice against its number and amount"""
+    expected = verification_token(invoice_number, amount)
+    return bool(expected and token) and hmac.compare_digest(expected, token)
+
+
+def qr_payload(invoice_number: str, amount, signed: bool = True) -> str:
+    """Text encoded in the invoice QR code"""
+    payload = f"PGT-INV:{invoice_number}|AMT:{_normalize_amount(amount)}|VERIFY:{VERIFY_URL}"
+    token = verification_token(invoice_number, amount) if signed else None
+    if token:
+        payload += f"|SIG:{token}"
+    return payload
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def _qr_group(payload: str) -> tuple:
+    """
+    Encode the payload once and build the module shapes in a unit grid.
+    Dark modules on a row are merged into single rectangles to keep the
+    PDF drawing small. Returns (group, modules_per_side).
+    """
+    qr = qrcode.QRCode(border=QR_BORDER_MODULES, error_correction=qrcode.constants.ERROR_CORRECT_M)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    size = len(matrix)
+    
+    group = Group()
+    group.add(Rect(0, 0, size, size, fillColor=colors.white, strokeColor=None))
+    for row_index, row in enumerate(matrix):
+        y = size - row_index - 1
+        col = 0
+        while col < size:
+            if not row[col]:
+                col += 1
+                continue
+            start = col
+            while col < size and row[col]:
+                col += 1
+            group.add(Rect(start, y, col - start, 1, fillColor=colors.black, strokeColor=None, strokeWidth=0))
+    return group, size
+
+
+def invoice_qr_drawing(invoice_number: str, amount, size: float = 1*inch, signed: bool = True) -> Drawing:
+    """
+    QR code flowable for an invoice. The encoded shapes are shared from the
+    cache; each call only wraps them in a new Drawing, so one cached code can be
+    placed in any number of documents, including concurrent renders.
+    """
+    group, modules = _qr_group(qr_payload(invoice_number, amount, signed))
+    scale = size / modules
+    drawing = Drawing(size, size)
+    drawing.add(group)
+    drawing.transform = (scale, 0, 0, scale, 0, 0)
+    return drawing
+
+
+def qr_cache_info():
+    return _qr_group.cache_info()
+
+
+def clear_qr_cache():
+    _qr_group.cache_clear()
@@ -3,15 +3,12 @@ Invoice Generator Service
 Professional invoice generation with company branding
 """
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-from datetime import datetime
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from io import BytesIO
 from typing import Optional, Dict, List
-import os
+from pdf_assets import get_pdf_assets
 
 class InvoiceGenerator:
     def __init__(self):
@@ -24,6 +21,7 @@ class InvoiceGenerator:
             "website": "www.pgtinternational.com",
             "tax_id": "NTN: XXXXXXX-X"
         }
+        self.assets = get_pdf_assets()
     
     def generate_invoice_pdf(
         self,
@@ -74,37 +72,12 @@ class InvoiceGenerator:
         
         # Container for elements
         elements = []
-        styles = getSampleStyleSheet()
+        styles = self.assets.styles
         
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#dc2626'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#6b7280'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Oblique'
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#374151'),
-            spaceAfter=12,
-            fontName='Helvetica-Bold'
-        )
+        # Shared document styles
+        title_style = styles['InvoiceCompanyTitle']
+        subtitle_style = styles['InvoiceCompanySubtitle']
+        heading_style = styles['InvoiceHeading']
         
         # Company Header
         elements.append(Paragraph(self.company_info['name'], title_style))
@@ -124,7 +97,7 @@ class InvoiceGenerator:
         
         # Invoice Title
         invoice_title = f'<font size=18 color="#dc2626"><b>INVOICE</b></font>'
-        elements.append(Paragraph(invoice_title, ParagraphStyle('InvoiceTitle', alignment=TA_CENTER)))
+        elements.append(Paragraph(invoice_title, styles['AlignCenter']))
         elements.append(Spacer(1, 0.2*inch))
         
         # Invoice Details and Client Info (Side by side)
@@ -256,7 +229,7 @@ class InvoiceGenerator:
         This is a computer-generated invoice and does not require a signature.
         </font>
         """
-        elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
         
         # Build PDF
         doc.build(elements)
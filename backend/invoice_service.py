@@ -2,16 +2,33 @@
 Invoice Service
 Manages invoice generation, storage, and operations
 """
+from sqlalchemy import Boolean, func, type_coerce
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
 import models
+from projections import Projection, entity_columns
 from enhanced_invoice_generator import enhanced_invoice_generator
 from modern_invoice_generator import modern_invoice_generator, modern_invoice_generator_blue, modern_invoice_generator_red
 from email_service import email_service
 
+INVOICE_LIST = Projection("InvoiceRow", models.Receivable, {
+    **entity_columns(models.Receivable, "id", "invoice_number"),
+    "client_name": func.coalesce(models.Client.name, "Unknown"),
+    **entity_columns(
+        models.Receivable,
+        "invoice_date", "due_date", "total_amount", "paid_amount", "remaining_amount", "status"
+    ),
+    "has_pdf": type_coerce(func.coalesce(models.Receivable.invoice_pdf_path, "") != "", Boolean),
+    "emailed": type_coerce(models.Receivable.invoice_sent_at.isnot(None), Boolean),
+    "trip_reference": models.Trip.reference_no,
+}, joins=[
+    (models.Client, models.Receivable.client_id == models.Client.id),
+    (models.Trip, models.Receivable.trip_id == models.Trip.id),
+])
+
 class InvoiceService:
     def __init__(self, db: Session, use_modern=True, theme='red_black'):
         self.db = db
@@ -275,35 +292,18 @@ class InvoiceService:
         end_date: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[Dict]:
-        """List invoices with filters"""
-        query = self.db.query(models.Receivable)
+    ) -> List:
+        """List invoices with filters (InvoiceRow records)"""
+        query = INVOICE_LIST.select()
         
         if client_id:
-            query = query.filter(models.Receivable.client_id == client_id)
+            query = query.where(models.Receivable.client_id == client_id)
         if status:
-            query = query.filter(models.Receivable.status == status)
+            query = query.where(models.Receivable.status == status)
         if start_date:
-            query = query.filter(models.Receivable.invoice_date >= start_date)
+            query = query.where(models.Receivable.invoice_date >= start_date)
         if end_date:
-            query = query.filter(models.Receivable.invoice_date <= end_date)
-        
-        receivables = query.order_by(models.Receivable.invoice_date.desc()).offset(skip).limit(limit).all()
+            query = query.where(models.Receivable.invoice_date <= end_date)
         
-        return [
-            {
-                'id': r.id,
-                'invoice_number': r.invoice_number,
-                'client_name': r.client.name if r.client else 'Unknown',
-                'invoice_date': r.invoice_date.isoformat(),
-                'due_date': r.due_date.isoformat(),
-                'total_amount': float(r.total_amount),
-                'paid_amount': float(r.paid_amount),
-                'remaining_amount': float(r.remaining_amount),
-                'status': r.status.value if hasattr(r.status, 'value') else str(r.status),
-                'has_pdf': bool(r.invoice_pdf_path),
-                'emailed': bool(r.invoice_sent_at),
-                'trip_reference': r.trip.reference_no if r.trip else None
-            }
-            for r in receivables
-        ]
+        query = query.order_by(models.Receivable.invoice_date.desc()).offset(skip).limit(limit)
+        return INVOICE_LIST.fetch(self.db, query)
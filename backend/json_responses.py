@@ -0,0 +1,85 @@
+"""
+JSON Responses
+Fast serialization for large list endpoints. Returning a Response skips
+FastAPI's jsonable_encoder and response_model validation, which walk every
+row in Python; orjson encodes the rows in one native pass instead.
+
+Endpoints select the columns they emit (db.execute(select(...)) or
+db.query(col, ...)) and hand the row tuples to RowsResponse, so no ORM
+objects or Pydantic models are built per row.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    # Types orjson does not encode itself, converted as jsonable_encoder does
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """orjson response that also encodes Decimal, Pydantic models and sets"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    One dict per row tuple
+    
+    Args:
+        rows: Result rows (or any sequences) in field order
+        fields: Key of each position; "client.name" puts name under a nested
+            "client" object, which is null when all of its values are (an outer
+            join without a match). Defaults to the rows' own column labels.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    if fields is None:
+        fields = rows[0]._fields
+        
+    if not any("." in field for field in fields):
+        return [dict(zip(fields, row)) for row in rows]
+        
+    flat = []
+    groups: Dict[str, List[tuple]] = {}
+    for position, field in enumerate(fields):
+        if "." in field:
+            group, name = field.split(".", 1)
+            groups.setdefault(group, []).append((name, position))
+        else:
+            flat.append((field, position))
+            
+    result = []
+    for row in rows:
+        item = {field: row[position] for field, position in flat}
+        for group, members in groups.items():
+            values = {name: row[position] for name, position in members}
+            item[group] = values if any(value is not None for value in values.values()) else None
+        result.append(item)
+    return result
+
+
+class RowsResponse(ORJSONResponse):
+    """JSON array of objects built straight from row tuples (see rows_to_dicts)"""
+    
+    def __init__(self, rows: Iterable[Sequence[Any]], fields: Optional[Sequence[str]] = None, **kwargs):
+        super().__init__(rows_to_dicts(rows, fields), **kwargs)
@@ -146,6 +146,27 @@ class CashTransaction(Base):
         Index('idx_cash_source', 'source_module', 'source_id'),
     )
 
+class CashDailyRollup(Base):
+    """
+    Live (non-deleted) cash register totals per day, source module and payment mode.
+    Rebuilt for a day whenever that day's transactions change;
+    cash_register_service reads balances as prefix sums over it.
+    """
+    __tablename__ = "cash_daily_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False)
+    source_module = Column(Enum(CashSourceModule), nullable=False)
+    payment_mode = Column(Enum(PaymentMode), nullable=False)
+    cash_in = Column(Float, nullable=False, default=0.0)
+    cash_out = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_cash_rollup_day', 'date', 'source_module', 'payment_mode', unique=True),
+    )
+
 
 class LedgerEntry(Base):
     __tablename__ = "ledger_entries"
@@ -574,6 +595,81 @@ class CEOCapital(Base):
     # Relationships
     created_by_user = relationship("User", foreign_keys=[created_by])
 
+class BalanceHead(Base):
+    """
+    Current totals and balance for one running-balance account
+    (CEO capital, office expenses, one staff member's advances).
+    Updated under a row lock in the same transaction as each posting;
+    balance_heads.BalanceHeadService can rebuild it from the detail rows.
+    """
+    __tablename__ = "balance_heads"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    account_type = Column(String, nullable=False)  # 'ceo_capital', 'office_expense', 'staff_advance'
+    account_id = Column(Integer, nullable=False, default=0)  # staff_id for staff_advance, 0 otherwise
+    opening_balance = Column(Float, nullable=False, default=0.0)  # Balance not explained by detail rows (pre-ledger data)
+    total_in = Column(Float, nullable=False, default=0.0)
+    total_out = Column(Float, nullable=False, default=0.0)
+    balance = Column(Float, nullable=False, default=0.0)  # opening_balance + total_in - total_out
+    entry_count = Column(Integer, nullable=False, default=0)
+    last_entry_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_balance_head_account', 'account_type', 'account_id', unique=True),
+    )
+
+class PeriodClose(Base):
+    """
+    Month-end close. Its PeriodBalance rows freeze every account's closing
+    balance so later opening balances start here instead of at the first posting.
+    A back-dated posting marks the month (and every later one) stale until re-closed.
+    """
+    __tablename__ = "period_closes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False, index=True)  # Last day of the month
+    status = Column(String, nullable=False, default="closed")  # 'closed', 'stale'
+    closed_at = Column(DateTime(timezone=True), server_default=func.now())
+    closed_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # None when re-closed automatically
+    stale_since = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    closed_by_user = relationship("User", foreign_keys=[closed_by])
+    balances = relationship("PeriodBalance", back_populates="period_close", cascade="all, delete-orphan")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_period_close_month', 'year', 'month', unique=True),
+        Index('idx_period_close_status_end', 'status', 'period_end'),
+    )
+
+class PeriodBalance(Base):
+    """One account's opening/closing balance and movement totals for a closed month"""
+    __tablename__ = "period_balances"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    period_close_id = Column(Integer, ForeignKey("period_closes.id", ondelete="CASCADE"), nullable=False)
+    account_type = Column(String, nullable=False)  # 'client', 'vendor', 'ceo_capital', 'office_expense', 'staff_advance', 'trips', 'expenses'
+    entity_id = Column(Integer, nullable=False, default=0)  # client/vendor/staff id, 0 for company-wide accounts
+    opening_balance = Column(Float, nullable=False, default=0.0)
+    total_in = Column(Float, nullable=False, default=0.0)
+    total_out = Column(Float, nullable=False, default=0.0)
+    closing_balance = Column(Float, nullable=False, default=0.0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    
+    # Relationships
+    period_close = relationship("PeriodClose", back_populates="balances")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_period_balance_account', 'period_close_id', 'account_type', 'entity_id', unique=True),
+    )
+
 class Receivable(Base):
     __tablename__ = "receivables"
     
@@ -739,13 +835,28 @@ class AuditLog(Base):
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
     
-    # Indexes for performance
+    # Indexes for performance: one per access path, each ending in timestamp
+    # so the newest/oldest-first listings read the index in order
     __table_args__ = (
         Index('idx_audit_user_timestamp', 'user_id', 'timestamp'),
-        Index('idx_audit_table_record', 'table_name', 'record_id'),
+        Index('idx_audit_record_history', 'table_name', 'record_id', 'timestamp'),
+        Index('idx_audit_table_timestamp', 'table_name', 'timestamp'),
         Index('idx_audit_action', 'action'),
     )
 
+class AuditArchive(Base):
+    """One gzip-compressed JSON-lines file holding a month of archived audit logs"""
+    __tablename__ = "audit_archives"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    month = Column(String(7), nullable=False, index=True)  # YYYY-MM
+    path = Column(String, nullable=False, unique=True)
+    row_count = Column(Integer, nullable=False)
+    first_timestamp = Column(DateTime(timezone=True), nullable=True)
+    last_timestamp = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    archived_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
 # System Settings
 class SystemSetting(Base):
     __tablename__ = "system_settings"
@@ -3,20 +3,15 @@ Modern Commercial Invoice Generator
 Professional branding with Theme A (Blue) and Theme B (Red/Black)
 """
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.graphics.shapes import Drawing, Rect, String
-from reportlab.graphics import renderPDF
 from datetime import datetime
 from io import BytesIO
 from typing import Optional, Dict
-import os
-from pathlib import Path
-import qrcode
+from pdf_assets import get_pdf_assets
+from invoice_codes import invoice_qr_drawing
 
 class ModernInvoiceGenerator:
     def __init__(self, theme='red_black'):
@@ -60,28 +55,9 @@ class ModernInvoiceGenerator:
             ]
         }
         
-        # Theme Colors
-        if theme == 'blue':
-            self.colors = {
-                'primary': colors.HexColor('#1e40af'),
-                'secondary': colors.HexColor('#0ea5e9'),
-                'accent': colors.HexColor('#1e293b'),
-                'background': colors.HexColor('#f8fafc'),
-                'text': colors.HexColor('#1f2937')
-            }
-        else:  # red_black
-            self.colors = {
-                'primary': colors.HexColor('#dc2626'),
-                'secondary': colors.HexColor('#1f2937'),
-                'accent': colors.HexColor('#ef4444'),
-                'background': colors.HexColor('#ffffff'),
-                'text': colors.HexColor('#1f2937')
-            }
-        
-        # Logo path
-        self.logo_path = Path("backend/static/logo.png")
-        if not self.logo_path.exists():
-            self.logo_path = None
+        # Theme colors, styles and logo come precompiled from the shared registry
+        self.assets = get_pdf_assets()
+        self.colors = self.assets.palette(theme)
     
     def create_logo_placeholder(self, width=1.2*inch, height=1.2*inch):
         """Create a simple logo placeholder if no logo file exists"""
@@ -100,23 +76,9 @@ class ModernInvoiceGenerator:
         
         return drawing
     
-    def generate_qr_code(self, invoice_number, amount):
-        """Generate QR code for invoice verification"""
-        qr_data = f"PGT-INV:{invoice_number}|AMT:{amount}|VERIFY:pgtinternational.com/verify"
-        
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        # Use string colors for QR code
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        return buffer
+    def generate_qr_code(self, invoice_number, amount, size=1*inch):
+        """Vector QR code for invoice verification (cached per invoice number and amount)"""
+        return invoice_qr_drawing(invoice_number, amount, size=size)
     
     def generate_commercial_invoice(
         self,
@@ -176,7 +138,7 @@ class ModernInvoiceGenerator:
         )
         
         elements = []
-        styles = getSampleStyleSheet()
+        styles = self.assets.stylesheet(self.theme)
         
         # ============================================
         # HEADER WITH LOGO AND COMPANY INFO
@@ -184,15 +146,15 @@ class ModernInvoiceGenerator:
         
         header_data = []
         
-        if self.logo_path and self.logo_path.exists():
-            logo = Image(str(self.logo_path), width=1*inch, height=1*inch)
+        if self.assets.logo:
+            logo = self.assets.logo_image(1*inch, 1*inch)
         else:
             logo = self.create_logo_placeholder(1*inch, 1*inch)
         
         company_header = f"""
-        <font size=18 color="{self.colors['primary'].hexval()}"><b>{self.company_info['name']}</b></font><br/>
-        <font size=9 color="{self.colors['text'].hexval()}"><i>{self.company_info['tagline']}</i></font><br/>
-        <font size=7 color="{self.colors['text'].hexval()}">
+        <font size=18 color="{self.colors.hex['primary']}"><b>{self.company_info['name']}</b></font><br/>
+        <font size=9 color="{self.colors.hex['text']}"><i>{self.company_info['tagline']}</i></font><br/>
+        <font size=7 color="{self.colors.hex['text']}">
         {self.company_info['ntn']} | Phone: {self.company_info['phone']}<br/>
         Email: {self.company_info['email']} | Web: {self.company_info['website']}
         </font>
@@ -200,11 +162,7 @@ class ModernInvoiceGenerator:
         
         header_data = [[logo, Paragraph(company_header, styles['Normal'])]]
         header_table = Table(header_data, colWidths=[1.2*inch, 5.8*inch])
-        header_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ]))
+        header_table.setStyle(self.assets.table_style('logo_header', self.theme))
         elements.append(header_table)
         elements.append(Spacer(1, 0.15*inch))
         
@@ -220,17 +178,17 @@ class ModernInvoiceGenerator:
         # INVOICE TITLE
         # ============================================
         
-        invoice_title = f'<font size=20 color="{self.colors['primary'].hexval()}"><b>COMMERCIAL INVOICE</b></font>'
-        elements.append(Paragraph(invoice_title, ParagraphStyle('InvoiceTitle', alignment=TA_CENTER)))
+        invoice_title = f'<font size=20 color="{self.colors.hex["primary"]}"><b>COMMERCIAL INVOICE</b></font>'
+        elements.append(Paragraph(invoice_title, styles['AlignCenter']))
         elements.append(Spacer(1, 0.15*inch))
         
         # Invoice details header
         invoice_header_data = [[
             Paragraph(f'<font size=10><b>Invoice #:</b> {invoice_data["invoice_number"]}</font>', styles['Normal']),
-            Paragraph(f'<font size=10><b>Date:</b> {invoice_data["invoice_date"]}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+            Paragraph(f'<font size=10><b>Date:</b> {invoice_data["invoice_date"]}</font>', styles['AlignRight'])
         ], [
             Paragraph(f'<font size=10><b>Due Date:</b> {invoice_data["due_date"]}</font>', styles['Normal']),
-            Paragraph(f'<font size=10><b>Terms:</b> {invoice_data.get("payment_terms", "Net 30 Days")}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+            Paragraph(f'<font size=10><b>Terms:</b> {invoice_data.get("payment_terms", "Net 30 Days")}</font>', styles['AlignRight'])
         ]]
         
         invoice_header_table = Table(invoice_header_data, colWidths=[3.5*inch, 3.5*inch])
@@ -251,8 +209,8 @@ class ModernInvoiceGenerator:
         
         bill_trip_data = [
             [
-                Paragraph(f'<font size=10 color="{self.colors['primary'].hexval()}"><b>▓ BILL TO:</b></font>', styles['Normal']),
-                Paragraph(f'<font size=10 color="{self.colors['primary'].hexval()}"><b>▓ TRIP SUMMARY:</b></font>', styles['Normal'])
+                Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>▓ BILL TO:</b></font>', styles['Normal']),
+                Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>▓ TRIP SUMMARY:</b></font>', styles['Normal'])
             ],
             [
                 Paragraph(f"""
@@ -298,16 +256,16 @@ class ModernInvoiceGenerator:
         # FINANCIAL BREAKDOWN
         # ============================================
         
-        elements.append(Paragraph(f'<font size=11 color="{self.colors['primary'].hexval()}"><b>▓ FINANCIAL BREAKDOWN</b></font>', styles['Normal']))
+        elements.append(Paragraph(f'<font size=11 color="{self.colors.hex["primary"]}"><b>▓ FINANCIAL BREAKDOWN</b></font>', styles['Normal']))
         elements.append(Spacer(1, 0.1*inch))
         
         charges_data = [
             [
                 Paragraph('<font size=9 color="white"><b>Description</b></font>', styles['Normal']),
-                Paragraph('<font size=9 color="white"><b>Rate</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph('<font size=9 color="white"><b>Weight/Qty</b></font>', ParagraphStyle('Center', alignment=TA_CENTER)),
-                Paragraph('<font size=9 color="white"><b>Halting</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph('<font size=9 color="white"><b>Total</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                Paragraph('<font size=9 color="white"><b>Rate</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>Weight/Qty</b></font>', styles['AlignCenter']),
+                Paragraph('<font size=9 color="white"><b>Halting</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>Total</b></font>', styles['AlignRight'])
             ]
         ]
         
@@ -326,10 +284,10 @@ class ModernInvoiceGenerator:
         
         charges_data.append([
             Paragraph(f'<font size=8>{service_desc}</font>', styles['Normal']),
-            Paragraph(f'<font size=8>{rate_text}</font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-            Paragraph(f'<font size=8>{qty_text}</font>', ParagraphStyle('Center', alignment=TA_CENTER)),
-            Paragraph(f'<font size=8>{halting_charges:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-            Paragraph(f'<font size=8><b>PKR {amount + halting_charges:,.2f}</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+            Paragraph(f'<font size=8>{rate_text}</font>', styles['AlignRight']),
+            Paragraph(f'<font size=8>{qty_text}</font>', styles['AlignCenter']),
+            Paragraph(f'<font size=8>{halting_charges:,.2f}</font>', styles['AlignRight']),
+            Paragraph(f'<font size=8><b>PKR {amount + halting_charges:,.2f}</b></font>', styles['AlignRight'])
         ])
         
         charges_table = Table(charges_data, colWidths=[2.5*inch, 1.2*inch, 1*inch, 0.8*inch, 1.5*inch])
@@ -361,26 +319,26 @@ class ModernInvoiceGenerator:
         total_amount = subtotal + tax_amount - discount_amount
         
         totals_data = [
-            ['', '', '', Paragraph('<font size=9><b>Subtotal:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)), 
-             Paragraph(f'<font size=9>PKR {subtotal:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))],
+            ['', '', '', Paragraph('<font size=9><b>Subtotal:</b></font>', styles['AlignRight']), 
+             Paragraph(f'<font size=9>PKR {subtotal:,.2f}</font>', styles['AlignRight'])],
         ]
         
         if tax_amount > 0:
             totals_data.append([
-                '', '', '', Paragraph('<font size=9><b>GST (0%):</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph(f'<font size=9>PKR {tax_amount:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                '', '', '', Paragraph('<font size=9><b>GST (0%):</b></font>', styles['AlignRight']),
+                Paragraph(f'<font size=9>PKR {tax_amount:,.2f}</font>', styles['AlignRight'])
             ])
         
         if discount_amount > 0:
             totals_data.append([
-                '', '', '', Paragraph('<font size=9><b>Discount:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph(f'<font size=9>- PKR {discount_amount:,.2f}</font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                '', '', '', Paragraph('<font size=9><b>Discount:</b></font>', styles['AlignRight']),
+                Paragraph(f'<font size=9>- PKR {discount_amount:,.2f}</font>', styles['AlignRight'])
             ])
         
         totals_data.append([
             '', '', '', 
-            Paragraph(f'<font size=12 color="{self.colors['primary'].hexval()}"><b>TOTAL DUE:</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-            Paragraph(f'<font size=12 color="{self.colors['primary'].hexval()}"><b>PKR {total_amount:,.2f}</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+            Paragraph(f'<font size=12 color="{self.colors.hex["primary"]}"><b>TOTAL DUE:</b></font>', styles['AlignRight']),
+            Paragraph(f'<font size=12 color="{self.colors.hex["primary"]}"><b>PKR {total_amount:,.2f}</b></font>', styles['AlignRight'])
         ])
         
         totals_table = Table(totals_data, colWidths=[2.5*inch, 1.2*inch, 1*inch, 0.8*inch, 1.5*inch])
@@ -400,12 +358,11 @@ class ModernInvoiceGenerator:
         # PAYMENT INFORMATION WITH QR CODE
         # ============================================
         
-        elements.append(Paragraph(f'<font size=11 color="{self.colors['primary'].hexval()}"><b>▓ PAYMENT INFORMATION</b></font>', styles['Normal']))
+        elements.append(Paragraph(f'<font size=11 color="{self.colors.hex["primary"]}"><b>▓ PAYMENT INFORMATION</b></font>', styles['Normal']))
         elements.append(Spacer(1, 0.1*inch))
         
         # Generate QR code
-        qr_buffer = self.generate_qr_code(invoice_data['invoice_number'], total_amount)
-        qr_image = Image(qr_buffer, width=1*inch, height=1*inch)
+        qr_image = self.generate_qr_code(invoice_data['invoice_number'], total_amount)
         
         payment_data = [[
             Paragraph(f"""
@@ -424,7 +381,7 @@ class ModernInvoiceGenerator:
             A/C #: {self.company_info['bank_details']['faysal']['account_number']}<br/>
             IBAN: {self.company_info['bank_details']['faysal']['iban']}<br/>
             <br/>
-            <font color="{self.colors['accent'].hexval()}"><b>⚠️ IMPORTANT:</b> Quote Invoice # in payment reference</font>
+            <font color="{self.colors.hex['accent']}"><b>⚠️ IMPORTANT:</b> Quote Invoice # in payment reference</font>
             </font>
             """, styles['Normal']),
             qr_image
@@ -448,7 +405,7 @@ class ModernInvoiceGenerator:
         # TERMS & CONDITIONS
         # ============================================
         
-        elements.append(Paragraph(f'<font size=10 color="{self.colors['primary'].hexval()}"><b>▓ TERMS & CONDITIONS</b></font>', styles['Normal']))
+        elements.append(Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>▓ TERMS & CONDITIONS</b></font>', styles['Normal']))
         elements.append(Spacer(1, 0.05*inch))
         
         terms_text = f"""
@@ -474,17 +431,17 @@ class ModernInvoiceGenerator:
         elements.append(Spacer(1, 0.08*inch))
         
         footer_text = f"""
-        <font size=8 color="{self.colors['text'].hexval()}">
+        <font size=8 color="{self.colors.hex['text']}">
         <b>Thank you for choosing PGT International!</b><br/>
         <br/>
         This is a digitally generated invoice. No signature required.<br/>
         For queries: {self.company_info['phone']} | {self.company_info['email']}<br/>
         <br/>
         Generated: {datetime.now().strftime('%d-%b-%Y %I:%M %p')} | Ref: {invoice_data['invoice_number']}<br/>
-        <font color="{self.colors['accent'].hexval()}"><b>⚠️ NON-EDITABLE DOCUMENT</b> - Any alterations void this invoice</font>
+        <font color="{self.colors.hex['accent']}"><b>⚠️ NON-EDITABLE DOCUMENT</b> - Any alterations void this invoice</font>
         </font>
         """
-        elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
         
         # Build PDF
         doc.build(elements)
@@ -501,23 +458,7 @@ class ModernInvoiceGenerator:
         """
         if theme:
             self.theme = theme
-            # Update colors based on theme
-            if theme == 'blue':
-                self.colors = {
-                    'primary': colors.HexColor('#1e40af'),
-                    'secondary': colors.HexColor('#0ea5e9'),
-                    'accent': colors.HexColor('#1e293b'),
-                    'background': colors.HexColor('#f8fafc'),
-                    'text': colors.HexColor('#1f2937')
-                }
-            else:
-                self.colors = {
-                    'primary': colors.HexColor('#dc2626'),
-                    'secondary': colors.HexColor('#1f2937'),
-                    'accent': colors.HexColor('#ef4444'),
-                    'background': colors.HexColor('#ffffff'),
-                    'text': colors.HexColor('#1f2937')
-                }
+            self.colors = self.assets.palette(theme)
         
         import models
         
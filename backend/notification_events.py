@@ -0,0 +1,133 @@
+"""
+Notification Events
+In-process publish/subscribe for pushing notifications to open browser tabs
+over server-sent events, instead of each tab polling the unread count.
+
+Publishers (NotificationService, running in FastAPI's worker threads) call
+publish() after their commit; every open stream of the target user receives
+the event on the event loop. Streams also re-send the unread count every
+FALLBACK_INTERVAL seconds, which covers events published by another server
+process.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Dict, Set
+
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments (proxies drop idle connections)
+KEEPALIVE_INTERVAL = 15
+
+# Seconds between unread-count refreshes on an otherwise idle stream
+FALLBACK_INTERVAL = int(os.getenv("NOTIFICATION_FALLBACK_INTERVAL", "120"))
+
+# Events buffered per stream before a slow client is told to resync instead
+QUEUE_SIZE = 100
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+        
+    def deliver(self, event: Dict):
+        # Runs on the subscriber's loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class NotificationHub:
+    """Per-user fan-out of events to the streams open in this process"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[_Subscriber]] = {}
+        
+    def subscribe(self, user_id: int) -> _Subscriber:
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+        
+    def unsubscribe(self, user_id: int, subscriber: _Subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[user_id]
+                    
+    def has_subscribers(self, user_id: int) -> bool:
+        with self._lock:
+            return bool(self._subscribers.get(user_id))
+            
+    def publish(self, user_id: int, event: Dict) -> int:
+        """Queue an event for every stream of the user; safe to call from any thread"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, event)
+            except RuntimeError:
+                # Loop already closed; the stream's cleanup will unsubscribe it
+                pass
+        return len(subscribers)
+        
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+hub = NotificationHub()
+
+
+def format_event(event: Dict) -> str:
+    """One server-sent event frame"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def event_stream(user_id: int, unread_count, is_disconnected):
+    """
+    Server-sent event frames for one connection. unread_count is an async
+    callable returning the user's current count; is_disconnected is the
+    request's disconnect check.
+    """
+    subscriber = hub.subscribe(user_id)
+    loop = asyncio.get_running_loop()
+    try:
+        yield "retry: 5000\n\n"
+        yield format_event({"type": "unread_count", "count": await unread_count()})
+        last_count_at = loop.time()
+        
+        while not await is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                event = None
+                
+            if subscriber.overflowed:
+                # Too far behind to replay; the client reloads its list
+                subscriber.overflowed = False
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                event = {"type": "resync"}
+                
+            if event is not None:
+                yield format_event(event)
+                if "unread_count" in event or event["type"] == "unread_count":
+                    last_count_at = loop.time()
+            elif loop.time() - last_count_at >= FALLBACK_INTERVAL:
+                yield format_event({"type": "unread_count", "count": await unread_count()})
+                last_count_at = loop.time()
+            else:
+                yield ": keep-alive\n\n"
+    finally:
+        hub.unsubscribe(user_id, subscriber)
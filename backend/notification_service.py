@@ -3,10 +3,27 @@ Notification Service
 Handles in-app notifications and alerts
 """
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
 from datetime import datetime, timedelta
 from typing import List, Optional
+import logging
+import os
+import threading
 import models
+from notification_events import hub
+
+logger = logging.getLogger(__name__)
+
+# Users per INSERT statement when one notification goes to many users
+FANOUT_BATCH_SIZE = 500
+
+# Read notifications older than this are removed by the background retention job,
+# which runs at most once per interval and deletes in chunks of RETENTION_CHUNK_SIZE
+RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "90"))
+RETENTION_INTERVAL = timedelta(hours=int(os.getenv("NOTIFICATION_RETENTION_HOURS", "24")))
+RETENTION_CHUNK_SIZE = 1000
 
 class NotificationService:
     """Service for managing user notifications"""
@@ -47,8 +64,70 @@ class NotificationService:
         self.db.commit()
         self.db.refresh(notification)
         
+        self._publish_notification(notification)
+        schedule_retention()
         return notification
     
+    def notify_users(
+        self,
+        user_ids: List[int],
+        title: str,
+        message: str,
+        notification_type: str = "info",
+        link: Optional[str] = None,
+        coalesce: bool = False
+    ) -> int:
+        """
+        Create the same notification for many users in one commit, with one
+        INSERT per FANOUT_BATCH_SIZE users.
+        
+        Args:
+            coalesce: Users who already have an identical unread notification
+                get that one moved to the top instead of a duplicate
+        
+        Returns:
+            Number of notifications created
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return 0
+        now = datetime.now()
+        
+        coalesced = set()
+        if coalesce:
+            existing = self.db.query(models.Notification.id, models.Notification.user_id).filter(
+                models.Notification.user_id.in_(user_ids),
+                models.Notification.is_read == False,
+                models.Notification.title == title,
+                models.Notification.message == message,
+                models.Notification.link == link if link is not None else models.Notification.link.is_(None)
+            ).all()
+            if existing:
+                self.db.query(models.Notification).filter(
+                    models.Notification.id.in_([row.id for row in existing])
+                ).update({"created_at": now}, synchronize_session=False)
+                coalesced = {row.user_id for row in existing}
+        
+        rows = [
+            {
+                "user_id": user_id,
+                "title": title,
+                "message": message,
+                "notification_type": notification_type,
+                "link": link,
+                "is_read": False,
+                "created_at": now
+            }
+            for user_id in user_ids if user_id not in coalesced
+        ]
+        for start in range(0, len(rows), FANOUT_BATCH_SIZE):
+            self.db.execute(insert(models.Notification), rows[start:start + FANOUT_BATCH_SIZE])
+        self.db.commit()
+        
+        self._publish_fanout(user_ids, title, message)
+        schedule_retention()
+        return len(rows)
+    
     def get_user_notifications(
         self,
         user_id: int,
@@ -78,6 +157,7 @@ class NotificationService:
             notification.is_read = True
             notification.read_at = datetime.now()
             self.db.commit()
+            self._publish_unread_count(user_id)
             return True
         
         return False
@@ -93,6 +173,7 @@ class NotificationService:
         })
         
         self.db.commit()
+        self._publish_unread_count(user_id)
         return count
     
     def get_unread_count(self, user_id: int) -> int:
@@ -112,22 +193,68 @@ class NotificationService:
         if notification:
             self.db.delete(notification)
             self.db.commit()
+            self._publish_unread_count(user_id)
             return True
         
         return False
     
-    def delete_old_notifications(self, days: int = 90) -> int:
-        """Delete notifications older than specified days"""
+    def delete_old_notifications(self, days: int = RETENTION_DAYS, chunk_size: int = RETENTION_CHUNK_SIZE) -> int:
+        """
+        Delete read notifications older than specified days, committing every
+        chunk_size rows so the table is never locked for long
+        """
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        count = self.db.query(models.Notification).filter(
-            models.Notification.created_at < cutoff_date,
-            models.Notification.is_read == True
-        ).delete()
-        
-        self.db.commit()
+        count = 0
+        while True:
+            ids = [row.id for row in self.db.query(models.Notification.id).filter(
+                models.Notification.created_at < cutoff_date,
+                models.Notification.is_read == True
+            ).limit(chunk_size)]
+            if not ids:
+                break
+            count += self.db.query(models.Notification).filter(
+                models.Notification.id.in_(ids)
+            ).delete(synchronize_session=False)
+            self.db.commit()
         return count
     
+    # Push to open notification streams (no queries when the user has none)
+    def _publish_notification(self, notification: models.Notification):
+        if not hub.has_subscribers(notification.user_id):
+            return
+        hub.publish(notification.user_id, {
+            "type": "notification",
+            "notification": {
+                "id": notification.id,
+                "title": notification.title,
+                "message": notification.message,
+                "notification_type": notification.notification_type,
+                "link": notification.link,
+                "is_read": notification.is_read,
+                "created_at": notification.created_at
+            },
+            "unread_count": self.get_unread_count(notification.user_id)
+        })
+    
+    def _publish_fanout(self, user_ids: List[int], title: str, message: str):
+        subscribed = [user_id for user_id in user_ids if hub.has_subscribers(user_id)]
+        if not subscribed:
+            return
+        latest = {}
+        for notification in self.db.query(models.Notification).filter(
+            models.Notification.user_id.in_(subscribed),
+            models.Notification.title == title,
+            models.Notification.message == message
+        ).order_by(models.Notification.id.desc()):
+            latest.setdefault(notification.user_id, notification)
+        for notification in latest.values():
+            self._publish_notification(notification)
+    
+    def _publish_unread_count(self, user_id: int):
+        if hub.has_subscribers(user_id):
+            hub.publish(user_id, {"type": "unread_count", "count": self.get_unread_count(user_id)})
+    
     # Predefined notification creators
     def notify_payment_request_submitted(
         self,
@@ -137,14 +264,13 @@ class NotificationService:
         payment_request_id: int
     ):
         """Notify admins of new payment request"""
-        for user_id in admin_user_ids:
-            self.create_notification(
-                user_id=user_id,
-                title="New Payment Request",
-                message=f"Payment request from {vendor_name} for PKR {amount:,.2f}",
-                notification_type="info",
-                link=f"/payables?highlight={payment_request_id}"
-            )
+        self.notify_users(
+            admin_user_ids,
+            title="New Payment Request",
+            message=f"Payment request from {vendor_name} for PKR {amount:,.2f}",
+            notification_type="info",
+            link=f"/payables?highlight={payment_request_id}"
+        )
     
     def notify_payment_approved(
         self,
@@ -220,14 +346,14 @@ class NotificationService:
         threshold: float
     ):
         """Notify admins of low cash balance"""
-        for user_id in admin_user_ids:
-            self.create_notification(
-                user_id=user_id,
-                title="Low Cash Balance Alert",
-                message=f"Cash balance (PKR {current_balance:,.2f}) is below threshold (PKR {threshold:,.2f})",
-                notification_type="warning",
-                link="/dashboard"
-            )
+        self.notify_users(
+            admin_user_ids,
+            title="Low Cash Balance Alert",
+            message=f"Cash balance (PKR {current_balance:,.2f}) is below threshold (PKR {threshold:,.2f})",
+            notification_type="warning",
+            link="/dashboard",
+            coalesce=True
+        )
     
     def notify_trip_created(
         self,
@@ -245,6 +371,37 @@ class NotificationService:
             link="/fleet-logs"
         )
 
+# Background retention
+_retention_lock = threading.Lock()
+_last_retention_run: Optional[datetime] = None
+
+def schedule_retention(force: bool = False) -> bool:
+    """Delete expired notifications on a background thread, at most once per RETENTION_INTERVAL"""
+    global _last_retention_run
+    now = datetime.now()
+    if not force and _last_retention_run and now - _last_retention_run < RETENTION_INTERVAL:
+        return False
+    if not _retention_lock.acquire(blocking=False):
+        return False
+    _last_retention_run = now
+    threading.Thread(target=_retention_worker, name="notification-retention", daemon=True).start()
+    return True
+
+def _retention_worker():
+    from database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        deleted = NotificationService(db).delete_old_notifications()
+        if deleted:
+            logger.info("Notification retention removed %s read notification(s)", deleted)
+    except Exception:
+        db.rollback()
+        logger.exception("Notification retention failed; it runs again after the next interval")
+    finally:
+        db.close()
+        _retention_lock.release()
+
 def get_admin_user_ids(db: Session) -> List[int]:
     """Get all admin user IDs for notifications"""
     admins = db.query(models.User).filter(
@@ -253,3 +410,31 @@ def get_admin_user_ids(db: Session) -> List[int]:
     ).all()
     
     return [admin.id for admin in admins]
+
+# ============================================
+# ASYNC READS (polled by every open browser tab)
+# ============================================
+
+async def list_notifications(
+    db: AsyncSession,
+    user_id: int,
+    unread_only: bool = False,
+    limit: int = 50
+) -> List[models.Notification]:
+    """NotificationService.get_user_notifications on an AsyncSession"""
+    query = select(models.Notification).where(models.Notification.user_id == user_id)
+    
+    if unread_only:
+        query = query.where(models.Notification.is_read == False)
+    
+    result = await db.scalars(query.order_by(models.Notification.created_at.desc()).limit(limit))
+    return list(result)
+
+async def count_unread(db: AsyncSession, user_id: int) -> int:
+    """NotificationService.get_unread_count on an AsyncSession"""
+    return await db.scalar(
+        select(func.count(models.Notification.id)).where(
+            models.Notification.user_id == user_id,
+            models.Notification.is_read == False
+        )
+    )
@@ -0,0 +1,88 @@
+"""
+Keyset Pagination
+Pages through a projection ordered by one sort column plus the primary key.
+The cursor carries the (sort value, id) of the last row returned, and the
+next page starts with WHERE (sort, id) > cursor, so every page costs the
+same however deep the client scrolls, and rows inserted meanwhile neither
+repeat nor go missing as they can with OFFSET.
+
+NULL sort values come last in both directions.
+"""
+import base64
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+import orjson
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import Select
+
+from json_responses import rows_to_dicts
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    payload = orjson.dumps([sort_value, row_id])
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> tuple:
+    """(sort value, id) with the sort value converted back to the column's Python type"""
+    try:
+        sort_value, row_id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        python_type = sort_column.type.python_type
+        if sort_value is not None and python_type in (datetime, date):
+            sort_value = python_type.fromisoformat(sort_value)
+        elif sort_value is not None and python_type in (int, float):
+            sort_value = python_type(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def _after(sort_column, id_column, descending: bool, sort_value, row_id):
+    # Rows after (sort_value, row_id) in ORDER BY sort IS NULL, sort, id
+    if sort_value is None:
+        return and_(sort_column.is_(None), id_column < row_id if descending else id_column > row_id)
+    beyond = sort_column < sort_value if descending else sort_column > sort_value
+    tie = and_(sort_column == sort_value, id_column < row_id if descending else id_column > row_id)
+    return or_(beyond, tie, sort_column.is_(None))
+
+
+def fetch_page(
+    db,
+    projection,
+    statement: Select,
+    sort_column,
+    id_column,
+    descending: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """
+    One page of a projection's statement (already filtered)
+    
+    Returns:
+        {"items": [...], "next_cursor": str or None}
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        statement = statement.where(_after(sort_column, id_column, descending, *decode_cursor(cursor, sort_column)))
+    order = [sort_column.is_(None)]
+    order += [sort_column.desc(), id_column.desc()] if descending else [sort_column.asc(), id_column.asc()]
+    statement = statement.add_columns(sort_column.label("_sort"), id_column.label("_id")).order_by(*order).limit(limit + 1)
+    
+    rows = db.execute(statement).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+    return {
+        # Records take the projection's fields; the trailing sort/id columns are left out
+        "items": rows_to_dicts(projection.records(rows)),
+        "next_cursor": next_cursor,
+    }
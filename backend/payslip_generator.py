@@ -3,15 +3,14 @@ Payslip Generator Service
 Professional payslip generation for staff
 """
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from datetime import datetime
 from io import BytesIO
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import calendar
+from pdf_assets import get_pdf_assets
 
 class PayslipGenerator:
     def __init__(self):
@@ -21,6 +20,7 @@ class PayslipGenerator:
             "phone": "+92-XXX-XXXXXXX",
             "email": "hr@pgtinternational.com"
         }
+        self.assets = get_pdf_assets()
     
     def generate_payslip_pdf(
         self,
@@ -61,29 +61,24 @@ class PayslipGenerator:
             bottomMargin=0.75*inch
         )
         
+        # Build PDF
+        doc.build(self.build_payslip_story(staff_data, payroll_data))
+        
+        if not output_path:
+            buffer.seek(0)
+            return buffer
+        
+        return None
+    
+    def build_payslip_story(self, staff_data: Dict, payroll_data: Dict) -> List:
+        """Payslip flowables; used for single PDFs and for multi-document bundles"""
         # Container for elements
         elements = []
-        styles = getSampleStyleSheet()
+        styles = self.assets.styles
         
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#dc2626'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#6b7280'),
-            spaceAfter=12,
-            alignment=TA_CENTER
-        )
+        # Shared document styles
+        title_style = styles['PayslipCompanyTitle']
+        subtitle_style = styles['PayslipCompanySubtitle']
         
         # Company Header
         elements.append(Paragraph(self.company_info['name'], title_style))
@@ -93,7 +88,7 @@ class PayslipGenerator:
         # Payslip Title
         month_name = calendar.month_name[payroll_data['month']]
         payslip_title = f'<font size=16 color="#374151"><b>PAYSLIP - {month_name} {payroll_data["year"]}</b></font>'
-        elements.append(Paragraph(payslip_title, ParagraphStyle('PayslipTitle', alignment=TA_CENTER)))
+        elements.append(Paragraph(payslip_title, styles['AlignCenter']))
         elements.append(Spacer(1, 0.3*inch))
         
         # Employee Details
@@ -217,16 +212,33 @@ class PayslipGenerator:
         <b>Confidential:</b> This payslip is confidential and intended solely for the named employee.
         </font>
         """
-        elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
         
-        # Build PDF
-        doc.build(elements)
+        return elements
+    
+    @staticmethod
+    def payslip_data(staff, payroll) -> tuple:
+        """Shape a staff row and payroll entry into (staff_data, payroll_data)"""
+        staff_data = {
+            'employee_id': staff.employee_id,
+            'name': staff.name,
+            'position': staff.position,
+            'bank_account': getattr(staff, 'bank_account', None) or 'N/A'
+        }
         
-        if not output_path:
-            buffer.seek(0)
-            return buffer
+        payment_date = getattr(payroll, 'payment_date', None)
+        payroll_data = {
+            'month': payroll.month,
+            'year': payroll.year,
+            'gross_salary': float(payroll.gross_salary or 0),
+            'arrears': float(payroll.arrears) if payroll.arrears else 0,
+            'advance_deduction': float(payroll.advance_deduction) if payroll.advance_deduction else 0,
+            'other_deductions': float(payroll.other_deductions) if payroll.other_deductions else 0,
+            'net_payable': float(payroll.net_payable or 0),
+            'payment_date': payment_date.strftime('%Y-%m-%d') if payment_date else datetime.now().strftime('%Y-%m-%d')
+        }
         
-        return None
+        return staff_data, payroll_data
     
     def generate_bulk_payslips(self, payroll_entries: list, output_dir: str = "payslips"):
         """Generate payslips for multiple employees"""
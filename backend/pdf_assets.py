@@ -0,0 +1,353 @@
+"""
+PDF Asset Registry
+Process-wide, read-only styles, colour palettes, logo bitmap and table styles
+shared by every PDF generator (reports, invoices, payslips, ledgers).
+The stylesheet and table styles are built once per theme from its palette.
+"""
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from io import BytesIO
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image, TableStyle
+
+from company_config import get_company_info
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent
+
+DEFAULT_THEME = 'red_black'
+
+# Theme palettes (hex values); every generator colour comes from one of these
+THEMES = {
+    'red_black': {
+        'primary': '#dc2626',
+        'secondary': '#1f2937',
+        'accent': '#ef4444',
+        'background': '#ffffff',
+        'text': '#1f2937',
+        'positive': '#059669',
+        'negative': '#dc2626',
+        'muted': '#6b7280',
+        'heading': '#374151',
+        'faint': '#9ca3af'
+    },
+    'blue': {
+        'primary': '#1e40af',
+        'secondary': '#0ea5e9',
+        'accent': '#1e293b',
+        'background': '#f8fafc',
+        'text': '#1f2937',
+        'positive': '#059669',
+        'negative': '#dc2626',
+        'muted': '#64748b',
+        'heading': '#374151',
+        'faint': '#9ca3af'
+    },
+    # Statement layout: red/black with a light slate background
+    'ledger': {
+        'primary': '#dc2626',
+        'secondary': '#1f2937',
+        'accent': '#ef4444',
+        'background': '#f8fafc',
+        'text': '#1f2937',
+        'positive': '#059669',
+        'negative': '#dc2626',
+        'muted': '#6b7280',
+        'heading': '#374151',
+        'faint': '#9ca3af'
+    }
+}
+
+
+class Palette(Mapping):
+    """Read-only theme colours; ``palette.hex`` holds the matching '#rrggbb' strings for markup"""
+    
+    def __init__(self, name: str, hex_values: Dict[str, str]):
+        self.name = name
+        self.hex = MappingProxyType(dict(hex_values))
+        self._colors = {key: colors.HexColor(value) for key, value in hex_values.items()}
+        
+    def __getitem__(self, key):
+        return self._colors[key]
+        
+    def __iter__(self):
+        return iter(self._colors)
+        
+    def __len__(self):
+        return len(self._colors)
+        
+    def __repr__(self):
+        return f"Palette({self.name!r})"
+
+
+class FrozenStyleSheet(StyleSheet1):
+    """Shared stylesheet; styles are looked up, never added per document"""
+    
+    def __init__(self, source: StyleSheet1):
+        super().__init__()
+        self.byName.update(source.byName)
+        self.byAlias.update(source.byAlias)
+        self._frozen = True
+        
+    def add(self, style, alias=None):
+        if getattr(self, '_frozen', False):
+            raise TypeError(
+                f"Cannot add style '{style.name}' to the shared PDF stylesheet; "
+                "register it in pdf_assets instead"
+            )
+        super().add(style, alias)
+
+
+def _build_styles(palette: Palette) -> FrozenStyleSheet:
+    styles = getSampleStyleSheet()
+    
+    # ============================================
+    # REPORT BRANDING (ReportGenerator family)
+    # ============================================
+    styles.add(ParagraphStyle(
+        name='CompanyHeader',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=4,
+        alignment=TA_CENTER,
+        textColor=palette['primary'],
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='CompanyTagline',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=2,
+        alignment=TA_CENTER,
+        textColor=palette['muted'],
+        fontName='Helvetica-Oblique'
+    ))
+    styles.add(ParagraphStyle(
+        name='CompanyAddress',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=2,
+        alignment=TA_CENTER,
+        textColor=palette['heading']
+    ))
+    styles.add(ParagraphStyle(
+        name='ReportTitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        textColor=palette['heading'],
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading3'],
+        fontSize=12,
+        spaceAfter=6,
+        textColor=palette['secondary'],
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='Summary',
+        parent=styles['Normal'],
+        fontSize=9,
+        spaceAfter=6,
+        textColor=palette['muted']
+    ))
+    styles.add(ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        alignment=TA_CENTER,
+        textColor=palette['faint']
+    ))
+    
+    # ============================================
+    # DOCUMENT TITLES (invoices, payslips)
+    # ============================================
+    styles.add(ParagraphStyle(
+        name='PayslipCompanyTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        textColor=palette['primary'],
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='PayslipCompanySubtitle',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=palette['muted'],
+        spaceAfter=12,
+        alignment=TA_CENTER
+    ))
+    styles.add(ParagraphStyle(
+        name='InvoiceCompanyTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=palette['primary'],
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='InvoiceCompanySubtitle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=palette['muted'],
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Oblique'
+    ))
+    styles.add(ParagraphStyle(
+        name='InvoiceHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=palette['heading'],
+        spaceAfter=12,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='ClassicInvoiceCompanyTitle',
+        parent=styles['Heading1'],
+        fontSize=26,
+        textColor=palette['primary'],
+        spaceAfter=4,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='ClassicInvoiceCompanySubtitle',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=palette['muted'],
+        spaceAfter=8,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Oblique'
+    ))
+    
+    # ============================================
+    # PLAIN ALIGNMENT STYLES (table cells, inline markup)
+    # ============================================
+    styles.add(ParagraphStyle('AlignLeft', alignment=TA_LEFT))
+    styles.add(ParagraphStyle('AlignCenter', alignment=TA_CENTER))
+    styles.add(ParagraphStyle('AlignRight', alignment=TA_RIGHT))
+    
+    return FrozenStyleSheet(styles)
+
+
+def _build_table_styles(palette: Palette) -> Dict[str, TableStyle]:
+    return {
+        # Logo + company block side by side
+        'logo_header': TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ]),
+        # Separator in the primary colour under the company header
+        'brand_rule': TableStyle([
+            ('LINEABOVE', (0, 0), (-1, 0), 2, palette['primary']),
+        ]),
+    }
+
+
+def _logo_candidates():
+    """Logo locations in priority order (env override, company config, bundled static file)"""
+    configured = os.getenv('PDF_LOGO_PATH')
+    if configured:
+        yield Path(configured)
+        
+    logo_path = get_company_info().get('logo_path')
+    if logo_path:
+        logo_path = Path(logo_path)
+        yield logo_path if logo_path.is_absolute() else BASE_DIR / logo_path
+        
+    yield BASE_DIR / 'static' / 'logo.png'
+
+
+def _load_logo() -> Optional[ImageReader]:
+    for candidate in _logo_candidates():
+        if not candidate.is_file():
+            continue
+        try:
+            with open(candidate, 'rb') as f:
+                reader = ImageReader(BytesIO(f.read()))
+            reader.getRGBData()  # decode the bitmap once; the reader caches the pixels
+            return reader
+        except Exception as e:
+            logger.warning("Could not load logo %s: %s", candidate, e)
+    return None
+
+
+class LogoImage(Image):
+    """Image flowable that draws an already-decoded bitmap instead of re-reading the file"""
+    
+    def __init__(self, reader: ImageReader, width=None, height=None, **kwargs):
+        self._img = reader
+        super().__init__(BytesIO(), width=width, height=height, **kwargs)
+
+
+class PDFAssets:
+    """Immutable bundle of everything a generator needs that does not depend on the document"""
+    
+    def __init__(self):
+        self.palettes = MappingProxyType({
+            name: Palette(name, values) for name, values in THEMES.items()
+        })
+        self.stylesheets = MappingProxyType({
+            name: _build_styles(palette) for name, palette in self.palettes.items()
+        })
+        self.theme_table_styles = MappingProxyType({
+            name: MappingProxyType(_build_table_styles(palette)) for name, palette in self.palettes.items()
+        })
+        # Default theme, for generators that are not themed
+        self.styles = self.stylesheets[DEFAULT_THEME]
+        self.table_styles = self.theme_table_styles[DEFAULT_THEME]
+        self.logo = _load_logo()
+        
+    @staticmethod
+    def _theme(theme: Optional[str]) -> str:
+        # Unknown themes fall back to the red/black default
+        return theme if theme in THEMES else DEFAULT_THEME
+        
+    def palette(self, theme: Optional[str] = None) -> Palette:
+        """Palette for a theme; unknown themes fall back to the red/black default"""
+        return self.palettes[self._theme(theme)]
+        
+    def stylesheet(self, theme: Optional[str] = None) -> FrozenStyleSheet:
+        """Stylesheet whose branded styles use the theme's palette"""
+        return self.stylesheets[self._theme(theme)]
+        
+    def table_style(self, name: str, theme: Optional[str] = None) -> TableStyle:
+        return self.theme_table_styles[self._theme(theme)][name]
+        
+    def logo_image(self, width, height) -> Optional[LogoImage]:
+        """Logo flowable at the given size, or None when no logo is configured"""
+        if self.logo is None:
+            return None
+        return LogoImage(self.logo, width=width, height=height)
+
+
+_assets: Optional[PDFAssets] = None
+_assets_lock = threading.Lock()
+
+
+def get_pdf_assets() -> PDFAssets:
+    """Return the process-wide asset registry, building it on first use"""
+    global _assets
+    if _assets is None:
+        with _assets_lock:
+            if _assets is None:
+                _assets = PDFAssets()
+    return _assets
@@ -0,0 +1,480 @@
+"""
+Period Close Service
+Month-end snapshots of every running-balance account (client and vendor
+ledgers, CEO capital, office expenses, staff advances) plus the monthly trip
+and expense totals used by the dashboard.
+
+Opening balances start from the nearest closed month and only scan postings
+after it, so their cost depends on the open period, not on account age.
+Any insert, update or delete dated on or before the last closed month-end
+marks that month and every later one stale; stale months are ignored by
+readers and re-closed in the background after the posting commits.
+"""
+import calendar
+import logging
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, literal, select, update
+from sqlalchemy.orm import Session, attributes
+
+import models
+from balance_heads import CEO_CAPITAL, OFFICE_EXPENSE, STAFF_ADVANCE
+
+logger = logging.getLogger(__name__)
+
+CLIENT = 'client'
+VENDOR = 'vendor'
+TRIPS = 'trips'        # total_in = revenue, total_out = vendor + operational trip costs
+EXPENSES = 'expenses'  # total_out = operating expenses
+
+ACCOUNT_TYPES = (CLIENT, VENDOR, CEO_CAPITAL, OFFICE_EXPENSE, STAFF_ADVANCE, TRIPS, EXPENSES)
+
+STATUS_CLOSED = 'closed'
+STATUS_STALE = 'stale'
+
+# Re-close stale months in a background thread once the back-dated posting commits
+AUTO_RECLOSE = os.getenv("PERIOD_AUTO_RECLOSE", "true").lower() == "true"
+
+# Detail models that feed a snapshot: the column that dates a posting and the
+# columns that change an amount or move it to another account
+TRACKED_COLUMNS = {
+    models.Receivable: ('invoice_date', ('client_id', 'total_amount')),
+    models.Collection: ('collection_date', ('client_id', 'collection_amount')),
+    models.Payable: ('created_at', ('vendor_id', 'amount')),
+    models.PaymentRequest: ('payment_date', ('vendor_id', 'requested_amount', 'status')),
+    models.CEOCapital: ('date', ('amount_in', 'amount_out')),
+    models.OfficeExpense: ('date', ('amount_received', 'amount_paid')),
+    models.StaffAdvanceLedger: ('transaction_date', ('staff_id', 'amount')),
+    models.Trip: ('date', (
+        'client_freight', 'vendor_freight', 'fuel_cost', 'advance_paid',
+        'munshiyana_bank_charges', 'other_expenses', 'status'
+    )),
+    models.Expense: ('date', ('amount',)),
+}
+
+# Balances below this are not carried into a snapshot
+ZERO_TOLERANCE = 0.005
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).date()
+    return value
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """First and last day of a month"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class PeriodCloseService:
+    """Month-end close and snapshot-based opening balances"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        
+    # ============================================
+    # READS
+    # ============================================
+    
+    def latest_close(self, before: date) -> Optional[models.PeriodClose]:
+        """Most recent closed (not stale) month that ends before the given day"""
+        return self.db.query(models.PeriodClose).filter(
+            models.PeriodClose.status == STATUS_CLOSED,
+            models.PeriodClose.period_end < before
+        ).order_by(models.PeriodClose.period_end.desc()).first()
+        
+    def opening_balances(self, account_type: str, as_of, entity_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """
+        Balance of each account at the start of ``as_of``: the nearest snapshot's
+        closing balance plus the postings between that month-end and ``as_of``
+        """
+        as_of = _as_date(as_of)
+        entity_ids = list(entity_ids) if entity_ids is not None else None
+        
+        snapshot = self.latest_close(as_of)
+        if snapshot:
+            rows = self.db.query(models.PeriodBalance.entity_id, models.PeriodBalance.closing_balance).filter(
+                models.PeriodBalance.period_close_id == snapshot.id,
+                models.PeriodBalance.account_type == account_type
+            )
+            if entity_ids is not None:
+                rows = rows.filter(models.PeriodBalance.entity_id.in_(entity_ids))
+            balances = {entity_id: float(balance) for entity_id, balance in rows.all()}
+            gap_start = snapshot.period_end + timedelta(days=1)
+        else:
+            balances = self._base_balances(account_type, entity_ids)
+            gap_start = None
+            
+        for entity_id, (total_in, total_out, _) in self._period_totals(account_type, gap_start, as_of, entity_ids).items():
+            balances[entity_id] = balances.get(entity_id, 0.0) + total_in - total_out
+            
+        if entity_ids is not None:
+            for entity_id in entity_ids:
+                balances.setdefault(entity_id, 0.0)
+        return balances
+        
+    def opening_balance(self, account_type: str, as_of, entity_id: int = 0) -> float:
+        return self.opening_balances(account_type, as_of, [entity_id])[entity_id]
+        
+    def period_totals(self, account_type: str, year: int, month: int) -> Tuple[float, float]:
+        """(total_in, total_out) for one month across all accounts of a type; from the snapshot when the month is closed"""
+        close = self.db.query(models.PeriodClose).filter(
+            models.PeriodClose.year == year,
+            models.PeriodClose.month == month,
+            models.PeriodClose.status == STATUS_CLOSED
+        ).first()
+        if close:
+            total_in, total_out = self.db.query(
+                func.coalesce(func.sum(models.PeriodBalance.total_in), 0.0),
+                func.coalesce(func.sum(models.PeriodBalance.total_out), 0.0)
+            ).filter(
+                models.PeriodBalance.period_close_id == close.id,
+                models.PeriodBalance.account_type == account_type
+            ).one()
+            return float(total_in), float(total_out)
+            
+        start, end = month_bounds(year, month)
+        totals = self._period_totals(account_type, start, end + timedelta(days=1))
+        return (
+            sum(values[0] for values in totals.values()),
+            sum(values[1] for values in totals.values())
+        )
+        
+    def status(self) -> List[Dict]:
+        counts = dict(self.db.query(
+            models.PeriodBalance.period_close_id, func.count(models.PeriodBalance.id)
+        ).group_by(models.PeriodBalance.period_close_id).all())
+        closes = self.db.query(models.PeriodClose).order_by(models.PeriodClose.period_end.desc()).all()
+        return [
+            {
+                "year": close.year,
+                "month": close.month,
+                "period_end": close.period_end,
+                "status": close.status,
+                "closed_at": close.closed_at,
+                "closed_by": close.closed_by,
+                "stale_since": close.stale_since,
+                "account_count": counts.get(close.id, 0)
+            }
+            for close in closes
+        ]
+        
+    # ============================================
+    # CLOSING
+    # ============================================
+    
+    def close_period(self, year: int, month: int, user_id: Optional[int] = None) -> models.PeriodClose:
+        """Freeze every account's balance at the end of a completed month (re-closing replaces the snapshot)"""
+        period_start, period_end = month_bounds(year, month)
+        if period_end >= date.today():
+            raise ValueError(f"{calendar.month_name[month]} {year} has not ended yet and cannot be closed")
+            
+        close = self.db.query(models.PeriodClose).filter(
+            models.PeriodClose.year == year,
+            models.PeriodClose.month == month
+        ).first()
+        if close is None:
+            close = models.PeriodClose(year=year, month=month, period_start=period_start, period_end=period_end)
+            self.db.add(close)
+            self.db.flush()
+        else:
+            self.db.query(models.PeriodBalance).filter(
+                models.PeriodBalance.period_close_id == close.id
+            ).delete(synchronize_session=False)
+            
+        next_day = period_end + timedelta(days=1)
+        rows = []
+        for account_type in ACCOUNT_TYPES:
+            opening = self.opening_balances(account_type, period_start)
+            totals = self._period_totals(account_type, period_start, next_day)
+            for entity_id in set(opening) | set(totals):
+                opening_balance = opening.get(entity_id, 0.0)
+                total_in, total_out, entry_count = totals.get(entity_id, (0.0, 0.0, 0))
+                if not entry_count and abs(opening_balance) < ZERO_TOLERANCE:
+                    continue
+                rows.append({
+                    'period_close_id': close.id,
+                    'account_type': account_type,
+                    'entity_id': entity_id,
+                    'opening_balance': opening_balance,
+                    'total_in': total_in,
+                    'total_out': total_out,
+                    'closing_balance': opening_balance + total_in - total_out,
+                    'entry_count': entry_count
+                })
+        if rows:
+            self.db.bulk_insert_mappings(models.PeriodBalance, rows)
+            
+        close.status = STATUS_CLOSED
+        close.closed_at = datetime.now()
+        close.closed_by = user_id
+        close.stale_since = None
+        self.db.flush()
+        
+        logger.info("Closed %s-%02d with %s account balances", year, month, len(rows))
+        return close
+        
+    def close_through(self, year: Optional[int] = None, month: Optional[int] = None, user_id: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Close every month up to and including the given one (default: last
+        completed month) that is not already closed, oldest first
+        """
+        if year is None or month is None:
+            last_month_end = date.today().replace(day=1) - timedelta(days=1)
+            year, month = last_month_end.year, last_month_end.month
+            
+        closed = {
+            (close_year, close_month)
+            for close_year, close_month in self.db.query(models.PeriodClose.year, models.PeriodClose.month).filter(
+                models.PeriodClose.status == STATUS_CLOSED
+            ).all()
+        }
+        first = self._first_activity()
+        if first is None:
+            return []
+            
+        done = []
+        current = (first.year, first.month)
+        while current <= (year, month):
+            if current not in closed:
+                self.close_period(current[0], current[1], user_id)
+                done.append(current)
+            current = _next_month(*current)
+        return done
+        
+    def reclose_stale(self, user_id: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Re-close stale months oldest first, so each one starts from a fresh predecessor"""
+        stale = self.db.query(models.PeriodClose.year, models.PeriodClose.month).filter(
+            models.PeriodClose.status == STATUS_STALE
+        ).order_by(models.PeriodClose.period_end).all()
+        for year, month in stale:
+            self.close_period(year, month, user_id)
+        return [(year, month) for year, month in stale]
+        
+    # ============================================
+    # DETAIL AGGREGATES
+    # ============================================
+    
+    def _base_balances(self, account_type: str, entity_ids: Optional[List[int]]) -> Dict[int, float]:
+        """Balances carried in from before the detail rows (balance head opening balances)"""
+        if account_type not in (CEO_CAPITAL, OFFICE_EXPENSE, STAFF_ADVANCE):
+            return {}
+        query = self.db.query(models.BalanceHead.account_id, models.BalanceHead.opening_balance).filter(
+            models.BalanceHead.account_type == account_type,
+            models.BalanceHead.opening_balance != 0
+        )
+        if entity_ids is not None:
+            query = query.filter(models.BalanceHead.account_id.in_(entity_ids))
+        return {account_id: float(balance) for account_id, balance in query.all()}
+        
+    def _period_totals(
+        self,
+        account_type: str,
+        start: Optional[date],
+        end: date,
+        entity_ids: Optional[List[int]] = None
+    ) -> Dict[int, Tuple[float, float, int]]:
+        """(total_in, total_out, entry_count) per account for postings dated in [start, end)"""
+        def in_range(query, column, is_datetime=True):
+            lower = datetime.combine(start, time.min) if is_datetime and start else start
+            upper = datetime.combine(end, time.min) if is_datetime else end
+            if lower is not None:
+                query = query.filter(column >= lower)
+            return query.filter(column < upper)
+            
+        def per_entity(query, entity_column):
+            if entity_ids is not None:
+                query = query.filter(entity_column.in_(entity_ids))
+            return query.group_by(entity_column)
+            
+        zero = literal(0.0)
+        company = literal(0)
+        queries = []
+        if account_type == CLIENT:
+            receivable, collection = models.Receivable, models.Collection
+            queries.append(per_entity(in_range(self.db.query(
+                receivable.client_id, func.sum(receivable.total_amount), zero, func.count(receivable.id)
+            ), receivable.invoice_date), receivable.client_id))
+            queries.append(per_entity(in_range(self.db.query(
+                collection.client_id, zero, func.sum(collection.collection_amount), func.count(collection.id)
+            ), collection.collection_date), collection.client_id))
+        elif account_type == VENDOR:
+            payable, payment = models.Payable, models.PaymentRequest
+            queries.append(per_entity(in_range(self.db.query(
+                payable.vendor_id, func.sum(payable.amount), zero, func.count(payable.id)
+            ), payable.created_at), payable.vendor_id))
+            queries.append(per_entity(in_range(self.db.query(
+                payment.vendor_id, zero, func.sum(payment.requested_amount), func.count(payment.id)
+            ).filter(
+                payment.status.in_([models.PaymentRequestStatus.APPROVED, models.PaymentRequestStatus.PAID])
+            ), payment.payment_date), payment.vendor_id))
+        elif account_type == CEO_CAPITAL:
+            ceo = models.CEOCapital
+            queries.append(in_range(self.db.query(
+                company, func.sum(ceo.amount_in), func.sum(ceo.amount_out), func.count(ceo.id)
+            ), ceo.date, is_datetime=False))
+        elif account_type == OFFICE_EXPENSE:
+            office = models.OfficeExpense
+            queries.append(in_range(self.db.query(
+                company, func.sum(office.amount_received), func.sum(office.amount_paid), func.count(office.id)
+            ), office.date, is_datetime=False))
+        elif account_type == STAFF_ADVANCE:
+            ledger = models.StaffAdvanceLedger
+            queries.append(per_entity(in_range(self.db.query(
+                ledger.staff_id,
+                func.sum(case((ledger.amount > 0, ledger.amount), else_=0.0)),
+                func.sum(case((ledger.amount < 0, -ledger.amount), else_=0.0)),
+                func.count(ledger.id)
+            ), ledger.transaction_date), ledger.staff_id))
+        elif account_type == TRIPS:
+            trip = models.Trip
+            active = trip.status != models.TripStatus.CANCELLED
+            queries.append(in_range(self.db.query(
+                company, func.sum(trip.client_freight), func.sum(trip.vendor_freight), func.count(trip.id)
+            ).filter(active), trip.date))
+            queries.append(in_range(self.db.query(
+                company, zero,
+                func.sum(trip.fuel_cost + trip.advance_paid + trip.munshiyana_bank_charges + trip.other_expenses),
+                literal(0)
+            ).filter(active), trip.date))
+        elif account_type == EXPENSES:
+            expense = models.Expense
+            queries.append(in_range(self.db.query(
+                company, zero, func.sum(expense.amount), func.count(expense.id)
+            ), expense.date))
+        else:
+            raise ValueError(f"Unknown account type '{account_type}'; use one of {', '.join(ACCOUNT_TYPES)}")
+            
+        totals: Dict[int, List] = {}
+        for query in queries:
+            for entity_id, total_in, total_out, entry_count in query.all():
+                if not entry_count and not total_in and not total_out:
+                    continue
+                current = totals.setdefault(entity_id, [0.0, 0.0, 0])
+                current[0] += float(total_in or 0)
+                current[1] += float(total_out or 0)
+                current[2] += int(entry_count or 0)
+        return {entity_id: tuple(values) for entity_id, values in totals.items()}
+        
+    def _first_activity(self) -> Optional[date]:
+        """Date of the oldest posting in any tracked table"""
+        earliest = []
+        for model, (date_attr, _) in TRACKED_COLUMNS.items():
+            value = self.db.query(func.min(getattr(model, date_attr))).scalar()
+            if value is not None:
+                earliest.append(_as_date(value))
+        return min(earliest) if earliest else None
+
+
+# ============================================
+# BACK-DATED POSTINGS
+# ============================================
+
+def invalidate_from(db: Session, day) -> int:
+    """
+    Mark every closed month ending on or after ``day`` stale, in the caller's
+    transaction. Bulk writes that bypass the ORM flush call this themselves.
+    """
+    day = _as_date(day)
+    result = db.connection().execute(
+        update(models.PeriodClose.__table__).where(
+            models.PeriodClose.__table__.c.status == STATUS_CLOSED,
+            models.PeriodClose.__table__.c.period_end >= day
+        ).values(status=STATUS_STALE, stale_since=datetime.now())
+    )
+    if result.rowcount:
+        db.info['periods_stale'] = True
+        logger.info("Back-dated posting on %s marked %s closed month(s) stale", day, result.rowcount)
+    return result.rowcount
+
+
+def _posting_dates(session: Session) -> List[date]:
+    dates = []
+    for obj in chain(session.new, session.deleted):
+        spec = TRACKED_COLUMNS.get(type(obj))
+        if spec:
+            dates.append(getattr(obj, spec[0], None))
+            
+    for obj in session.dirty:
+        spec = TRACKED_COLUMNS.get(type(obj))
+        if not spec:
+            continue
+        date_attr, amount_attrs = spec
+        state = attributes.instance_state(obj)
+        changed = False
+        for name in (date_attr,) + amount_attrs:
+            history = state.attrs[name].history
+            if history.has_changes():
+                changed = True
+                if name == date_attr:
+                    dates.extend(history.deleted)
+        if changed:
+            dates.append(getattr(obj, date_attr))
+            
+    return [_as_date(value) for value in dates if value is not None]
+
+
+@event.listens_for(Session, 'before_flush')
+def _invalidate_backdated_periods(session, flush_context, instances):
+    dates = _posting_dates(session)
+    if not dates:
+        return
+    last_close = session.connection().execute(
+        select(func.max(models.PeriodClose.__table__.c.period_end)).where(
+            models.PeriodClose.__table__.c.status == STATUS_CLOSED
+        )
+    ).scalar()
+    last_close = _as_date(last_close)
+    if last_close is not None and min(dates) <= last_close:
+        invalidate_from(session, min(dates))
+
+
+@event.listens_for(Session, 'after_commit')
+def _reclose_after_commit(session):
+    if session.info.pop('periods_stale', False) and AUTO_RECLOSE:
+        schedule_reclose()
+
+
+_reclose_lock = threading.Lock()
+_reclose_requested = threading.Event()
+
+
+def schedule_reclose():
+    """Re-close stale months on a background thread; requests made while one runs are folded into it"""
+    _reclose_requested.set()
+    if _reclose_lock.acquire(blocking=False):
+        threading.Thread(target=_reclose_worker, name="period-reclose", daemon=True).start()
+
+
+def _reclose_worker():
+    from database import SessionLocal
+    
+    try:
+        while _reclose_requested.is_set():
+            _reclose_requested.clear()
+            db = SessionLocal()
+            try:
+                reclosed = PeriodCloseService(db).reclose_stale()
+                db.commit()
+                if reclosed:
+                    logger.info("Re-closed %s stale month(s)", len(reclosed))
+            except Exception:
+                db.rollback()
+                logger.exception("Re-closing stale periods failed; they stay stale until the next attempt")
+            finally:
+                db.close()
+    finally:
+        _reclose_lock.release()
+    if _reclose_requested.is_set():
+        schedule_reclose()
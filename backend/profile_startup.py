@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Startup profile
+Shows where worker cold-start time goes: the slowest imports of the app
+module (from python -X importtime) and the time of each startup step.
+
+Usage:
+    python profile_startup.py [--top 25] [--module main] [--skip-steps]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+def import_times(module: str):
+    """(self_us, cumulative_us, name) for every module imported by `import module`"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        sys.exit(completed.returncode)
+        
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile application import and startup time")
+    parser.add_argument("--top", type=int, default=25, help="Number of imports to list")
+    parser.add_argument("--module", default="main", help="Application module to import")
+    parser.add_argument("--skip-steps", action="store_true", help="Only profile imports")
+    args = parser.parse_args()
+    
+    rows = import_times(args.module)
+    total = next((cumulative for _, cumulative, name in rows if name.strip() == args.module), 0)
+    print(f"Importing {args.module}: {total / 1000:.0f} ms, {len(rows)} modules\n")
+    print(f"{'self ms':>9} {'total ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+        
+    if args.skip_steps:
+        return
+        
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import startup
+    from database import engine
+    
+    print("\nStartup steps:")
+    for name, seconds in startup.prepare_database(engine).items():
+        print(f"{seconds * 1000:9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
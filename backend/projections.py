@@ -0,0 +1,87 @@
+"""
+Projections
+Column-projected list queries. A Projection declares the fields one list
+endpoint emits, the column or SQL expression each one comes from and the
+outer joins those columns need. Its statement selects exactly those columns
+in one query, and rows come back as __slots__ records instead of ORM
+entities: nothing unused is loaded and no relationship is lazy-loaded per row.
+
+Field keys with a dot ("client.name") are nested objects in JSON output
+(json_responses.rows_to_dicts); on records the dot becomes a double
+underscore (record.client__name).
+"""
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from json_responses import rows_to_dicts
+
+
+class Record:
+    """Base of the row classes Projection generates; iterable and indexable like a row tuple"""
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    
+    def __init__(self, values: Iterable[Any]):
+        for slot, value in zip(self.__slots__, values):
+            setattr(self, slot, value)
+            
+    def __iter__(self):
+        return (getattr(self, slot) for slot in self.__slots__)
+        
+    def __getitem__(self, index: int):
+        return getattr(self, self.__slots__[index])
+        
+    def __len__(self) -> int:
+        return len(self.__slots__)
+        
+    def __repr__(self) -> str:
+        values = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__)
+        return f"{type(self).__name__}({values})"
+        
+    def as_dict(self) -> Dict[str, Any]:
+        return rows_to_dicts([self])[0]
+
+
+def entity_columns(entity, *names: str, prefix: str = "") -> Dict[str, Any]:
+    """{prefix + name: column} for the named columns of a mapped class"""
+    return {prefix + name: getattr(entity, name) for name in names}
+
+
+def schema_columns(schema, entity, prefix: str = "") -> Dict[str, Any]:
+    """Columns of entity named by the fields of a Pydantic response schema, in schema order"""
+    table = entity.__table__
+    return entity_columns(entity, *(name for name in schema.model_fields if name in table.c), prefix=prefix)
+
+
+class Projection:
+    def __init__(self, name: str, entity, fields: Dict[str, Any], joins: Sequence[Tuple[Any, Any]] = ()):
+        """
+        Args:
+            name: Class name of the generated records
+            entity: Mapped class the rows come from (the FROM clause)
+            fields: Output key -> column or SQL expression, in output order
+            joins: (target, onclause) pairs, outer joined in order
+        """
+        self.entity = entity
+        self.fields = dict(fields)
+        self.joins = list(joins)
+        slots = tuple(key.replace(".", "__") for key in self.fields)
+        if len(set(slots)) != len(slots):
+            raise ValueError(f"Projection {name} has fields that map to the same record attribute")
+        self.record = type(name, (Record,), {"__slots__": slots, "_fields": tuple(self.fields)})
+        
+    def select(self) -> Select:
+        """SELECT of every field with the joins; add filters, ordering and limits to it"""
+        statement = select(*(column.label(key) for key, column in self.fields.items())).select_from(self.entity)
+        for target, onclause in self.joins:
+            statement = statement.outerjoin(target, onclause)
+        return statement
+        
+    def records(self, rows: Iterable[Sequence[Any]]) -> List[Record]:
+        record = self.record
+        return [record(row) for row in rows]
+        
+    def fetch(self, db, statement: Select) -> List[Record]:
+        return self.records(db.execute(statement))
@@ -6,16 +6,14 @@ Generates professional reports with print-ready layouts and company branding
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import pandas as pd
 from io import BytesIO
 from datetime import datetime, date
-from typing import List, Dict, Any, Optional
-import os
+from typing import List, Dict
 from company_config import get_company_info, get_company_header
+from pdf_assets import get_pdf_assets
 
 class ReportGenerator:
     """
@@ -26,95 +24,18 @@ class ReportGenerator:
     def __init__(self):
         self.company_info = get_company_info()
         self.company_header = get_company_header()
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
-    
-    def setup_custom_styles(self):
-        """Setup custom styles for reports"""
-        # Company header style
-        self.styles.add(ParagraphStyle(
-            name='CompanyHeader',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            spaceAfter=4,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#dc2626'),
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Company tagline style
-        self.styles.add(ParagraphStyle(
-            name='CompanyTagline',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            spaceAfter=2,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#6b7280'),
-            fontName='Helvetica-Oblique'
-        ))
-        
-        # Company address style
-        self.styles.add(ParagraphStyle(
-            name='CompanyAddress',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            spaceAfter=2,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#374151')
-        ))
-        
-        # Report title style
-        self.styles.add(ParagraphStyle(
-            name='ReportTitle',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#374151'),
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading3'],
-            fontSize=12,
-            spaceAfter=6,
-            textColor=colors.HexColor('#1f2937'),
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Summary style
-        self.styles.add(ParagraphStyle(
-            name='Summary',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            spaceAfter=6,
-            textColor=colors.HexColor('#6b7280')
-        ))
-        
-        # Footer style
-        self.styles.add(ParagraphStyle(
-            name='Footer',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#9ca3af')
-        ))
+        # Styles and logo come from the shared registry; nothing is rebuilt per generator
+        self.assets = get_pdf_assets()
+        self.styles = self.assets.styles
     
     def create_header(self, doc_title: str, date_range: str = None) -> List:
         """Create standard report header with company branding"""
         elements = []
         
         # Add logo if exists
-        logo_path = self.company_info.get('logo_path')
-        if logo_path and os.path.exists(logo_path):
-            try:
-                logo = Image(logo_path, width=1.5*inch, height=0.75*inch)
-                elements.append(logo)
-                elements.append(Spacer(1, 6))
-            except:
-                pass  # Skip logo if file not found
+        if self.assets.logo:
+            elements.append(self.assets.logo_image(1.5*inch, 0.75*inch))
+            elements.append(Spacer(1, 6))
         
         # Company name
         elements.append(Paragraph(self.company_info['name'], self.styles['CompanyHeader']))
@@ -133,9 +54,7 @@ class ReportGenerator:
         # Separator line
         elements.append(Spacer(1, 12))
         line_table = Table([['']], colWidths=[7*inch])
-        line_table.setStyle(TableStyle([
-            ('LINEABOVE', (0, 0), (-1, 0), 2, colors.HexColor('#dc2626')),
-        ]))
+        line_table.setStyle(self.assets.table_style('brand_rule'))
         elements.append(line_table)
         elements.append(Spacer(1, 12))
         
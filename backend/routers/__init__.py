@@ -0,0 +1,60 @@
+"""
+Feature Routers
+The API is split into one APIRouter module per feature so a deployment can
+mount only what a worker pool serves. Modules of routers that are not mounted
+are never imported.
+
+Configuration (environment variables):
+    APP_ROLE       Preset router set: all, api or documents (default: all)
+    APP_ROUTERS    Comma-separated router names; overrides APP_ROLE
+"""
+import importlib
+import os
+from typing import List, Optional
+
+# Mount order matters where paths overlap (dashboard's /clients/aging-analysis
+# must precede operations' /clients/{client_id})
+ROUTERS = [
+    "accounts",
+    "notifications",
+    "admin",
+    "dashboard",
+    "operations",
+    "ledgers",
+    "reports",
+    "invoices",
+    "payroll",
+    "imports",
+]
+
+ROLES = {
+    "all": ROUTERS,
+    # Interactive API without the PDF/Excel document stack
+    "api": ["accounts", "notifications", "admin", "dashboard", "operations", "ledgers"],
+    # Report and document generation workers
+    "documents": ["reports", "invoices", "payroll", "imports"],
+}
+
+
+def selected_routers() -> List[str]:
+    """Router names to mount, in mount order"""
+    names = os.getenv("APP_ROUTERS")
+    if names:
+        wanted = {name.strip() for name in names.split(",") if name.strip()}
+    else:
+        role = os.getenv("APP_ROLE", "all")
+        if role not in ROLES:
+            raise ValueError(f"APP_ROLE must be one of: {', '.join(ROLES)}")
+        wanted = set(ROLES[role])
+    unknown = wanted - set(ROUTERS)
+    if unknown:
+        raise ValueError(f"Unknown routers in APP_ROUTERS: {', '.join(sorted(unknown))}")
+    return [name for name in ROUTERS if name in wanted]
+
+
+def include_routers(app, names: Optional[List[str]] = None) -> List[str]:
+    """Import and mount the given routers (default: selected_routers()); returns the names mounted"""
+    names = selected_routers() if names is None else names
+    for name in names:
+        app.include_router(importlib.import_module(f"routers.{name}").router)
+    return names
@@ -0,0 +1,329 @@
+"""
+Account Routes
+Login, password reset, user management and two-factor authentication
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session
+from datetime import timedelta
+import models
+import schemas
+import crud
+import auth
+from database import get_db
+
+router = APIRouter(tags=["accounts"])
+
+# Authentication endpoints
+@router.post("/token", response_model=schemas.Token)
+def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = auth.authenticate_user(db, form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = auth.create_access_token(
+        data={"sub": user.username}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+# ============================================
+# PASSWORD RESET ENDPOINTS
+# ============================================
+
+@router.post("/password-reset/request")
+def request_password_reset(
+    email: str,
+    db: Session = Depends(get_db)
+):
+    """Request password reset - sends email with reset link"""
+    from password_reset_service import PasswordResetService
+    
+    result = PasswordResetService.create_reset_token(db, email)
+    return result
+
+@router.post("/password-reset/validate")
+def validate_reset_token(
+    token: str,
+    db: Session = Depends(get_db)
+):
+    """Validate if reset token is valid"""
+    from password_reset_service import PasswordResetService
+    
+    user = PasswordResetService.validate_reset_token(db, token)
+    
+    if user:
+        return {
+            "valid": True,
+            "username": user.username
+        }
+    else:
+        return {
+            "valid": False,
+            "error": "Invalid or expired token"
+        }
+
+@router.post("/password-reset/reset")
+def reset_password(
+    token: str,
+    new_password: str,
+    db: Session = Depends(get_db)
+):
+    """Reset password using token"""
+    from password_reset_service import PasswordResetService
+    
+    result = PasswordResetService.reset_password(db, token, new_password)
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+@router.post("/users/", response_model=schemas.User)
+def create_user(
+    user: schemas.UserCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    return crud.create_user(db=db, user=user)
+
+# ============================================
+# USER MANAGEMENT ENDPOINTS
+# ============================================
+
+@router.get("/users/", response_model=list[schemas.User])
+def get_all_users(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Get all users - Admin only"""
+    users = db.query(models.User).all()
+    return users
+
+@router.get("/users/{user_id}", response_model=schemas.User)
+def get_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Get specific user - Admin only"""
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+@router.put("/users/{user_id}", response_model=schemas.User)
+def update_user(
+    user_id: int,
+    user_update: schemas.UserUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Update user - Admin only"""
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Prevent admin from deactivating themselves
+    if user.id == current_user.id and user_update.is_active == False:
+        raise HTTPException(status_code=400, detail="Cannot deactivate your own account")
+    
+    # Update fields
+    if user_update.full_name is not None:
+        user.full_name = user_update.full_name
+    if user_update.email is not None:
+        user.email = user_update.email
+    if user_update.role is not None:
+        user.role = user_update.role
+    if user_update.is_active is not None:
+        user.is_active = user_update.is_active
+    
+    db.commit()
+    db.refresh(user)
+    return user
+
+@router.delete("/users/{user_id}")
+def delete_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Delete user - Admin only"""
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Prevent admin from deleting themselves
+    if user.id == current_user.id:
+        raise HTTPException(status_code=400, detail="Cannot delete your own account")
+    
+    db.delete(user)
+    db.commit()
+    return {"message": f"User {user.username} deleted successfully"}
+
+@router.put("/users/{user_id}/password")
+def reset_user_password(
+    user_id: int,
+    password_data: schemas.PasswordReset,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Reset user password - Admin only"""
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Hash new password
+    user.hashed_password = auth.get_password_hash(password_data.new_password)
+    db.commit()
+    
+    return {"message": f"Password reset successfully for {user.username}"}
+
+@router.get("/users/me/permissions")
+def get_my_permissions(
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get current user's permissions"""
+    permissions = {
+        models.UserRole.ADMIN: {
+            "can_manage_users": True,
+            "can_view_profit": True,
+            "can_approve_payments": True,
+            "can_delete_data": True,
+            "can_view_all_reports": True,
+            "can_manage_master_data": True
+        },
+        models.UserRole.MANAGER: {
+            "can_manage_users": False,
+            "can_view_profit": False,
+            "can_approve_payments": True,
+            "can_delete_data": False,
+            "can_view_all_reports": True,
+            "can_manage_master_data": True
+        },
+        models.UserRole.SUPERVISOR: {
+            "can_manage_users": False,
+            "can_view_profit": False,
+            "can_approve_payments": False,
+            "can_delete_data": False,
+            "can_view_all_reports": False,
+            "can_manage_master_data": False
+        }
+    }
+    
+    return {
+        "user": {
+            "id": current_user.id,
+            "username": current_user.username,
+            "full_name": current_user.full_name,
+            "role": current_user.role.value
+        },
+        "permissions": permissions.get(current_user.role, {})
+    }
+
+# ============================================
+# TWO-FACTOR AUTHENTICATION (2FA) ENDPOINTS
+# ============================================
+
+@router.post("/2fa/enable")
+def enable_2fa(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Enable 2FA for current user"""
+    from two_factor_auth import TwoFactorAuth
+    
+    tfa = TwoFactorAuth()
+    result = tfa.enable_2fa(db, current_user.id)
+    
+    return result
+
+@router.post("/2fa/disable")
+def disable_2fa(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Disable 2FA for current user"""
+    from two_factor_auth import TwoFactorAuth
+    
+    tfa = TwoFactorAuth()
+    result = tfa.disable_2fa(db, current_user.id)
+    
+    return result
+
+@router.post("/2fa/send-otp")
+def send_otp(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Send OTP to user's email"""
+    from two_factor_auth import TwoFactorAuth
+    
+    tfa = TwoFactorAuth()
+    result = tfa.send_otp(db, current_user.id)
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+@router.post("/2fa/verify-otp")
+def verify_otp(
+    otp: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Verify OTP code"""
+    from two_factor_auth import TwoFactorAuth
+    
+    tfa = TwoFactorAuth()
+    result = tfa.verify_otp(db, current_user.id, otp)
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+@router.post("/2fa/generate-backup-codes")
+def generate_backup_codes(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Generate backup codes for 2FA"""
+    from two_factor_auth import TwoFactorAuth
+    
+    tfa = TwoFactorAuth()
+    result = tfa.generate_backup_codes(db, current_user.id)
+    
+    return result
+
+@router.post("/2fa/verify-backup-code")
+def verify_backup_code(
+    code: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Verify backup code"""
+    from two_factor_auth import TwoFactorAuth
+    
+    tfa = TwoFactorAuth()
+    result = tfa.verify_backup_code(db, current_user.id, code)
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+@router.get("/2fa/status")
+def get_2fa_status(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get 2FA status for current user"""
+    return {
+        "enabled": current_user.two_factor_enabled if hasattr(current_user, 'two_factor_enabled') else False,
+        "email": current_user.email
+    }
@@ -0,0 +1,334 @@
+"""
+Administration Routes
+Company settings, backups, audit logs and database reset
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import models
+import auth
+from database import get_db
+from audit_service import AuditService
+from json_responses import ORJSONResponse, RowsResponse
+
+router = APIRouter(tags=["admin"])
+
+# ============================================
+# COMPANY SETTINGS ENDPOINTS
+# ============================================
+
+@router.get("/company-settings")
+def get_company_settings(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get company settings"""
+    settings = db.query(models.CompanySetting).first()
+    if not settings:
+        # Create default settings if none exist
+        settings = models.CompanySetting()
+        db.add(settings)
+        db.commit()
+        db.refresh(settings)
+    return settings
+
+@router.put("/company-settings")
+def update_company_settings(
+    settings_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Update company settings (Admin only)"""
+    settings = db.query(models.CompanySetting).first()
+    if not settings:
+        settings = models.CompanySetting()
+        db.add(settings)
+    
+    # Update fields
+    for key, value in settings_data.items():
+        if hasattr(settings, key):
+            setattr(settings, key, value)
+    
+    settings.updated_by = current_user.id
+    db.commit()
+    db.refresh(settings)
+    return settings
+
+# ============================================
+# BACKUP & RESTORE ENDPOINTS
+# ============================================
+
+@router.post("/backup/create")
+def create_backup(
+    description: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Create database backup (Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    result = service.create_backup(description or f"Manual backup by {current_user.username}")
+    
+    if result["success"]:
+        return {
+            "success": True,
+            "message": "Backup created successfully",
+            "backup": result["metadata"]
+        }
+    else:
+        raise HTTPException(status_code=500, detail=result["error"])
+
+@router.get("/backup/list")
+def list_backups(
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """List backups from the backup catalog, newest first (Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    backups = service.list_backups(limit=limit, offset=offset)
+    return {
+        "backups": backups,
+        "total": service.count_backups(),
+        "limit": limit,
+        "offset": offset
+    }
+
+@router.post("/backup/verify")
+def verify_backups(
+    backup_name: Optional[str] = None,
+    workers: int = 4,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Verify integrity of one or all backups in parallel (Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    results = service.verify_backups([backup_name] if backup_name else None, workers=min(max(workers, 1), 16))
+    return {
+        "verified": len(results),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "results": results
+    }
+
+@router.post("/backup/catalog/rebuild")
+def rebuild_backup_catalog(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Rebuild the backup catalog by scanning the backup directory (Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    return {"backups": len(service.rebuild_catalog())}
+
+@router.post("/backup/retention")
+def apply_backup_retention(
+    keep_last: Optional[int] = None,
+    keep_daily: Optional[int] = None,
+    keep_weekly: Optional[int] = None,
+    keep_monthly: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Apply backup retention policy (defaults from BACKUP_KEEP_* settings, Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    return service.apply_retention(
+        keep_last=keep_last,
+        keep_daily=keep_daily,
+        keep_weekly=keep_weekly,
+        keep_monthly=keep_monthly
+    )
+
+@router.post("/backup/restore/{backup_name}")
+def restore_backup(
+    backup_name: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Restore from backup (Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    backup_file = service.find_backup(backup_name)
+    
+    if backup_file is None:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    
+    result = service.restore_backup(str(backup_file))
+    
+    if result["success"]:
+        return {
+            "success": True,
+            "message": "Database restored successfully",
+            "safety_backup": result["safety_backup"]
+        }
+    else:
+        raise HTTPException(status_code=500, detail=result["error"])
+
+@router.delete("/backup/{backup_name}")
+def delete_backup(
+    backup_name: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Delete backup (Admin only)"""
+    from backup_service import BackupService
+    
+    service = BackupService()
+    backup_file = service.find_backup(backup_name)
+    
+    if backup_file is None:
+        raise HTTPException(status_code=404, detail="Backup not found")
+    
+    result = service.delete_backup(str(backup_file))
+    
+    if result["success"]:
+        return {"success": True, "message": "Backup deleted"}
+    else:
+        raise HTTPException(status_code=500, detail=result["error"])
+
+# ============================================
+# AUDIT TRAIL ENDPOINTS
+# ============================================
+
+@router.get("/audit-logs")
+def get_audit_logs(
+    table_name: Optional[str] = None,
+    record_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    include_archived: bool = False,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Get audit logs (Admin/Manager only); include_archived also searches archived months"""
+    audit = AuditService(db)
+    
+    if include_archived:
+        return ORJSONResponse(audit.search(
+            table_name=table_name,
+            record_id=record_id,
+            user_id=user_id,
+            action=action,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            include_archived=True
+        ))
+    
+    if table_name and record_id:
+        logs = audit.get_record_history(table_name, record_id, limit=limit, rows=True)
+    elif user_id:
+        logs = audit.get_user_activity(user_id, start_date, end_date, limit=limit, rows=True)
+    else:
+        # Get recent audit logs
+        logs = audit.get_audit_trail(
+            table_name=table_name,
+            action=action,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            rows=True
+        )
+    
+    return RowsResponse(logs)
+
+@router.post("/audit-logs/archive")
+def archive_audit_logs(
+    keep_months: int = 12,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Move audit logs older than the last keep_months months to compressed archive files (Admin only)"""
+    import audit_archive
+    
+    if keep_months < 1:
+        raise HTTPException(status_code=400, detail="keep_months must be at least 1")
+    
+    archived = audit_archive.archive_old_months(db, keep_months, user_id=current_user.id)
+    return {
+        "archived": archived,
+        "rows": sum(item["rows"] for item in archived)
+    }
+
+@router.get("/audit-logs/archives")
+def list_audit_archives(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """List archived audit months (Admin/Manager only)"""
+    return db.query(models.AuditArchive).order_by(
+        models.AuditArchive.month.desc(), models.AuditArchive.id
+    ).all()
+
+
+# ============================================
+# DATABASE POOL
+# ============================================
+
+@router.get("/admin/db-pool")
+def get_db_pool_metrics(
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Connection pool occupancy, checkout wait times and read-replica status for this worker process (Admin only)"""
+    from database import pool_metrics, replica_engine, replica_router
+    
+    metrics = pool_metrics()
+    if replica_router is not None:
+        metrics["replica"] = dict(pool_metrics(replica_engine), **replica_router.status())
+    return metrics
+
+# ============================================
+# ADMIN ENDPOINTS - DANGEROUS OPERATIONS
+# ============================================
+
+@router.post("/admin/reset-database")
+def reset_database(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """
+    DANGER: Reset all data in the database
+    This will delete ALL records except users
+    Admin only - requires confirmation
+    """
+    try:
+        # Delete all data (keep users for login)
+        db.query(models.StaffAdvanceLedger).delete()
+        db.query(models.OfficeExpense).delete()
+        # Every balance head, ceo_capital included; heads are rebuilt from the remaining detail rows on next use
+        db.query(models.BalanceHead).delete(synchronize_session=False)
+        db.query(models.PeriodBalance).delete()
+        db.query(models.PeriodClose).delete()
+        db.query(models.Receivable).delete()
+        db.query(models.Payable).delete()
+        db.query(models.FinancialTransaction).delete()
+        db.query(models.Trip).delete()
+        db.query(models.Staff).delete()
+        db.query(models.Client).delete()
+        db.query(models.Vendor).delete()
+        db.query(models.Vehicle).delete()
+        db.query(models.VehicleLog).delete()
+        
+        db.commit()
+        
+        return {
+            "message": "Database reset successfully",
+            "deleted": "All trips, clients, vendors, staff, vehicles, and financial records",
+            "preserved": "User accounts"
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to reset database: {str(e)}")
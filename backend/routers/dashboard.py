@@ -0,0 +1,399 @@
+"""
+Dashboard Routes
+Summary widgets, aging analysis, cash position and global search
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func
+import models
+import schemas
+import crud
+import auth
+from database import get_db
+import search_index
+from json_responses import ORJSONResponse
+from projections import Projection, entity_columns
+
+router = APIRouter(tags=["dashboard"])
+
+# Dashboard endpoints
+@router.get("/dashboard/stats", response_model=schemas.DashboardStats)
+def get_dashboard_stats(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_dashboard_stats(db)
+
+@router.get("/dashboard/financial-summary")
+def get_financial_summary(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get comprehensive financial summary for dashboard"""
+    from financial_calculator import FinancialCalculator
+    
+    calculator = FinancialCalculator(db)
+    try:
+        return calculator.get_master_financial_summary()
+    finally:
+        calculator.close()
+
+@router.get("/dashboard/chart-data")
+def get_dashboard_chart_data(
+    months: int = 6,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get chart data for dashboard visualizations"""
+    from financial_calculator import FinancialCalculator
+    
+    calculator = FinancialCalculator(db)
+    try:
+        return calculator.get_revenue_vs_expenses_chart_data(months)
+    finally:
+        calculator.close()
+
+# ============================================
+# DAILY CASH FLOW ENDPOINTS
+# ============================================
+
+@router.get("/daily-cash-flow")
+def get_daily_cash_flow(
+    date: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get daily cash flow data with optional date range"""
+    from financial_calculator import FinancialCalculator
+    from datetime import datetime, timedelta, date as date_type
+    
+    calculator = FinancialCalculator(db)
+    
+    try:
+        if start_date and end_date:
+            # Return range of daily cash flows
+            cash_flows = []
+            current = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+            
+            while current <= end:
+                flow = calculator.get_daily_cash_flow(current)
+                flow['date'] = current.isoformat()
+                cash_flows.append(flow)
+                current += timedelta(days=1)
+            
+            # Calculate totals
+            total_income = sum(f['daily_income'] for f in cash_flows)
+            total_outgoing = sum(f['daily_outgoing'] for f in cash_flows)
+            total_net = sum(f['daily_net'] for f in cash_flows)
+            
+            return {
+                "cash_flows": cash_flows,
+                "summary": {
+                    "total_income": total_income,
+                    "total_outgoing": total_outgoing,
+                    "total_net": total_net,
+                    "days": len(cash_flows)
+                }
+            }
+        else:
+            # Return single day
+            target_date = datetime.strptime(date, '%Y-%m-%d').date() if date else date_type.today()
+            flow = calculator.get_daily_cash_flow(target_date)
+            flow['date'] = target_date.isoformat()
+            return flow
+    finally:
+        calculator.close()
+
+@router.get("/cash-register/position")
+def get_cash_position(
+    as_of: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Cash balance, today's flow and breakdowns by source module and payment mode"""
+    from cash_register_service import CashRegisterService
+    
+    try:
+        as_of_date = datetime.strptime(as_of, '%Y-%m-%d').date() if as_of else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="as_of must be YYYY-MM-DD")
+    return CashRegisterService(db).get_cash_position(as_of_date)
+
+@router.post("/cash-register/rollup/rebuild")
+def rebuild_cash_rollup(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Rebuild the per-day cash rollup from the register and switch reads to it (Admin only)"""
+    from cash_register_service import CashRegisterService
+    
+    rows = CashRegisterService(db).rebuild_daily_rollup()
+    db.commit()
+    return {"message": "Cash rollup rebuilt", "rows": rows}
+
+# ============================================
+# SEARCH
+# ============================================
+
+@router.get("/search")
+def search(
+    q: str,
+    types: Optional[str] = None,
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    Ranked search over trips (reference, route, vehicle, client, vendor), clients,
+    vendors, invoices and payment references. types is a comma-separated subset
+    of trip, client, vendor, receivable, payable, collection, payment_request.
+    """
+    selected = [name.strip() for name in types.split(",") if name.strip()] if types else None
+    try:
+        results = search_index.search(db, q, selected, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    counts = {}
+    for result in results:
+        counts[result["type"]] = counts.get(result["type"], 0) + 1
+    return {"query": q, "results": results, "counts": counts}
+
+@router.post("/search/rebuild")
+def rebuild_search_index(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Re-index every searchable record (Admin only)"""
+    count = search_index.rebuild(db.connection())
+    db.commit()
+    return {"message": "Search index rebuilt", "documents": count}
+
+# ============================================
+# AGING ANALYSIS ENDPOINTS
+# ============================================
+
+@router.get("/vendors/aging-analysis")
+def get_vendors_aging_analysis(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get vendor aging analysis"""
+    from ledger_service import LedgerService
+    from datetime import date, timedelta
+    
+    service = LedgerService(db)
+    vendors = service.get_all_vendors_summary()
+    
+    # Calculate aging for each vendor
+    for vendor in vendors:
+        # Get all unpaid payables
+        payables = db.query(models.Payable).filter(
+            models.Payable.vendor_id == vendor['vendor_id'],
+            models.Payable.outstanding_amount > 0
+        ).all()
+        
+        aging = {
+            '0-30': 0,
+            '31-60': 0,
+            '61-90': 0,
+            '90+': 0
+        }
+        
+        for payable in payables:
+            if payable.date:
+                payable_date = payable.date.date() if hasattr(payable.date, 'date') else payable.date
+                days_old = (date.today() - payable_date).days
+                
+                if days_old <= 30:
+                    aging['0-30'] += float(payable.outstanding_amount)
+                elif days_old <= 60:
+                    aging['31-60'] += float(payable.outstanding_amount)
+                elif days_old <= 90:
+                    aging['61-90'] += float(payable.outstanding_amount)
+                else:
+                    aging['90+'] += float(payable.outstanding_amount)
+        
+        vendor['aging'] = aging
+        vendor['total_overdue'] = aging['31-60'] + aging['61-90'] + aging['90+']
+    
+    return vendors
+
+@router.get("/clients/aging-analysis")
+def get_clients_aging_analysis(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get client aging analysis"""
+    from ledger_service import LedgerService
+    from datetime import date, timedelta
+    
+    service = LedgerService(db)
+    clients = service.get_all_clients_summary()
+    
+    # Calculate aging for each client
+    for client in clients:
+        # Get all unpaid receivables
+        receivables = db.query(models.Receivable).filter(
+            models.Receivable.client_id == client['client_id'],
+            models.Receivable.remaining_amount > 0
+        ).all()
+        
+        aging = {
+            '0-30': 0,
+            '31-60': 0,
+            '61-90': 0,
+            '90+': 0
+        }
+        
+        for receivable in receivables:
+            if receivable.invoice_date:
+                invoice_date = receivable.invoice_date.date() if hasattr(receivable.invoice_date, 'date') else receivable.invoice_date
+                days_old = (date.today() - invoice_date).days
+                
+                if days_old <= 30:
+                    aging['0-30'] += float(receivable.remaining_amount)
+                elif days_old <= 60:
+                    aging['31-60'] += float(receivable.remaining_amount)
+                elif days_old <= 90:
+                    aging['61-90'] += float(receivable.remaining_amount)
+                else:
+                    aging['90+'] += float(receivable.remaining_amount)
+        
+        client['aging'] = aging
+        client['total_overdue'] = aging['31-60'] + aging['61-90'] + aging['90+']
+    
+    return clients
+
+RECEIVABLE_DETAILS = Projection("ReceivableDetail", models.Receivable, {
+    "id": models.Receivable.id,
+    "client_name": func.coalesce(models.Client.name, "Unknown Client"),
+    **entity_columns(
+        models.Receivable,
+        "invoice_number", "total_amount", "paid_amount", "remaining_amount", "due_date", "status"
+    ),
+}, joins=[
+    (models.Client, models.Receivable.client_id == models.Client.id),
+])
+
+PAYABLE_DETAILS = Projection("PayableDetail", models.Payable, {
+    "id": models.Payable.id,
+    "vendor_name": func.coalesce(models.Vendor.name, "Unknown Vendor"),
+    "invoice_number": models.Payable.invoice_number,
+    "amount": models.Payable.amount,  # Total amount
+    "outstanding_amount": models.Payable.outstanding_amount,  # Amount still owed
+    "paid_amount": models.Payable.amount - models.Payable.outstanding_amount,  # Amount already paid
+    "due_date": models.Payable.due_date,
+    "status": models.Payable.status,
+    "vendor_contact": models.Vendor.contact_person,
+    "vendor_phone": models.Vendor.phone,
+}, joins=[
+    (models.Vendor, models.Payable.vendor_id == models.Vendor.id),
+])
+
+def _days_overdue(due_date: Optional[datetime], now: datetime) -> int:
+    if due_date is None:
+        return 0
+    if due_date.tzinfo is not None:
+        now = now.astimezone(due_date.tzinfo)
+    return (now - due_date).days if due_date < now else 0
+
+@router.get("/dashboard/receivables-details")
+def get_receivables_details(
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    The `limit` largest outstanding receivables; total_receivables and count
+    cover all of them (the dashboard says when the list is cut short)
+    """
+    conditions = crud.receivable_filters(outstanding_only=True)
+    totals = crud.receivable_totals(db, conditions)
+    receivables = RECEIVABLE_DETAILS.fetch(
+        db,
+        RECEIVABLE_DETAILS.select().where(*conditions).order_by(
+            models.Receivable.remaining_amount.desc(), models.Receivable.id
+        ).limit(limit)
+    )
+    
+    now = datetime.now()
+    details = []
+    for receivable in receivables:
+        detail = receivable.as_dict()
+        detail["days_overdue"] = _days_overdue(receivable.due_date, now)
+        details.append(detail)
+    
+    return ORJSONResponse({
+        "total_receivables": totals["remaining_amount"],
+        "count": totals["count"],
+        "details": details
+    })
+
+@router.get("/dashboard/payables-details")
+def get_payables_details(
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    The `limit` largest outstanding payables (only outstanding amounts);
+    total_payables and count cover all of them (the dashboard says when the
+    list is cut short)
+    """
+    outstanding = models.Payable.outstanding_amount > 0
+    count, total = db.query(
+        func.count(models.Payable.id),
+        func.coalesce(func.sum(models.Payable.outstanding_amount), 0.0)
+    ).filter(outstanding).one()
+    payables = PAYABLE_DETAILS.fetch(
+        db,
+        PAYABLE_DETAILS.select().where(outstanding).order_by(
+            models.Payable.outstanding_amount.desc(), models.Payable.id
+        ).limit(limit)
+    )
+    
+    now = datetime.now()
+    details = []
+    for payable in payables:
+        detail = payable.as_dict()
+        detail["days_overdue"] = _days_overdue(payable.due_date, now)
+        details.append(detail)
+    
+    return ORJSONResponse({
+        "total_payables": float(total),
+        "count": count,
+        "details": details
+    })
+
+@router.get("/dashboard/payment-requests-summary")
+def get_payment_requests_summary(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get payment requests summary for dashboard"""
+    pending_count = crud.get_pending_payment_requests_count(db)
+    
+    # Get recent payment requests
+    recent_requests = crud.get_payment_requests(db, skip=0, limit=5)
+    
+    return {
+        "pending_count": pending_count,
+        "recent_requests": [
+            {
+                "id": req.id,
+                "vendor_name": req.vendor.name if req.vendor else "Unknown",
+                "amount": req.requested_amount,
+                "payment_type": req.payment_type,
+                "urgency_level": req.urgency_level,
+                "requested_at": req.requested_at.isoformat(),
+                "status": req.status.value if hasattr(req.status, 'value') else req.status
+            }
+            for req in recent_requests
+        ]
+    }
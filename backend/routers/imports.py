@@ -0,0 +1,219 @@
+"""
+Import/Export Routes
+Bulk import, export and import templates
+"""
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import models
+import auth
+from database import get_db, get_read_db
+
+router = APIRouter(tags=["imports"])
+
+# ============================================
+# BULK IMPORT/EXPORT ENDPOINTS
+# ============================================
+
+@router.post("/import/clients")
+def import_clients(
+    file: UploadFile = File(...),
+    chunk_size: int = 500,
+    upsert: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Import clients from CSV/Excel file (streamed, chunked, upsert on client_code)"""
+    from bulk_import_export import BulkImportExportService
+    
+    service = BulkImportExportService(db)
+    return service.import_clients_csv(
+        file.file,
+        filename=file.filename or "clients.csv",
+        chunk_size=max(1, chunk_size),
+        upsert=upsert
+    )
+
+@router.post("/import/vendors")
+def import_vendors(
+    file: UploadFile = File(...),
+    chunk_size: int = 500,
+    upsert: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Import vendors from CSV/Excel file (streamed, chunked, upsert on vendor_code)"""
+    from bulk_import_export import BulkImportExportService
+    
+    service = BulkImportExportService(db)
+    return service.import_vendors_csv(
+        file.file,
+        filename=file.filename or "vendors.csv",
+        chunk_size=max(1, chunk_size),
+        upsert=upsert
+    )
+
+@router.post("/import/staff")
+def import_staff(
+    file: UploadFile = File(...),
+    chunk_size: int = 500,
+    upsert: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Import staff from CSV/Excel file (streamed, chunked, upsert on employee_id)"""
+    from bulk_import_export import BulkImportExportService
+    
+    service = BulkImportExportService(db)
+    return service.import_staff_csv(
+        file.file,
+        filename=file.filename or "staff.csv",
+        chunk_size=max(1, chunk_size),
+        upsert=upsert
+    )
+
+@router.post("/import/vehicles")
+def import_vehicles(
+    file: UploadFile = File(...),
+    chunk_size: int = 500,
+    upsert: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Import vehicles from CSV/Excel file (streamed, chunked, upsert on vehicle_no)"""
+    from bulk_import_export import BulkImportExportService
+    
+    service = BulkImportExportService(db)
+    return service.import_vehicles_csv(
+        file.file,
+        filename=file.filename or "vehicles.csv",
+        chunk_size=max(1, chunk_size),
+        upsert=upsert
+    )
+
+@router.post("/import/trips")
+def import_trips(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    chunk_size: int = 500,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """
+    Import trips from CSV/Excel file
+    Creates receivables/payables in batches and returns a per-row error report
+    """
+    from bulk_import_export import BulkImportExportService
+    
+    service = BulkImportExportService(db)
+    return service.import_trips(
+        file.file,
+        file.filename or "",
+        current_user_id=current_user.id,
+        chunk_size=max(1, chunk_size),
+        dry_run=dry_run
+    )
+
+@router.get("/export/clients")
+def export_clients(
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Export all clients to Excel"""
+    from fastapi.responses import StreamingResponse
+    from bulk_import_export import BulkImportExport
+    
+    service = BulkImportExport(db)
+    excel_buffer = service.export_clients()
+    
+    return StreamingResponse(
+        excel_buffer,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename=clients_export_{datetime.now().strftime('%Y%m%d')}.xlsx"}
+    )
+
+@router.get("/export/vendors")
+def export_vendors(
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Export all vendors to Excel"""
+    from fastapi.responses import StreamingResponse
+    from bulk_import_export import BulkImportExport
+    
+    service = BulkImportExport(db)
+    excel_buffer = service.export_vendors()
+    
+    return StreamingResponse(
+        excel_buffer,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename=vendors_export_{datetime.now().strftime('%Y%m%d')}.xlsx"}
+    )
+
+@router.get("/export/staff")
+def export_staff(
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Export all staff to Excel"""
+    from fastapi.responses import StreamingResponse
+    from bulk_import_export import BulkImportExport
+    
+    service = BulkImportExport(db)
+    excel_buffer = service.export_staff()
+    
+    return StreamingResponse(
+        excel_buffer,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename=staff_export_{datetime.now().strftime('%Y%m%d')}.xlsx"}
+    )
+
+@router.get("/export/trips")
+def export_trips(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Export trips to Excel with optional date range"""
+    from fastapi.responses import StreamingResponse
+    from bulk_import_export import BulkImportExport
+    
+    service = BulkImportExport(db)
+    excel_buffer = service.export_trips(start_date, end_date)
+    
+    return StreamingResponse(
+        excel_buffer,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename=trips_export_{datetime.now().strftime('%Y%m%d')}.xlsx"}
+    )
+
+@router.get("/templates/{entity_type}")
+def download_import_template(
+    entity_type: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Download import template for specified entity type"""
+    from fastapi.responses import StreamingResponse
+    from bulk_import_export import BulkImportExport
+    
+    service = BulkImportExport(db)
+    
+    if entity_type == "clients":
+        template = service.get_client_template()
+    elif entity_type == "vendors":
+        template = service.get_vendor_template()
+    elif entity_type == "staff":
+        template = service.get_staff_template()
+    elif entity_type == "vehicles":
+        template = service.get_vehicle_template()
+    else:
+        raise HTTPException(status_code=400, detail="Invalid entity type")
+    
+    return StreamingResponse(
+        template,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={entity_type}_import_template.xlsx"}
+    )
@@ -0,0 +1,383 @@
+"""
+Invoice Routes
+Invoice generation, delivery and payment reminders
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+import models
+import auth
+from database import get_db
+from json_responses import ORJSONResponse, rows_to_dicts
+
+router = APIRouter(tags=["invoices"])
+
+# ============================================
+# INVOICE GENERATION ENDPOINTS
+# ============================================
+
+@router.post("/invoices/generate/{receivable_id}")
+def generate_invoice(
+    receivable_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Generate invoice PDF for receivable"""
+    from fastapi.responses import StreamingResponse
+    from invoice_generator import invoice_generator
+    
+    # Get receivable
+    receivable = db.query(models.Receivable).filter(
+        models.Receivable.id == receivable_id
+    ).first()
+    
+    if not receivable:
+        raise HTTPException(status_code=404, detail="Receivable not found")
+    
+    # Prepare invoice data
+    invoice_data = {
+        'invoice_number': receivable.invoice_number,
+        'invoice_date': receivable.invoice_date.strftime('%Y-%m-%d'),
+        'due_date': receivable.due_date.strftime('%Y-%m-%d'),
+        'reference': f"Trip #{receivable.trip_id}" if receivable.trip_id else "N/A",
+        'notes': 'Thank you for your business! Payment is due within the specified terms.',
+        'payment_terms': f'Payment due within {receivable.payment_terms} days',
+        'tax_rate': 0  # Add tax if applicable
+    }
+    
+    # Prepare client data
+    client_data = {
+        'name': receivable.client.name,
+        'contact_person': receivable.client.contact_person or 'N/A',
+        'address': receivable.client.address or 'N/A',
+        'phone': receivable.client.phone or 'N/A',
+        'email': receivable.client.email or 'N/A'
+    }
+    
+    # Prepare items
+    items = [{
+        'description': receivable.description,
+        'quantity': 1,
+        'rate': receivable.total_amount,
+        'amount': receivable.total_amount
+    }]
+    
+    # Generate PDF
+    pdf_buffer = invoice_generator.generate_invoice_pdf(
+        invoice_data=invoice_data,
+        client_data=client_data,
+        items=items
+    )
+    
+    return StreamingResponse(
+        pdf_buffer,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=invoice_{receivable.invoice_number}.pdf"
+        }
+    )
+
+@router.post("/invoices/email/{receivable_id}")
+def email_invoice(
+    receivable_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Generate and email invoice to client"""
+    from invoice_generator import invoice_generator
+    from email_service import email_service
+    
+    # Get receivable
+    receivable = db.query(models.Receivable).filter(
+        models.Receivable.id == receivable_id
+    ).first()
+    
+    if not receivable:
+        raise HTTPException(status_code=404, detail="Receivable not found")
+    
+    if not receivable.client.email:
+        raise HTTPException(status_code=400, detail="Client email not found")
+    
+    # Generate invoice PDF
+    invoice_data = {
+        'invoice_number': receivable.invoice_number,
+        'invoice_date': receivable.invoice_date.strftime('%Y-%m-%d'),
+        'due_date': receivable.due_date.strftime('%Y-%m-%d'),
+        'reference': f"Trip #{receivable.trip_id}" if receivable.trip_id else "N/A",
+        'notes': 'Thank you for your business!',
+        'payment_terms': f'Payment due within {receivable.payment_terms} days',
+        'tax_rate': 0
+    }
+    
+    client_data = {
+        'name': receivable.client.name,
+        'contact_person': receivable.client.contact_person or 'N/A',
+        'address': receivable.client.address or 'N/A',
+        'phone': receivable.client.phone or 'N/A',
+        'email': receivable.client.email
+    }
+    
+    items = [{
+        'description': receivable.description,
+        'quantity': 1,
+        'rate': receivable.total_amount,
+        'amount': receivable.total_amount
+    }]
+    
+    # Send email
+    result = email_service.send_invoice_email(
+        to_email=receivable.client.email,
+        client_name=receivable.client.name,
+        invoice_number=receivable.invoice_number,
+        amount=receivable.total_amount
+    )
+    
+    if result["success"]:
+        return {
+            "success": True,
+            "message": f"Invoice emailed to {receivable.client.email}"
+        }
+    else:
+        raise HTTPException(status_code=500, detail="Failed to send email")
+
+# ============================================
+# PAYMENT REMINDER ENDPOINTS
+# ============================================
+
+@router.post("/reminders/send-all")
+def send_all_payment_reminders(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Send all pending payment reminders (Admin/Manager only)"""
+    from payment_reminder_service import PaymentReminderService
+    
+    service = PaymentReminderService(db)
+    results = service.send_all_reminders()
+    
+    return results
+
+@router.post("/reminders/send/{receivable_id}")
+def send_manual_reminder(
+    receivable_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Send manual payment reminder for specific receivable"""
+    from payment_reminder_service import PaymentReminderService
+    
+    service = PaymentReminderService(db)
+    result = service.send_manual_reminder(receivable_id)
+    
+    if result["success"]:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+@router.get("/reminders/overdue-summary")
+def get_overdue_summary(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get summary of overdue receivables"""
+    from payment_reminder_service import PaymentReminderService
+    
+    service = PaymentReminderService(db)
+    summary = service.get_overdue_summary()
+    
+    return summary
+
+@router.get("/reminders/history/{receivable_id}")
+def get_reminder_history(
+    receivable_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get reminder history for receivable"""
+    from payment_reminder_service import PaymentReminderService
+    
+    service = PaymentReminderService(db)
+    history = service.get_reminder_history(receivable_id)
+    
+    return {"history": history}
+
+
+# ============================================
+# ENHANCED INVOICE MANAGEMENT ENDPOINTS
+# ============================================
+
+@router.post("/invoices/generate-from-trip/{trip_id}")
+def generate_invoice_from_trip(
+    trip_id: int,
+    auto_email: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Generate professional invoice from trip with all details"""
+    from invoice_service import InvoiceService
+    
+    service = InvoiceService(db)
+    result = service.generate_invoice_from_trip(trip_id, auto_email=auto_email)
+    
+    if result['success']:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result['error'])
+
+@router.get("/invoices/list")
+def list_invoices(
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """List all invoices with filters"""
+    from invoice_service import InvoiceService
+    from datetime import datetime
+    
+    service = InvoiceService(db)
+    
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
+    
+    invoices = service.list_invoices(
+        client_id=client_id,
+        status=status,
+        start_date=start,
+        end_date=end,
+        skip=skip,
+        limit=limit
+    )
+    
+    return ORJSONResponse({"invoices": rows_to_dicts(invoices), "total": len(invoices)})
+
+@router.get("/invoices/{invoice_id}/pdf")
+def download_invoice_pdf(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Download invoice PDF"""
+    from fastapi.responses import StreamingResponse
+    from invoice_service import InvoiceService
+    import io
+    
+    service = InvoiceService(db)
+    pdf_data = service.get_invoice_pdf(invoice_id)
+    
+    if not pdf_data:
+        raise HTTPException(status_code=404, detail="Invoice PDF not found")
+    
+    receivable = db.query(models.Receivable).filter(models.Receivable.id == invoice_id).first()
+    
+    return StreamingResponse(
+        io.BytesIO(pdf_data),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={receivable.invoice_number}.pdf"
+        }
+    )
+
+@router.post("/invoices/{invoice_id}/regenerate")
+def regenerate_invoice(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Regenerate invoice PDF"""
+    from invoice_service import InvoiceService
+    
+    service = InvoiceService(db)
+    result = service.regenerate_invoice(invoice_id)
+    
+    if result['success']:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result['error'])
+
+@router.post("/invoices/{invoice_id}/email")
+def email_invoice_to_client(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Email invoice to client"""
+    from invoice_service import InvoiceService
+    
+    service = InvoiceService(db)
+    result = service.email_invoice(invoice_id)
+    
+    if result['success']:
+        return result
+    else:
+        raise HTTPException(status_code=400, detail=result['error'])
+
+@router.get("/invoices/summary")
+def get_invoice_summary(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    client_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get invoice summary statistics"""
+    from invoice_service import InvoiceService
+    from datetime import datetime
+    
+    service = InvoiceService(db)
+    
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
+    
+    summary = service.get_invoice_summary(
+        start_date=start,
+        end_date=end,
+        client_id=client_id
+    )
+    
+    return summary
+
+@router.get("/invoices/verify")
+def verify_invoice(
+    invoice_number: str,
+    amount: float,
+    token: str,
+    db: Session = Depends(get_db)
+):
+    """Check the signed verification code printed in an invoice QR code (public, no login)"""
+    from invoice_codes import verify_token
+    
+    if not verify_token(invoice_number, amount, token):
+        return {"valid": False, "invoice_number": invoice_number}
+    
+    receivable = db.query(models.Receivable).filter(
+        models.Receivable.invoice_number == invoice_number
+    ).first()
+    if not receivable or round(float(receivable.total_amount or 0), 2) != round(amount, 2):
+        return {"valid": False, "invoice_number": invoice_number}
+    
+    return {
+        "valid": True,
+        "invoice_number": receivable.invoice_number,
+        "amount": float(receivable.total_amount or 0),
+        "invoice_date": receivable.invoice_date
+    }
+
+@router.post("/invoices/bulk-generate")
+def bulk_generate_invoices(
+    trip_ids: list[int],
+    auto_email: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Generate invoices for multiple trips"""
+    from invoice_service import InvoiceService
+    
+    service = InvoiceService(db)
+    results = service.bulk_generate_invoices(trip_ids, auto_email=auto_email)
+    
+    return results
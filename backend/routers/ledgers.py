@@ -0,0 +1,791 @@
+"""
+Ledger Routes
+Vendor/client ledgers, CEO capital, balance heads, reconciliation and period close
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from datetime import datetime, date
+from typing import Optional
+import models
+import schemas
+import crud
+import auth
+from database import get_db, get_read_db
+from json_responses import ORJSONResponse, RowsResponse
+
+router = APIRouter(tags=["ledgers"])
+
+# Ledger endpoints
+@router.post("/ledger/", response_model=schemas.LedgerEntry)
+def create_ledger_entry(
+    ledger: schemas.LedgerEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_ledger_entry(db=db, ledger=ledger)
+
+@router.get("/ledger/{vendor_id}", response_model=list[schemas.LedgerEntry])
+def read_ledger_entries(
+    vendor_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_ledger_entries(db, vendor_id, skip=skip, limit=limit)
+
+# Enhanced Ledger Endpoints with Real-Time Data from Trips
+@router.get("/api/ledgers/vendor/{vendor_id}")
+def get_vendor_ledger_detailed(
+    vendor_id: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get vendor ledger from real-time payables and payments with trip details"""
+    try:
+        from datetime import datetime
+        
+        # Get vendor
+        vendor = db.query(models.Vendor).filter(models.Vendor.id == vendor_id).first()
+        if not vendor:
+            raise HTTPException(status_code=404, detail="Vendor not found")
+        
+        # Entries are picked by their own dates, as period_close totals them:
+        # payables by created_at, payments by payment_date (whichever payable they settle)
+        payables_query = db.query(models.Payable).filter(
+            models.Payable.vendor_id == vendor_id
+        )
+        payments_query = db.query(models.PaymentRequest).filter(
+            models.PaymentRequest.vendor_id == vendor_id,
+            models.PaymentRequest.status.in_([models.PaymentRequestStatus.APPROVED, models.PaymentRequestStatus.PAID]),
+            models.PaymentRequest.payment_date.isnot(None)
+        )
+        
+        # Apply date filters
+        if start_date:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
+            payables_query = payables_query.filter(models.Payable.created_at >= start)
+            payments_query = payments_query.filter(models.PaymentRequest.payment_date >= start)
+        if end_date:
+            end = datetime.strptime(end_date, "%Y-%m-%d")
+            payables_query = payables_query.filter(models.Payable.created_at <= end)
+            payments_query = payments_query.filter(models.PaymentRequest.payment_date <= end)
+        
+        payables = payables_query.order_by(models.Payable.created_at).all()
+        payments = payments_query.order_by(models.PaymentRequest.payment_date).all()
+        
+        # Trips behind these payables, in one query
+        payable_ids = [payable.id for payable in payables]
+        trips = {
+            trip.payable_id: trip for trip in db.query(models.Trip).filter(models.Trip.payable_id.in_(payable_ids))
+        } if payable_ids else {}
+        
+        # Build ledger entries from payables and payments
+        entries = []
+        
+        for payable in payables:
+            trip = trips.get(payable.id)
+            
+            # Build trip details if trip exists
+            trip_details = None
+            if trip:
+                trip_details = {
+                    "from": trip.source_location,
+                    "to": trip.destination_location,
+                    "tonnage": float(trip.total_tonnage) if trip.total_tonnage else None,
+                    "freight": float(trip.vendor_freight) if trip.vendor_freight else None,
+                    "vehicle": trip.vehicle_number
+                }
+            
+            # Debit entry (we owe vendor)
+            entries.append({
+                "id": f"payable_{payable.id}",
+                "date": payable.created_at,
+                "description": payable.description or f"Invoice: {payable.invoice_number}",
+                "trip_reference": trip.reference_no if trip else payable.invoice_number,
+                "trip_details": trip_details,
+                "debit": float(payable.amount),
+                "credit": 0,
+                "balance": 0,
+                "type": "payable",
+                "status": "paid" if payable.status == "paid" else "pending"
+            })
+        
+        for payment in payments:
+            entries.append({
+                "id": f"payment_{payment.id}",
+                "date": payment.payment_date,
+                "description": f"Payment: {payment.payment_channel.value if payment.payment_channel else 'N/A'}",
+                "trip_reference": payment.payment_reference or "",
+                "trip_details": None,
+                "debit": 0,
+                "credit": float(payment.requested_amount),
+                "balance": 0,
+                "type": "payment",
+                "status": "paid"
+            })
+        
+        # Sort by date
+        entries.sort(key=lambda x: x["date"])
+        
+        # Balance brought forward from before the period (from the last closed month)
+        opening_balance = 0.0
+        if start_date:
+            from period_close import PeriodCloseService, VENDOR
+            opening_balance = PeriodCloseService(db).opening_balance(VENDOR, start, vendor_id)
+        
+        # Recalculate running balance
+        running_balance = opening_balance
+        for entry in entries:
+            running_balance += entry["debit"] - entry["credit"]
+            entry["balance"] = running_balance
+        
+        # Calculate summary
+        total_debit = sum(e["debit"] for e in entries)
+        total_credit = sum(e["credit"] for e in entries)
+        
+        return ORJSONResponse({
+            "vendor": {
+                "id": vendor.id,
+                "name": vendor.name,
+                "code": vendor.vendor_code,
+                "contact": vendor.contact_person,
+                "phone": vendor.phone
+            },
+            "entries": entries,
+            "summary": {
+                "opening_balance": float(opening_balance),
+                "total_debit": float(total_debit),
+                "total_credit": float(total_credit),
+                "balance": float(opening_balance + total_debit - total_credit),
+                "trip_count": len([e for e in entries if e["type"] == "payable"]),
+                "payment_count": len([e for e in entries if e["type"] == "payment"])
+            }
+        })
+    except Exception as e:
+        print(f"Error in get_vendor_ledger_detailed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/ledgers/client/{client_id}")
+def get_client_ledger_detailed(
+    client_id: int,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get client ledger from real-time receivables and collections with trip details"""
+    try:
+        from datetime import datetime
+        
+        # Get client
+        client = db.query(models.Client).filter(models.Client.id == client_id).first()
+        if not client:
+            raise HTTPException(status_code=404, detail="Client not found")
+        
+        # Entries are picked by their own dates, as period_close totals them:
+        # invoices by invoice_date, collections by collection_date (whichever invoice they settle)
+        receivables_query = db.query(models.Receivable).filter(
+            models.Receivable.client_id == client_id
+        )
+        collections_query = db.query(models.Collection).filter(
+            models.Collection.client_id == client_id
+        )
+        
+        # Apply date filters
+        if start_date:
+            start = datetime.strptime(start_date, "%Y-%m-%d")
+            receivables_query = receivables_query.filter(models.Receivable.invoice_date >= start)
+            collections_query = collections_query.filter(models.Collection.collection_date >= start)
+        if end_date:
+            end = datetime.strptime(end_date, "%Y-%m-%d")
+            receivables_query = receivables_query.filter(models.Receivable.invoice_date <= end)
+            collections_query = collections_query.filter(models.Collection.collection_date <= end)
+        
+        receivables = receivables_query.order_by(models.Receivable.invoice_date).all()
+        collections = collections_query.order_by(models.Collection.collection_date).all()
+        
+        # Trips behind these invoices, in one query
+        trip_ids = [receivable.trip_id for receivable in receivables if receivable.trip_id]
+        trips = {
+            trip.id: trip for trip in db.query(models.Trip).filter(models.Trip.id.in_(trip_ids))
+        } if trip_ids else {}
+        
+        # Build ledger entries from receivables and collections
+        entries = []
+        
+        for receivable in receivables:
+            # Get trip details if trip_id exists
+            trip_details = None
+            trip_reference = receivable.invoice_number
+            
+            trip = trips.get(receivable.trip_id)
+            if trip:
+                trip_reference = trip.reference_no
+                trip_details = {
+                    "from": trip.source_location,
+                    "to": trip.destination_location,
+                    "tonnage": float(trip.total_tonnage) if trip.total_tonnage else None,
+                    "freight": float(trip.client_freight) if trip.client_freight else None,
+                    "vehicle": trip.vehicle_number
+                }
+            
+            # Debit entry (client owes us)
+            entries.append({
+                "id": f"receivable_{receivable.id}",
+                "date": receivable.invoice_date,
+                "description": receivable.description or f"Invoice: {receivable.invoice_number}",
+                "trip_reference": trip_reference,
+                "trip_details": trip_details,
+                "debit": float(receivable.total_amount),
+                "credit": 0,
+                "balance": 0,
+                "type": "receivable",
+                "status": "paid" if receivable.status == models.ReceivableStatus.PAID else "pending"
+            })
+        
+        for collection in collections:
+            entries.append({
+                "id": f"collection_{collection.id}",
+                "date": collection.collection_date,
+                "description": f"Payment Received: {collection.collection_channel.value if collection.collection_channel else 'N/A'}",
+                "trip_reference": collection.reference_number or "",
+                "trip_details": None,
+                "debit": 0,
+                "credit": float(collection.collection_amount),
+                "balance": 0,
+                "type": "collection",
+                "status": "paid"
+            })
+        
+        # Sort by date
+        entries.sort(key=lambda x: x["date"])
+        
+        # Balance brought forward from before the period (from the last closed month)
+        opening_balance = 0.0
+        if start_date:
+            from period_close import PeriodCloseService, CLIENT
+            opening_balance = PeriodCloseService(db).opening_balance(CLIENT, start, client_id)
+        
+        # Recalculate running balance
+        running_balance = opening_balance
+        for entry in entries:
+            running_balance += entry["debit"] - entry["credit"]
+            entry["balance"] = running_balance
+        
+        # Calculate summary
+        total_debit = sum(e["debit"] for e in entries)
+        total_credit = sum(e["credit"] for e in entries)
+        
+        return ORJSONResponse({
+            "client": {
+                "id": client.id,
+                "name": client.name,
+                "code": client.client_code,
+                "contact": client.contact_person,
+                "phone": client.phone
+            },
+            "entries": entries,
+            "summary": {
+                "opening_balance": float(opening_balance),
+                "total_debit": float(total_debit),
+                "total_credit": float(total_credit),
+                "balance": float(opening_balance + total_debit - total_credit),
+                "trip_count": len([e for e in entries if e["type"] == "receivable"]),
+                "payment_count": len([e for e in entries if e["type"] == "collection"])
+            }
+        })
+    except Exception as e:
+        print(f"Error in get_client_ledger_detailed: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/ledgers/vendors/summary")
+def get_all_vendors_summary(
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get summary of all vendors with real-time outstanding balances"""
+    payable = models.Payable
+    # A zero or missing outstanding amount counts as the full amount
+    outstanding = case(
+        (func.coalesce(payable.outstanding_amount, 0) == 0, payable.amount),
+        else_=payable.outstanding_amount
+    )
+    rows = db.query(
+        models.Vendor.id.label("vendor_id"),
+        models.Vendor.name.label("vendor_name"),
+        models.Vendor.vendor_code,
+        func.coalesce(func.sum(payable.amount), 0.0).label("total_debit"),
+        func.coalesce(func.sum(payable.amount - outstanding), 0.0).label("total_credit"),
+        func.coalesce(func.sum(outstanding), 0.0).label("balance"),
+        func.count(payable.id).label("trip_count")
+    ).outerjoin(
+        payable, payable.vendor_id == models.Vendor.id
+    ).filter(
+        models.Vendor.is_active == True
+    ).group_by(models.Vendor.id).order_by(models.Vendor.id).all()
+    
+    return RowsResponse(rows)
+
+@router.get("/api/ledgers/clients/summary")
+def get_all_clients_summary(
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get summary of all clients with real-time outstanding balances"""
+    receivable = models.Receivable
+    # A zero or missing remaining amount counts as the full amount
+    remaining = case(
+        (func.coalesce(receivable.remaining_amount, 0) == 0, receivable.total_amount),
+        else_=receivable.remaining_amount
+    )
+    rows = db.query(
+        models.Client.id.label("client_id"),
+        models.Client.name.label("client_name"),
+        models.Client.client_code,
+        func.coalesce(func.sum(receivable.total_amount), 0.0).label("total_debit"),
+        func.coalesce(func.sum(func.coalesce(receivable.paid_amount, 0)), 0.0).label("total_credit"),
+        func.coalesce(func.sum(remaining), 0.0).label("balance"),
+        func.count(receivable.id).label("trip_count")
+    ).outerjoin(
+        receivable, receivable.client_id == models.Client.id
+    ).filter(
+        models.Client.is_active == True
+    ).group_by(models.Client.id).order_by(models.Client.id).all()
+    
+    return RowsResponse(rows)
+
+@router.get("/ceo-capital/balance", response_model=schemas.CEOCapitalBalance)
+def get_ceo_capital_balance(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get current CEO Capital balance and summary"""
+    from balance_heads import BalanceHeadService, CEO_CAPITAL
+    
+    head = BalanceHeadService(db).get(CEO_CAPITAL)
+    
+    return schemas.CEOCapitalBalance(
+        current_balance=head.balance,
+        total_in=head.total_in,
+        total_out=head.total_out,
+        last_transaction_date=head.last_entry_date
+    )
+
+@router.post("/balance-heads/verify")
+def verify_balance_heads(
+    account_type: Optional[str] = None,
+    repair: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """
+    Rebuild CEO capital, office expense and staff advance balances from their
+    detail rows and compare them with the stored balance heads (Admin only).
+    With repair=true, mismatched heads are overwritten with the rebuilt values.
+    """
+    from balance_heads import BalanceHeadService
+    
+    try:
+        report = BalanceHeadService(db).verify(account_type, repair=repair)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if repair:
+        db.commit()
+    return report
+
+@router.post("/reconciliation/run")
+def run_reconciliation(
+    checks: Optional[str] = None,
+    repair: bool = False,
+    workers: Optional[int] = None,
+    limit: int = 500,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """
+    Recompute receivable, payable, client/vendor, ledger and cash register
+    balances from their source rows in parallel and report discrepancies with
+    the rows behind them (Admin only). checks is a comma-separated subset of
+    receivables, payables, ledgers, cash. With repair=true all fixes are applied
+    in one transaction; notices (vendor balances) are never repaired.
+    """
+    from reconciliation_service import ReconciliationService
+    
+    selected = [name.strip() for name in checks.split(",") if name.strip()] if checks else None
+    service = ReconciliationService(db, workers=min(max(workers, 1), 32) if workers else None)
+    try:
+        report = service.run(selected, repair=repair, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if repair:
+        db.commit()
+    report["discrepancies"] = report["discrepancies"][:max(limit, 0)]
+    report["notices"] = report["notices"][:max(limit, 0)]
+    return report
+
+# ============================================
+# PERIOD CLOSE (month-end balance snapshots)
+# ============================================
+
+@router.get("/period-close/status")
+def get_period_close_status(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Closed months, newest first; stale months are re-closed automatically after back-dated postings"""
+    from period_close import PeriodCloseService
+    
+    return PeriodCloseService(db).status()
+
+@router.post("/period-close/close")
+def close_periods(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """
+    Close every month up to the given one (default: last completed month) that
+    is not closed yet, freezing ledger, capital, expense and advance balances (Admin only)
+    """
+    from period_close import PeriodCloseService
+    
+    if (year is None) != (month is None):
+        raise HTTPException(status_code=400, detail="Provide both year and month, or neither")
+    if month is not None and not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
+    
+    try:
+        closed = PeriodCloseService(db).close_through(year, month, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    
+    return {
+        "success": True,
+        "closed": [{"year": y, "month": m} for y, m in closed],
+        "count": len(closed)
+    }
+
+@router.post("/period-close/reclose")
+def reclose_stale_periods(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Re-close months invalidated by back-dated postings now instead of waiting for the background run"""
+    from period_close import PeriodCloseService
+    
+    reclosed = PeriodCloseService(db).reclose_stale(user_id=current_user.id)
+    db.commit()
+    
+    return {
+        "success": True,
+        "reclosed": [{"year": y, "month": m} for y, m in reclosed],
+        "count": len(reclosed)
+    }
+
+@router.get("/ceo-capital/transactions", response_model=list[schemas.CEOCapital])
+def get_ceo_capital_transactions(
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get CEO Capital transactions with optional filters"""
+    query = db.query(models.CEOCapital).order_by(models.CEOCapital.date.asc(), models.CEOCapital.id.asc())
+    
+    if start_date:
+        query = query.filter(models.CEOCapital.date >= start_date)
+    if end_date:
+        query = query.filter(models.CEOCapital.date <= end_date)
+    if transaction_type:
+        query = query.filter(models.CEOCapital.transaction_type == transaction_type)
+    
+    return query.offset(skip).limit(limit).all()
+
+@router.post("/ceo-capital/transaction", response_model=schemas.CEOCapital)
+def create_ceo_capital_transaction(
+    transaction: schemas.CEOCapitalCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Create a new CEO Capital transaction (Admin only)"""
+    from balance_heads import BalanceHeadService, CEO_CAPITAL
+    
+    # Calculate new balance from the locked running balance
+    current_balance, new_balance = BalanceHeadService(db).post(
+        CEO_CAPITAL,
+        amount_in=transaction.amount_in,
+        amount_out=transaction.amount_out,
+        entry_date=transaction.date
+    )
+    
+    # Create transaction
+    db_transaction = models.CEOCapital(
+        **transaction.dict(),
+        balance=new_balance,
+        created_by=current_user.id
+    )
+    
+    db.add(db_transaction)
+    db.commit()
+    db.refresh(db_transaction)
+    
+    return db_transaction
+
+@router.post("/ceo-capital/allocate-profit")
+def allocate_profit_to_ceo_capital(
+    profit_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Allocate profit to CEO Capital"""
+    from datetime import date as dt_date
+    
+    amount = profit_data.get('amount')
+    description = profit_data.get('description')
+    reference_date = profit_data.get('date')
+    
+    transaction_date = dt_date.fromisoformat(reference_date) if reference_date else dt_date.today()
+    
+    # Add to the locked running balance
+    from balance_heads import BalanceHeadService, CEO_CAPITAL
+    
+    current_balance, new_balance = BalanceHeadService(db).post(
+        CEO_CAPITAL, amount_in=amount, entry_date=transaction_date
+    )
+    
+    # Create profit allocation transaction
+    transaction = models.CEOCapital(
+        date=transaction_date,
+        transaction_type='profit_allocation',
+        description=description,
+        amount_in=amount,
+        amount_out=0.0,
+        balance=new_balance,
+        reference_type='manual',
+        created_by=current_user.id
+    )
+    
+    db.add(transaction)
+    db.commit()
+    db.refresh(transaction)
+    
+    return {
+        "success": True,
+        "message": f"Profit of PKR {amount:,.2f} allocated to CEO Capital",
+        "new_balance": new_balance,
+        "transaction_id": transaction.id
+    }
+
+@router.post("/ceo-capital/withdrawal")
+def record_ceo_withdrawal(
+    withdrawal_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Record CEO withdrawal from capital"""
+    from datetime import date as dt_date
+    
+    amount = withdrawal_data.get('amount')
+    description = withdrawal_data.get('description')
+    withdrawal_date = withdrawal_data.get('date')
+    
+    transaction_date = dt_date.fromisoformat(withdrawal_date) if withdrawal_date else dt_date.today()
+    
+    # Check and post against the locked balance so two withdrawals cannot both pass
+    from balance_heads import BalanceHeadService, CEO_CAPITAL
+    
+    balances = BalanceHeadService(db)
+    current_balance = balances.lock(CEO_CAPITAL).balance
+    
+    if current_balance < amount:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient balance. Current: PKR {current_balance:,.2f}, Requested: PKR {amount:,.2f}"
+        )
+    
+    current_balance, new_balance = balances.post(CEO_CAPITAL, amount_out=amount, entry_date=transaction_date)
+    
+    # Create withdrawal transaction
+    transaction = models.CEOCapital(
+        date=transaction_date,
+        transaction_type='withdrawal',
+        description=description,
+        amount_in=0.0,
+        amount_out=amount,
+        balance=new_balance,
+        reference_type='withdrawal',
+        created_by=current_user.id
+    )
+    
+    db.add(transaction)
+    db.commit()
+    db.refresh(transaction)
+    
+    return {
+        "success": True,
+        "message": f"Withdrawal of PKR {amount:,.2f} recorded",
+        "new_balance": new_balance,
+        "transaction_id": transaction.id
+    }
+
+@router.get("/ceo-capital/monthly-summary")
+def get_ceo_capital_monthly_summary(
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get CEO Capital monthly summary"""
+    from datetime import date as dt_date
+    from balance_heads import CEO_CAPITAL
+    from period_close import PeriodCloseService, month_bounds
+    
+    # Use current month/year if not provided
+    today = dt_date.today()
+    target_month = month or today.month
+    target_year = year or today.year
+    month_start, month_end = month_bounds(target_year, target_month)
+    
+    # Get transactions for the month
+    transactions = db.query(models.CEOCapital).filter(
+        models.CEOCapital.date >= month_start,
+        models.CEOCapital.date <= month_end
+    ).order_by(models.CEOCapital.date.asc(), models.CEOCapital.id.asc()).all()
+    
+    # Opening balance starts from the last closed month, not the first transaction ever
+    opening_balance = PeriodCloseService(db).opening_balance(CEO_CAPITAL, month_start)
+    closing_balance = opening_balance + sum(t.amount_in or 0 for t in transactions) - sum(t.amount_out or 0 for t in transactions)
+    
+    total_profit = sum(t.amount_in for t in transactions if t.transaction_type == 'profit_allocation')
+    total_expenses = sum(t.amount_out for t in transactions if t.transaction_type == 'office_expense')
+    total_salaries = sum(t.amount_out for t in transactions if t.transaction_type == 'salary_payment')
+    total_withdrawals = sum(t.amount_out for t in transactions if t.transaction_type == 'withdrawal')
+    
+    return {
+        "month": target_month,
+        "year": target_year,
+        "opening_balance": opening_balance,
+        "total_profit": total_profit,
+        "total_expenses": total_expenses,
+        "total_salaries": total_salaries,
+        "total_withdrawals": total_withdrawals,
+        "closing_balance": closing_balance,
+        "transaction_count": len(transactions)
+    }
+
+@router.get("/ceo-capital/download")
+def download_ceo_capital_report(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Download CEO Capital transactions as Excel"""
+    from io import BytesIO
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from fastapi.responses import StreamingResponse
+    
+    # Build query
+    query = db.query(models.CEOCapital)
+    
+    if start_date:
+        query = query.filter(models.CEOCapital.date >= start_date)
+    if end_date:
+        query = query.filter(models.CEOCapital.date <= end_date)
+    if transaction_type:
+        query = query.filter(models.CEOCapital.transaction_type == transaction_type)
+    
+    transactions = query.order_by(models.CEOCapital.date.desc()).all()
+    
+    # Create workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "CEO Capital"
+    
+    # Company header
+    ws.merge_cells('A1:F1')
+    ws['A1'] = "PGT INTERNATIONAL"
+    ws['A1'].font = Font(size=16, bold=True, color="DC2626")
+    ws['A1'].alignment = Alignment(horizontal='center')
+    
+    ws.merge_cells('A2:F2')
+    ws['A2'] = "CEO Capital Transaction Report"
+    ws['A2'].font = Font(size=12, bold=True)
+    ws['A2'].alignment = Alignment(horizontal='center')
+    
+    ws.merge_cells('A3:F3')
+    ws['A3'] = f"Generated on: {datetime.now().strftime('%d-%b-%Y %I:%M %p')}"
+    ws['A3'].font = Font(size=10)
+    ws['A3'].alignment = Alignment(horizontal='center')
+    
+    # Headers
+    headers = ['Date', 'Type', 'Description', 'Amount In', 'Amount Out', 'Balance']
+    header_fill = PatternFill(start_color="DC2626", end_color="DC2626", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=5, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+    
+    # Data rows
+    for row_idx, transaction in enumerate(transactions, 6):
+        ws.cell(row=row_idx, column=1, value=transaction.date.strftime('%d-%b-%Y'))
+        ws.cell(row=row_idx, column=2, value=transaction.transaction_type.replace('_', ' ').title())
+        ws.cell(row=row_idx, column=3, value=transaction.description)
+        ws.cell(row=row_idx, column=4, value=transaction.amount_in if transaction.amount_in > 0 else '')
+        ws.cell(row=row_idx, column=5, value=transaction.amount_out if transaction.amount_out > 0 else '')
+        ws.cell(row=row_idx, column=6, value=transaction.balance)
+        
+        # Apply borders
+        for col in range(1, 7):
+            ws.cell(row=row_idx, column=col).border = border
+            if col >= 4:  # Amount columns
+                ws.cell(row=row_idx, column=col).alignment = Alignment(horizontal='right')
+    
+    # Column widths
+    ws.column_dimensions['A'].width = 15
+    ws.column_dimensions['B'].width = 20
+    ws.column_dimensions['C'].width = 40
+    ws.column_dimensions['D'].width = 15
+    ws.column_dimensions['E'].width = 15
+    ws.column_dimensions['F'].width = 15
+    
+    # Save to BytesIO
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    
+    filename = f"ceo_capital_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    
+    return StreamingResponse(
+        output,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
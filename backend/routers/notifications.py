@@ -0,0 +1,116 @@
+"""
+Notification Routes
+In-app notifications and the live notification stream
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional
+import models
+import auth
+from async_database import async_session, get_async_db
+from database import get_db
+from notification_service import NotificationService, count_unread, list_notifications
+
+router = APIRouter(tags=["notifications"])
+
+# ============================================
+# NOTIFICATION ENDPOINTS
+# ============================================
+
+@router.get("/notifications")
+async def get_notifications(
+    unread_only: bool = False,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_active_user_async)
+):
+    """Get user notifications"""
+    return await list_notifications(
+        db,
+        user_id=current_user.id,
+        unread_only=unread_only,
+        limit=limit
+    )
+
+@router.get("/notifications/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_active_user_async)
+):
+    """Get count of unread notifications"""
+    count = await count_unread(db, user_id=current_user.id)
+    return {"count": count}
+
+@router.put("/notifications/{notification_id}/read")
+def mark_notification_read(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Mark notification as read"""
+    notif = NotificationService(db)
+    success = notif.mark_as_read(notification_id, current_user.id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return {"success": True}
+
+@router.put("/notifications/mark-all-read")
+def mark_all_read(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Mark all notifications as read"""
+    notif = NotificationService(db)
+    count = notif.mark_all_as_read(current_user.id)
+    return {"marked_read": count}
+
+@router.delete("/notifications/{notification_id}")
+def delete_notification(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Delete a notification"""
+    notif = NotificationService(db)
+    if not notif.delete_notification(notification_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return {"success": True}
+
+@router.get("/notifications/stream")
+async def stream_notifications(
+    request: Request,
+    token: Optional[str] = None
+):
+    """
+    Server-sent events with new notifications and unread-count changes for the
+    current user. EventSource cannot send headers, so the access token may be
+    passed as ?token=. Clients fall back to polling /notifications/unread-count
+    when the stream is unavailable.
+    """
+    from fastapi.responses import StreamingResponse
+    from notification_events import event_stream
+    
+    if not token:
+        authorization = request.headers.get("Authorization", "")
+        token = authorization[7:] if authorization.lower().startswith("bearer ") else None
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    
+    username = auth.decode_access_token(token)
+    async with async_session() as db:
+        user = await auth.get_user_async(db, username)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
+    user = await auth.get_current_active_user(user)
+    user_id = user.id
+    
+    async def current_count():
+        async with async_session() as db:
+            return await count_unread(db, user_id)
+    
+    return StreamingResponse(
+        event_stream(user_id, current_count, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
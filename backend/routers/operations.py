@@ -0,0 +1,1188 @@
+"""
+Operations Routes
+Trips, master data (clients, vendors, staff, vehicles), receivables,
+payables, payment requests and expenses
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from datetime import date, datetime
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+import models
+import schemas
+import crud
+import auth
+from database import get_db
+from notification_service import NotificationService, get_admin_user_ids
+from validators import BusinessValidator, ValidationError
+from audit_service import AuditService, get_client_ip, get_user_agent
+from json_responses import ORJSONResponse, RowsResponse
+
+router = APIRouter(tags=["operations"])
+
+# Staff endpoints
+@router.post("/staff/", response_model=schemas.Staff)
+def create_staff(
+    staff: schemas.StaffCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_staff(db=db, staff=staff)
+
+@router.get("/staff/", response_model=list[schemas.Staff])
+def read_staff(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_all_staff(db, skip=skip, limit=limit)
+
+@router.put("/staff/{staff_id}/advance")
+def update_staff_advance(
+    staff_id: int,
+    advance_amount: float,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.update_staff_advance(db, staff_id, advance_amount, created_by=current_user.id)
+
+# ============================================
+# DIRECTOR'S RULE #1: STAFF ADVANCE RECOVERY
+# ============================================
+
+@router.post("/staff/{staff_id}/advance")
+def give_staff_advance(
+    staff_id: int,
+    advance_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """
+    Give advance to staff member (handles multiple advances)
+    
+    Example: Muhammad Hussain has 140,000 existing advance
+    Can give another 5,000 emergency advance
+    System adds to existing balance: 140,000 + 5,000 = 145,000
+    """
+    staff = db.query(models.Staff).filter(models.Staff.id == staff_id).first()
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff not found")
+    
+    amount = advance_data.get('amount', 0)
+    description = advance_data.get('description', 'Advance given')
+    monthly_deduction = advance_data.get('monthly_deduction')
+    
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Advance amount must be positive")
+    
+    # Add new advance to the locked running balance
+    from balance_heads import BalanceHeadService, STAFF_ADVANCE
+    
+    transaction_date = datetime.now()
+    current_balance, new_balance = BalanceHeadService(db).post(
+        STAFF_ADVANCE, amount_in=amount, entry_date=transaction_date, account_id=staff_id
+    )
+    
+    # Create ledger entry
+    ledger_entry = models.StaffAdvanceLedger(
+        staff_id=staff_id,
+        transaction_date=transaction_date,
+        transaction_type='advance_given',
+        amount=amount,
+        balance_after=new_balance,
+        description=description,
+        created_by=current_user.id
+    )
+    db.add(ledger_entry)
+    
+    # Update staff balance
+    staff.advance_balance = new_balance
+    staff.advance_given_date = datetime.now()
+    
+    # Update monthly deduction if provided
+    if monthly_deduction is not None and monthly_deduction > 0:
+        staff.monthly_deduction = monthly_deduction
+        staff.recovery_start_date = datetime.now()
+    
+    db.commit()
+    db.refresh(staff)
+    db.refresh(ledger_entry)
+    
+    return {
+        "success": True,
+        "staff_id": staff_id,
+        "staff_name": staff.name,
+        "advance_given": amount,
+        "previous_balance": current_balance,
+        "new_balance": new_balance,
+        "monthly_deduction": staff.monthly_deduction,
+        "ledger_entry_id": ledger_entry.id
+    }
+
+@router.get("/staff/{staff_id}/advance-ledger")
+def get_staff_advance_ledger(
+    staff_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    Get complete advance recovery history for a staff member
+    Shows all advances given and recoveries made
+    """
+    staff = db.query(models.Staff).filter(models.Staff.id == staff_id).first()
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff not found")
+    
+    # Get all ledger entries
+    ledger_entries = db.query(models.StaffAdvanceLedger).filter(
+        models.StaffAdvanceLedger.staff_id == staff_id
+    ).order_by(models.StaffAdvanceLedger.transaction_date.desc()).all()
+    
+    # Format entries
+    entries = []
+    for entry in ledger_entries:
+        entries.append({
+            "id": entry.id,
+            "date": entry.transaction_date.isoformat(),
+            "type": entry.transaction_type,
+            "amount": entry.amount,
+            "balance_after": entry.balance_after,
+            "description": entry.description,
+            "payroll_id": entry.payroll_id,
+            "created_by": entry.created_by_user.full_name if entry.created_by_user else None
+        })
+    
+    # Calculate months to clear (if monthly deduction is set)
+    months_to_clear = None
+    expected_clear_date = None
+    if staff.monthly_deduction and staff.monthly_deduction > 0 and staff.advance_balance > 0:
+        months_to_clear = int(staff.advance_balance / staff.monthly_deduction) + 1
+        if staff.recovery_start_date:
+            from dateutil.relativedelta import relativedelta
+            expected_clear_date = staff.recovery_start_date + relativedelta(months=months_to_clear)
+    
+    return {
+        "staff": {
+            "id": staff.id,
+            "employee_id": staff.employee_id,
+            "name": staff.name,
+            "position": staff.position,
+            "gross_salary": staff.gross_salary,
+            "is_active": staff.is_active
+        },
+        "advance_summary": {
+            "current_balance": staff.advance_balance,
+            "monthly_deduction": staff.monthly_deduction,
+            "advance_given_date": staff.advance_given_date.isoformat() if staff.advance_given_date else None,
+            "recovery_start_date": staff.recovery_start_date.isoformat() if staff.recovery_start_date else None,
+            "months_to_clear": months_to_clear,
+            "expected_clear_date": expected_clear_date.isoformat() if expected_clear_date else None
+        },
+        "ledger_entries": entries,
+        "total_entries": len(entries)
+    }
+
+@router.post("/staff/{staff_id}/advance-recovery")
+def manual_advance_recovery(
+    staff_id: int,
+    recovery_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """
+    Manual advance recovery entry (not linked to payroll)
+    Used for one-time recoveries or adjustments
+    """
+    staff = db.query(models.Staff).filter(models.Staff.id == staff_id).first()
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff not found")
+    
+    amount = recovery_data.get('amount', 0)
+    description = recovery_data.get('description', 'Manual recovery')
+    
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="Recovery amount must be positive")
+    
+    from balance_heads import BalanceHeadService, STAFF_ADVANCE
+    
+    # Check against the locked balance so two recoveries cannot both pass
+    balances = BalanceHeadService(db)
+    head = balances.lock(STAFF_ADVANCE, staff_id)
+    if amount > head.balance:
+        raise HTTPException(status_code=400, detail=f"Recovery amount ({amount}) exceeds advance balance ({head.balance})")
+    
+    # Subtract recovery from balance
+    transaction_date = datetime.now()
+    current_balance, new_balance = balances.post(
+        STAFF_ADVANCE, amount_out=amount, entry_date=transaction_date, account_id=staff_id
+    )
+    
+    # Create ledger entry
+    ledger_entry = models.StaffAdvanceLedger(
+        staff_id=staff_id,
+        transaction_date=transaction_date,
+        transaction_type='recovery',
+        amount=-amount,  # Negative for recovery
+        balance_after=new_balance,
+        description=description,
+        created_by=current_user.id
+    )
+    db.add(ledger_entry)
+    
+    # Update staff balance
+    staff.advance_balance = new_balance
+    
+    db.commit()
+    db.refresh(staff)
+    db.refresh(ledger_entry)
+    
+    return {
+        "success": True,
+        "staff_id": staff_id,
+        "staff_name": staff.name,
+        "recovery_amount": amount,
+        "previous_balance": current_balance,
+        "new_balance": new_balance,
+        "ledger_entry_id": ledger_entry.id
+    }
+
+# Vehicle endpoints
+@router.post("/vehicles/", response_model=schemas.Vehicle)
+def create_vehicle(
+    vehicle: schemas.VehicleCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_vehicle(db=db, vehicle=vehicle)
+
+@router.get("/vehicles/", response_model=list[schemas.Vehicle])
+def read_vehicles(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_vehicles(db, skip=skip, limit=limit)
+
+# Enhanced Trip endpoints (matching Excel structure)
+@router.post("/trips/", response_model=schemas.Trip)
+def create_trip(
+    trip: schemas.TripCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Create a new trip with automatic receivable and payable creation"""
+    try:
+        # Validate trip data
+        trip_dict = trip.model_dump()
+        validated_data = BusinessValidator.validate_trip_data(trip_dict)
+        
+        # Create trip with audit logging
+        db_trip = crud.create_trip(
+            db=db, 
+            trip=trip, 
+            current_user_id=current_user.id,
+            request=request
+        )
+        
+        # Send notification to user
+        notif = NotificationService(db)
+        notif.create_notification(
+            user_id=current_user.id,
+            title="Trip Created Successfully",
+            message=f"Trip {db_trip.reference_no} created with profit PKR {db_trip.net_profit:,.0f}",
+            notification_type="success",
+            link="/fleet-logs"
+        )
+        
+        return db_trip
+        
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Validation Error", "field": e.field, "message": e.message}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/trips/bulk")
+def create_trips_bulk(
+    trips: list[schemas.TripCreate],
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Create many trips (with receivables/payables) in a single transaction"""
+    errors = []
+    for index, trip in enumerate(trips):
+        try:
+            BusinessValidator.validate_trip_data(trip.model_dump())
+        except ValueError as e:
+            errors.append({"index": index, "reference_no": trip.reference_no, "errors": e.args[0]})
+    if errors:
+        raise HTTPException(status_code=400, detail={"error": "Validation Error", "rows": errors})
+    
+    try:
+        db_trips = crud.create_trips_bulk(
+            db=db,
+            trips=trips,
+            current_user_id=current_user.id,
+            request=request
+        )
+    except IntegrityError as e:
+        raise HTTPException(status_code=400, detail=f"Duplicate or invalid trip data: {e.orig}")
+    
+    return {
+        "message": f"{len(db_trips)} trips created successfully",
+        "created": len(db_trips),
+        "trip_ids": [t.id for t in db_trips]
+    }
+
+@router.get("/trips/")
+def read_trips(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get all trips with client, vendor and vehicle names"""
+    return RowsResponse(crud.get_trips(db, skip=skip, limit=limit))
+
+# Vendor endpoints
+@router.post("/vendors/", response_model=schemas.Vendor)
+def create_vendor(
+    vendor: schemas.VendorCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_vendor(db=db, vendor=vendor)
+
+@router.get("/vendors/", response_model=list[schemas.Vendor])
+def read_vendors(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_vendors(db, skip=skip, limit=limit)
+
+# Expense endpoints
+@router.post("/expenses/", response_model=schemas.Expense)
+def create_expense(
+    expense: schemas.ExpenseCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.create_expense(db=db, expense=expense, current_user_id=current_user.id)
+
+@router.get("/expenses/", response_model=list[schemas.Expense])
+def read_expenses(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return RowsResponse(crud.get_expenses(db, skip=skip, limit=limit))
+
+# Office Expense endpoints
+@router.post("/office-expenses/", response_model=schemas.OfficeExpense)
+def create_office_expense(
+    expense: schemas.OfficeExpenseCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Create a new office expense entry and automatically deduct from CEO Capital if payment is made"""
+    from balance_heads import BalanceHeadService, CEO_CAPITAL, OFFICE_EXPENSE
+    
+    balances = BalanceHeadService(db)
+    balances.post(
+        OFFICE_EXPENSE,
+        amount_in=expense.amount_received,
+        amount_out=expense.amount_paid,
+        entry_date=expense.date
+    )
+    
+    db_expense = models.OfficeExpense(
+        **expense.dict(),
+        created_by=current_user.id
+    )
+    db.add(db_expense)
+    db.flush()  # Get the expense ID before committing
+    
+    # If this is a payment (amount_paid > 0), automatically deduct from CEO Capital
+    if expense.amount_paid > 0:
+        current_balance, new_balance = balances.post(
+            CEO_CAPITAL, amount_out=expense.amount_paid, entry_date=expense.date
+        )
+        
+        # Create CEO Capital transaction
+        ceo_transaction = models.CEOCapital(
+            date=expense.date,
+            transaction_type='expense_payment',
+            description=f"Office Expense: {expense.account_title} - {expense.particulars[:50]}",
+            amount_in=0.0,
+            amount_out=expense.amount_paid,
+            balance=new_balance,
+            reference_id=db_expense.id,
+            reference_type='office_expense',
+            created_by=current_user.id
+        )
+        db.add(ceo_transaction)
+        db.flush()
+        
+        # Link the CEO Capital transaction to the expense
+        db_expense.ceo_capital_transaction_id = ceo_transaction.id
+    
+    db.commit()
+    db.refresh(db_expense)
+    return db_expense
+
+@router.get("/office-expenses/", response_model=list[schemas.OfficeExpense])
+def read_office_expenses(
+    skip: int = 0,
+    limit: int = 1000,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    entry_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get all office expenses with optional filters"""
+    query = db.query(models.OfficeExpense).order_by(models.OfficeExpense.date.asc(), models.OfficeExpense.id.asc())
+    
+    if start_date:
+        query = query.filter(models.OfficeExpense.date >= start_date)
+    if end_date:
+        query = query.filter(models.OfficeExpense.date <= end_date)
+    if category:
+        query = query.filter(models.OfficeExpense.account_title == category)
+    if entry_type:
+        query = query.filter(models.OfficeExpense.entry_type == entry_type)
+    
+    return query.offset(skip).limit(limit).all()
+
+@router.get("/office-expenses/download")
+def download_office_expenses_excel(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    category: Optional[str] = None,
+    entry_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Download office expenses as Excel file"""
+    from io import BytesIO
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from fastapi.responses import StreamingResponse
+    from datetime import datetime as dt
+    
+    # Get filtered expenses
+    query = db.query(models.OfficeExpense).order_by(models.OfficeExpense.date.asc(), models.OfficeExpense.id.asc())
+    
+    if start_date:
+        query = query.filter(models.OfficeExpense.date >= start_date)
+    if end_date:
+        query = query.filter(models.OfficeExpense.date <= end_date)
+    if category:
+        query = query.filter(models.OfficeExpense.account_title == category)
+    if entry_type:
+        query = query.filter(models.OfficeExpense.entry_type == entry_type)
+    
+    expenses = query.all()
+    
+    # Create workbook
+    wb = Workbook()
+    ws = wb.active
+    
+    # Determine month/year for title
+    if expenses:
+        first_date = expenses[0].date
+        title = f"SWL OFFICE EXPENSES {first_date.strftime('%b %Y').upper()}"
+    else:
+        title = f"SWL OFFICE EXPENSES {dt.now().strftime('%b %Y').upper()}"
+    
+    ws.title = "Office Expenses"
+    
+    # Add title row
+    ws.merge_cells('A1:G1')
+    title_cell = ws['A1']
+    title_cell.value = title
+    title_cell.font = Font(size=14, bold=True)
+    title_cell.alignment = Alignment(horizontal='center', vertical='center')
+    title_cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    title_cell.font = Font(size=14, bold=True, color="FFFFFF")
+    ws.row_dimensions[1].height = 25
+    
+    # Add headers
+    headers = ['Sr#', 'Date', 'Acc. Title', 'Particulars/Descriptions', 'Amount Rcvd', 'Amount Paid', 'Balance']
+    header_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+    header_font = Font(bold=True)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    for col_num, header in enumerate(headers, 1):
+        cell = ws.cell(row=2, column=col_num)
+        cell.value = header
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+    
+    # Set column widths
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 12
+    ws.column_dimensions['C'].width = 25
+    ws.column_dimensions['D'].width = 50
+    ws.column_dimensions['E'].width = 15
+    ws.column_dimensions['F'].width = 15
+    ws.column_dimensions['G'].width = 15
+    
+    # Add data rows with running balance
+    balance = 0
+    for idx, expense in enumerate(expenses, 1):
+        row_num = idx + 2
+        
+        # Calculate running balance
+        balance += (expense.amount_received or 0) - (expense.amount_paid or 0)
+        
+        # Add data
+        ws.cell(row=row_num, column=1).value = idx
+        ws.cell(row=row_num, column=2).value = expense.date.strftime('%d-%b-%y')
+        ws.cell(row=row_num, column=3).value = expense.account_title
+        ws.cell(row=row_num, column=4).value = expense.particulars
+        ws.cell(row=row_num, column=5).value = expense.amount_received if expense.amount_received > 0 else '-'
+        ws.cell(row=row_num, column=6).value = expense.amount_paid if expense.amount_paid > 0 else '-'
+        ws.cell(row=row_num, column=7).value = balance
+        
+        # Format numbers
+        if expense.amount_received > 0:
+            ws.cell(row=row_num, column=5).number_format = '#,##0'
+        if expense.amount_paid > 0:
+            ws.cell(row=row_num, column=6).number_format = '#,##0'
+        ws.cell(row=row_num, column=7).number_format = '#,##0'
+        
+        # Apply borders
+        for col in range(1, 8):
+            ws.cell(row=row_num, column=col).border = border
+            ws.cell(row=row_num, column=col).alignment = Alignment(vertical='center')
+        
+        # Right align numbers
+        for col in [5, 6, 7]:
+            ws.cell(row=row_num, column=col).alignment = Alignment(horizontal='right', vertical='center')
+    
+    # Save to BytesIO
+    excel_file = BytesIO()
+    wb.save(excel_file)
+    excel_file.seek(0)
+    
+    # Return as streaming response
+    filename = f"Office_Expenses_{dt.now().strftime('%Y%m%d')}.xlsx"
+    return StreamingResponse(
+        excel_file,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+# Client endpoints
+@router.post("/clients/", response_model=schemas.Client)
+def create_client(
+    client: schemas.ClientCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_client(db=db, client=client)
+
+@router.get("/clients/", response_model=list[schemas.Client])
+def read_clients(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_clients(db, skip=skip, limit=limit)
+
+@router.get("/clients/{client_id}", response_model=schemas.Client)
+def read_client(
+    client_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    client = crud.get_client(db, client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return client
+
+# Receivable endpoints
+@router.post("/receivables/", response_model=schemas.Receivable)
+def create_receivable(
+    receivable: schemas.ReceivableCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_receivable(db=db, receivable=receivable, current_user_id=current_user.id)
+
+@router.get("/receivables/", response_model=list[schemas.Receivable])
+def read_receivables(
+    skip: int = 0,
+    limit: int = 100,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return RowsResponse(crud.get_receivables(db, skip=skip, limit=limit, client_id=client_id, status=status))
+
+@router.get("/api/receivables")
+def list_receivables(
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    overdue_only: bool = False,
+    outstanding_only: bool = False,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort: str = "due_date",
+    order: str = "asc",
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    include_totals: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    Receivables one page at a time; pass next_cursor back as cursor for the next page.
+    totals cover every receivable matching the filters (skip them with include_totals=false).
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    try:
+        conditions = crud.receivable_filters(
+            client_id=client_id, status=status, due_from=due_from, due_to=due_to,
+            overdue_only=overdue_only, outstanding_only=outstanding_only,
+            min_amount=min_amount, max_amount=max_amount
+        )
+        page = crud.receivables_page(db, conditions, sort, order == "desc", cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if include_totals:
+        page["totals"] = crud.receivable_totals(db, conditions)
+    return ORJSONResponse(page)
+
+@router.get("/receivables/{receivable_id}", response_model=schemas.Receivable)
+def read_receivable(
+    receivable_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    receivable = crud.get_receivable(db, receivable_id)
+    if not receivable:
+        raise HTTPException(status_code=404, detail="Receivable not found")
+    return receivable
+
+# Collection endpoints
+@router.post("/collections/", response_model=schemas.Collection)
+def create_collection(
+    collection: schemas.CollectionCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    try:
+        return crud.create_collection(db=db, collection=collection, current_user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/collections/", response_model=list[schemas.Collection])
+def read_collections(
+    skip: int = 0,
+    limit: int = 100,
+    receivable_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_collections(db, skip=skip, limit=limit, receivable_id=receivable_id)
+
+# Trip completion and receivable creation
+@router.put("/trips/{trip_id}/complete")
+def complete_trip_and_create_receivable(
+    trip_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Complete trip and automatically create receivable if client is assigned"""
+    trip = db.query(models.Trip).filter(models.Trip.id == trip_id).first()
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    
+    # Update trip status
+    trip.status = "completed"
+    trip.completed_at = datetime.now()
+    
+    # Create receivable if client is assigned and not already created
+    receivable = None
+    if trip.client_id and not trip.receivable_created:
+        receivable = crud.create_receivable_from_trip(db, trip, current_user.id)
+    
+    db.commit()
+    
+    return {
+        "message": "Trip completed successfully",
+        "trip_id": trip.id,
+        "receivable_created": receivable is not None,
+        "receivable_id": receivable.id if receivable else None
+    }
+
+# Trip status update endpoint
+@router.put("/trips/{trip_id}/status")
+def update_trip_status(
+    trip_id: int,
+    status_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Update trip status (DRAFT -> ACTIVE -> COMPLETED -> LOCKED)"""
+    trip = db.query(models.Trip).filter(models.Trip.id == trip_id).first()
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    
+    new_status = status_data.get("status")
+    if not new_status:
+        raise HTTPException(status_code=400, detail="Status is required")
+    
+    # Validate status transition
+    valid_statuses = ["DRAFT", "ACTIVE", "COMPLETED", "LOCKED"]
+    if new_status not in valid_statuses:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
+    
+    # Update status
+    trip.status = models.TripStatus[new_status]
+    
+    if new_status == "COMPLETED":
+        trip.completed_at = datetime.now()
+    
+    db.commit()
+    db.refresh(trip)
+    
+    return {
+        "message": f"Trip status updated to {new_status}",
+        "trip_id": trip.id,
+        "status": trip.status.value
+    }
+
+# Trip cancellation endpoint with financial reversal
+@router.put("/trips/{trip_id}/cancel")
+def cancel_trip(
+    trip_id: int,
+    cancel_data: dict,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Cancel trip and reverse all financial records (receivable, payable, cash transactions)"""
+    trip = db.query(models.Trip).filter(models.Trip.id == trip_id).first()
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    
+    if trip.status in [models.TripStatus.LOCKED]:
+        raise HTTPException(status_code=400, detail="Cannot cancel a locked trip")
+    
+    reason = cancel_data.get("reason", "")
+    if not reason:
+        raise HTTPException(status_code=400, detail="Cancellation reason is required")
+    
+    try:
+        # Mark trip as cancelled
+        trip.status = models.TripStatus.CANCELLED if hasattr(models.TripStatus, 'CANCELLED') else models.TripStatus.DRAFT
+        trip.notes = f"{trip.notes or ''}\n\nCANCELLED: {reason} (by {current_user.username} on {datetime.now()})"
+        
+        # Reverse receivable if exists
+        if trip.receivable_id:
+            receivable = db.query(models.Receivable).filter(models.Receivable.id == trip.receivable_id).first()
+            if receivable:
+                receivable.status = models.ReceivableStatus.CANCELLED
+                receivable.is_deleted = True
+                receivable.deleted_at = datetime.now()
+                receivable.deleted_by = current_user.id
+        
+        # Reverse payable if exists
+        if trip.payable_id:
+            payable = db.query(models.Payable).filter(models.Payable.id == trip.payable_id).first()
+            if payable:
+                payable.status = "cancelled"
+                payable.is_deleted = True
+                payable.deleted_at = datetime.now()
+                payable.deleted_by = current_user.id
+        
+        # Reverse cash transactions
+        # Find cash transactions related to this trip's receivable and payable
+        if trip.receivable_id:
+            cash_txns = db.query(models.CashTransaction).filter(
+                models.CashTransaction.source_module == "receivable",
+                models.CashTransaction.source_id == trip.receivable_id,
+                models.CashTransaction.is_deleted == False
+            ).all()
+            for txn in cash_txns:
+                txn.is_deleted = True
+                txn.deleted_at = datetime.now()
+                txn.deleted_by = current_user.id
+        
+        if trip.payable_id:
+            cash_txns = db.query(models.CashTransaction).filter(
+                models.CashTransaction.source_module == "payable",
+                models.CashTransaction.source_id == trip.payable_id,
+                models.CashTransaction.is_deleted == False
+            ).all()
+            for txn in cash_txns:
+                txn.is_deleted = True
+                txn.deleted_at = datetime.now()
+                txn.deleted_by = current_user.id
+        
+        db.commit()
+        
+        return {
+            "message": "Trip cancelled and financial records reversed successfully",
+            "trip_id": trip.id,
+            "receivable_reversed": trip.receivable_id is not None,
+            "payable_reversed": trip.payable_id is not None,
+            "reason": reason
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to cancel trip: {str(e)}")
+
+# Payable endpoints
+@router.post("/payables/", response_model=schemas.Payable)
+def create_payable(
+    payable: schemas.PayableCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_payable(db=db, payable=payable)
+
+@router.get("/payables/", response_model=list[schemas.Payable])
+def read_payables(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return RowsResponse(crud.get_payables(db, skip=skip, limit=limit))
+
+@router.get("/api/payables")
+def list_payables(
+    vendor_id: Optional[int] = None,
+    status: Optional[str] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    overdue_only: bool = False,
+    outstanding_only: bool = False,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort: str = "due_date",
+    order: str = "asc",
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    include_totals: bool = True,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """
+    Payables one page at a time; pass next_cursor back as cursor for the next page.
+    totals cover every payable matching the filters (skip them with include_totals=false).
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    try:
+        conditions = crud.payable_filters(
+            vendor_id=vendor_id, status=status, due_from=due_from, due_to=due_to,
+            overdue_only=overdue_only, outstanding_only=outstanding_only,
+            min_amount=min_amount, max_amount=max_amount
+        )
+        page = crud.payables_page(db, conditions, sort, order == "desc", cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if include_totals:
+        page["totals"] = crud.payable_totals(db, conditions)
+    return ORJSONResponse(page)
+
+@router.put("/payables/{payable_id}/status")
+def update_payable_status(
+    payable_id: int,
+    status: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.update_payable_status(db, payable_id, status)
+
+# Payment Request endpoints
+@router.post("/payment-requests/", response_model=schemas.PaymentRequest)
+def create_payment_request(
+    payment_request: schemas.PaymentRequestCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Create payment request and notify admins"""
+    try:
+        # Get the payable to check outstanding amount
+        payable = crud.get_payable(db, payment_request.payable_id)
+        if not payable:
+            raise HTTPException(status_code=404, detail="Payable not found")
+        
+        # Validate payment request with outstanding amount
+        validated_data = BusinessValidator.validate_payment_request(
+            payment_request.model_dump(), 
+            payable.outstanding_amount or payable.amount
+        )
+        
+        # Create payment request
+        db_payment_request = crud.create_payment_request(
+            db=db, 
+            payment_request=payment_request, 
+            current_user_id=current_user.id
+        )
+        
+        # Audit logging
+        audit = AuditService(db)
+        audit.log_create(
+            user_id=current_user.id,
+            table_name="payment_requests",
+            record_id=db_payment_request.id,
+            new_values={
+                "vendor_id": db_payment_request.vendor_id,
+                "requested_amount": db_payment_request.requested_amount,
+                "status": db_payment_request.status.value
+            },
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request)
+        )
+        
+        # Notify admins
+        notif = NotificationService(db)
+        admin_ids = get_admin_user_ids(db)
+        vendor = db.query(models.Vendor).filter(models.Vendor.id == db_payment_request.vendor_id).first()
+        
+        notif.notify_payment_request_submitted(
+            admin_user_ids=admin_ids,
+            vendor_name=vendor.name if vendor else "Unknown",
+            amount=db_payment_request.requested_amount,
+            payment_request_id=db_payment_request.id
+        )
+        
+        return db_payment_request
+        
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Validation Error", "field": e.field, "message": e.message}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/payment-requests/")
+def read_payment_requests(
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get all payment requests with proper enum serialization and relationships"""
+    payment_requests = crud.get_payment_requests(db, skip=skip, limit=limit, status=status)
+    
+    # Manually serialize to handle enums and include relationships
+    result = []
+    for pr in payment_requests:
+        result.append({
+            "id": pr.id,
+            "payable_id": pr.payable_id,
+            "vendor_id": pr.vendor_id,
+            "payment_type": pr.payment_type.value if hasattr(pr.payment_type, 'value') else str(pr.payment_type),
+            "requested_amount": pr.requested_amount,
+            "remaining_amount": pr.remaining_amount,
+            "payment_channel": pr.payment_channel.value if hasattr(pr.payment_channel, 'value') else str(pr.payment_channel),
+            "request_reason": pr.request_reason,
+            "urgency_level": pr.urgency_level,
+            "status": pr.status.value if hasattr(pr.status, 'value') else str(pr.status),
+            "requested_by": pr.requested_by,
+            "requested_at": pr.requested_at,
+            "approved_by": pr.approved_by,
+            "approved_at": pr.approved_at,
+            "rejection_reason": pr.rejection_reason,
+            "payment_reference": pr.payment_reference,
+            "payment_date": pr.payment_date,
+            "payment_notes": pr.payment_notes,
+            "created_at": pr.created_at,
+            "updated_at": pr.updated_at,
+            # Include vendor and payable data
+            "vendor": {
+                "id": pr.vendor.id,
+                "name": pr.vendor.name,
+                "vendor_code": pr.vendor.vendor_code
+            } if pr.vendor else None,
+            "payable": {
+                "id": pr.payable.id,
+                "invoice_number": pr.payable.invoice_number,
+                "amount": pr.payable.amount,
+                "outstanding_amount": pr.payable.outstanding_amount
+            } if pr.payable else None
+        })
+    
+    return result
+
+@router.get("/payment-requests/{request_id}")
+def read_payment_request(
+    request_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get single payment request with proper enum serialization"""
+    pr = crud.get_payment_request(db, request_id)
+    if not pr:
+        raise HTTPException(status_code=404, detail="Payment request not found")
+    
+    # Manually serialize to handle enums
+    return {
+        "id": pr.id,
+        "payable_id": pr.payable_id,
+        "vendor_id": pr.vendor_id,
+        "payment_type": pr.payment_type.value if hasattr(pr.payment_type, 'value') else str(pr.payment_type),
+        "requested_amount": pr.requested_amount,
+        "remaining_amount": pr.remaining_amount,
+        "payment_channel": pr.payment_channel.value if hasattr(pr.payment_channel, 'value') else str(pr.payment_channel),
+        "request_reason": pr.request_reason,
+        "urgency_level": pr.urgency_level,
+        "status": pr.status.value if hasattr(pr.status, 'value') else str(pr.status),
+        "requested_by": pr.requested_by,
+        "requested_at": pr.requested_at,
+        "approved_by": pr.approved_by,
+        "approved_at": pr.approved_at,
+        "rejection_reason": pr.rejection_reason,
+        "payment_reference": pr.payment_reference,
+        "payment_date": pr.payment_date,
+        "payment_notes": pr.payment_notes,
+        "created_at": pr.created_at,
+        "updated_at": pr.updated_at
+    }
+
+@router.put("/payment-requests/{request_id}")
+def update_payment_request(
+    request_id: int,
+    update_data: schemas.PaymentRequestUpdate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Update payment request and notify requester"""
+    try:
+        # Get old values for audit
+        old_payment_request = crud.get_payment_request(db, request_id)
+        if not old_payment_request:
+            raise HTTPException(status_code=404, detail="Payment request not found")
+        
+        old_status = old_payment_request.status.value
+        
+        # Update payment request
+        payment_request = crud.update_payment_request(db, request_id, update_data, current_user.id)
+        
+        if not payment_request:
+            raise HTTPException(status_code=404, detail="Payment request not found")
+        
+        # Audit logging
+        audit = AuditService(db)
+        audit.log_update(
+            user_id=current_user.id,
+            table_name="payment_requests",
+            record_id=request_id,
+            old_values={"status": old_status},
+            new_values={"status": payment_request.status.value},
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request)
+        )
+        
+        # Send notification based on status change
+        notif = NotificationService(db)
+        vendor = db.query(models.Vendor).filter(models.Vendor.id == payment_request.vendor_id).first()
+        vendor_name = vendor.name if vendor else "Unknown"
+        
+        if payment_request.status.value == "approved" and old_status != "approved":
+            notif.notify_payment_approved(
+                requester_id=payment_request.requested_by,
+                vendor_name=vendor_name,
+                amount=payment_request.requested_amount
+            )
+        elif payment_request.status.value == "rejected" and old_status != "rejected":
+            notif.notify_payment_rejected(
+                requester_id=payment_request.requested_by,
+                vendor_name=vendor_name,
+                amount=payment_request.requested_amount,
+                reason=update_data.rejection_reason or "No reason provided"
+            )
+        
+        # Manually serialize to handle enums
+        return {
+            "id": payment_request.id,
+            "payable_id": payment_request.payable_id,
+            "vendor_id": payment_request.vendor_id,
+            "payment_type": payment_request.payment_type.value if hasattr(payment_request.payment_type, 'value') else str(payment_request.payment_type),
+            "requested_amount": payment_request.requested_amount,
+            "remaining_amount": payment_request.remaining_amount,
+            "payment_channel": payment_request.payment_channel.value if hasattr(payment_request.payment_channel, 'value') else str(payment_request.payment_channel),
+            "request_reason": payment_request.request_reason,
+            "urgency_level": payment_request.urgency_level,
+            "status": payment_request.status.value if hasattr(payment_request.status, 'value') else str(payment_request.status),
+            "requested_by": payment_request.requested_by,
+            "requested_at": payment_request.requested_at,
+            "approved_by": payment_request.approved_by,
+            "approved_at": payment_request.approved_at,
+            "rejection_reason": payment_request.rejection_reason,
+            "payment_reference": payment_request.payment_reference,
+            "payment_date": payment_request.payment_date,
+            "payment_notes": payment_request.payment_notes,
+            "created_at": payment_request.created_at,
+            "updated_at": payment_request.updated_at
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error updating payment request: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@router.get("/payment-requests/pending/count")
+def get_pending_payment_requests_count(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    count = crud.get_pending_payment_requests_count(db)
+    return {"pending_count": count}
+
+# Vehicle Log endpoints
+@router.post("/vehicle-logs/", response_model=schemas.VehicleLog)
+def create_vehicle_log(
+    log: schemas.VehicleLogCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    try:
+        return crud.create_vehicle_log(db=db, log=log)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/vehicle-logs/", response_model=list[schemas.VehicleLog])
+def read_vehicle_logs(
+    skip: int = 0,
+    limit: int = 100,
+    vehicle_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    return crud.get_vehicle_logs(db, skip=skip, limit=limit, vehicle_id=vehicle_id)
@@ -0,0 +1,188 @@
+"""
+Payroll Routes
+Payroll entries and payslips
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+import models
+import schemas
+import crud
+import auth
+from database import get_db
+from document_bundle import bundle_response
+
+router = APIRouter(tags=["payroll"])
+
+# Payroll endpoints
+@router.post("/payroll/", response_model=schemas.PayrollEntry)
+def create_payroll_entry(
+    payroll: schemas.PayrollEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.create_payroll_entry(db=db, payroll=payroll)
+
+@router.get("/payroll/", response_model=list[schemas.PayrollEntry])
+def read_payroll_entries(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    return crud.get_payroll_entries(db, skip=skip, limit=limit)
+
+# ============================================
+# PAYSLIP GENERATION ENDPOINTS
+# ============================================
+
+@router.post("/payslips/generate/{payroll_id}")
+def generate_payslip(
+    payroll_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Generate payslip PDF for specific payroll entry"""
+    from fastapi.responses import StreamingResponse
+    from payslip_generator import payslip_generator
+    
+    # Get payroll entry
+    payroll = db.query(models.PayrollEntry).filter(models.PayrollEntry.id == payroll_id).first()
+    if not payroll:
+        raise HTTPException(status_code=404, detail="Payroll entry not found")
+    
+    # Get staff details
+    staff = payroll.staff
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff member not found")
+    
+    # Prepare staff and payroll data
+    staff_data, payroll_data = payslip_generator.payslip_data(staff, payroll)
+    
+    # Generate PDF
+    pdf_buffer = payslip_generator.generate_payslip_pdf(staff_data, payroll_data)
+    
+    return StreamingResponse(
+        pdf_buffer,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=payslip_{staff.name.replace(' ', '_')}_{payroll.month}_{payroll.year}.pdf"
+        }
+    )
+
+@router.post("/payslips/email/{payroll_id}")
+def email_payslip(
+    payroll_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """Generate and email payslip to staff member"""
+    from payslip_generator import payslip_generator
+    from email_service import email_service
+    
+    # Get payroll entry
+    payroll = db.query(models.PayrollEntry).filter(models.PayrollEntry.id == payroll_id).first()
+    if not payroll:
+        raise HTTPException(status_code=404, detail="Payroll entry not found")
+    
+    # Get staff details
+    staff = payroll.staff
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff member not found")
+    
+    if not staff.email:
+        raise HTTPException(status_code=400, detail="Staff member email not found")
+    
+    # Prepare data
+    staff_data, payroll_data = payslip_generator.payslip_data(staff, payroll)
+    
+    # Generate PDF
+    pdf_buffer = payslip_generator.generate_payslip_pdf(staff_data, payroll_data)
+    
+    # Send email
+    result = email_service.send_payslip_email(
+        to_email=staff.email,
+        staff_name=staff.name,
+        month=payroll.month,
+        year=payroll.year,
+        net_payable=payroll.net_payable,
+        pdf_attachment=pdf_buffer
+    )
+    
+    if result["success"]:
+        return {
+            "success": True,
+            "message": f"Payslip emailed to {staff.email}"
+        }
+    else:
+        raise HTTPException(status_code=500, detail="Failed to send email")
+
+@router.post("/payslips/bulk-generate")
+def bulk_generate_payslips(
+    month: int,
+    year: int,
+    bundle: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN, models.UserRole.MANAGER]))
+):
+    """
+    Generate payslips for all staff for specified month/year.
+    With bundle=zip or bundle=pdf the payslips are streamed back as one download.
+    """
+    from payslip_generator import payslip_generator
+    
+    if bundle:
+        from document_bundle import DocumentBundleService
+        
+        documents = DocumentBundleService(db).payslip_documents(month, year)
+        if not documents:
+            raise HTTPException(status_code=404, detail=f"No payroll entries found for {month}/{year}")
+        return bundle_response(documents, bundle, f"payslips_{year}_{month:02d}")
+    
+    # Get all payroll entries for the month/year
+    payrolls = db.query(models.PayrollEntry).filter(
+        models.PayrollEntry.month == month,
+        models.PayrollEntry.year == year
+    ).all()
+    
+    if not payrolls:
+        raise HTTPException(status_code=404, detail=f"No payroll entries found for {month}/{year}")
+    
+    results = {
+        "generated": 0,
+        "failed": 0,
+        "details": []
+    }
+    
+    for payroll in payrolls:
+        try:
+            staff = payroll.staff
+            if not staff:
+                results["failed"] += 1
+                results["details"].append({
+                    "payroll_id": payroll.id,
+                    "status": "failed",
+                    "error": "Staff not found"
+                })
+                continue
+            
+            # Generate payslip
+            staff_data, payroll_data = payslip_generator.payslip_data(staff, payroll)
+            payslip_generator.generate_payslip_pdf(staff_data, payroll_data)
+            
+            results["generated"] += 1
+            results["details"].append({
+                "payroll_id": payroll.id,
+                "staff_name": staff.name,
+                "status": "success"
+            })
+            
+        except Exception as e:
+            results["failed"] += 1
+            results["details"].append({
+                "payroll_id": payroll.id,
+                "status": "failed",
+                "error": str(e)
+            })
+    
+    return results
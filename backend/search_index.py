@@ -0,0 +1,369 @@
+"""
+Search Index
+One full-text index over trips, clients, vendors, invoices and payment references.
+
+SQLite stores it in an FTS5 table with the trigram tokenizer, so any three or
+more characters of a vehicle number or reference match. PostgreSQL stores it in
+a table with a GIN-indexed tsvector and matches word prefixes. Flush hooks
+re-index changed rows (and the trips, invoices and payments that show a
+renamed client, vendor or vehicle) in the same transaction; bulk writes, which
+skip those hooks, call index_rows themselves.
+"""
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session, attributes
+
+import models
+
+logger = logging.getLogger(__name__)
+
+SQLITE_TABLE = "search_index"
+POSTGRES_TABLE = "search_documents"
+
+# Document keys are ref_id * KEY_SLOTS + kind position, so a row is found without scanning
+KEY_SLOTS = 8
+
+MAX_RESULTS = 100
+
+# Set once the index table exists; the hooks do nothing before that
+_index_ready = False
+
+
+class Kind(NamedTuple):
+    model: type
+    build: Callable  # select of (id, title, subtitle, *searchable parts)
+
+
+def _trips():
+    trip, vehicle = models.Trip, models.Vehicle
+    return select(
+        trip.id,
+        trip.reference_no,
+        trip.source_location + " → " + trip.destination_location,
+        trip.reference_no, vehicle.vehicle_no, trip.source_location, trip.destination_location,
+        models.Client.name, models.Vendor.name, trip.category_product, trip.driver_operator
+    ).outerjoin(vehicle, vehicle.id == trip.vehicle_id).outerjoin(
+        models.Client, models.Client.id == trip.client_id
+    ).outerjoin(models.Vendor, models.Vendor.id == trip.vendor_id)
+
+
+def _clients():
+    client = models.Client
+    return select(
+        client.id, client.name, client.client_code,
+        client.name, client.client_code, client.contact_person, client.phone
+    )
+
+
+def _vendors():
+    vendor = models.Vendor
+    return select(
+        vendor.id, vendor.name, vendor.vendor_code,
+        vendor.name, vendor.vendor_code, vendor.contact_person, vendor.phone
+    )
+
+
+def _receivables():
+    receivable = models.Receivable
+    return select(
+        receivable.id, receivable.invoice_number, models.Client.name,
+        receivable.invoice_number, models.Client.name, receivable.description
+    ).outerjoin(models.Client, models.Client.id == receivable.client_id)
+
+
+def _payables():
+    payable = models.Payable
+    return select(
+        payable.id, payable.invoice_number, models.Vendor.name,
+        payable.invoice_number, models.Vendor.name, payable.description
+    ).outerjoin(models.Vendor, models.Vendor.id == payable.vendor_id)
+
+
+def _collections():
+    collection = models.Collection
+    return select(
+        collection.id, collection.reference_number, models.Client.name,
+        collection.reference_number, models.Client.name
+    ).outerjoin(models.Client, models.Client.id == collection.client_id).where(
+        collection.reference_number.isnot(None)
+    )
+
+
+def _payment_requests():
+    request = models.PaymentRequest
+    return select(
+        request.id, request.payment_reference, models.Vendor.name,
+        request.payment_reference, models.Vendor.name
+    ).outerjoin(models.Vendor, models.Vendor.id == request.vendor_id).where(
+        request.payment_reference.isnot(None)
+    )
+
+
+# Result types, in key-slot order (append only: the position is part of stored keys)
+KINDS: Dict[str, Kind] = {
+    'trip': Kind(models.Trip, _trips),
+    'client': Kind(models.Client, _clients),
+    'vendor': Kind(models.Vendor, _vendors),
+    'receivable': Kind(models.Receivable, _receivables),
+    'payable': Kind(models.Payable, _payables),
+    'collection': Kind(models.Collection, _collections),
+    'payment_request': Kind(models.PaymentRequest, _payment_requests),
+}
+KIND_SLOT = {name: position for position, name in enumerate(KINDS)}
+KIND_BY_MODEL = {kind.model: name for name, kind in KINDS.items()}
+
+# Renaming one of these changes the documents of other kinds: (attribute, [(kind, foreign key)])
+DEPENDENTS = {
+    models.Client: ('name', [('trip', models.Trip.client_id), ('receivable', models.Receivable.client_id),
+                             ('collection', models.Collection.client_id)]),
+    models.Vendor: ('name', [('trip', models.Trip.vendor_id), ('payable', models.Payable.vendor_id),
+                             ('payment_request', models.PaymentRequest.vendor_id)]),
+    models.Vehicle: ('vehicle_no', [('trip', models.Trip.vehicle_id)]),
+}
+
+
+def _is_postgres(connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+# ============================================
+# SCHEMA
+# ============================================
+
+def ensure_index(engine) -> bool:
+    """
+    Create the index table when missing and fill it from the source tables.
+    Returns True when the index was (re)built.
+    """
+    global _index_ready
+    with engine.begin() as connection:
+        if _is_postgres(connection):
+            exists = connection.execute(text("SELECT to_regclass(:name)"), {"name": POSTGRES_TABLE}).scalar()
+            if not exists:
+                connection.execute(text(
+                    f"CREATE TABLE {POSTGRES_TABLE} ("
+                    "doc_key BIGINT PRIMARY KEY, kind VARCHAR NOT NULL, ref_id INTEGER NOT NULL, "
+                    "title TEXT, subtitle TEXT, content TEXT, document TSVECTOR NOT NULL)"
+                ))
+                connection.execute(text(
+                    f"CREATE INDEX idx_search_document ON {POSTGRES_TABLE} USING GIN (document)"
+                ))
+        else:
+            exists = connection.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": SQLITE_TABLE}
+            ).scalar()
+            if not exists:
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5("
+                    "kind UNINDEXED, ref_id UNINDEXED, title, subtitle UNINDEXED, content, "
+                    "tokenize = 'trigram')"
+                ))
+        if not exists:
+            count = rebuild(connection)
+            logger.info("Search index created with %s documents", count)
+    _index_ready = True
+    return not exists
+
+
+def rebuild(connection) -> int:
+    """Re-index every document on the given connection. Returns the number indexed."""
+    table = POSTGRES_TABLE if _is_postgres(connection) else SQLITE_TABLE
+    connection.execute(text(f"DELETE FROM {table}"))
+    return sum(_reindex(connection, kind) for kind in KINDS)
+
+
+# ============================================
+# INDEXING
+# ============================================
+
+def _reindex(connection, kind: str, ids: Optional[Iterable[int]] = None, where=None) -> int:
+    """Replace the documents of one kind: the given ids, the rows matching where, or all"""
+    spec = KINDS[kind]
+    if ids is None and where is None:
+        rows = connection.execute(spec.build()).all()
+        return _write(connection, kind, [], rows)
+        
+    written = 0
+    ids = sorted(set(ids or ()))
+    query = spec.build()
+    if where is not None:
+        rows = connection.execute(query.where(where)).all()
+        written += _write(connection, kind, [row[0] for row in rows], rows)
+    for start in range(0, len(ids), 900):
+        chunk = ids[start:start + 900]
+        rows = connection.execute(query.where(spec.model.id.in_(chunk))).all()
+        written += _write(connection, kind, chunk, rows)
+    return written
+
+
+def _write(connection, kind: str, stale_ids: List[int], rows) -> int:
+    slot = KIND_SLOT[kind]
+    keys = [ref_id * KEY_SLOTS + slot for ref_id in stale_ids]
+    documents = []
+    for row in rows:
+        ref_id, title, subtitle, *parts = row
+        content = " ".join(str(part) for part in parts if part)
+        if not content:
+            continue
+        documents.append({
+            "doc_key": ref_id * KEY_SLOTS + slot,
+            "kind": kind,
+            "ref_id": ref_id,
+            "title": title or "",
+            "subtitle": subtitle or "",
+            "content": content
+        })
+        
+    if _is_postgres(connection):
+        if keys:
+            connection.execute(text(f"DELETE FROM {POSTGRES_TABLE} WHERE doc_key = ANY(:keys)"), {"keys": keys})
+        if documents:
+            connection.execute(text(
+                f"INSERT INTO {POSTGRES_TABLE} (doc_key, kind, ref_id, title, subtitle, content, document) "
+                "VALUES (:doc_key, :kind, :ref_id, :title, :subtitle, :content, "
+                "to_tsvector('simple', :content))"
+            ), documents)
+    else:
+        if keys:
+            placeholders = ", ".join(str(int(key)) for key in keys)
+            connection.execute(text(f"DELETE FROM {SQLITE_TABLE} WHERE rowid IN ({placeholders})"))
+        if documents:
+            connection.execute(text(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, kind, ref_id, title, subtitle, content) "
+                "VALUES (:doc_key, :kind, :ref_id, :title, :subtitle, :content)"
+            ), documents)
+    return len(documents)
+
+
+def _changed_documents(session: Session) -> Dict[str, set]:
+    changes: Dict[str, set] = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        kind = KIND_BY_MODEL.get(type(obj))
+        if kind and obj.id is not None:
+            changes.setdefault(kind, set()).add(obj.id)
+    return changes
+
+
+@event.listens_for(Session, 'after_flush')
+def _index_flushed_rows(session, flush_context):
+    if not _index_ready:
+        return
+    changes = _changed_documents(session)
+    dependents = []
+    for obj in session.dirty:
+        spec = DEPENDENTS.get(type(obj))
+        if spec and attributes.get_history(obj, spec[0]).has_changes():
+            dependents.extend((kind, column == obj.id) for kind, column in spec[1])
+    if not changes and not dependents:
+        return
+        
+    connection = session.connection()
+    for kind, ids in changes.items():
+        _reindex(connection, kind, ids)
+    for kind, condition in dependents:
+        _reindex(connection, kind, where=condition)
+
+
+def renamed_ids(session: Session, model, updates: List[Dict]) -> List[int]:
+    """
+    Ids in bulk update mappings that change the name other documents show.
+    Call before bulk_update_mappings; pass the result to index_rows after it.
+    """
+    spec = DEPENDENTS.get(model)
+    if not _index_ready or not spec:
+        return []
+    attribute = spec[0]
+    new_values = {m['id']: m[attribute] for m in updates if attribute in m}
+    if not new_values:
+        return []
+    column = getattr(model, attribute)
+    current = session.execute(select(model.id, column).where(model.id.in_(new_values.keys())))
+    return [row_id for row_id, value in current if value != new_values[row_id]]
+
+
+def index_rows(session: Session, model, ids: Iterable[int], renamed: Iterable[int] = ()) -> None:
+    """
+    Re-index rows written with bulk_insert_mappings / bulk_update_mappings,
+    which skip the flush hook, plus the documents showing a renamed row.
+    """
+    if not _index_ready:
+        return
+    kind = KIND_BY_MODEL.get(model)
+    renamed = list(renamed)
+    connection = session.connection()
+    if kind:
+        _reindex(connection, kind, ids)
+    if renamed:
+        for dependent, column in DEPENDENTS[model][1]:
+            _reindex(connection, dependent, where=column.in_(renamed))
+
+
+# ============================================
+# SEARCH
+# ============================================
+
+def search(db: Session, query: str, types: Optional[List[str]] = None, limit: int = 20) -> List[Dict]:
+    """Ranked documents matching every word of the query, best first"""
+    for name in types or []:
+        if name not in KINDS:
+            raise ValueError(f"Unknown result type '{name}'; use one of {', '.join(KINDS)}")
+    limit = min(max(limit, 1), MAX_RESULTS)
+    connection = db.connection()
+    if _is_postgres(connection):
+        rows = _search_postgres(connection, query, types, limit)
+    else:
+        rows = _search_sqlite(connection, query, types, limit)
+    return [
+        {"type": kind, "id": int(ref_id), "title": title, "subtitle": subtitle, "score": round(float(score), 4)}
+        for kind, ref_id, title, subtitle, score in rows
+    ]
+
+
+def _kind_filter(types: Optional[List[str]], params: Dict) -> str:
+    if not types:
+        return ""
+    names = []
+    for position, name in enumerate(types):
+        params[f"kind_{position}"] = name
+        names.append(f":kind_{position}")
+    return f" AND kind IN ({', '.join(names)})"
+
+
+def _search_sqlite(connection, query: str, types, limit: int):
+    params = {"limit": limit}
+    kinds = _kind_filter(types, params)
+    # The trigram tokenizer needs three characters; shorter words only narrow a longer query
+    terms = [term for term in query.lower().split() if len(term) >= 3]
+    if terms:
+        params["match"] = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        return connection.execute(text(
+            f"SELECT kind, ref_id, title, subtitle, -bm25({SQLITE_TABLE}, 0, 0, 10.0, 0, 1.0) AS score "
+            f"FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH :match{kinds} "
+            f"ORDER BY bm25({SQLITE_TABLE}, 0, 0, 10.0, 0, 1.0) LIMIT :limit"
+        ), params).all()
+        
+    term = query.strip().lower()
+    if not term:
+        return []
+    params["pattern"] = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return connection.execute(text(
+        f"SELECT kind, ref_id, title, subtitle, 0.0 AS score FROM {SQLITE_TABLE} "
+        f"WHERE (title LIKE :pattern ESCAPE '\\' OR content LIKE :pattern ESCAPE '\\'){kinds} LIMIT :limit"
+    ), params).all()
+
+
+def _search_postgres(connection, query: str, types, limit: int):
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return []
+    params = {"limit": limit, "tsquery": " & ".join(f"{word}:*" for word in words)}
+    kinds = _kind_filter(types, params)
+    return connection.execute(text(
+        f"SELECT kind, ref_id, title, subtitle, ts_rank(document, query) AS score "
+        f"FROM {POSTGRES_TABLE}, to_tsquery('simple', :tsquery) query "
+        f"WHERE document @@ query{kinds} ORDER BY score DESC LIMIT :limit"
+    ), params).all()
@@ -3,15 +3,13 @@ Staff Advance Ledger Generator - Bank Statement Style
 Professional ledger with running balance for Muhammad Hussain and other staff
 """
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from datetime import datetime
 from io import BytesIO
 from typing import Optional, Dict, List
-from pathlib import Path
+from pdf_assets import get_pdf_assets
 
 class StaffLedgerGenerator:
     def __init__(self):
@@ -23,21 +21,9 @@ class StaffLedgerGenerator:
             "email": "info@pgtinternational.com"
         }
         
-        # Red/Black theme
-        self.colors = {
-            'primary': colors.HexColor('#dc2626'),
-            'secondary': colors.HexColor('#1f2937'),
-            'accent': colors.HexColor('#ef4444'),
-            'background': colors.HexColor('#f8fafc'),
-            'text': colors.HexColor('#1f2937'),
-            'positive': colors.HexColor('#059669'),
-            'negative': colors.HexColor('#dc2626')
-        }
-        
-        # Logo path
-        self.logo_path = Path("backend/static/logo.png")
-        if not self.logo_path.exists():
-            self.logo_path = None
+        # Red/Black statement theme, styles and logo from the shared registry
+        self.assets = get_pdf_assets()
+        self.colors = self.assets.palette('ledger')
     
     def generate_staff_recovery_statement(
         self,
@@ -86,61 +72,25 @@ class StaffLedgerGenerator:
             bottomMargin=0.4*inch
         )
         
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # ============================================
-        # HEADER
-        # ============================================
-        
-        if self.logo_path and self.logo_path.exists():
-            logo = Image(str(self.logo_path), width=0.8*inch, height=0.8*inch)
-        else:
-            # Simple placeholder
-            from reportlab.graphics.shapes import Drawing, Rect, String
-            drawing = Drawing(0.8*inch, 0.8*inch)
-            drawing.add(Rect(0, 0, 0.8*inch, 0.8*inch, 
-                            fillColor=self.colors['primary'], 
-                            strokeColor=None))
-            drawing.add(String(0.4*inch, 0.4*inch, 'PGT',
-                              fontSize=18,
-                              fillColor=colors.white,
-                              textAnchor='middle'))
-            logo = drawing
-        
-        company_header = f"""
-        <font size=16 color="{self.colors['primary'].hexval()}"><b>{self.company_info['name']}</b></font><br/>
-        <font size=10 color="{self.colors['text'].hexval()}"><b>{self.company_info['tagline']}</b></font><br/>
-        <font size=7 color="{self.colors['text'].hexval()}">
-        {self.company_info['address']}<br/>
-        Phone: {self.company_info['phone']} | Email: {self.company_info['email']}
-        </font>
-        """
-        
-        header_data = [[logo, Paragraph(company_header, styles['Normal'])]]
-        header_table = Table(header_data, colWidths=[1*inch, 6*inch])
-        header_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.15*inch))
+        # Build PDF
+        doc.build(self.build_recovery_statement_story(staff_data, transactions))
         
-        # Decorative line
-        line_table = Table([['']], colWidths=[7*inch])
-        line_table.setStyle(TableStyle([
-            ('LINEABOVE', (0, 0), (-1, 0), 3, self.colors['primary']),
-        ]))
-        elements.append(line_table)
-        elements.append(Spacer(1, 0.2*inch))
+        if not output_path:
+            buffer.seek(0)
+            return buffer
+        return None
+    
+    def build_recovery_statement_story(self, staff_data: Dict, transactions: List[Dict]) -> List:
+        """Statement flowables; used for single PDFs and for multi-document bundles"""
+        elements = self.build_statement_header()
+        styles = self.assets.styles
         
         # ============================================
         # STATEMENT TITLE
         # ============================================
         
-        title = f'<font size=18 color="{self.colors['primary'].hexval()}"><b>STAFF ADVANCE RECOVERY STATEMENT</b></font>'
-        elements.append(Paragraph(title, ParagraphStyle('Title', alignment=TA_CENTER)))
+        title = f'<font size=18 color="{self.colors.hex["primary"]}"><b>STAFF ADVANCE RECOVERY STATEMENT</b></font>'
+        elements.append(Paragraph(title, styles['AlignCenter']))
         elements.append(Spacer(1, 0.15*inch))
         
         # ============================================
@@ -149,8 +99,8 @@ class StaffLedgerGenerator:
         
         staff_info_data = [
             [
-                Paragraph(f'<font size=10 color="{self.colors['primary'].hexval()}"><b>STAFF DETAILS</b></font>', styles['Normal']),
-                Paragraph(f'<font size=10 color="{self.colors['primary'].hexval()}"><b>ACCOUNT SUMMARY</b></font>', styles['Normal'])
+                Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>STAFF DETAILS</b></font>', styles['Normal']),
+                Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>ACCOUNT SUMMARY</b></font>', styles['Normal'])
             ],
             [
                 Paragraph(f"""
@@ -167,7 +117,7 @@ class StaffLedgerGenerator:
                 <b>Opening Balance:</b> PKR {staff_data.get('opening_balance', 0):,.2f}<br/>
                 <b>Total Advances:</b> PKR {sum(t.get('debit', 0) for t in transactions):,.2f}<br/>
                 <b>Total Recovered:</b> PKR {sum(t.get('credit', 0) for t in transactions):,.2f}<br/>
-                <b>Current Balance:</b> <font color="{self.colors['negative'].hexval()}"><b>PKR {staff_data.get('current_balance', 0):,.2f}</b></font>
+                <b>Current Balance:</b> <font color="{self.colors.hex['negative']}"><b>PKR {staff_data.get('current_balance', 0):,.2f}</b></font>
                 </font>
                 """, styles['Normal'])
             ]
@@ -191,7 +141,7 @@ class StaffLedgerGenerator:
         # TRANSACTION HISTORY (BANK STATEMENT STYLE)
         # ============================================
         
-        elements.append(Paragraph(f'<font size=11 color="{self.colors['primary'].hexval()}"><b>▓ TRANSACTION HISTORY</b></font>', styles['Normal']))
+        elements.append(Paragraph(f'<font size=11 color="{self.colors.hex["primary"]}"><b>▓ TRANSACTION HISTORY</b></font>', styles['Normal']))
         elements.append(Spacer(1, 0.1*inch))
         
         # Table header
@@ -199,9 +149,9 @@ class StaffLedgerGenerator:
             [
                 Paragraph('<font size=9 color="white"><b>Date</b></font>', styles['Normal']),
                 Paragraph('<font size=9 color="white"><b>Description</b></font>', styles['Normal']),
-                Paragraph('<font size=9 color="white"><b>Advance Given</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph('<font size=9 color="white"><b>Recovery</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph('<font size=9 color="white"><b>Running Balance</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                Paragraph('<font size=9 color="white"><b>Advance Given</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>Recovery</b></font>', styles['AlignRight']),
+                Paragraph('<font size=9 color="white"><b>Running Balance</b></font>', styles['AlignRight'])
             ]
         ]
         
@@ -216,7 +166,7 @@ class StaffLedgerGenerator:
             balance = trans.get('balance', 0)
             
             # Color code the balance (red if outstanding)
-            balance_color = self.colors['negative'].hexval() if balance > 0 else self.colors['positive'].hexval()
+            balance_color = self.colors.hex['negative'] if balance > 0 else self.colors.hex['positive']
             
             debit_str = f"{debit:,.2f}" if debit > 0 else "-"
             credit_str = f"{credit:,.2f}" if credit > 0 else "-"
@@ -224,9 +174,9 @@ class StaffLedgerGenerator:
             trans_data.append([
                 Paragraph(f'<font size=8>{date_str}</font>', styles['Normal']),
                 Paragraph(f'<font size=8>{trans.get("description", "")}</font>', styles['Normal']),
-                Paragraph(f'<font size=8>{debit_str}</font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph(f'<font size=8>{credit_str}</font>', ParagraphStyle('Right', alignment=TA_RIGHT)),
-                Paragraph(f'<font size=8 color="{balance_color}"><b>{balance:,.2f}</b></font>', ParagraphStyle('Right', alignment=TA_RIGHT))
+                Paragraph(f'<font size=8>{debit_str}</font>', styles['AlignRight']),
+                Paragraph(f'<font size=8>{credit_str}</font>', styles['AlignRight']),
+                Paragraph(f'<font size=8 color="{balance_color}"><b>{balance:,.2f}</b></font>', styles['AlignRight'])
             ])
         
         trans_table = Table(trans_data, colWidths=[1*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.1*inch])
@@ -252,7 +202,7 @@ class StaffLedgerGenerator:
         # ============================================
         
         if staff_data.get('monthly_deduction', 0) > 0 and staff_data.get('current_balance', 0) > 0:
-            elements.append(Paragraph(f'<font size=11 color="{self.colors['primary'].hexval()}"><b>▓ RECOVERY SCHEDULE</b></font>', styles['Normal']))
+            elements.append(Paragraph(f'<font size=11 color="{self.colors.hex["primary"]}"><b>▓ RECOVERY SCHEDULE</b></font>', styles['Normal']))
             elements.append(Spacer(1, 0.1*inch))
             
             months_remaining = int(staff_data['current_balance'] / staff_data['monthly_deduction'])
@@ -284,7 +234,7 @@ class StaffLedgerGenerator:
         # IMPORTANT NOTES
         # ============================================
         
-        elements.append(Paragraph(f'<font size=10 color="{self.colors['primary'].hexval()}"><b>▓ IMPORTANT NOTES</b></font>', styles['Normal']))
+        elements.append(Paragraph(f'<font size=10 color="{self.colors.hex["primary"]}"><b>▓ IMPORTANT NOTES</b></font>', styles['Normal']))
         elements.append(Spacer(1, 0.05*inch))
         
         notes_text = """
@@ -311,24 +261,67 @@ class StaffLedgerGenerator:
         elements.append(Spacer(1, 0.08*inch))
         
         footer_text = f"""
-        <font size=8 color="{self.colors['text'].hexval()}">
+        <font size=8 color="{self.colors.hex['text']}">
         <b>PGT International (Private) Limited</b><br/>
         This is a digitally generated statement. No signature required.<br/>
         For queries: {self.company_info['phone']} | {self.company_info['email']}<br/>
         <br/>
         Generated: {datetime.now().strftime('%d-%b-%Y %I:%M %p')}<br/>
-        <font color="{self.colors['accent'].hexval()}"><b>⚠️ NON-EDITABLE DOCUMENT</b> - Any alterations void this statement</font>
+        <font color="{self.colors.hex['accent']}"><b>⚠️ NON-EDITABLE DOCUMENT</b> - Any alterations void this statement</font>
         </font>
         """
-        elements.append(Paragraph(footer_text, ParagraphStyle('Footer', alignment=TA_CENTER)))
+        elements.append(Paragraph(footer_text, styles['AlignCenter']))
         
-        # Build PDF
-        doc.build(elements)
+        return elements
+    
+    def build_statement_header(self) -> List:
+        """Logo, company block and rule shared by every statement layout"""
+        elements = []
+        styles = self.assets.styles
         
-        if not output_path:
-            buffer.seek(0)
-            return buffer
-        return None
+        # ============================================
+        # HEADER
+        # ============================================
+        
+        if self.assets.logo:
+            logo = self.assets.logo_image(0.8*inch, 0.8*inch)
+        else:
+            # Simple placeholder
+            from reportlab.graphics.shapes import Drawing, Rect, String
+            drawing = Drawing(0.8*inch, 0.8*inch)
+            drawing.add(Rect(0, 0, 0.8*inch, 0.8*inch, 
+                            fillColor=self.colors['primary'], 
+                            strokeColor=None))
+            drawing.add(String(0.4*inch, 0.4*inch, 'PGT',
+                              fontSize=18,
+                              fillColor=colors.white,
+                              textAnchor='middle'))
+            logo = drawing
+        
+        company_header = f"""
+        <font size=16 color="{self.colors.hex['primary']}"><b>{self.company_info['name']}</b></font><br/>
+        <font size=10 color="{self.colors.hex['text']}"><b>{self.company_info['tagline']}</b></font><br/>
+        <font size=7 color="{self.colors.hex['text']}">
+        {self.company_info['address']}<br/>
+        Phone: {self.company_info['phone']} | Email: {self.company_info['email']}
+        </font>
+        """
+        
+        header_data = [[logo, Paragraph(company_header, styles['Normal'])]]
+        header_table = Table(header_data, colWidths=[1*inch, 6*inch])
+        header_table.setStyle(self.assets.table_style('logo_header'))
+        elements.append(header_table)
+        elements.append(Spacer(1, 0.15*inch))
+        
+        # Decorative line
+        line_table = Table([['']], colWidths=[7*inch])
+        line_table.setStyle(TableStyle([
+            ('LINEABOVE', (0, 0), (-1, 0), 3, self.colors['primary']),
+        ]))
+        elements.append(line_table)
+        elements.append(Spacer(1, 0.2*inch))
+        
+        return elements
     
     def generate_from_staff_id(self, db, staff_id: int) -> BytesIO:
         """Generate statement from staff ID"""
@@ -344,6 +337,17 @@ class StaffLedgerGenerator:
             models.StaffAdvanceLedger.staff_id == staff_id
         ).order_by(models.StaffAdvanceLedger.transaction_date).all()
         
+        staff_data, transactions = self.statement_data(staff, ledger_entries)
+        
+        # Generate PDF
+        return self.generate_staff_recovery_statement(
+            staff_data=staff_data,
+            transactions=transactions
+        )
+    
+    @staticmethod
+    def statement_data(staff, ledger_entries) -> tuple:
+        """Shape a staff row and its date-ordered advance ledger rows into (staff_data, transactions)"""
         # Prepare staff data
         staff_data = {
             'name': staff.name,
@@ -368,11 +372,7 @@ class StaffLedgerGenerator:
         if transactions:
             staff_data['opening_balance'] = transactions[0]['balance'] - transactions[0]['debit'] + transactions[0]['credit']
         
-        # Generate PDF
-        return self.generate_staff_recovery_statement(
-            staff_data=staff_data,
-            transactions=transactions
-        )
+        return staff_data, transactions
 
 
 # Create singleton instance
@@ -0,0 +1,152 @@
+"""
+Application Startup
+Database preparation run from the FastAPI lifespan rather than at import of
+main.py, so importing the app (tests, scripts, forking workers) touches
+neither the database nor the password hasher.
+
+The schema check compares a fingerprint of the SQLAlchemy metadata with the
+one stored in system_settings after the last successful check, and inspects
+nothing when they match. Otherwise missing tables and indexes are created
+(or startup fails, with DB_AUTO_CREATE=false) and columns missing from
+existing tables are reported for a migration script.
+
+Configuration (environment variables):
+    DB_AUTO_CREATE          Create missing tables and indexes at startup (default: true)
+    ENSURE_DEFAULT_USERS    Reset the default admin/manager/supervisor logins (default: true)
+"""
+import hashlib
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List
+
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+import models
+
+logger = logging.getLogger(__name__)
+
+AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "true").lower() == "true"
+ENSURE_DEFAULT_USERS = os.getenv("ENSURE_DEFAULT_USERS", "true").lower() == "true"
+
+SCHEMA_FINGERPRINT_KEY = "schema_fingerprint"
+
+
+def schema_fingerprint() -> str:
+    """Hash of every table, column (with type) and index the models declare"""
+    parts = []
+    for table in sorted(models.Base.metadata.tables.values(), key=lambda table: table.name):
+        parts.append(table.name)
+        parts.extend(f"{column.name}:{column.type!r}" for column in table.columns)
+        parts.extend(sorted(f"index:{index.name}" for index in table.indexes))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _stored_fingerprint(engine):
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                select(models.SystemSetting.setting_value).where(
+                    models.SystemSetting.setting_key == SCHEMA_FINGERPRINT_KEY
+                )
+            ).scalar()
+    except DBAPIError:
+        # system_settings itself is missing: a new database
+        return None
+
+
+def _store_fingerprint(engine, fingerprint: str):
+    db = Session(bind=engine)
+    try:
+        setting = db.query(models.SystemSetting).filter(
+            models.SystemSetting.setting_key == SCHEMA_FINGERPRINT_KEY
+        ).first()
+        if setting is None:
+            setting = models.SystemSetting(
+                setting_key=SCHEMA_FINGERPRINT_KEY,
+                setting_type="string",
+                description="Model schema last verified at startup"
+            )
+            db.add(setting)
+        setting.setting_value = fingerprint
+        db.commit()
+    finally:
+        db.close()
+
+
+def check_schema(engine) -> Dict[str, List[str]]:
+    """
+    Bring the database up to the models when their fingerprint changed
+    
+    Returns:
+        {"created_tables": [...], "missing_columns": ["table.column", ...]},
+        both empty when the stored fingerprint matched
+    """
+    import audit_archive
+    
+    result = {"created_tables": [], "missing_columns": []}
+    fingerprint = schema_fingerprint()
+    if _stored_fingerprint(engine) == fingerprint:
+        return result
+        
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    missing_tables = [table for table in models.Base.metadata.tables.values() if table.name not in existing]
+    for table in models.Base.metadata.tables.values():
+        if table.name in existing:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            result["missing_columns"].extend(
+                f"{table.name}.{column.name}" for column in table.columns if column.name not in columns
+            )
+            
+    if missing_tables and not AUTO_CREATE:
+        raise RuntimeError(
+            "Database is missing tables " + ", ".join(table.name for table in missing_tables) +
+            "; start once with DB_AUTO_CREATE=true to create them"
+        )
+    if missing_tables:
+        models.Base.metadata.create_all(bind=engine, tables=missing_tables)
+        result["created_tables"] = [table.name for table in missing_tables]
+        logger.info("Created tables: %s", ", ".join(result["created_tables"]))
+    if AUTO_CREATE:
+        audit_archive.ensure_indexes(engine)
+        
+    if result["missing_columns"]:
+        # Checked again on the next start, until a migration adds them
+        logger.warning("Columns missing from the database: %s", ", ".join(result["missing_columns"]))
+    else:
+        _store_fingerprint(engine, fingerprint)
+    return result
+
+
+def prepare_database(engine) -> Dict[str, float]:
+    """Run every startup step; returns seconds spent per step"""
+    import search_index
+    
+    steps = [("schema", check_schema), ("search_index", search_index.ensure_index)]
+    if ENSURE_DEFAULT_USERS:
+        from ensure_admin import ensure_admin_exists
+        steps.append(("default_users", lambda engine: ensure_admin_exists()))
+        
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        step(engine)
+        timings[name] = time.perf_counter() - started
+    logger.info("Startup steps: %s", ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+    return timings
+
+
+@asynccontextmanager
+async def lifespan(app):
+    from database import engine
+    import async_database
+    import audit_writer
+    
+    prepare_database(engine)
+    yield
+    audit_writer.writer.close()
+    await async_database.dispose()
@@ -0,0 +1,129 @@
+"""
+Test fixtures
+Every test run gets a throwaway SQLite database (and backup/audit paths) in a
+temporary directory; each test starts from empty tables.
+
+Run from backend/:  python -m pytest -q
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Configuration is read at import time, so it is set before any app module loads
+TEST_DIR = tempfile.mkdtemp(prefix="pgt_tms_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["BACKUP_DIR"] = os.path.join(TEST_DIR, "backups")
+os.environ["AUDIT_SPILL_PATH"] = os.path.join(TEST_DIR, "audit_spill.jsonl")
+os.environ["AUDIT_DEAD_LETTER_PATH"] = os.path.join(TEST_DIR, "audit_dead_letter.jsonl")
+os.environ["AUDIT_SYNC"] = "true"
+os.environ["PERIOD_AUTO_RECLOSE"] = "false"
+os.environ["ENSURE_DEFAULT_USERS"] = "false"
+
+
+@pytest.fixture(scope="session")
+def engine():
+    import startup
+    from database import engine
+    
+    startup.prepare_database(engine)
+    yield engine
+    engine.dispose()
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db(engine):
+    from sqlalchemy import text
+    
+    import models
+    import search_index
+    from database import SessionLocal
+    
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        with engine.begin() as connection:
+            for table in reversed(models.Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+            connection.execute(text(f"DELETE FROM {search_index.SQLITE_TABLE}"))
+
+
+@pytest.fixture
+def user(db):
+    import models
+    
+    account = models.User(
+        username="tester",
+        email="tester@example.com",
+        hashed_password="not-used",
+        full_name="Test User",
+        role=models.UserRole.ADMIN,
+        is_active=True
+    )
+    db.add(account)
+    db.commit()
+    return account
+
+
+@pytest.fixture
+def client(db):
+    import models
+    
+    record = models.Client(name="Fauji Fertilizer", client_code="CLI-0001", current_balance=0.0)
+    db.add(record)
+    db.commit()
+    return record
+
+
+@pytest.fixture
+def vendor(db):
+    import models
+    
+    record = models.Vendor(name="Shahzad Goods", vendor_code="VEN-0001", current_balance=0.0)
+    db.add(record)
+    db.commit()
+    return record
+
+
+@pytest.fixture
+def vehicle(db):
+    import models
+    
+    record = models.Vehicle(vehicle_no="LES-1234", vehicle_type="Trailer")
+    db.add(record)
+    db.commit()
+    return record
+
+
+@pytest.fixture
+def trip_data(client, vendor, vehicle):
+    """Factory of TripCreate payloads for the client, vendor and vehicle fixtures"""
+    import schemas
+    from datetime import datetime
+    
+    def make(reference_no, client_freight=40000.0, vendor_freight=30000.0, **overrides):
+        values = dict(
+            date=datetime(2026, 3, 10),
+            reference_no=reference_no,
+            vehicle_id=vehicle.id,
+            category_product="Urea",
+            source_location="Karachi",
+            destination_location="Lahore",
+            driver_operator="Aslam",
+            client_id=client.id,
+            vendor_id=vendor.id,
+            total_tonnage=30.0,
+            client_freight=client_freight,
+            vendor_freight=vendor_freight,
+        )
+        values.update(overrides)
+        return schemas.TripCreate(**values)
+    return make
@@ -0,0 +1,177 @@
+"""
+Audit writer (AUDIT_SYNC=false): spill file, crash replay, orphaned spills,
+dead-lettered entries and entries tied to the caller's transaction
+"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import audit_writer
+import models
+from audit_service import AuditService
+from audit_writer import AuditWriter
+
+
+@pytest.fixture
+def writers(tmp_path):
+    """Factory of writers spilling under tmp_path; their queues are dropped afterwards"""
+    created = []
+    
+    def make():
+        # A long interval keeps the background flusher out of the way; tests flush explicitly
+        writer = AuditWriter(
+            spill_path=str(tmp_path / "audit_spill.jsonl"),
+            dead_letter_path=str(tmp_path / "audit_dead_letter.jsonl"),
+            batch_size=100,
+            flush_interval=60,
+            retry_delay=60
+        )
+        created.append(writer)
+        return writer
+    yield make
+    for writer in created:
+        with writer._lock:
+            writer._buffer.clear()
+
+
+@pytest.fixture
+def async_audit(monkeypatch, writers):
+    """AuditService routed through a fresh writer, as in production"""
+    writer = writers()
+    monkeypatch.setattr(audit_writer, "SYNC", False)
+    monkeypatch.setattr(audit_writer, "writer", writer)
+    return writer
+
+
+def _entry(user, record_id, **values):
+    return {
+        "user_id": user.id,
+        "action": "create",
+        "table_name": "trips",
+        "record_id": record_id,
+        "timestamp": datetime(2026, 3, 1, 9, 30),
+        **values
+    }
+
+
+def _spill_lines(path):
+    with open(path, encoding="utf-8") as spill:
+        return [json.loads(line) for line in spill]
+
+
+def _logged(db):
+    db.expire_all()
+    return sorted(record_id for (record_id,) in db.query(models.AuditLog.record_id))
+
+
+def test_entries_are_spilled_until_flushed(db, user, writers):
+    writer = writers()
+    writer.enqueue(_entry(user, 1))
+    writer.enqueue(_entry(user, 2))
+    
+    assert [line["record_id"] for line in _spill_lines(writer.spill_path)] == [1, 2]
+    assert _logged(db) == []
+    
+    assert writer.flush() == 2
+    assert _logged(db) == [1, 2]
+    assert _spill_lines(writer.spill_path) == []
+
+
+def test_a_new_writer_replays_entries_left_by_a_crash(db, user, writers):
+    crashed = writers()
+    crashed.enqueue(_entry(user, 1))
+    crashed.enqueue(_entry(user, 2))
+    
+    # Same pid, as after a restart that reused it: the file is replayed, not lost
+    restarted = writers()
+    assert restarted.flush() == 2
+    assert _logged(db) == [1, 2]
+
+
+def test_spills_of_exited_processes_are_adopted(db, user, tmp_path, writers):
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    orphan = tmp_path / f"audit_spill.{exited.pid}.jsonl"
+    orphan.write_text(json.dumps(_entry(user, 1), default=str) + "\n", encoding="utf-8")
+    # The shared file from before spills were per process
+    legacy = tmp_path / "audit_spill.jsonl"
+    legacy.write_text(json.dumps(_entry(user, 2), default=str) + "\n", encoding="utf-8")
+    
+    writer = writers()
+    writer.enqueue(_entry(user, 3))
+    assert writer.pending() == 3
+    assert not orphan.exists() and not legacy.exists()
+    assert not list(tmp_path.glob("*.claimed"))
+    # Adopted entries are in our own spill file until they are written
+    assert sorted(line["record_id"] for line in _spill_lines(writer.spill_path)) == [1, 2, 3]
+    
+    assert writer.flush() == 3
+    assert _logged(db) == [1, 2, 3]
+
+
+def test_refused_entries_are_dead_lettered_and_the_rest_written(db, user, writers):
+    writer = writers()
+    writer.enqueue(_entry(user, 1))
+    writer.enqueue(_entry(user, 2, action=None))  # NOT NULL violation
+    writer.enqueue(_entry(user, 3))
+    
+    assert writer.flush() == 2
+    assert _logged(db) == [1, 3]
+    assert writer.pending() == 0
+    assert _spill_lines(writer.spill_path) == []
+    
+    dead = _spill_lines(writer.dead_letter_path)
+    assert [record["entry"]["record_id"] for record in dead] == [2]
+    assert "NOT NULL" in dead[0]["error"]
+
+
+def test_unreachable_database_keeps_entries_queued_and_backs_off(db, user, writers, monkeypatch):
+    writer = writers()
+    writer.buffer_size = 2
+    
+    def unreachable(*args, **kwargs):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+    monkeypatch.setattr(audit_writer, "insert", unreachable)
+    flushes = []
+    flush = writer.flush
+    
+    def counted_flush():
+        flushes.append(flush())
+        return flushes[-1]
+    monkeypatch.setattr(writer, "flush", counted_flush)
+    
+    for record_id in range(1, 5):
+        writer.enqueue(_entry(user, record_id))
+        
+    # Only the call that reached buffer_size flushed inline; later callers wait out the retry delay
+    assert flushes == [0]
+    assert writer.pending() == 4
+    assert len(_spill_lines(writer.spill_path)) == 4
+    assert not os.path.exists(writer.dead_letter_path)
+    
+    monkeypatch.undo()
+    assert writer.flush() == 4
+    assert _logged(db) == [1, 2, 3, 4]
+
+
+def test_entries_tied_to_a_transaction_follow_its_outcome(db, user, async_audit):
+    audit = AuditService(db)
+    audit.log_create(user.id, "trips", 1, {"reference_no": "TRP-1"}, commit=False)
+    db.rollback()
+    assert async_audit.pending() == 0
+    
+    audit.log_create(user.id, "trips", 2, {"reference_no": "TRP-2"}, commit=False)
+    db.close()
+    assert async_audit.pending() == 0
+    
+    audit.log_create(user.id, "trips", 3, {"reference_no": "TRP-3"}, commit=False)
+    assert async_audit.pending() == 0
+    db.commit()
+    assert async_audit.pending() == 1
+    assert async_audit.flush() == 1
+    assert _logged(db) == [3]
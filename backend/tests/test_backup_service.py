@@ -0,0 +1,87 @@
+"""
+Backups: chunked SQLite snapshots, restore, catalog verification and retention
+"""
+import sqlite3
+
+import pytest
+
+from backup_service import BackupService
+
+
+def _write_rows(path, start, count):
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, payload TEXT)")
+        connection.executemany(
+            "INSERT INTO items (id, payload) VALUES (?, ?)",
+            [(n, f"row {n} " + "x" * 200) for n in range(start, start + count)]
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _row_count(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def service(tmp_path):
+    db_path = str(tmp_path / "live.db")
+    _write_rows(db_path, 0, 2000)
+    backups = BackupService(db_path=db_path, backup_dir=str(tmp_path / "backups"), database_url=f"sqlite:///{db_path}")
+    backups.chunk_size = 16 * 1024
+    return backups
+
+
+def test_backup_and_restore_round_trip(service):
+    created = service.create_backup("before change")
+    assert created["success"], created
+    assert created["metadata"]["chunk_count"] == created["metadata"]["new_chunks"]
+    
+    _write_rows(service.db_path, 5000, 10)
+    assert _row_count(service.db_path) == 2010
+    
+    restored = service.restore_backup(created["backup_file"])
+    assert restored["success"], restored
+    assert restored["safety_backup"]["success"]
+    assert _row_count(service.db_path) == 2000
+
+
+def test_unchanged_chunks_are_stored_once(service):
+    first = service.create_backup()["metadata"]
+    _write_rows(service.db_path, 5000, 1)
+    second = service.create_backup()["metadata"]
+    
+    assert second["chunk_count"] >= first["chunk_count"]
+    assert 0 < second["new_chunks"] < second["chunk_count"]
+
+
+def test_catalog_lists_and_verifies_backups(service):
+    names = [service.create_backup(f"backup {n}")["metadata"]["backup_name"] for n in range(3)]
+    
+    assert [b["backup_name"] for b in service.list_backups()] == names[::-1]
+    assert service.count_backups() == 3
+    assert all(result["ok"] for result in service.verify_backups())
+    
+    chunk = next(service.chunk_dir.glob("*/*"))
+    chunk.write_bytes(b"corrupted")
+    assert not any(result["ok"] for result in service.verify_backups())
+
+
+def test_retention_keeps_newest_and_removes_unreferenced_chunks(service):
+    for n in range(4):
+        _write_rows(service.db_path, 10000 + n * 100, 100)
+        service.create_backup()
+    names = [b["backup_name"] for b in service.list_backups()]
+    
+    result = service.apply_retention(keep_last=2, keep_daily=0, keep_weekly=0, keep_monthly=0)
+    
+    assert sorted(result["deleted"]) == sorted(names[2:])
+    assert [b["backup_name"] for b in service.list_backups()] == names[:2]
+    assert result["removed_chunks"] > 0
+    assert all(r["ok"] for r in service.verify_backups())
@@ -0,0 +1,116 @@
+"""
+Balance heads: locked running balances for CEO capital, office expenses and staff advances
+"""
+from datetime import date, datetime
+
+import pytest
+
+import models
+from balance_heads import CEO_CAPITAL, OFFICE_EXPENSE, STAFF_ADVANCE, BalanceHeadService
+
+
+def _capital(db, user, day, amount_in, amount_out, balance):
+    db.add(models.CEOCapital(
+        date=day,
+        transaction_type='profit_allocation' if amount_in else 'withdrawal',
+        description="Legacy entry",
+        amount_in=amount_in,
+        amount_out=amount_out,
+        balance=balance,
+        created_by=user.id
+    ))
+
+
+def _head(db, account_type, account_id=0):
+    db.expire_all()
+    return db.query(models.BalanceHead).filter_by(account_type=account_type, account_id=account_id).one()
+
+
+def test_first_lock_creates_the_head_from_existing_rows(db, user):
+    # Rows from before heads existed; the last balance includes 2,000 no row explains
+    _capital(db, user, date(2026, 1, 5), 4000.0, 0.0, 6000.0)
+    _capital(db, user, date(2026, 1, 9), 0.0, 1000.0, 5000.0)
+    db.commit()
+    assert db.query(models.BalanceHead).count() == 0
+    
+    service = BalanceHeadService(db)
+    assert service.get(CEO_CAPITAL).balance == 5000.0
+    assert db.query(models.BalanceHead).count() == 0  # Reads do not store a head
+    
+    head = service.lock(CEO_CAPITAL)
+    assert service.lock(CEO_CAPITAL) is head
+    assert (head.opening_balance, head.total_in, head.total_out, head.entry_count) == (2000.0, 4000.0, 1000.0, 2)
+    assert head.last_entry_date == date(2026, 1, 9)
+    db.commit()
+    
+    head = _head(db, CEO_CAPITAL)
+    assert (head.balance, head.opening_balance) == (5000.0, 2000.0)
+
+
+def test_rolled_back_creation_leaves_no_head(db, user):
+    BalanceHeadService(db).post(OFFICE_EXPENSE, amount_in=100.0)
+    db.rollback()
+    assert db.query(models.BalanceHead).count() == 0
+
+
+def test_posts_chain_running_balances_across_transactions(db):
+    first = BalanceHeadService(db)
+    assert first.post(OFFICE_EXPENSE, amount_in=1000.0, entry_date=date(2026, 3, 2)) == (0.0, 1000.0)
+    assert first.post(OFFICE_EXPENSE, amount_out=250.0, entry_date=datetime(2026, 3, 1, 9)) == (1000.0, 750.0)
+    db.commit()
+    
+    second = BalanceHeadService(db)
+    assert second.post(OFFICE_EXPENSE, amount_out=50.0, entry_date=date(2026, 3, 5)) == (750.0, 700.0)
+    db.commit()
+    
+    head = _head(db, OFFICE_EXPENSE)
+    assert (head.total_in, head.total_out, head.balance, head.entry_count) == (1000.0, 300.0, 700.0, 3)
+    # The latest entry date, not the last one posted
+    assert head.last_entry_date == date(2026, 3, 5)
+
+
+def test_verify_reports_and_repairs_drift(db, user):
+    staff = models.Staff(employee_id="EMP-001", name="Bilal", gross_salary=50000.0, advance_balance=0.0)
+    db.add(staff)
+    db.flush()
+    service = BalanceHeadService(db)
+    for amount, day in ((10000.0, datetime(2026, 2, 1)), (-2500.0, datetime(2026, 3, 1))):
+        _, balance = service.post(STAFF_ADVANCE, amount_in=max(amount, 0), amount_out=max(-amount, 0),
+                                  entry_date=day, account_id=staff.id)
+        db.add(models.StaffAdvanceLedger(
+            staff_id=staff.id, transaction_date=day, transaction_type='advance_given' if amount > 0 else 'recovery',
+            amount=amount, balance_after=balance, created_by=user.id
+        ))
+        staff.advance_balance = balance
+    _capital(db, user, date(2026, 3, 1), 3000.0, 0.0, 3000.0)
+    db.commit()
+    assert BalanceHeadService(db).verify()['mismatches'] == []
+    
+    head = _head(db, STAFF_ADVANCE, staff.id)
+    head.balance = 9000.0
+    head.total_out = 0.0
+    db.query(models.Staff).filter_by(id=staff.id).update({'advance_balance': 1.0})
+    db.commit()
+    
+    report = BalanceHeadService(db).verify(STAFF_ADVANCE)
+    assert [m['account_id'] for m in report['mismatches']] == [staff.id]
+    fields = {problem['field']: problem['expected'] for problem in report['mismatches'][0]['differences']}
+    assert fields == {'total_out': 2500.0, 'balance': 7500.0, 'staff_advance_balance': 7500.0}
+    assert report['repaired'] == 0
+    
+    # The CEO capital rows have no head yet: repair creates it
+    report = BalanceHeadService(db).verify(repair=True)
+    db.commit()
+    assert (report['repaired'], report['created']) == (1, 1)
+    head = _head(db, STAFF_ADVANCE, staff.id)
+    assert (head.balance, head.total_out) == (7500.0, 2500.0)
+    assert db.get(models.Staff, staff.id).advance_balance == 7500.0
+    assert _head(db, CEO_CAPITAL).balance == 3000.0
+    assert BalanceHeadService(db).verify()['mismatches'] == []
+
+
+def test_unknown_account_types_are_rejected(db):
+    with pytest.raises(ValueError):
+        BalanceHeadService(db).verify('petty_cash')
+    with pytest.raises(ValueError):
+        BalanceHeadService(db).post('petty_cash', amount_in=1.0)
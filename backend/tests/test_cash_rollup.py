@@ -0,0 +1,111 @@
+"""
+Cash daily rollup: kept in step with the register and read once it is ready
+"""
+from datetime import date
+
+import models
+from cash_register_service import ROLLUP_READY_KEY, CashRegisterService, refresh_transaction_days
+from database import SessionLocal
+
+MARCH_1 = date(2026, 3, 1)
+MARCH_2 = date(2026, 3, 2)
+MARCH_3 = date(2026, 3, 3)
+
+
+def _cash(db, user, day, amount, direction=models.CashDirection.IN, mode=models.PaymentMode.CASH):
+    row = models.CashTransaction(
+        date=day,
+        amount=amount,
+        direction=direction,
+        source_module=models.CashSourceModule.ADJUSTMENT,
+        source_id=0,
+        payment_mode=mode,
+        created_by=user.id
+    )
+    db.add(row)
+    db.flush()
+    return row
+
+
+def _rollup(db):
+    rows = db.query(
+        models.CashDailyRollup.date,
+        models.CashDailyRollup.payment_mode,
+        models.CashDailyRollup.cash_in,
+        models.CashDailyRollup.cash_out,
+        models.CashDailyRollup.transaction_count
+    ).filter(models.CashDailyRollup.transaction_count > 0)
+    return {(day, mode): (cash_in, cash_out, count) for day, mode, cash_in, cash_out, count in rows}
+
+
+def test_flushes_keep_each_day_in_step(db, user):
+    first = _cash(db, user, MARCH_1, 100.0)
+    _cash(db, user, MARCH_1, 30.0, models.CashDirection.OUT)
+    second = _cash(db, user, MARCH_2, 50.0, mode=models.PaymentMode.BANK)
+    db.commit()
+    assert _rollup(db) == {
+        (MARCH_1, models.PaymentMode.CASH): (100.0, 30.0, 2),
+        (MARCH_2, models.PaymentMode.BANK): (50.0, 0.0, 1),
+    }
+    
+    first.is_deleted = True
+    second.date = MARCH_3
+    db.commit()
+    # The soft-deleted row drops out and the moved row leaves its old day
+    assert _rollup(db) == {
+        (MARCH_1, models.PaymentMode.CASH): (0.0, 30.0, 1),
+        (MARCH_3, models.PaymentMode.BANK): (50.0, 0.0, 1),
+    }
+
+
+def test_bulk_updates_refresh_their_days(db, user):
+    row = _cash(db, user, MARCH_1, 100.0)
+    db.commit()
+    
+    db.bulk_update_mappings(models.CashTransaction, [{'id': row.id, 'amount': 75.0}])
+    refresh_transaction_days(db, [row.id])
+    db.commit()
+    assert _rollup(db) == {(MARCH_1, models.PaymentMode.CASH): (75.0, 0.0, 1)}
+
+
+def test_reads_switch_to_the_rollup_once_built(db, user):
+    _cash(db, user, MARCH_1, 100.0)
+    _cash(db, user, MARCH_2, 40.0, models.CashDirection.OUT, models.PaymentMode.BANK)
+    _cash(db, user, MARCH_3, 25.0)
+    db.commit()
+    
+    service = CashRegisterService(db)
+    register = service.get_cash_position(as_of=MARCH_3)
+    register_flow = service.get_daily_cash_flow(MARCH_2, MARCH_3)
+    assert register["source"] == "register"
+    
+    assert service.rebuild_daily_rollup() == 3
+    db.commit()
+    rollup = service.get_cash_position(as_of=MARCH_3)
+    assert rollup["source"] == "rollup"
+    assert {key: value for key, value in rollup.items() if key != "source"} == \
+        {key: value for key, value in register.items() if key != "source"}
+    assert rollup["balance"] == 85.0 and rollup["transaction_count"] == 3
+    assert service.get_daily_cash_flow(MARCH_2, MARCH_3) == register_flow
+    assert register_flow[0]["opening_balance"] == 100.0
+
+
+def test_readiness_is_read_per_session(db, user):
+    _cash(db, user, MARCH_1, 100.0)
+    CashRegisterService(db).rebuild_daily_rollup()
+    db.commit()
+    
+    other = SessionLocal()
+    try:
+        assert CashRegisterService(other).get_cash_position()["source"] == "rollup"
+    finally:
+        other.close()
+        
+    # A reset database without the flag goes back to the register in new sessions
+    db.query(models.SystemSetting).filter(models.SystemSetting.setting_key == ROLLUP_READY_KEY).delete()
+    db.commit()
+    other = SessionLocal()
+    try:
+        assert CashRegisterService(other).get_cash_position()["source"] == "register"
+    finally:
+        other.close()
@@ -0,0 +1,134 @@
+"""
+Keyset pagination of the receivable and payable lists
+"""
+from datetime import datetime
+
+import pytest
+
+import crud
+import models
+from pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def _pages(fetch, **kwargs):
+    """Every id returned while following next_cursor, and the number of pages"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = fetch(cursor=cursor, limit=2, **kwargs)
+        ids += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def _expected(rows, column, descending):
+    # ORDER BY sort IS NULL, sort, id (both in the requested direction)
+    present = sorted(
+        ((getattr(row, column), row.id) for row in rows if getattr(row, column) is not None),
+        reverse=descending
+    )
+    missing = sorted((row.id for row in rows if getattr(row, column) is None), reverse=descending)
+    return [row_id for _, row_id in present] + missing
+
+
+@pytest.fixture
+def receivables(db, user):
+    clients = [models.Client(name=f"Client {n}", client_code=f"CLI-{n:04d}") for n in range(2)]
+    db.add_all(clients)
+    db.flush()
+    # Repeated amounts and dates so pages break inside runs of equal sort values
+    rows = [
+        models.Receivable(
+            client_id=clients[n % 2].id,
+            invoice_number=f"INV-{n}",
+            description="Freight",
+            total_amount=[500.0, 250.0, 500.0, 100.0][n % 4],
+            remaining_amount=[0.0, 250.0][n % 2],
+            invoice_date=datetime(2026, 1, 1 + n % 3),
+            due_date=datetime(2026, 2, 1 + n % 2, 12, 30),
+            created_by=user.id
+        )
+        for n in range(9)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+@pytest.fixture
+def payables(db):
+    vendor = models.Vendor(name="Shahzad Goods", vendor_code="VEN-0001")
+    db.add(vendor)
+    db.flush()
+    rows = [
+        models.Payable(
+            vendor_id=vendor.id,
+            invoice_number=f"BILL-{n}",
+            description="Freight",
+            amount=[300.0, 200.0, 300.0][n % 3],
+            # Payables from before outstanding_amount existed have NULLs here
+            outstanding_amount=None if n % 3 == 0 else 50.0 * (n % 2),
+            due_date=None if n == 4 else datetime(2026, 3, 1 + n % 2),
+        )
+        for n in range(8)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort", list(crud.RECEIVABLE_SORTS))
+def test_receivable_pages_cover_every_row_once_in_order(db, receivables, sort, descending):
+    ids, pages = _pages(lambda **kwargs: crud.receivables_page(db, [], sort, descending, **kwargs))
+    assert ids == _expected(receivables, sort, descending)
+    assert pages == 5
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort", list(crud.PAYABLE_SORTS))
+def test_payable_pages_put_nulls_last(db, payables, sort, descending):
+    ids, _ = _pages(lambda **kwargs: crud.payables_page(db, [], sort, descending, **kwargs))
+    assert ids == _expected(payables, sort, descending)
+
+
+def test_filters_apply_on_every_page(db, receivables):
+    client_id = receivables[0].client_id
+    conditions = crud.receivable_filters(client_id=client_id, min_amount=200.0)
+    ids, _ = _pages(lambda **kwargs: crud.receivables_page(db, conditions, "total_amount", True, **kwargs))
+    matching = [row for row in receivables if row.client_id == client_id and row.total_amount >= 200.0]
+    assert ids == _expected(matching, "total_amount", True)
+
+
+def test_rows_added_behind_the_cursor_are_not_repeated(db, user, receivables):
+    first = crud.receivables_page(db, [], "id", False, None, 4)
+    db.add(models.Receivable(
+        client_id=receivables[0].client_id,
+        invoice_number="INV-NEW",
+        description="Freight",
+        total_amount=1.0,
+        remaining_amount=1.0,
+        invoice_date=datetime(2026, 1, 1),
+        due_date=datetime(2026, 2, 1),
+        created_by=user.id
+    ))
+    db.commit()
+    rest = crud.receivables_page(db, [], "id", False, first["next_cursor"], 100)
+    seen = [item["id"] for item in first["items"] + rest["items"]]
+    assert len(seen) == len(set(seen)) == len(receivables) + 1
+
+
+def test_cursor_round_trip_and_rejection():
+    due = models.Receivable.due_date
+    assert decode_cursor(encode_cursor(datetime(2026, 2, 1, 12, 30), 7), due) == (datetime(2026, 2, 1, 12, 30), 7)
+    assert decode_cursor(encode_cursor(None, 3), due) == (None, 3)
+    assert decode_cursor(encode_cursor(250, 4), models.Receivable.total_amount) == (250.0, 4)
+    for cursor in ("not-a-cursor", encode_cursor("yesterday", 1)):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, due)
+
+
+def test_unknown_sort_is_rejected(db):
+    with pytest.raises(ValueError):
+        crud.receivables_page(db, [], "client_name")
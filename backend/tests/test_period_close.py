@@ -0,0 +1,87 @@
+"""
+Period close: month-end snapshots, opening balances and back-dated postings
+"""
+from datetime import date, datetime
+
+import pytest
+
+import models
+from period_close import CLIENT, STATUS_CLOSED, STATUS_STALE, PeriodCloseService
+
+
+def _invoice(db, client, user, number, amount, day):
+    receivable = models.Receivable(
+        client_id=client.id,
+        invoice_number=number,
+        description="Freight",
+        total_amount=amount,
+        remaining_amount=amount,
+        invoice_date=day,
+        due_date=day,
+        created_by=user.id
+    )
+    db.add(receivable)
+    db.flush()
+    return receivable
+
+
+def _collect(db, receivable, user, amount, day):
+    db.add(models.Collection(
+        receivable_id=receivable.id,
+        client_id=receivable.client_id,
+        collection_amount=amount,
+        collection_date=day,
+        collection_channel=models.CollectionChannel.BANK_TRANSFER,
+        collected_by=user.id
+    ))
+    db.flush()
+
+
+def test_close_snapshots_balances_carried_into_next_month(db, user, client):
+    january = _invoice(db, client, user, "INV-1", 1000.0, datetime(2026, 1, 10))
+    _collect(db, january, user, 400.0, datetime(2026, 1, 20))
+    february = _invoice(db, client, user, "INV-2", 250.0, datetime(2026, 2, 5))
+    _collect(db, february, user, 50.0, datetime(2026, 2, 25))
+    db.commit()
+    
+    service = PeriodCloseService(db)
+    assert service.close_through(2026, 1, user.id) == [(2026, 1)]
+    db.commit()
+    
+    assert service.latest_close(date(2026, 2, 1)).status == STATUS_CLOSED
+    snapshot = db.query(models.PeriodBalance).filter_by(account_type=CLIENT, entity_id=client.id).one()
+    assert (snapshot.opening_balance, snapshot.total_in, snapshot.total_out) == (0.0, 1000.0, 400.0)
+    assert snapshot.closing_balance == 600.0
+    
+    # February starts from the snapshot; March adds February's postings
+    assert service.opening_balance(CLIENT, date(2026, 2, 1), client.id) == 600.0
+    assert service.opening_balance(CLIENT, date(2026, 3, 1), client.id) == 800.0
+    assert service.period_totals(CLIENT, 2026, 2) == (250.0, 50.0)
+
+
+def test_back_dated_posting_marks_month_stale_until_reclosed(db, user, client):
+    _invoice(db, client, user, "INV-1", 1000.0, datetime(2026, 1, 10))
+    db.commit()
+    service = PeriodCloseService(db)
+    service.close_through(2026, 2, user.id)
+    db.commit()
+    
+    _invoice(db, client, user, "INV-OLD", 300.0, datetime(2026, 1, 31))
+    db.commit()
+    
+    statuses = {(row["year"], row["month"]): row["status"] for row in service.status()}
+    assert statuses == {(2026, 1): STATUS_STALE, (2026, 2): STATUS_STALE}
+    # Stale snapshots are ignored, so the back-dated invoice already counts
+    assert service.latest_close(date(2026, 3, 1)) is None
+    assert service.opening_balance(CLIENT, date(2026, 3, 1), client.id) == 1300.0
+    
+    assert service.reclose_stale(user.id) == [(2026, 1), (2026, 2)]
+    db.commit()
+    assert service.latest_close(date(2026, 3, 1)).month == 2
+    assert service.opening_balance(CLIENT, date(2026, 3, 1), client.id) == 1300.0
+
+
+def test_open_month_cannot_be_closed(db):
+    today = date.today()
+    with pytest.raises(ValueError):
+        PeriodCloseService(db).close_period(today.year, today.month)
@@ -0,0 +1,160 @@
+"""
+Reconciliation: derived balances recomputed from their source rows and repaired
+"""
+from datetime import date, datetime
+
+import pytest
+
+import crud
+import models
+from reconciliation_service import CASH, PAYABLES, RECEIVABLES, ReconciliationService
+
+
+def _client(db, name, code, balance):
+    record = models.Client(name=name, client_code=code, current_balance=balance)
+    db.add(record)
+    db.flush()
+    return record
+
+
+def _receivable(db, client, user, number, total, paid, remaining):
+    receivable = models.Receivable(
+        client_id=client.id,
+        invoice_number=number,
+        description="Freight",
+        total_amount=total,
+        paid_amount=paid,
+        remaining_amount=remaining,
+        invoice_date=datetime(2026, 3, 1),
+        due_date=datetime(2026, 3, 31),
+        created_by=user.id
+    )
+    db.add(receivable)
+    db.flush()
+    return receivable
+
+
+def _collection(db, receivable, user, amount):
+    collection = models.Collection(
+        receivable_id=receivable.id,
+        client_id=receivable.client_id,
+        collection_amount=amount,
+        collection_date=datetime(2026, 3, 15),
+        collection_channel=models.CollectionChannel.BANK_TRANSFER,
+        collected_by=user.id
+    )
+    db.add(collection)
+    db.flush()
+    return collection
+
+
+def _cash_row(db, user, source_id, amount):
+    row = models.CashTransaction(
+        date=date(2026, 3, 15),
+        amount=amount,
+        direction=models.CashDirection.IN,
+        source_module=models.CashSourceModule.RECEIVABLE,
+        source_id=source_id,
+        payment_mode=models.PaymentMode.BANK,
+        created_by=user.id
+    )
+    db.add(row)
+    db.flush()
+    return row
+
+
+def _identity(item):
+    return item['table'], item['id'], item['field']
+
+
+def test_receivable_and_client_balances_are_repaired(db, user):
+    client = _client(db, "Engro", "CLI-0001", 999.0)
+    receivable = _receivable(db, client, user, "INV-1", 1000.0, 0.0, 1000.0)
+    collection = _collection(db, receivable, user, 300.0)
+    _cash_row(db, user, collection.id, 300.0)
+    db.commit()
+    
+    service = ReconciliationService(db, workers=1)
+    report = service.run(checks=[RECEIVABLES])
+    found = {(item['table'], item['field']): item for item in report['discrepancies']}
+    assert set(found) == {('receivables', 'paid_amount'), ('receivables', 'remaining_amount'), ('clients', 'current_balance')}
+    assert found[('receivables', 'remaining_amount')]['expected'] == 700.0
+    assert found[('receivables', 'paid_amount')]['entries'] == [{'table': 'collections', 'id': collection.id}]
+    assert found[('clients', 'current_balance')]['entries'] == [{'table': 'receivables', 'id': receivable.id}]
+    assert report['repaired'] == 0
+    
+    assert service.run(checks=[RECEIVABLES], repair=True, user_id=user.id)['repaired'] == 2
+    db.commit()
+    db.expire_all()
+    assert (receivable.paid_amount, receivable.remaining_amount, client.current_balance) == (300.0, 700.0, 700.0)
+    assert service.run(checks=[RECEIVABLES])['discrepancy_count'] == 0
+
+
+def test_collection_cash_rows_missing_duplicated_or_orphaned(db, user):
+    client = _client(db, "Lucky Cement", "CLI-0002", 0.0)
+    receivable = _receivable(db, client, user, "INV-1", 500.0, 500.0, 0.0)
+    unrecorded = _collection(db, receivable, user, 200.0)
+    duplicated = _collection(db, receivable, user, 300.0)
+    kept = _cash_row(db, user, duplicated.id, 300.0)
+    extra = _cash_row(db, user, duplicated.id, 300.0)
+    orphan = _cash_row(db, user, duplicated.id + 100, 50.0)
+    db.commit()
+    
+    report = ReconciliationService(db, workers=1).run(checks=[RECEIVABLES, CASH], repair=True, user_id=user.id)
+    db.commit()
+    reasons = {(item['id'], item.get('reason')) for item in report['discrepancies']}
+    assert reasons == {
+        (unrecorded.id, 'cash_transaction_missing'),
+        (duplicated.id, 'duplicate_cash_transactions'),
+        (orphan.id, 'source_missing_or_unpaid'),
+    }
+    # The missing row is only reported; the duplicate and the orphan are soft-deleted
+    assert report['repaired'] == 2
+    db.expire_all()
+    assert (kept.is_deleted, extra.is_deleted, orphan.is_deleted) == (False, True, True)
+    assert extra.deleted_by == user.id
+
+
+def test_trips_reconcile_and_vendor_balances_are_only_noticed(db, user, vendor, trip_data):
+    first = crud.create_trip(db, trip_data("TRP-1", vendor_freight=30000.0, local_shifting_charges=500.0), user.id)
+    crud.create_trip(db, trip_data("TRP-2", vendor_freight=12000.0), user.id)
+    
+    service = ReconciliationService(db, workers=1)
+    report = service.run(checks=[RECEIVABLES, PAYABLES], repair=True, user_id=user.id)
+    db.commit()
+    assert report['discrepancy_count'] == 0 and report['repaired'] == 0
+    # Trips leave vendor balances to the ledger, so the open payables only show up as a notice
+    assert [(item['id'], item['stored'], item['expected']) for item in report['notices']] == [(vendor.id, 0.0, 42500.0)]
+    db.expire_all()
+    assert vendor.current_balance == 0.0
+    
+    payable = db.get(models.Payable, first.payable_id)
+    payable.outstanding_amount = 100.0
+    db.commit()
+    report = service.run(checks=[PAYABLES], repair=True, user_id=user.id)
+    db.commit()
+    assert [(item['table'], item['id'], item['expected']) for item in report['discrepancies']] == [
+        ('payables', payable.id, 30500.0)
+    ]
+    assert report['repaired'] == 1
+    db.expire_all()
+    assert (payable.outstanding_amount, vendor.current_balance) == (30500.0, 0.0)
+
+
+def test_parallel_chunks_match_a_single_pass(db, user):
+    for n in range(4):
+        client = _client(db, f"Client {n}", f"CLI-{n:04d}", 0.0)
+        _receivable(db, client, user, f"INV-{n}", 100.0 * (n + 1), 0.0, 0.0)
+    db.commit()
+    
+    serial = ReconciliationService(db, workers=1).run(checks=[RECEIVABLES])
+    parallel = ReconciliationService(db, workers=2, chunk_size=1).run(checks=[RECEIVABLES])
+    assert parallel['chunks'] == 4 and parallel['workers'] == 2
+    assert serial['discrepancy_count'] == 8
+    assert sorted(parallel['discrepancies'], key=_identity) == sorted(serial['discrepancies'], key=_identity)
+    assert parallel['checked'] == serial['checked']
+
+
+def test_unknown_check_is_rejected(db):
+    with pytest.raises(ValueError):
+        ReconciliationService(db, workers=1).run(checks=['inventory'])
@@ -0,0 +1,73 @@
+"""
+Search index (SQLite FTS5 trigram): substring hits, short queries and re-indexing on writes
+"""
+import pytest
+
+import crud
+import models
+import search_index
+
+
+def _hits(db, query, types=None):
+    return {(hit["type"], hit["id"]) for hit in search_index.search(db, query, types)}
+
+
+@pytest.fixture
+def trip(db, user, trip_data):
+    return crud.create_trip(db, trip_data("TRP-2026-0042"), user.id)
+
+
+def test_any_three_characters_match(db, trip, client, vehicle):
+    # Middle of a vehicle number and of a reference
+    assert ("trip", trip.id) in _hits(db, "s-12")
+    assert ("trip", trip.id) in _hits(db, "6-004")
+    # Every word must match
+    assert _hits(db, "auji aslam") == {("trip", trip.id)}
+    assert _hits(db, "auji", types=["client", "receivable"]) == {
+        ("client", client.id), ("receivable", trip.receivable_id)
+    }
+    assert _hits(db, "auji multan") == set()
+
+
+def test_short_queries_fall_back_to_like(db, trip):
+    assert ("trip", trip.id) in _hits(db, "34")
+    assert _hits(db, "4%") == set()  # LIKE wildcards are matched literally
+    assert _hits(db, "  ") == set()
+
+
+def test_renames_reach_the_documents_that_show_the_name(db, trip, client):
+    client.name = "Engro Fertilizer"
+    db.commit()
+    
+    assert _hits(db, "engro") == {("client", client.id), ("trip", trip.id), ("receivable", trip.receivable_id)}
+    assert _hits(db, "fauji") == set()
+    receivable = next(hit for hit in search_index.search(db, "engro") if hit["type"] == "receivable")
+    assert receivable["subtitle"] == "Engro Fertilizer"
+
+
+def test_bulk_renames_are_reindexed_by_index_rows(db, trip, vehicle):
+    updates = [{"id": vehicle.id, "vehicle_no": "KHI-9876"}]
+    renamed = search_index.renamed_ids(db, models.Vehicle, updates)
+    assert renamed == [vehicle.id]
+    db.bulk_update_mappings(models.Vehicle, updates)
+    search_index.index_rows(db, models.Vehicle, [vehicle.id], renamed)
+    db.commit()
+    
+    assert _hits(db, "9876") == {("trip", trip.id)}
+    assert _hits(db, "s-12") == set()
+
+
+def test_deleted_rows_leave_the_index(db):
+    client = models.Client(name="Lucky Cement", client_code="CLI-0002")
+    db.add(client)
+    db.commit()
+    assert _hits(db, "lucky") == {("client", client.id)}
+    
+    db.delete(client)
+    db.commit()
+    assert _hits(db, "lucky") == set()
+
+
+def test_unknown_result_type_is_rejected(db):
+    with pytest.raises(ValueError):
+        search_index.search(db, "lahore", types=["driver"])
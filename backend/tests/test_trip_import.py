@@ -0,0 +1,93 @@
+"""
+Trip import: per-row report, dry runs and the side effects of trip entry
+"""
+import csv
+import io
+
+import pytest
+
+import crud
+import models
+from bulk_import_export import BulkImportExportService
+
+HEADER = [
+    'date', 'reference_no', 'vehicle_no', 'client_name', 'vendor_name', 'category_product',
+    'source_location', 'destination_location', 'driver_operator', 'total_tonnage',
+    'vendor_freight', 'client_freight', 'fuel_cost'
+]
+
+
+def _row(reference_no, client="Fauji Fertilizer", vendor="Shahzad Goods", vehicle="LES-1234",
+         client_freight=40000, vendor_freight=30000, fuel_cost=0, day="2026-03-10"):
+    return [day, reference_no, vehicle, client, vendor, "Urea", "Karachi", "Lahore", "Aslam", 30,
+            vendor_freight, client_freight, fuel_cost]
+
+
+def _csv(*rows):
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(HEADER)
+    writer.writerows(rows)
+    return io.BytesIO(text.getvalue().encode())
+
+
+@pytest.fixture
+def importer(db, client, vendor, vehicle):
+    return BulkImportExportService(db)
+
+
+def test_rows_are_reported_by_number_and_field(db, user, importer, trip_data):
+    crud.create_trip(db, trip_data("TRP-OLD"), user.id)
+    upload = _csv(
+        _row("TRP-1"),
+        _row("TRP-OLD"),
+        _row("TRP-1"),
+        _row("TRP-2", client="Nobody", vehicle="XYZ-0"),
+        _row("TRP-3", client_freight=20000, vendor_freight=30000),
+        _row("TRP-4", day="10/03/2026"),
+    )
+    results = importer.import_trips(upload, "trips.csv", user.id, dry_run=True)
+    
+    assert (results['total'], results['valid'], results['failed'], results['success']) == (6, 1, 5, 0)
+    errors = {error['row']: error for error in results['errors']}
+    assert errors[3]['errors'] == [{'field': 'reference_no', 'message': 'Trip reference already exists'}]
+    assert errors[4]['errors'] == [{'field': 'reference_no', 'message': 'Duplicate reference in file'}]
+    assert [e['field'] for e in errors[5]['errors']] == ['client_name', 'vehicle_no']
+    assert [e['field'] for e in errors[6]['errors']] == ['client_freight']
+    assert 'negative profit' in errors[6]['errors'][0]['message']
+    assert [e['field'] for e in errors[7]['errors']] == ['date']
+    
+    # A dry run writes nothing
+    assert db.query(models.Trip).count() == 1
+
+
+def test_import_matches_trip_entry(db, user, client, importer, trip_data):
+    client.current_balance = 1000.0
+    db.commit()
+    upload = _csv(
+        _row("TRP-1", fuel_cost=1000),
+        _row("TRP-2", client_freight=30000, vendor_freight=30000),
+        _row("TRP-3", client_freight=50000, day="2026-03-12"),
+    )
+    results = importer.import_trips(upload, "trips.csv", user.id, chunk_size=2)
+    assert (results['success'], results['failed']) == (3, 0)
+    
+    trips = db.query(models.Trip).order_by(models.Trip.reference_no).all()
+    assert [trip.net_profit for trip in trips] == [9000.0, 0.0, 20000.0]
+    for trip in trips:
+        assert trip.receivable_created and trip.payable_created
+        assert trip.receivable.total_amount == trip.client_freight
+        assert trip.payable.outstanding_amount == trip.vendor_freight
+        
+    db.expire_all()
+    assert client.current_balance == 1000.0 + 40000 + 30000 + 50000
+    # Only trips with profit are allocated, each chained on the previous balance
+    capital = db.query(models.CEOCapital).order_by(models.CEOCapital.id).all()
+    assert [(row.reference_id, row.amount_in, row.balance) for row in capital] == [
+        (trips[0].id, 9000.0, 9000.0),
+        (trips[2].id, 20000.0, 29000.0),
+    ]
+    
+    # Later trip entry continues the same chain
+    crud.create_trip(db, trip_data("TRP-4", client_freight=35000.0), user.id)
+    assert db.query(models.CEOCapital).order_by(models.CEOCapital.id.desc()).first().balance == 34000.0
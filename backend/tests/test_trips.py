@@ -0,0 +1,67 @@
+"""
+Trip entry: one trip creates its receivable, payable, CEO Capital allocation and
+audit record in a single transaction
+"""
+import pytest
+from starlette.requests import Request
+
+import crud
+import models
+from audit_service import AuditService
+from balance_heads import CEO_CAPITAL, BalanceHeadService
+
+REQUEST = Request({"type": "http", "headers": [(b"user-agent", b"pytest")], "client": ("10.0.0.5", 4000)})
+
+
+def _counts(db):
+    return {
+        model.__tablename__: db.query(model).count()
+        for model in (models.Trip, models.Receivable, models.Payable, models.CEOCapital, models.AuditLog, models.BalanceHead)
+    }
+
+
+def _fail_on_call(number, function):
+    calls = []
+    
+    def failing(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == number:
+            raise RuntimeError("posting failed")
+        return function(*args, **kwargs)
+    return failing
+
+
+def test_bulk_trips_create_every_side_effect(db, user, client, trip_data):
+    trips = [trip_data(f"TRP-{n}", client_freight=40000.0, vendor_freight=30000.0, fuel_cost=1000.0 * n) for n in range(3)]
+    created = crud.create_trips_bulk(db, trips, user.id, REQUEST, batch_size=2)
+    
+    assert [trip.net_profit for trip in created] == [10000.0, 9000.0, 8000.0]
+    assert all(trip.receivable_created and trip.payable_created for trip in created)
+    counts = _counts(db)
+    assert (counts["trips"], counts["receivables"], counts["payables"], counts["ceo_capital"], counts["audit_logs"]) == (3, 3, 3, 3, 3)
+    
+    db.expire_all()
+    assert client.current_balance == 120000.0
+    balances = [row.balance for row in db.query(models.CEOCapital).order_by(models.CEOCapital.id)]
+    assert balances == [10000.0, 19000.0, 27000.0]
+    assert BalanceHeadService(db).get(CEO_CAPITAL).balance == 27000.0
+
+
+@pytest.mark.parametrize("target, attribute", [
+    (crud, "_trip_profit_allocation"),
+    (AuditService, "log_create"),
+])
+def test_failure_part_way_leaves_nothing_behind(db, user, client, trip_data, monkeypatch, target, attribute):
+    client.current_balance = 500.0
+    db.commit()
+    before = _counts(db)
+    
+    # The third call fails: the first batch of two is already flushed by then
+    monkeypatch.setattr(target, attribute, _fail_on_call(3, getattr(target, attribute)))
+    trips = [trip_data(f"TRP-{n}") for n in range(4)]
+    with pytest.raises(RuntimeError):
+        crud.create_trips_bulk(db, trips, user.id, REQUEST, batch_size=2)
+        
+    assert _counts(db) == before
+    db.expire_all()
+    assert client.current_balance == 500.0
@@ -11,9 +11,49 @@ const NotificationBell = () => {
 
   useEffect(() => {
     fetchUnreadCount();
-    // Poll every 30 seconds for new notifications
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+    let interval = null;
+    let source = null;
+
+    // Poll every 30 seconds when the browser or server cannot keep a stream open
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(fetchUnreadCount, 30000);
+      }
+    };
+
+    const token = localStorage.getItem('token');
+    if (window.EventSource && token) {
+      source = new EventSource(`http://localhost:8000/notifications/stream?token=${encodeURIComponent(token)}`);
+      source.addEventListener('unread_count', (event) => {
+        setUnreadCount(JSON.parse(event.data).count);
+      });
+      source.addEventListener('notification', (event) => {
+        const data = JSON.parse(event.data);
+        setUnreadCount(data.unread_count);
+        setNotifications((current) => [data.notification, ...current].slice(0, 20));
+      });
+      source.addEventListener('resync', fetchUnreadCount);
+      source.onopen = () => {
+        if (interval) {
+          clearInterval(interval);
+          interval = null;
+        }
+      };
+      source.onerror = () => {
+        // EventSource reconnects by itself; poll until it does, stop for good on auth errors
+        if (source.readyState === EventSource.CLOSED) {
+          source.close();
+        }
+        startPolling();
+      };
+    } else {
+      startPolling();
+    }
+
+    return () => {
+      if (source) source.close();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   // Close dropdown when clicking outside
@@ -814,6 +814,11 @@ const Dashboard = () => {
                       {receivablesDetails.count} clients with outstanding balances
                     </p>
                   )}
+                  {receivablesDetails.details.length < receivablesDetails.count && (
+                    <p style={{ fontSize: '0.75rem', color: '#6b7280', fontStyle: 'italic' }}>
+                      Showing the {receivablesDetails.details.length} largest of {receivablesDetails.count} outstanding invoices
+                    </p>
+                  )}
                 </div>
                 
                 {receivablesDetails.details.length > 0 ? (
@@ -915,6 +920,11 @@ const Dashboard = () => {
                   <p style={{ fontSize: '0.875rem', color: '#6b7280' }}>
                     {payablesDetails.count} vendors to pay
                   </p>
+                  {payablesDetails.details.length < payablesDetails.count && (
+                    <p style={{ fontSize: '0.75rem', color: '#6b7280', fontStyle: 'italic' }}>
+                      Showing the {payablesDetails.details.length} largest of {payablesDetails.count} outstanding payables
+                    </p>
+                  )}
                 </div>
                 
                 <div style={{ maxHeight: '300px', overflow: 'auto' }}>